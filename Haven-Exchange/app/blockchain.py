@@ -3,19 +3,35 @@ Travelers Exchange — Simulated Blockchain Engine
 
 Provides the core transaction engine: hash chaining, balance management,
 chain verification, and all ledger operations.  Every currency movement
-in the Travelers Exchange flows through create_transaction().
+in the Travelers Exchange flows through create_transaction() or, for
+batches, append_transactions().
 """
 
 import hashlib
+import hmac
+import json
 import secrets
 import threading
-from datetime import datetime
-from typing import Optional
-
-from sqlalchemy import func, or_, select
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.config import settings
-from app.models import Bank, Nation, Transaction, User
+from app.models import AddressDailyFlow, Bank, LedgerCheckpoint, Nation, Transaction, User
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -82,12 +98,277 @@ def create_genesis_block(db) -> None:
         status="confirmed",
     )
     db.add(genesis)
+    _record_flows(db, [genesis], datetime.utcnow().strftime("%Y-%m-%d"))
     db.commit()
 
 
 # ---------------------------------------------------------------------------
 # Core transaction creation
 # ---------------------------------------------------------------------------
+class Transfer(NamedTuple):
+    """One ledger movement queued for append_transactions()."""
+    tx_type: str
+    from_address: str
+    to_address: str
+    amount: int
+    memo: Optional[str] = None
+
+
+_WALLET_LOOKUP_CHUNK = 500  # addresses per IN (...) when loading wallets
+
+
+def _check_transfer(t: Transfer) -> None:
+    """Validate the parts of a transfer that don't depend on balances."""
+    # -- Validate tx_type -----------------------------------------------------
+    if t.tx_type not in _VALID_TX_TYPES:
+        raise ValueError(
+            f"Invalid transaction type '{t.tx_type}'. "
+            f"Must be one of: {', '.join(sorted(_VALID_TX_TYPES - {'GENESIS'}))}"
+        )
+
+    # -- Validate amount ------------------------------------------------------
+    # LOAN_FORGIVE is allowed amount=0 because forgiveness does not move
+    # coins (the bank loses a receivable, but no balance changes hands).
+    # The transaction exists purely as an audit-log entry. Negative
+    # amounts are still rejected for all types.
+    if t.amount < 0:
+        raise ValueError("Transaction amount cannot be negative.")
+    if t.tx_type not in ("GENESIS", "LOAN_FORGIVE") and t.amount == 0:
+        raise ValueError("Transaction amount must be greater than zero.")
+
+    # -- Validate MINT source -------------------------------------------------
+    if t.tx_type == "MINT" and t.from_address != settings.WORLD_MINT_ADDRESS:
+        raise ValueError(
+            f"MINT transactions must originate from the World Mint ({settings.WORLD_MINT_ADDRESS})."
+        )
+
+
+def _load_wallets(db, addresses: set[str]) -> dict:
+    """Map every known address in *addresses* to its Bank, Nation or User row."""
+    groups = {Bank: [], Nation: [], User: []}
+    for address in addresses:
+        if address.startswith("TRV-BANK-"):
+            groups[Bank].append(address)
+        elif address.startswith(settings.NATION_WALLET_PREFIX):
+            groups[Nation].append(address)
+        elif address != "SYSTEM":
+            groups[User].append(address)
+
+    wallets: dict = {}
+    for model, wanted in groups.items():
+        column = Nation.treasury_address if model is Nation else model.wallet_address
+        for i in range(0, len(wanted), _WALLET_LOOKUP_CHUNK):
+            rows = db.execute(
+                select(model).where(column.in_(wanted[i:i + _WALLET_LOOKUP_CHUNK]))
+            ).scalars()
+            for row in rows:
+                wallets[getattr(row, column.key)] = row
+    return wallets
+
+
+def _wallet_balance(wallet) -> int:
+    return wallet.treasury_balance if isinstance(wallet, Nation) else wallet.balance
+
+
+def _debit_wallet(t: Transfer, wallets: dict):
+    """Return the wallet row whose cached balance *t* debits, if any."""
+    if t.from_address in (settings.WORLD_MINT_ADDRESS, "SYSTEM"):
+        return None
+    return wallets.get(t.from_address)
+
+
+def _credit_wallet(t: Transfer, wallets: dict):
+    """Return the wallet row whose cached balance *t* credits, if any."""
+    # Skip balance credit for BURN and DEMURRAGE_BURN transactions to the
+    # World Mint address — these are genuine destructions of supply.
+    # Sends to SYSTEM are also skipped.  MINT-to-self (pre-staging) still
+    # credits the admin's balance (MINT tx type, not BURN).
+    is_burn_target = (
+        t.to_address == settings.WORLD_MINT_ADDRESS
+        and t.tx_type in ("BURN", "DEMURRAGE_BURN")
+    )
+    if t.to_address == "SYSTEM" or is_burn_target:
+        return None
+    return wallets.get(t.to_address)
+
+
+def _check_funds(t: Transfer, wallets: dict, pending: dict[str, int]) -> None:
+    """Check the sender can cover *t* after the batch's earlier transfers.
+
+    *pending* holds the net balance change each address has accumulated so
+    far in the batch; nothing is written to the wallet rows until every
+    transfer has passed.
+    """
+    if t.tx_type in ("MINT", "GENESIS"):
+        return
+    address = t.from_address
+    wallet = wallets.get(address)
+    if address.startswith("TRV-BANK-"):
+        if wallet is None:
+            raise ValueError(f"Bank with wallet address '{address}' not found.")
+        label = "Insufficient bank balance."
+    elif address.startswith(settings.NATION_WALLET_PREFIX):
+        if wallet is None:
+            raise ValueError(f"Nation with treasury address '{address}' not found.")
+        label = "Insufficient treasury balance."
+    elif address != settings.WORLD_MINT_ADDRESS:
+        if wallet is None:
+            raise ValueError(f"Sender wallet '{address}' not found.")
+        label = "Insufficient balance."
+    else:
+        return
+    available = _wallet_balance(wallet) + pending.get(address, 0)
+    if available < t.amount:
+        raise ValueError(f"{label} Available: {available}, required: {t.amount}.")
+
+
+def _apply_wallet_changes(db, changes: dict, now: datetime) -> None:
+    """Write the batch's net balance and wallet-health changes.
+
+    *changes* maps (model, id) to [balance delta, user-side legs, volume].
+    Each wallet kind is one executemany UPDATE with relative SET clauses,
+    so a batch costs the same few statements however many wallets it
+    touches, and concurrent writers' changes are added to, not overwritten.
+    """
+    by_model: dict = {}
+    for (model, wallet_id), (delta, legs, volume) in changes.items():
+        by_model.setdefault(model, []).append({
+            "wallet_id": wallet_id, "delta": delta, "legs": legs, "volume": volume,
+        })
+
+    for model, params in by_model.items():
+        table = model.__table__
+        if model is User:
+            values = {
+                "balance": table.c.balance + bindparam("delta"),
+                # -- Phase 2H: wallet health real-time bumps ------------------
+                # Lifetime + 30d tx counters and volume grow with every user
+                # side of a transaction.  The daily wallet-health job decays
+                # activity that ages past 30 days; this keeps the counters
+                # warm so the wallet view reflects fresh activity immediately.
+                "transaction_count_lifetime": (
+                    func.coalesce(table.c.transaction_count_lifetime, 0) + bindparam("legs")
+                ),
+                "transaction_count_30d": (
+                    func.coalesce(table.c.transaction_count_30d, 0) + bindparam("legs")
+                ),
+                "volume_lifetime": func.coalesce(table.c.volume_lifetime, 0) + bindparam("volume"),
+                "volume_30d": func.coalesce(table.c.volume_30d, 0) + bindparam("volume"),
+                "last_active": case(
+                    (bindparam("legs") > 0, literal(now, type_=table.c.last_active.type)),
+                    else_=table.c.last_active,
+                ),
+            }
+        elif model is Nation:
+            values = {"treasury_balance": table.c.treasury_balance + bindparam("delta")}
+        else:
+            values = {"balance": table.c.balance + bindparam("delta")}
+        db.execute(
+            update(table).where(table.c.id == bindparam("wallet_id")).values(values),
+            params,
+        )
+
+
+def append_transactions(db, transfers: list) -> list[Transaction]:
+    """Validate, hash-chain and commit a batch of ledger entries at once.
+
+    *transfers* is a list of Transfer tuples (plain tuples in the same field
+    order work too).  Every transfer is validated against the balances left
+    by the ones before it, and nothing is written unless all of them pass:
+    a ValueError names the failing transfer and leaves the ledger and the
+    session untouched.  The chain tip is read once, the hashes for the whole
+    batch are chained in memory, and the batch lands in a single commit, so
+    the ledger lock is held for one round-trip rather than one per row.
+    The address_daily_flows rollup is updated in the same commit.  Returns
+    the committed Transaction rows in chain order.
+    """
+    transfers = [t if isinstance(t, Transfer) else Transfer(*t) for t in transfers]
+    if not transfers:
+        return []
+
+    with _tx_lock:
+        wallets = _load_wallets(
+            db, {a for t in transfers for a in (t.from_address, t.to_address)}
+        )
+
+        # -- Validate the whole batch before touching anything -------------
+        pending: dict[str, int] = {}
+        for index, t in enumerate(transfers):
+            try:
+                _check_transfer(t)
+                _check_funds(t, wallets, pending)
+            except ValueError as exc:
+                if len(transfers) == 1:
+                    raise
+                raise ValueError(f"Transfer {index + 1} of {len(transfers)}: {exc}") from None
+            if _debit_wallet(t, wallets) is not None:
+                pending[t.from_address] = pending.get(t.from_address, 0) - t.amount
+            if _credit_wallet(t, wallets) is not None:
+                pending[t.to_address] = pending.get(t.to_address, 0) + t.amount
+
+        # -- Chain the batch and total up the wallet changes -------------
+        prev_hash = get_last_hash(db)
+        now = datetime.utcnow()
+        rows: list[dict] = []
+        changes: dict = {}
+        for t in transfers:
+            nonce = secrets.token_hex(16)
+            timestamp = datetime.utcnow().isoformat()
+            tx_hash = compute_tx_hash(
+                prev_hash, t.from_address, t.to_address, t.amount, timestamp, nonce
+            )
+            rows.append({
+                "tx_hash": tx_hash,
+                "prev_hash": prev_hash,
+                "tx_type": t.tx_type,
+                "from_address": t.from_address,
+                "to_address": t.to_address,
+                "amount": t.amount,
+                "fee": 0,
+                "memo": t.memo,
+                "nonce": nonce,
+                "status": "confirmed",
+            })
+            prev_hash = tx_hash
+
+            # GENESIS is a synthetic SYSTEM tx with no real wallet, so it
+            # doesn't count towards wallet health; the World Mint never
+            # counts as a sender.
+            counts = t.tx_type != "GENESIS"
+            for wallet, delta in (
+                (_debit_wallet(t, wallets), -t.amount),
+                (_credit_wallet(t, wallets), t.amount),
+            ):
+                if wallet is None:
+                    continue
+                change = changes.setdefault((type(wallet), wallet.id), [0, 0, 0])
+                change[0] += delta
+                if counts and isinstance(wallet, User):
+                    change[1] += 1
+                    change[2] += t.amount
+
+        # One executemany INSERT; ORM unit-of-work inserts would go out
+        # one statement per row to fetch each generated id.
+        try:
+            db.execute(insert(Transaction), rows)
+            _apply_wallet_changes(db, changes, now)
+            _record_flows(db, transfers, now.strftime("%Y-%m-%d"))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    hashes = [row["tx_hash"] for row in rows]
+    txs: list[Transaction] = []
+    for i in range(0, len(hashes), _WALLET_LOOKUP_CHUNK):
+        txs += db.execute(
+            select(Transaction)
+            .where(Transaction.tx_hash.in_(hashes[i:i + _WALLET_LOOKUP_CHUNK]))
+            .order_by(Transaction.id)
+        ).scalars().all()
+    return txs
+
+
 def create_transaction(
     db,
     tx_type: str,
@@ -99,185 +380,14 @@ def create_transaction(
     """Create, validate, and commit a new ledger entry.
 
     This function is thread-safe: only one transaction can be written at a
-    time, guaranteeing a linear hash chain.
+    time, guaranteeing a linear hash chain.  Callers writing many entries
+    at once should use append_transactions() instead.
 
     Raises ValueError for any validation failure.
     """
-    _tx_lock.acquire()
-    try:
-        # -- Validate tx_type -------------------------------------------------
-        if tx_type not in _VALID_TX_TYPES:
-            raise ValueError(
-                f"Invalid transaction type '{tx_type}'. "
-                f"Must be one of: {', '.join(sorted(_VALID_TX_TYPES - {'GENESIS'}))}"
-            )
-
-        # -- Validate amount --------------------------------------------------
-        # LOAN_FORGIVE is allowed amount=0 because forgiveness does not move
-        # coins (the bank loses a receivable, but no balance changes hands).
-        # The transaction exists purely as an audit-log entry. Negative
-        # amounts are still rejected for all types.
-        if amount < 0:
-            raise ValueError("Transaction amount cannot be negative.")
-        if tx_type not in ("GENESIS", "LOAN_FORGIVE") and amount == 0:
-            raise ValueError("Transaction amount must be greater than zero.")
-
-        # -- Validate MINT source ---------------------------------------------
-        if tx_type == "MINT" and from_address != settings.WORLD_MINT_ADDRESS:
-            raise ValueError(
-                f"MINT transactions must originate from the World Mint ({settings.WORLD_MINT_ADDRESS})."
-            )
-
-        # -- Balance checks for non-MINT types --------------------------------
-        if tx_type not in ("MINT", "GENESIS"):
-            if from_address.startswith("TRV-BANK-"):
-                # Bank wallet
-                bank = db.execute(
-                    select(Bank).where(Bank.wallet_address == from_address)
-                ).scalar_one_or_none()
-                if bank is None:
-                    raise ValueError(f"Bank with wallet address '{from_address}' not found.")
-                if bank.balance < amount:
-                    raise ValueError(
-                        f"Insufficient bank balance. "
-                        f"Available: {bank.balance}, required: {amount}."
-                    )
-            elif from_address.startswith(settings.NATION_WALLET_PREFIX):
-                # Nation treasury
-                nation = db.execute(
-                    select(Nation).where(Nation.treasury_address == from_address)
-                ).scalar_one_or_none()
-                if nation is None:
-                    raise ValueError(f"Nation with treasury address '{from_address}' not found.")
-                if nation.treasury_balance < amount:
-                    raise ValueError(
-                        f"Insufficient treasury balance. "
-                        f"Available: {nation.treasury_balance}, required: {amount}."
-                    )
-            elif from_address != settings.WORLD_MINT_ADDRESS:
-                # Regular user wallet
-                user = db.execute(
-                    select(User).where(User.wallet_address == from_address)
-                ).scalar_one_or_none()
-                if user is None:
-                    raise ValueError(f"Sender wallet '{from_address}' not found.")
-                if user.balance < amount:
-                    raise ValueError(
-                        f"Insufficient balance. "
-                        f"Available: {user.balance}, required: {amount}."
-                    )
-
-        # -- Build the transaction --------------------------------------------
-        prev_hash = get_last_hash(db)
-        nonce = secrets.token_hex(16)
-        timestamp = datetime.utcnow().isoformat()
-        tx_hash = compute_tx_hash(prev_hash, from_address, to_address, amount, timestamp, nonce)
-
-        tx = Transaction(
-            tx_hash=tx_hash,
-            prev_hash=prev_hash,
-            tx_type=tx_type,
-            from_address=from_address,
-            to_address=to_address,
-            amount=amount,
-            fee=0,
-            memo=memo,
-            nonce=nonce,
-            status="confirmed",
-        )
-        db.add(tx)
-
-        # -- Update cached balances -------------------------------------------
-        # Sender side
-        sender_user: Optional[User] = None
-        if from_address.startswith("TRV-BANK-"):
-            bank = db.execute(
-                select(Bank).where(Bank.wallet_address == from_address)
-            ).scalar_one_or_none()
-            if bank is not None:
-                bank.balance -= amount
-        elif from_address.startswith(settings.NATION_WALLET_PREFIX):
-            nation = db.execute(
-                select(Nation).where(Nation.treasury_address == from_address)
-            ).scalar_one_or_none()
-            if nation is not None:
-                nation.treasury_balance -= amount
-        elif from_address != settings.WORLD_MINT_ADDRESS and from_address != "SYSTEM":
-            sender_user = db.execute(
-                select(User).where(User.wallet_address == from_address)
-            ).scalar_one_or_none()
-            if sender_user is not None:
-                sender_user.balance -= amount
-
-        # Receiver side
-        # Skip balance credit for BURN and DEMURRAGE_BURN transactions to the
-        # World Mint address — these are genuine destructions of supply.
-        # Sends to SYSTEM are also skipped.  MINT-to-self (pre-staging) still
-        # credits the admin's balance (MINT tx type, not BURN).
-        is_burn_target = (
-            to_address == settings.WORLD_MINT_ADDRESS
-            and tx_type in ("BURN", "DEMURRAGE_BURN")
-        )
-        receiver_user: Optional[User] = None
-        if to_address.startswith("TRV-BANK-"):
-            bank = db.execute(
-                select(Bank).where(Bank.wallet_address == to_address)
-            ).scalar_one_or_none()
-            if bank is not None:
-                bank.balance += amount
-        elif to_address.startswith(settings.NATION_WALLET_PREFIX):
-            nation = db.execute(
-                select(Nation).where(Nation.treasury_address == to_address)
-            ).scalar_one_or_none()
-            if nation is not None:
-                nation.treasury_balance += amount
-        elif to_address != "SYSTEM" and not is_burn_target:
-            receiver_user = db.execute(
-                select(User).where(User.wallet_address == to_address)
-            ).scalar_one_or_none()
-            if receiver_user is not None:
-                receiver_user.balance += amount
-
-        # -- Phase 2H: wallet health real-time bumps --------------------------
-        # Increment lifetime + 30d tx counters and volume on each user side
-        # of the transaction.  The daily wallet-health job decays activity
-        # that ages past 30 days; this just keeps the counters warm in real
-        # time so the wallet view reflects fresh activity immediately.
-        # GENESIS, MINT, and BURN do not move tokens between user wallets in
-        # the way that should count as "wallet activity" for health metrics:
-        #   - GENESIS: synthetic SYSTEM tx, no real wallet
-        #   - MINT:    issuance from the World Mint to the admin staging wallet
-        #   - BURN:    counts on the sender side only (volume out)
-        # We track all confirmed transfers that touch a user wallet.
-        if tx_type not in ("GENESIS",):
-            now = datetime.utcnow()
-            if sender_user is not None:
-                sender_user.transaction_count_lifetime = (
-                    (sender_user.transaction_count_lifetime or 0) + 1
-                )
-                sender_user.transaction_count_30d = (
-                    (sender_user.transaction_count_30d or 0) + 1
-                )
-                sender_user.volume_lifetime = (sender_user.volume_lifetime or 0) + amount
-                sender_user.volume_30d = (sender_user.volume_30d or 0) + amount
-                sender_user.last_active = now
-            if receiver_user is not None:
-                receiver_user.transaction_count_lifetime = (
-                    (receiver_user.transaction_count_lifetime or 0) + 1
-                )
-                receiver_user.transaction_count_30d = (
-                    (receiver_user.transaction_count_30d or 0) + 1
-                )
-                receiver_user.volume_lifetime = (receiver_user.volume_lifetime or 0) + amount
-                receiver_user.volume_30d = (receiver_user.volume_30d or 0) + amount
-                receiver_user.last_active = now
-
-        db.commit()
-        db.refresh(tx)
-        return tx
-
-    finally:
-        _tx_lock.release()
+    return append_transactions(
+        db, [Transfer(tx_type, from_address, to_address, amount, memo)]
+    )[0]
 
 
 # ---------------------------------------------------------------------------
@@ -290,103 +400,287 @@ def get_transaction_by_hash(db, tx_hash: str) -> Optional[Transaction]:
     ).scalar_one_or_none()
 
 
+# Newest-first listings page with keyset cursors on (created_at, id) rather
+# than OFFSET, so page N costs the same as page 1.  A cursor is the id of the
+# first/last row on the current page; its created_at is read back from the
+# table inside the query, so the bound always compares DB values with DB
+# values (SQLite stores timestamps as strings in more than one format).
+# Address filters run as two index range scans — ix_transactions_from_created
+# and ix_transactions_to_created — merged here, instead of one OR scan.
+def _keyset_bound(cursor_id: int, older: bool):
+    """Row-value bound selecting rows older (or newer) than transaction *cursor_id*."""
+    cursor_created = (
+        select(Transaction.created_at)
+        .where(Transaction.id == cursor_id)
+        .scalar_subquery()
+    )
+    key = tuple_(Transaction.created_at, Transaction.id)
+    bound = tuple_(cursor_created, literal(cursor_id))
+    return key < bound if older else key > bound
+
+
+def _fetch_leg(db, conditions: list, limit: int, before, after) -> list[Transaction]:
+    stmt = select(Transaction).where(*conditions)
+    if before is not None:
+        stmt = stmt.where(_keyset_bound(before, older=True))
+    if after is not None:
+        stmt = stmt.where(_keyset_bound(after, older=False))
+        order = (Transaction.created_at.asc(), Transaction.id.asc())
+    else:
+        order = (Transaction.created_at.desc(), Transaction.id.desc())
+    return list(db.execute(stmt.order_by(*order).limit(limit)).scalars().all())
+
+
+def page_transactions(
+    db,
+    *conditions,
+    address: Optional[str] = None,
+    direction: str = "",
+    limit: int = 50,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    offset: int = 0,
+) -> tuple[list[Transaction], dict]:
+    """Return one newest-first page of transactions and its cursor info.
+
+    *conditions* are extra WHERE clauses.  *address* restricts to rows it
+    sent or received (*direction* 'sent' / 'received' picks one side).
+    Pass *before* (the page's next_cursor) to go to older rows or *after*
+    (prev_cursor) to go back to newer ones.  *offset* is only honoured when
+    no cursor is given, for API callers that still page by number.
+
+    page_info keys: has_prev, has_next, prev_cursor, next_cursor.
+    """
+    if address is None:
+        legs = [list(conditions)]
+    else:
+        legs = []
+        if direction != "received":
+            legs.append([Transaction.from_address == address, *conditions])
+        if direction != "sent":
+            legs.append([Transaction.to_address == address, *conditions])
+
+    fetch = offset + limit + 1
+    rows: dict[int, Transaction] = {}
+    for leg in legs:
+        for tx in _fetch_leg(db, leg, fetch, before, after):
+            rows[tx.id] = tx  # a self-transfer comes back from both legs
+    ordered = sorted(rows.values(), key=lambda tx: (tx.created_at, tx.id), reverse=after is None)
+    if before is None and after is None:
+        ordered = ordered[offset:]
+    page, more = ordered[:limit], len(ordered) > limit
+    if after is not None:
+        page.reverse()
+        has_prev, has_next = more, True
+    else:
+        has_prev, has_next = before is not None or offset > 0, more
+
+    return page, {
+        "has_prev": has_prev and bool(page),
+        "has_next": has_next and bool(page),
+        "prev_cursor": page[0].id if has_prev and page else None,
+        "next_cursor": page[-1].id if has_next and page else None,
+    }
+
+
 def get_transactions_for_address(
-    db, address: str, limit: int = 50, offset: int = 0
+    db, address: str, limit: int = 50, offset: int = 0, before: Optional[int] = None
 ) -> list[Transaction]:
-    """Return transactions involving *address* (sender or receiver)."""
-    stmt = (
-        select(Transaction)
-        .where(
-            or_(
-                Transaction.from_address == address,
-                Transaction.to_address == address,
-            )
-        )
-        .order_by(Transaction.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-    )
-    return list(db.execute(stmt).scalars().all())
+    """Return transactions involving *address* (sender or receiver), newest first."""
+    rows, _ = page_transactions(db, address=address, limit=limit, offset=offset, before=before)
+    return rows
 
 
 def get_all_transactions(
-    db, limit: int = 50, offset: int = 0
+    db, limit: int = 50, offset: int = 0, before: Optional[int] = None
 ) -> tuple[list[Transaction], int]:
     """Return (transactions, total_count) for the public ledger view."""
     total = db.execute(select(func.count(Transaction.id))).scalar() or 0
-    rows = list(
-        db.execute(
-            select(Transaction)
-            .order_by(Transaction.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        .scalars()
-        .all()
-    )
+    rows, _ = page_transactions(db, limit=limit, offset=offset, before=before)
     return rows, total
 
 
 # ---------------------------------------------------------------------------
 # Chain verification
 # ---------------------------------------------------------------------------
-def verify_chain(db) -> dict:
-    """Walk the full chain and verify hash linkage + hash integrity.
+# Rows are streamed in id order CHAIN_VERIFY_CHUNK at a time (keyset on id,
+# only the three hash columns) so a full walk never holds the ledger in
+# memory.  Every walk ends by writing a signed LedgerCheckpoint; incremental
+# verification resumes from the newest one, and pages read it for the badge.
+#
+# Only hash *linkage* is verified.  The hash cannot be recomputed because the
+# raw ISO timestamp string it was built from is not stored (created_at is set
+# by the DB and may be formatted differently).  If that is ever needed, store
+# the raw timestamp on the Transaction row.
+CHAIN_VERIFY_CHUNK = 1000       # rows fetched per query while walking
+CHAIN_ERROR_LIMIT = 50          # error messages kept per result / checkpoint
+CHECKPOINT_RETENTION = 100      # newest checkpoints kept; older rows pruned
+
+
+def _checkpoint_signature(
+    last_tx_id: int, last_tx_hash: str, tx_count: int, valid: bool, error_count: int
+) -> str:
+    """HMAC-SHA256 over a checkpoint's verified fields, keyed with SECRET_KEY."""
+    message = f"{last_tx_id}|{last_tx_hash}|{tx_count}|{int(bool(valid))}|{error_count}"
+    return hmac.new(
+        settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256
+    ).hexdigest()
 
-    Returns a dict with keys: valid (bool), total_transactions (int),
-    errors (list[str]).
+
+def _checkpoint_is_authentic(cp: LedgerCheckpoint) -> bool:
+    expected = _checkpoint_signature(
+        cp.last_tx_id, cp.last_tx_hash, cp.tx_count, cp.valid, cp.error_count
+    )
+    return hmac.compare_digest(expected, cp.signature or "")
+
+
+def _latest_checkpoint(db) -> Optional[LedgerCheckpoint]:
+    """Return the newest checkpoint, or None if there is none or it fails its signature."""
+    cp = db.execute(
+        select(LedgerCheckpoint).order_by(LedgerCheckpoint.id.desc()).limit(1)
+    ).scalar_one_or_none()
+    if cp is None:
+        return None
+    return cp if _checkpoint_is_authentic(cp) else None
+
+
+def _checkpoint_result(cp: LedgerCheckpoint) -> dict:
+    return {
+        "valid": cp.valid,
+        "total_transactions": cp.tx_count,
+        "errors": json.loads(cp.errors) if cp.errors else [],
+        "error_count": cp.error_count,
+        "last_tx_id": cp.last_tx_id,
+        "mode": cp.mode,
+        "verified_at": cp.created_at,
+    }
+
+
+def _walk_chain(
+    db, after_id: int, prev_hash: str, index: int, errors: list[str]
+) -> tuple[int, str, int, int]:
+    """Check linkage of every transaction with id > *after_id*.
+
+    *prev_hash* is the tx_hash the first row must point back to and *index*
+    its position in the chain.  Appends up to CHAIN_ERROR_LIMIT messages to
+    *errors* and returns (last_id, last_hash, rows_checked, error_count).
     """
-    transactions = list(
-        db.execute(
-            select(Transaction).order_by(Transaction.id.asc())
+    last_id, checked, error_count = after_id, 0, 0
+    while True:
+        rows = db.execute(
+            select(Transaction.id, Transaction.prev_hash, Transaction.tx_hash)
+            .where(Transaction.id > last_id)
+            .order_by(Transaction.id.asc())
+            .limit(CHAIN_VERIFY_CHUNK)
+        ).all()
+        for tx_id, tx_prev_hash, tx_hash in rows:
+            if tx_prev_hash != prev_hash:
+                error_count += 1
+                if len(errors) < CHAIN_ERROR_LIMIT:
+                    errors.append(
+                        f"Transaction #{tx_id} (index {index + checked}): prev_hash mismatch. "
+                        f"Expected '{prev_hash[:16]}...', got '{tx_prev_hash[:16]}...'."
+                    )
+            prev_hash = tx_hash
+            last_id = tx_id
+            checked += 1
+        if len(rows) < CHAIN_VERIFY_CHUNK:
+            return last_id, prev_hash, checked, error_count
+
+
+def _record_checkpoint(
+    db,
+    mode: str,
+    last_tx_id: int,
+    last_tx_hash: str,
+    tx_count: int,
+    valid: bool,
+    errors: list[str],
+    error_count: int,
+) -> dict:
+    """Write a signed checkpoint, prune old ones, commit, and return its result dict."""
+    cp = LedgerCheckpoint(
+        last_tx_id=last_tx_id,
+        last_tx_hash=last_tx_hash,
+        tx_count=tx_count,
+        valid=valid,
+        error_count=error_count,
+        errors=json.dumps(errors[:CHAIN_ERROR_LIMIT]) if errors else None,
+        mode=mode,
+        signature=_checkpoint_signature(last_tx_id, last_tx_hash, tx_count, valid, error_count),
+    )
+    db.add(cp)
+    db.flush()
+    db.execute(
+        delete(LedgerCheckpoint).where(
+            LedgerCheckpoint.id <= cp.id - CHECKPOINT_RETENTION
         )
-        .scalars()
-        .all()
     )
+    db.commit()
+    db.refresh(cp)
+    return _checkpoint_result(cp)
+
+
+def verify_chain(db) -> dict:
+    """Walk the full chain from genesis and record a 'full' checkpoint.
 
+    Returns a dict with keys: valid (bool), total_transactions (int),
+    errors (list[str], capped at CHAIN_ERROR_LIMIT), error_count (int),
+    last_tx_id, mode and verified_at.
+    """
     errors: list[str] = []
-    prev_hash = GENESIS_HASH
-
-    for i, tx in enumerate(transactions):
-        # Check prev_hash linkage
-        if tx.prev_hash != prev_hash:
-            errors.append(
-                f"Transaction #{tx.id} (index {i}): prev_hash mismatch. "
-                f"Expected '{prev_hash[:16]}...', got '{tx.prev_hash[:16]}...'."
-            )
+    last_id, last_hash, checked, error_count = _walk_chain(db, 0, GENESIS_HASH, 0, errors)
+    return _record_checkpoint(
+        db, "full", last_id, last_hash, checked, error_count == 0, errors, error_count
+    )
 
-        # Recompute and verify tx_hash
-        expected_hash = compute_tx_hash(
-            tx.prev_hash,
-            tx.from_address,
-            tx.to_address,
-            tx.amount,
-            # We need the original timestamp, but we stored created_at via the DB.
-            # The nonce + prev_hash already make each hash unique, but for
-            # verification we need to reconstruct the same inputs.  Since we
-            # stored nonce but not the raw timestamp string used at creation,
-            # and the hash was computed with datetime.utcnow().isoformat(),
-            # we cannot perfectly re-derive the timestamp from created_at
-            # (DB may round or reformat).  Therefore we only verify linkage
-            # here, not full hash recomputation — unless we store the raw
-            # timestamp.  For robustness we skip the hash value check and
-            # only verify the chain linkage.
-            #
-            # NOTE: If you need full hash verification, store the raw ISO
-            # timestamp string in the Transaction model.
-            tx.nonce,  # placeholder — see note above
-            tx.nonce,
-        )
-        # We cannot fully recompute the hash without the original ISO timestamp
-        # string (created_at in the DB may differ).  We still verify linkage.
 
-        prev_hash = tx.tx_hash
+def verify_chain_incremental(db) -> dict:
+    """Verify only the transactions appended since the newest checkpoint.
 
-    return {
-        "valid": len(errors) == 0,
-        "total_transactions": len(transactions),
-        "errors": errors,
-    }
+    Falls back to verify_chain() when there is no usable checkpoint or the
+    checkpointed tip row no longer carries the hash the checkpoint recorded.
+    A chain found invalid stays invalid until a full re-verify passes.
+    """
+    cp = _latest_checkpoint(db)
+    if cp is None:
+        return verify_chain(db)
+    if cp.last_tx_id:
+        tip_hash = db.execute(
+            select(Transaction.tx_hash).where(Transaction.id == cp.last_tx_id)
+        ).scalar_one_or_none()
+        if tip_hash != cp.last_tx_hash:
+            return verify_chain(db)  # already-verified history was rewritten
+
+    errors: list[str] = json.loads(cp.errors) if cp.errors else []
+    last_id, last_hash, checked, new_errors = _walk_chain(
+        db, cp.last_tx_id, cp.last_tx_hash, cp.tx_count, errors
+    )
+    if checked == 0:
+        return _checkpoint_result(cp)
+    return _record_checkpoint(
+        db,
+        "incremental",
+        last_id,
+        last_hash,
+        cp.tx_count + checked,
+        cp.valid and new_errors == 0,
+        errors,
+        cp.error_count + new_errors,
+    )
+
+
+def get_chain_status(db) -> dict:
+    """Return the cached verification result from the newest checkpoint.
+
+    Used by pages that show the chain-valid badge; the scheduler keeps the
+    checkpoint current.  Only verifies (incrementally) when no usable
+    checkpoint exists yet.
+    """
+    cp = _latest_checkpoint(db)
+    if cp is None:
+        return verify_chain_incremental(db)
+    return _checkpoint_result(cp)
 
 
 # ---------------------------------------------------------------------------
@@ -420,3 +714,185 @@ def get_balance_from_chain(db, address: str) -> int:
     )
 
     return incoming - outgoing
+
+
+# ---------------------------------------------------------------------------
+# Daily flow rollup (address_daily_flows)
+# ---------------------------------------------------------------------------
+# Maintained in the same commit as the ledger rows it summarises, so the
+# economics jobs can aggregate per-address daily totals instead of scanning
+# transactions.  Windows are whole UTC days: flow_window_start(30) includes
+# all of the day 30 days ago.
+def flow_window_start(days: int) -> str:
+    """Return the first 'YYYY-MM-DD' day inside a trailing *days* window."""
+    return (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _record_flows(db, txs: list, day: str) -> None:
+    """Add *txs* (Transactions or Transfers) to the rollup rows for *day*.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    totals: dict[tuple[str, str], list[int]] = {}
+    for tx in txs:
+        out_row = totals.setdefault((tx.from_address, tx.tx_type), [0, 0, 0])
+        out_row[1] += tx.amount
+        out_row[2] += 1
+        in_row = totals.setdefault((tx.to_address, tx.tx_type), [0, 0, 0])
+        in_row[0] += tx.amount
+        in_row[2] += 1
+
+    stmt = sqlite_insert(AddressDailyFlow)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["address", "day", "tx_type"],
+        set_={
+            "inflow": AddressDailyFlow.inflow + stmt.excluded.inflow,
+            "outflow": AddressDailyFlow.outflow + stmt.excluded.outflow,
+            "tx_count": AddressDailyFlow.tx_count + stmt.excluded.tx_count,
+        },
+    )
+    db.execute(stmt, [
+        {
+            "address": address, "day": day, "tx_type": tx_type,
+            "inflow": inflow, "outflow": outflow, "tx_count": count,
+        }
+        for (address, tx_type), (inflow, outflow, count) in totals.items()
+    ])
+
+
+def rebuild_address_daily_flows(db) -> int:
+    """Recompute the whole rollup from the ledger.  Returns rows written."""
+    day = func.date(Transaction.created_at)
+    legs = union_all(
+        select(
+            Transaction.from_address.label("address"),
+            day.label("day"),
+            Transaction.tx_type.label("tx_type"),
+            literal(0).label("inflow"),
+            Transaction.amount.label("outflow"),
+        ),
+        select(
+            Transaction.to_address, day, Transaction.tx_type,
+            Transaction.amount, literal(0),
+        ),
+    ).subquery()
+    grouped = select(
+        legs.c.address, legs.c.day, legs.c.tx_type,
+        func.sum(legs.c.inflow), func.sum(legs.c.outflow), func.count(),
+    ).group_by(legs.c.address, legs.c.day, legs.c.tx_type)
+
+    with _tx_lock:
+        db.execute(delete(AddressDailyFlow))
+        db.execute(
+            insert(AddressDailyFlow).from_select(
+                ["address", "day", "tx_type", "inflow", "outflow", "tx_count"], grouped
+            )
+        )
+        db.commit()
+    return db.execute(select(func.count()).select_from(AddressDailyFlow)).scalar()
+
+
+def backfill_address_daily_flows(db) -> int:
+    """Build the rollup once for a ledger that predates it.  Returns rows written."""
+    has_flows = db.execute(select(AddressDailyFlow.address).limit(1)).first()
+    has_ledger = db.execute(select(Transaction.id).limit(1)).first()
+    if has_flows or not has_ledger:
+        return 0
+    return rebuild_address_daily_flows(db)
+
+
+def get_address_flows(
+    db,
+    since: Optional[str] = None,
+    tx_type: Optional[str] = None,
+    exclude_types: tuple[str, ...] = (),
+) -> dict[str, tuple[int, int, int]]:
+    """Return {address: (tx_count, inflow, outflow)} summed over the rollup.
+
+    *since* is a 'YYYY-MM-DD' lower bound (see flow_window_start()); omit it
+    for lifetime totals.
+    """
+    stmt = select(
+        AddressDailyFlow.address,
+        func.sum(AddressDailyFlow.tx_count),
+        func.sum(AddressDailyFlow.inflow),
+        func.sum(AddressDailyFlow.outflow),
+    ).group_by(AddressDailyFlow.address)
+    if since is not None:
+        stmt = stmt.where(AddressDailyFlow.day >= since)
+    if tx_type is not None:
+        stmt = stmt.where(AddressDailyFlow.tx_type == tx_type)
+    if exclude_types:
+        stmt = stmt.where(AddressDailyFlow.tx_type.not_in(exclude_types))
+    return {
+        address: (count or 0, inflow or 0, outflow or 0)
+        for address, count, inflow, outflow in db.execute(stmt)
+    }
+
+
+def get_nation_flows(db, since: str, nation_ids: Optional[list[int]] = None) -> dict[int, dict]:
+    """Return per-nation flow totals since *since*, each transaction once.
+
+    Each value holds tx_count and volume (count and TC of transactions
+    touching a member wallet or the treasury) and member_tx_count (count of
+    those touching a member wallet).  Nations without any flows in the window
+    are absent.
+
+    The rollup has one row per address, so a transfer between two of a
+    nation's own wallets shows up on both of them.  Those internal transfers
+    are counted from the window's ledger rows and taken off once.
+    """
+    wallets = union_all(
+        select(
+            User.wallet_address.label("address"),
+            User.nation_id.label("nation_id"),
+            literal(False).label("is_treasury"),
+        ).where(User.nation_id.is_not(None)),
+        select(Nation.treasury_address, Nation.id, literal(True)),
+    ).cte("nation_wallets")
+    stmt = (
+        select(
+            wallets.c.nation_id,
+            wallets.c.is_treasury,
+            func.sum(AddressDailyFlow.tx_count),
+            func.sum(AddressDailyFlow.inflow + AddressDailyFlow.outflow),
+        )
+        .join(AddressDailyFlow, AddressDailyFlow.address == wallets.c.address)
+        .where(AddressDailyFlow.day >= since)
+        .group_by(wallets.c.nation_id, wallets.c.is_treasury)
+    )
+    src, dst = wallets.alias("src"), wallets.alias("dst")
+    internal = (
+        select(
+            src.c.nation_id,
+            src.c.is_treasury,
+            dst.c.is_treasury,
+            func.count(Transaction.id),
+            func.sum(Transaction.amount),
+        )
+        .select_from(Transaction)
+        .join(src, src.c.address == Transaction.from_address)
+        .join(dst, and_(dst.c.address == Transaction.to_address, dst.c.nation_id == src.c.nation_id))
+        .where(Transaction.created_at >= datetime.strptime(since, "%Y-%m-%d"))
+        .group_by(src.c.nation_id, src.c.is_treasury, dst.c.is_treasury)
+    )
+    if nation_ids is not None:
+        stmt = stmt.where(wallets.c.nation_id.in_(nation_ids))
+        internal = internal.where(src.c.nation_id.in_(nation_ids))
+
+    flows: dict[int, dict] = {}
+    for nation_id, is_treasury, count, volume in db.execute(stmt):
+        row = flows.setdefault(nation_id, {"tx_count": 0, "volume": 0, "member_tx_count": 0})
+        row["tx_count"] += count or 0
+        row["volume"] += volume or 0
+        if not is_treasury:
+            row["member_tx_count"] += count or 0
+    for nation_id, from_treasury, to_treasury, count, amount in db.execute(internal):
+        row = flows.get(nation_id)
+        if row is None:
+            continue
+        row["tx_count"] -= count
+        row["volume"] -= amount or 0
+        if not from_treasury and not to_treasury:
+            row["member_tx_count"] -= count
+    return flows
@@ -24,8 +24,9 @@ from typing import Any
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.blockchain import create_transaction
+from app.blockchain import Transfer, append_transactions
 from app.config import settings
+from app.jobs import chunked
 from app.models import Nation, User
 
 # Wallets idle for this many days are subject to demurrage
@@ -46,87 +47,100 @@ def _is_idle(user: User, now: datetime) -> bool:
     return (now - last).days >= _IDLE_THRESHOLD_DAYS
 
 
-def apply_demurrage_for_nation(
-    db: Session,
-    nation: Nation,
-    *,
-    now: datetime | None = None,
-) -> dict[str, Any]:
-    """Apply one day's demurrage charge for all idle wallets in *nation*.
-
-    Idempotent across multiple same-day calls: if a wallet's balance has
-    already been reduced to 0 by an earlier run today, no tx is created.
+def _apply_demurrage(db: Session, nations: list[Nation], now: datetime) -> dict[str, Any]:
+    """Charge one day's demurrage to the idle wallets of every nation in *nations*.
 
-    Returns a summary dict with:
-      - ``wallets_checked``  — number of citizen wallets examined.
-      - ``wallets_charged``  — number of wallets that had demurrage applied.
-      - ``total_burned``     — sum of all TC burned this run.
-      - ``wallets_skipped``  — wallets with 0 balance or insufficient amount.
+    One query loads every member wallet, the charges are worked out in
+    memory, and the DEMURRAGE_BURN entries are appended in batches of
+    WRITE_CHUNK, each in its own commit.  If a batch is rejected (a balance
+    moved since it was read) that batch is retried one entry at a time so
+    only the affected wallets are skipped.
     """
-    if now is None:
-        now = datetime.now(timezone.utc)
-
-    rate_bps = nation.demurrage_rate_bps or 50
-    wallets_checked = 0
-    wallets_charged = 0
-    wallets_skipped = 0
-    total_burned = 0
+    summary = {
+        "wallets_checked": 0,
+        "wallets_charged": 0,
+        "wallets_skipped": 0,
+        "total_burned": 0,
+    }
+    by_id = {nation.id: nation for nation in nations}
+    if not by_id:
+        return summary
 
-    # Fetch all members of this nation
     members = list(
-        db.execute(select(User).where(User.nation_id == nation.id)).scalars().all()
+        db.execute(select(User).where(User.nation_id.in_(list(by_id)))).scalars().all()
     )
 
+    charges: list[Transfer] = []
     for user in members:
         # Skip non-citizen roles that should never be subject to demurrage
         if user.role in ("world_mint",):
             continue
-        wallets_checked += 1
-
-        # Only idle wallets pay demurrage
-        if not _is_idle(user, now):
-            wallets_skipped += 1
-            continue
+        summary["wallets_checked"] += 1
 
-        # No balance — nothing to charge
-        if user.balance <= 0:
-            wallets_skipped += 1
+        # Only idle wallets with a balance pay demurrage
+        if not _is_idle(user, now) or user.balance <= 0:
+            summary["wallets_skipped"] += 1
             continue
 
         # Compute charge: floor(balance * rate_bps / 10_000)
+        nation = by_id[user.nation_id]
+        rate_bps = nation.demurrage_rate_bps or 50
         charge = math.floor(user.balance * rate_bps / 10_000)
         if charge <= 0:
-            wallets_skipped += 1
+            summary["wallets_skipped"] += 1
             continue
 
-        # Write the ledger entry.  create_transaction handles the balance
-        # debit on user.balance and credits the World Mint (which, for BURN
-        # transactions, is skipped per the existing is_burn_target guard).
+        # The ledger append debits user.balance; the World Mint credit is
+        # skipped for burns per the is_burn_target guard.
+        charges.append(Transfer(
+            "DEMURRAGE_BURN",
+            user.wallet_address,
+            settings.WORLD_MINT_ADDRESS,
+            charge,
+            f"Idle-wallet demurrage: {rate_bps}bps of balance "
+            f"{user.balance} TC charged by nation {nation.name}",
+        ))
+
+    for batch in chunked(charges):
         try:
-            create_transaction(
-                db,
-                tx_type="DEMURRAGE_BURN",
-                from_address=user.wallet_address,
-                to_address=settings.WORLD_MINT_ADDRESS,
-                amount=charge,
-                memo=(
-                    f"Idle-wallet demurrage: {rate_bps}bps of balance "
-                    f"{user.balance} TC charged by nation {nation.name}"
-                ),
-            )
-            wallets_charged += 1
-            total_burned += charge
+            append_transactions(db, batch)
+            applied = list(batch)
         except ValueError:
-            # Insufficient balance race — skip silently (balance might have
-            # been depleted between our read and the tx write).
-            wallets_skipped += 1
-
-    return {
-        "wallets_checked": wallets_checked,
-        "wallets_charged": wallets_charged,
-        "wallets_skipped": wallets_skipped,
-        "total_burned": total_burned,
-    }
+            # Insufficient balance race — fall back to single entries and
+            # skip the wallets that no longer cover their charge.
+            applied = []
+            for transfer in batch:
+                try:
+                    append_transactions(db, [transfer])
+                    applied.append(transfer)
+                except ValueError:
+                    summary["wallets_skipped"] += 1
+        summary["wallets_charged"] += len(applied)
+        summary["total_burned"] += sum(t.amount for t in applied)
+
+    return summary
+
+
+def apply_demurrage_for_nation(
+    db: Session,
+    nation: Nation,
+    *,
+    now: datetime | None = None,
+) -> dict[str, Any]:
+    """Apply one day's demurrage charge for all idle wallets in *nation*.
+
+    Idempotent across multiple same-day calls: if a wallet's balance has
+    already been reduced to 0 by an earlier run today, no tx is created.
+
+    Returns a summary dict with:
+      - ``wallets_checked``  — number of citizen wallets examined.
+      - ``wallets_charged``  — number of wallets that had demurrage applied.
+      - ``total_burned``     — sum of all TC burned this run.
+      - ``wallets_skipped``  — wallets with 0 balance or insufficient amount.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return _apply_demurrage(db, [nation], now)
 
 
 def apply_all_demurrage(
@@ -136,7 +150,8 @@ def apply_all_demurrage(
 ) -> dict[str, Any]:
     """Run demurrage for every nation that has it enabled.
 
-    Called by the daily scheduler.  Returns an aggregate summary.
+    Called by the daily scheduler.  All enabled nations are handled in one
+    pass (see _apply_demurrage).  Returns an aggregate summary.
     """
     if now is None:
         now = datetime.now(timezone.utc)
@@ -152,24 +167,4 @@ def apply_all_demurrage(
         .all()
     )
 
-    agg_checked = 0
-    agg_charged = 0
-    agg_skipped = 0
-    agg_burned = 0
-    nations_processed = 0
-
-    for nation in nations:
-        result = apply_demurrage_for_nation(db, nation, now=now)
-        agg_checked += result["wallets_checked"]
-        agg_charged += result["wallets_charged"]
-        agg_skipped += result["wallets_skipped"]
-        agg_burned += result["total_burned"]
-        nations_processed += 1
-
-    return {
-        "nations_processed": nations_processed,
-        "wallets_checked": agg_checked,
-        "wallets_charged": agg_charged,
-        "wallets_skipped": agg_skipped,
-        "total_burned": agg_burned,
-    }
+    return {"nations_processed": len(nations), **_apply_demurrage(db, nations, now)}
@@ -14,14 +14,15 @@ Pillars (25 % each):
 
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.blockchain import flow_window_start, get_address_flows, get_nation_flows
 from app.models import (
+    AddressDailyFlow,
     GdpSnapshot,
     Nation,
     Shop,
-    Transaction,
     User,
 )
 
@@ -34,91 +35,97 @@ GDP_MAX = 200   # 2.00x
 
 
 # ---------------------------------------------------------------------------
-# Per-nation GDP calculation
+# Raw pillar metrics (set-based)
 # ---------------------------------------------------------------------------
-def _calculate_nation_gdp(db: Session, nation: Nation, maxes: dict) -> dict:
-    """Compute the four GDP pillar scores for a single nation.
+def _gather_nation_metrics(db: Session, nations: list[Nation]) -> dict[int, dict]:
+    """Return the raw pillar inputs for each nation, keyed by nation id.
 
-    Returns a dict with per-pillar scores (0–100), composite score, and
-    the resulting GDP multiplier (int × 100).
+    A fixed handful of GROUP BY queries covers every nation: member and
+    active counts from users, and 30-day ledger activity from the
+    address_daily_flows rollup.  Transaction volume counts each side a
+    member or treasury wallet appears on.
     """
-    nation_id = nation.id
+    ids = [n.id for n in nations]
+    if not ids:
+        return {}
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    since = flow_window_start(30)
 
-    # -- Pillar 1: Treasury Health (balance per capita) ---------------------
-    member_count = (
+    member_counts = dict(
         db.execute(
-            select(func.count(User.id)).where(
-                User.nation_id == nation_id,
+            select(User.nation_id, func.count(User.id))
+            .where(
+                User.nation_id.in_(ids),
                 User.is_active == True,  # noqa: E712
             )
-        ).scalar()
-        or 0
-    )
-    per_capita = (
-        nation.treasury_balance / member_count if member_count > 0 else 0
-    )
-
-    # -- Pillar 2: Transaction Volume (30-day) ----------------------------
-    member_addresses = [
-        row[0]
-        for row in db.execute(
-            select(User.wallet_address).where(User.nation_id == nation_id)
+            .group_by(User.nation_id)
         ).all()
-    ]
-    all_addrs = list(member_addresses)
-    if nation.treasury_address:
-        all_addrs.append(nation.treasury_address)
-
-    tx_count = 0
-    if all_addrs:
-        tx_count = (
-            db.execute(
-                select(func.count(Transaction.id)).where(
-                    Transaction.created_at >= thirty_days_ago,
-                    or_(
-                        Transaction.from_address.in_(all_addrs),
-                        Transaction.to_address.in_(all_addrs),
-                    ),
-                )
-            ).scalar()
-            or 0
-        )
-
-    # -- Pillar 3: Business Revenue (30-day shop revenue) -----------------
-    # Sum revenue from purchase transactions flowing to shop owners in this nation
-    shop_owner_addrs = [
-        row[0]
-        for row in db.execute(
-            select(User.wallet_address)
-            .join(Shop, Shop.owner_id == User.id)
-            .where(Shop.nation_id == nation_id)
-        ).all()
-    ]
-    revenue = 0
-    if shop_owner_addrs:
-        revenue = (
-            db.execute(
-                select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                    Transaction.tx_type == "PURCHASE",
-                    Transaction.created_at >= thirty_days_ago,
-                    Transaction.to_address.in_(shop_owner_addrs),
-                )
-            ).scalar()
-            or 0
-        )
-
-    # -- Pillar 4: Active Citizens (% active in 30 d) --------------------
-    active_count = (
+    )
+    active_counts = dict(
         db.execute(
-            select(func.count(User.id)).where(
-                User.nation_id == nation_id,
+            select(User.nation_id, func.count(User.id))
+            .where(
+                User.nation_id.in_(ids),
                 User.last_active >= thirty_days_ago,
             )
-        ).scalar()
-        or 0
+            .group_by(User.nation_id)
+        ).all()
+    )
+    flows = get_nation_flows(db, since, ids)
+
+    # Shop revenue: 30-day PURCHASE inflow to each nation's shop owners
+    # (distinct, so an owner with two shops is counted once).
+    owners = (
+        select(Shop.nation_id, User.wallet_address)
+        .join(User, Shop.owner_id == User.id)
+        .where(Shop.nation_id.in_(ids))
+        .distinct()
+        .subquery()
+    )
+    revenues = dict(
+        db.execute(
+            select(owners.c.nation_id, func.sum(AddressDailyFlow.inflow))
+            .join(AddressDailyFlow, AddressDailyFlow.address == owners.c.wallet_address)
+            .where(
+                AddressDailyFlow.tx_type == "PURCHASE",
+                AddressDailyFlow.day >= since,
+            )
+            .group_by(owners.c.nation_id)
+        ).all()
     )
-    active_ratio = active_count / member_count if member_count > 0 else 0
+
+    metrics = {}
+    for nation in nations:
+        member_count = member_counts.get(nation.id, 0)
+        flow = flows.get(nation.id, {})
+        metrics[nation.id] = {
+            "per_capita": (
+                nation.treasury_balance / member_count if member_count > 0 else 0
+            ),
+            "tx_count": flow.get("tx_count", 0),
+            "revenue": revenues.get(nation.id) or 0,
+            "active_ratio": (
+                active_counts.get(nation.id, 0) / member_count if member_count > 0 else 0
+            ),
+            "member_count": member_count,
+        }
+    return metrics
+
+
+# ---------------------------------------------------------------------------
+# Per-nation GDP calculation
+# ---------------------------------------------------------------------------
+def _calculate_nation_gdp(
+    db: Session, nation: Nation, maxes: dict, raw: dict | None = None
+) -> dict:
+    """Compute the four GDP pillar scores for a single nation.
+
+    *raw* is the nation's entry from _gather_nation_metrics(); it is
+    gathered on demand when omitted.  Returns a dict with per-pillar scores
+    (0–100), composite score, and the resulting GDP multiplier (int × 100).
+    """
+    if raw is None:
+        raw = _gather_nation_metrics(db, [nation])[nation.id]
 
     # -- Normalize each pillar against max across all nations (0–100) -----
     max_pc = maxes.get("max_per_capita", 0)
@@ -126,10 +133,10 @@ def _calculate_nation_gdp(db: Session, nation: Nation, maxes: dict) -> dict:
     max_rev = maxes.get("max_revenue", 0)
     max_ar = maxes.get("max_active_ratio", 0)
 
-    treasury_score = _norm(per_capita, max_pc)
-    activity_score = _norm(tx_count, max_tx)
-    revenue_score = _norm(revenue, max_rev)
-    citizens_score = _norm(active_ratio, max_ar)
+    treasury_score = _norm(raw["per_capita"], max_pc)
+    activity_score = _norm(raw["tx_count"], max_tx)
+    revenue_score = _norm(raw["revenue"], max_rev)
+    citizens_score = _norm(raw["active_ratio"], max_ar)
 
     composite = round((treasury_score + activity_score + revenue_score + citizens_score) / 4)
 
@@ -146,11 +153,11 @@ def _calculate_nation_gdp(db: Session, nation: Nation, maxes: dict) -> dict:
         "composite_score": composite,
         "gdp_multiplier": multiplier,
         "raw": {
-            "per_capita": per_capita,
-            "tx_count": tx_count,
-            "revenue": revenue,
-            "active_ratio": round(active_ratio, 4),
-            "member_count": member_count,
+            "per_capita": raw["per_capita"],
+            "tx_count": raw["tx_count"],
+            "revenue": raw["revenue"],
+            "active_ratio": round(raw["active_ratio"], 4),
+            "member_count": raw["member_count"],
         },
     }
 
@@ -165,136 +172,47 @@ def _norm(value: float, max_value: float) -> int:
 # ---------------------------------------------------------------------------
 # Gather max metrics across all approved nations
 # ---------------------------------------------------------------------------
-def _gather_gdp_maxes(db: Session) -> dict:
+def _gather_gdp_maxes(db: Session, metrics: dict[int, dict] | None = None) -> dict:
     """Pre-compute the maximum value for each pillar across all nations.
 
-    Used for peer-relative normalization.
+    Used for peer-relative normalization.  Pass the approved nations'
+    _gather_nation_metrics() result to avoid gathering it twice.
     """
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-
-    nations = list(
-        db.execute(
-            select(Nation).where(Nation.status == "approved")
-        ).scalars().all()
-    )
-
-    max_per_capita = 0.0
-    max_tx_count = 0
-    max_revenue = 0
-    max_active_ratio = 0.0
-
-    for nation in nations:
-        nid = nation.id
-
-        # Member count
-        mc = (
-            db.execute(
-                select(func.count(User.id)).where(
-                    User.nation_id == nid,
-                    User.is_active == True,  # noqa: E712
-                )
-            ).scalar()
-            or 0
-        )
-
-        # Per-capita treasury
-        pc = nation.treasury_balance / mc if mc > 0 else 0
-        max_per_capita = max(max_per_capita, pc)
-
-        # Transaction count
-        addrs = [
-            r[0] for r in db.execute(
-                select(User.wallet_address).where(User.nation_id == nid)
-            ).all()
-        ]
-        if nation.treasury_address:
-            addrs.append(nation.treasury_address)
-
-        txc = 0
-        if addrs:
-            txc = (
-                db.execute(
-                    select(func.count(Transaction.id)).where(
-                        Transaction.created_at >= thirty_days_ago,
-                        or_(
-                            Transaction.from_address.in_(addrs),
-                            Transaction.to_address.in_(addrs),
-                        ),
-                    )
-                ).scalar()
-                or 0
-            )
-        max_tx_count = max(max_tx_count, txc)
-
-        # Shop revenue
-        shop_addrs = [
-            r[0] for r in db.execute(
-                select(User.wallet_address)
-                .join(Shop, Shop.owner_id == User.id)
-                .where(Shop.nation_id == nid)
-            ).all()
-        ]
-        rev = 0
-        if shop_addrs:
-            rev = (
-                db.execute(
-                    select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                        Transaction.tx_type == "PURCHASE",
-                        Transaction.created_at >= thirty_days_ago,
-                        Transaction.to_address.in_(shop_addrs),
-                    )
-                ).scalar()
-                or 0
-            )
-        max_revenue = max(max_revenue, rev)
-
-        # Active ratio
-        ac = (
+    if metrics is None:
+        nations = list(
             db.execute(
-                select(func.count(User.id)).where(
-                    User.nation_id == nid,
-                    User.last_active >= thirty_days_ago,
-                )
-            ).scalar()
-            or 0
+                select(Nation).where(Nation.status == "approved")
+            ).scalars().all()
         )
-        ar = ac / mc if mc > 0 else 0
-        max_active_ratio = max(max_active_ratio, ar)
+        metrics = _gather_nation_metrics(db, nations)
 
+    rows = list(metrics.values())
     return {
-        "max_per_capita": max_per_capita,
-        "max_tx_count": max_tx_count,
-        "max_revenue": max_revenue,
-        "max_active_ratio": max_active_ratio,
+        "max_per_capita": max((r["per_capita"] for r in rows), default=0.0),
+        "max_tx_count": max((r["tx_count"] for r in rows), default=0),
+        "max_revenue": max((r["revenue"] for r in rows), default=0),
+        "max_active_ratio": max((r["active_ratio"] for r in rows), default=0.0),
     }
 
 
 # ---------------------------------------------------------------------------
 # Recalculate all nations
 # ---------------------------------------------------------------------------
-def _calculate_shop_gdp_contribution(db: Session, shop: Shop) -> int:
-    """Sum 30-day PURCHASE inflow to the given shop's owner wallet.
+def _refresh_shop_contributions(db: Session, now: datetime) -> int:
+    """Set ``Shop.gdp_contribution_30d`` to each owner's 30-day PURCHASE inflow.
 
-    Returns the running 30-day GDP contribution in TC.  Used by the daily
-    GDP job to update ``Shop.gdp_contribution_30d`` and to rank shops in
-    the marketplace by economic contribution rather than recency.
+    The running 30-day GDP contribution in TC ranks shops in the
+    marketplace by economic contribution rather than recency.  One rollup
+    query covers every owner.  Returns the number of shops touched.
     """
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    owner = db.execute(
-        select(User).where(User.id == shop.owner_id)
-    ).scalar_one_or_none()
-    if owner is None:
-        return 0
-    return (
-        db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                Transaction.tx_type == "PURCHASE",
-                Transaction.created_at >= thirty_days_ago,
-                Transaction.to_address == owner.wallet_address,
-            )
-        ).scalar()
-        or 0
-    )
+    revenue = get_address_flows(db, since=flow_window_start(30), tx_type="PURCHASE")
+    rows = db.execute(
+        select(Shop, User.wallet_address).outerjoin(User, User.id == Shop.owner_id)
+    ).all()
+    for shop, owner_address in rows:
+        shop.gdp_contribution_30d = revenue.get(owner_address, (0, 0, 0))[1]
+        shop.gdp_last_calculated = now
+    return len(rows)
 
 
 def recalculate_all_shop_contributions(db: Session) -> int:
@@ -304,13 +222,9 @@ def recalculate_all_shop_contributions(db: Session) -> int:
     audit metric of historical revenue and is independent of approval state.
     Returns the number of shops touched.
     """
-    now = datetime.now(timezone.utc)
-    shops = list(db.execute(select(Shop)).scalars().all())
-    for shop in shops:
-        shop.gdp_contribution_30d = _calculate_shop_gdp_contribution(db, shop)
-        shop.gdp_last_calculated = now
+    count = _refresh_shop_contributions(db, datetime.now(timezone.utc))
     db.commit()
-    return len(shops)
+    return count
 
 
 def recalculate_all_gdp(db: Session) -> int:
@@ -324,17 +238,17 @@ def recalculate_all_gdp(db: Session) -> int:
     now = datetime.now(timezone.utc)
     today = now.strftime("%Y-%m-%d")
 
-    maxes = _gather_gdp_maxes(db)
-
     nations = list(
         db.execute(
             select(Nation).where(Nation.status == "approved")
         ).scalars().all()
     )
+    metrics = _gather_nation_metrics(db, nations)
+    maxes = _gather_gdp_maxes(db, metrics)
 
     count = 0
     for nation in nations:
-        scores = _calculate_nation_gdp(db, nation, maxes)
+        scores = _calculate_nation_gdp(db, nation, maxes, metrics[nation.id])
 
         # Update cached columns
         nation.gdp_score = scores["composite_score"]
@@ -357,10 +271,7 @@ def recalculate_all_gdp(db: Session) -> int:
 
     # Phase 2E: refresh per-shop GDP contribution so the marketplace
     # ranking reflects the same 30-day window the nation pillar uses.
-    shops = list(db.execute(select(Shop)).scalars().all())
-    for shop in shops:
-        shop.gdp_contribution_30d = _calculate_shop_gdp_contribution(db, shop)
-        shop.gdp_last_calculated = now
+    _refresh_shop_contributions(db, now)
 
     db.commit()
     return count
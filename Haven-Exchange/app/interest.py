@@ -34,13 +34,29 @@ Design choices:
 """
 
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
+from app.jobs import chunked
 from app.models import Loan
 
+# Columns _accrue_loan reads, and the ones it may change
+_ACCRUAL_COLUMNS = (
+    Loan.id,
+    Loan.status,
+    Loan.principal,
+    Loan.interest_rate,
+    Loan.cap_amount,
+    Loan.accrued_interest,
+    Loan.interest_frozen,
+    Loan.last_accrual_at,
+    Loan.opened_at,
+)
+_WRITTEN_FIELDS = ("accrued_interest", "interest_frozen", "last_accrual_at")
+
 
 # ---------------------------------------------------------------------------
 # Per-loan accrual
@@ -49,7 +65,8 @@ def _accrue_loan(loan: Loan, now: datetime) -> int:
     """Apply daily-compounded simple interest to a single loan.
 
     Returns the integer TC of interest added (0 if none).  Mutates the
-    loan in place — caller is responsible for flushing/committing.
+    loan in place — caller is responsible for writing it back.  Any object
+    carrying the Loan accrual fields works (the daily job passes row copies).
 
     The amount added per elapsed day is:
 
@@ -130,7 +147,7 @@ def accrue_daily_interest(db: Session, *, now: Optional[datetime] = None) -> dic
 
     Returns:
         A summary dict: ``{"loans_processed": N, "loans_accrued": M,
-        "total_interest_added": X, "loans_frozen": Y}``.
+        "total_interest_added": X, "loans_frozen": Y, "loans_updated": U}``.
     """
     if now is None:
         now = datetime.now(timezone.utc)
@@ -139,31 +156,38 @@ def accrue_daily_interest(db: Session, *, now: Optional[datetime] = None) -> dic
     # cap, a frozen loan whose accrued_interest has dropped below cap_amount
     # (because the borrower paid interest down) needs to be re-evaluated and
     # potentially have its frozen flag reset by ``_accrue_loan``.
-    loans = list(
-        db.execute(
-            select(Loan).where(Loan.status == "active")
-        ).scalars().all()
-    )
+    #
+    # One column-only query feeds the whole run; _accrue_loan works on a
+    # plain copy of each row, and only loans whose accrual fields changed
+    # are written back, as bulk UPDATEs committed in chunks.
+    rows = db.execute(
+        select(*_ACCRUAL_COLUMNS).where(Loan.status == "active")
+    ).all()
 
     total_added = 0
     accrued_count = 0
     frozen_count = 0
+    updates: list[dict] = []
 
-    for loan in loans:
-        was_frozen = loan.interest_frozen
+    for row in rows:
+        loan = SimpleNamespace(**row._mapping)
         added = _accrue_loan(loan, now)
         if added > 0:
             accrued_count += 1
             total_added += added
-        if loan.interest_frozen and not was_frozen:
+        if loan.interest_frozen and not row.interest_frozen:
             frozen_count += 1
+        if any(getattr(loan, f) != getattr(row, f) for f in _WRITTEN_FIELDS):
+            updates.append({"id": row.id, **{f: getattr(loan, f) for f in _WRITTEN_FIELDS}})
 
-    if total_added > 0 or frozen_count > 0 or accrued_count > 0:
+    for batch in chunked(updates):
+        db.execute(update(Loan), list(batch))
         db.commit()
 
     return {
-        "loans_processed": len(loans),
+        "loans_processed": len(rows),
         "loans_accrued": accrued_count,
         "total_interest_added": total_added,
         "loans_frozen": frozen_count,
+        "loans_updated": len(updates),
     }
@@ -0,0 +1,85 @@
+"""
+Travelers Exchange — Background Job History
+
+The daily economics jobs run inside record_job(), which stores one JobRun
+row per execution with the run's duration, the rows it wrote and the SQL
+statements it issued.  The bulk jobs also share chunked() so each batch of
+writes commits on its own instead of holding one long write transaction.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Sequence, TypeVar
+
+from sqlalchemy import delete, event
+from sqlalchemy.orm import Session
+
+from app.models import JobRun
+
+WRITE_CHUNK = 500          # rows per batched write (and commit) in bulk jobs
+JOB_RUN_RETENTION = 1000   # newest job_runs rows kept; older rows pruned
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int = WRITE_CHUNK) -> Iterator[Sequence[T]]:
+    """Yield consecutive slices of *items* holding at most *size* entries."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class JobStats:
+    """Run counters: the job sets rows_touched / summary, queries is counted."""
+
+    def __init__(self) -> None:
+        self.rows_touched = 0
+        self.queries = 0
+        self.summary: Optional[dict] = None
+
+
+@contextmanager
+def record_job(db: Session, job_name: str) -> Iterator[JobStats]:
+    """Time the enclosed job, count its statements and store a JobRun row.
+
+    Statements are counted on the session's engine for the calling thread
+    only, so requests served concurrently don't inflate the count.  A job
+    that raises is recorded with status 'error' and the exception is
+    re-raised.
+    """
+    stats = JobStats()
+    engine = db.get_bind()
+    thread_id = threading.get_ident()
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            stats.queries += 1
+
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    error: Optional[BaseException] = None
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield stats
+    except Exception as exc:
+        error = exc
+        db.rollback()
+        raise
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+        run = JobRun(
+            job_name=job_name,
+            started_at=started_at,
+            duration_ms=round((time.perf_counter() - started) * 1000),
+            rows_touched=stats.rows_touched,
+            queries=stats.queries,
+            status="error" if error is not None else "ok",
+            error=repr(error)[:1000] if error is not None else None,
+            summary=json.dumps(stats.summary, default=str) if stats.summary is not None else None,
+        )
+        db.add(run)
+        db.flush()
+        db.execute(delete(JobRun).where(JobRun.id <= run.id - JOB_RUN_RETENTION))
+        db.commit()
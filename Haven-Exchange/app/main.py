@@ -15,7 +15,7 @@ from fastapi.templating import Jinja2Templates
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from app.blockchain import create_genesis_block
+from app.blockchain import backfill_address_daily_flows, create_genesis_block
 from app.config import settings
 from app.database import SessionLocal, init_db
 from app.models import ApiKey, Bank, GdpSnapshot, GlobalSettings, Loan, LoanPayment, StimulusProposal, User  # noqa: F401  — ensures models are registered with Base
@@ -210,6 +210,12 @@ def _run_schema_migrations() -> None:
         # Keeper integration P0: Discord identity binding
         "ALTER TABLE users ADD COLUMN discord_id TEXT",
         "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_discord_id ON users(discord_id) WHERE discord_id IS NOT NULL",
+        # Ledger access paths — keyset pagination on (created_at, id) and
+        # index-only balance sums (see Transaction.__table_args__)
+        "CREATE INDEX IF NOT EXISTS ix_transactions_from_created ON transactions(from_address, created_at, id, status, amount)",
+        "CREATE INDEX IF NOT EXISTS ix_transactions_to_created ON transactions(to_address, created_at, id, status, amount)",
+        "CREATE INDEX IF NOT EXISTS ix_transactions_type_created ON transactions(tx_type, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_transactions_created ON transactions(created_at, id)",
     ]
     for sql in migrations:
         try:
@@ -322,6 +328,9 @@ def on_startup() -> None:
         # 4. Create genesis block if the transactions table is empty
         create_genesis_block(db)
 
+        # 4b. Build the daily flow rollup once for a ledger that predates it
+        backfill_address_daily_flows(db)
+
         # 5. Seed default GlobalSettings if the table is empty
         existing_settings = db.query(GlobalSettings).first()
         if existing_settings is None:
@@ -340,10 +349,13 @@ def on_startup() -> None:
 
 # ---------------------------------------------------------------------------
 # Background scheduler — GDP and stock price recalculation every 24 hours
+# The daily economics jobs record each run in job_runs (see app/jobs.py).
 # ---------------------------------------------------------------------------
+from app.blockchain import verify_chain, verify_chain_incremental
 from app.demurrage import apply_all_demurrage
 from app.gdp import recalculate_all_gdp
 from app.interest import accrue_daily_interest
+from app.jobs import record_job
 from app.stimulus import run_stimulus_checks
 from app.valuation import recalculate_all_prices
 from app.wallet_health import recalculate_wallet_health
@@ -355,9 +367,10 @@ def _scheduled_gdp_recalc() -> None:
     """Recalculate GDP scores for all approved nations, then check stimulus triggers."""
     db = SessionLocal()
     try:
-        recalculate_all_gdp(db)
-        # Phase 2J: check for GDP drops and propose stimulus mints if thresholds met
-        run_stimulus_checks(db)
+        with record_job(db, "gdp_recalc") as run:
+            run.rows_touched = recalculate_all_gdp(db)
+            # Phase 2J: check for GDP drops and propose stimulus mints if thresholds met
+            run_stimulus_checks(db)
     finally:
         db.close()
 
@@ -366,7 +379,8 @@ def _scheduled_stock_recalc() -> None:
     """Recalculate stock prices for all active stocks.  Uses its own DB session."""
     db = SessionLocal()
     try:
-        recalculate_all_prices(db)
+        with record_job(db, "stock_recalc") as run:
+            run.rows_touched = recalculate_all_prices(db)
     finally:
         db.close()
 
@@ -375,7 +389,9 @@ def _scheduled_interest_accrual() -> None:
     """Apply daily interest to every active, non-frozen loan."""
     db = SessionLocal()
     try:
-        accrue_daily_interest(db)
+        with record_job(db, "interest_accrual") as run:
+            run.summary = accrue_daily_interest(db)
+            run.rows_touched = run.summary["loans_updated"]
     finally:
         db.close()
 
@@ -384,7 +400,8 @@ def _scheduled_wallet_health_recalc() -> None:
     """Reconcile wallet-health metrics & decay 30-day counters past their window."""
     db = SessionLocal()
     try:
-        recalculate_wallet_health(db)
+        with record_job(db, "wallet_health_recalc") as run:
+            run.rows_touched = recalculate_wallet_health(db)
     finally:
         db.close()
 
@@ -393,7 +410,27 @@ def _scheduled_demurrage() -> None:
     """Apply idle-wallet demurrage for all nations that have it enabled."""
     db = SessionLocal()
     try:
-        apply_all_demurrage(db)
+        with record_job(db, "demurrage") as run:
+            run.summary = apply_all_demurrage(db)
+            run.rows_touched = run.summary["wallets_charged"]
+    finally:
+        db.close()
+
+
+def _scheduled_chain_verify() -> None:
+    """Verify ledger rows appended since the last checkpoint."""
+    db = SessionLocal()
+    try:
+        verify_chain_incremental(db)
+    finally:
+        db.close()
+
+
+def _scheduled_chain_full_verify() -> None:
+    """Re-verify the whole ledger from genesis and reset the checkpoint."""
+    db = SessionLocal()
+    try:
+        verify_chain(db)
     finally:
         db.close()
 
@@ -408,6 +445,14 @@ scheduler.add_job(
 scheduler.add_job(
     _scheduled_demurrage, "interval", hours=24, id="demurrage"
 )
+# Ledger verification: cheap incremental pass keeps the chain-valid badge
+# current; the daily full walk catches tampering behind the checkpoint.
+scheduler.add_job(
+    _scheduled_chain_verify, "interval", minutes=5, id="chain_verify"
+)
+scheduler.add_job(
+    _scheduled_chain_full_verify, "interval", hours=24, id="chain_full_verify"
+)
 
 
 @app.on_event("startup")
@@ -19,12 +19,13 @@ Defines all core tables:
   - Banks
   - Loans
   - LoanPayments
+  - LedgerCheckpoints
 """
 
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -163,6 +164,16 @@ class Transaction(Base):
     """An immutable ledger entry representing a currency movement."""
 
     __tablename__ = "transactions"
+    # Access paths for wallet history, filtered ledger pages and balance
+    # reconciliation.  Listings page on (created_at, id) keyset cursors; the
+    # address indexes also carry status + amount so get_balance_from_chain()
+    # sums straight from the index.  Keep in step with _run_schema_migrations.
+    __table_args__ = (
+        Index("ix_transactions_from_created", "from_address", "created_at", "id", "status", "amount"),
+        Index("ix_transactions_to_created", "to_address", "created_at", "id", "status", "amount"),
+        Index("ix_transactions_type_created", "tx_type", "created_at", "id"),
+        Index("ix_transactions_created", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     tx_hash: Mapped[str] = mapped_column(String, unique=True, nullable=False)
@@ -186,6 +197,36 @@ class Transaction(Base):
         )
 
 
+class AddressDailyFlow(Base):
+    """Per-address, per-day ledger totals, one row per transaction type.
+
+    Every ledger leg lands here as it is appended: the sender's row gains
+    `outflow`, the receiver's row gains `inflow`, and each side bumps
+    `tx_count` (a self-transfer counts twice, as the wallet-health counters
+    do).  The daily GDP, valuation and wallet-health jobs aggregate this
+    table instead of re-scanning `transactions`.  `day` is the UTC date as
+    'YYYY-MM-DD'.  Rebuilt from the ledger by rebuild_address_daily_flows().
+    """
+
+    __tablename__ = "address_daily_flows"
+    __table_args__ = (
+        Index("ix_address_daily_flows_day", "day", "address"),
+    )
+
+    address: Mapped[str] = mapped_column(String, primary_key=True)
+    day: Mapped[str] = mapped_column(String, primary_key=True)
+    tx_type: Mapped[str] = mapped_column(String, primary_key=True)
+    inflow: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    outflow: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tx_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AddressDailyFlow(address='{self.address}', day='{self.day}', "
+            f"tx_type='{self.tx_type}', tx_count={self.tx_count})>"
+        )
+
+
 class MintAllocation(Base):
     """A monthly minting allocation for a nation based on active members."""
 
@@ -801,3 +842,74 @@ class ApiKey(Base):
 ## DiscordLinkCode model removed — auto-provision replaces the link flow.
 ## Bot bearer + X-Discord-User-Id alone is sufficient; if no user is bound to
 ## that discord_id, the Exchange creates one automatically on first call.
+
+
+# ===========================================================================
+# Ledger verification checkpoints
+# ===========================================================================
+
+class LedgerCheckpoint(Base):
+    """A signed record of how far the hash chain has been verified.
+
+    Each row says "every transaction up to and including last_tx_id links
+    correctly, ending in last_tx_hash".  Incremental verification resumes
+    from the newest checkpoint instead of re-walking the whole ledger, and
+    pages read the newest row for the chain-valid badge.  `signature` is an
+    HMAC over the verified fields keyed with settings.SECRET_KEY so a
+    hand-edited row is detected and forces a full re-verify.
+    """
+
+    __tablename__ = "ledger_checkpoints"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    last_tx_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_tx_hash: Mapped[str] = mapped_column(String, nullable=False)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # JSON list of the first CHAIN_ERROR_LIMIT error messages
+    errors: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # 'full' (walked from genesis) or 'incremental' (walked from the previous checkpoint)
+    mode: Mapped[str] = mapped_column(String, nullable=False)
+    signature: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        insert_default=func.current_timestamp()
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LedgerCheckpoint(id={self.id}, last_tx_id={self.last_tx_id}, "
+            f"valid={self.valid}, mode='{self.mode}')>"
+        )
+
+
+class JobRun(Base):
+    """One execution of a scheduled background job.
+
+    Written by app.jobs.record_job(): wall-clock duration, how many rows the
+    job wrote, and how many SQL statements it issued, so a job whose cost
+    grows with round-trips rather than with rows changed stands out.
+    `summary` is the job's own result dict as JSON.
+    """
+
+    __tablename__ = "job_runs"
+    __table_args__ = (
+        Index("ix_job_runs_job_started", "job_name", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_name: Mapped[str] = mapped_column(String, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_touched: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    queries: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # 'ok' or 'error'
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<JobRun(id={self.id}, job='{self.job_name}', status='{self.status}', "
+            f"duration_ms={self.duration_ms}, rows={self.rows_touched}, queries={self.queries})>"
+        )
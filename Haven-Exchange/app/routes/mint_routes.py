@@ -16,7 +16,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.auth import require_role
-from app.blockchain import create_transaction, verify_chain
+from app.blockchain import create_transaction, get_chain_status
 from app.config import settings
 from app.database import get_db
 from app.gdp import recalculate_all_gdp
@@ -123,7 +123,7 @@ def mint_stats(
     )
 
     # Chain validity
-    chain_result = verify_chain(db)
+    chain_result = get_chain_status(db)
     chain_valid = chain_result["valid"]
 
     # GDP overview — per-nation scores
@@ -1034,10 +1034,9 @@ def mint_stats_detailed(
     behind the website's /mint/stats page.
     """
     from sqlalchemy import func as _func
-    from app.blockchain import verify_chain
     from app.models import Transaction as _Tx
 
-    chain = verify_chain(db)
+    chain = get_chain_status(db)
 
     user_balance = db.execute(
         select(_func.coalesce(_func.sum(User.balance), 0)).where(User.role != "world_mint")
@@ -13,7 +13,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.auth import require_login
-from app.blockchain import create_transaction
+from app.blockchain import Transfer, append_transactions, create_transaction
 from app.config import settings
 from app.database import get_db
 from app.models import Nation, User
@@ -421,23 +421,16 @@ def distribute_bulk(
                 detail=f"Recipient '{item.to_address}' is not a member of this nation.",
             )
 
-    # Execute all distributions
-    total_amount = 0
-    count = 0
+    # Execute all distributions as one all-or-nothing batch
     try:
-        for item in payload.distributions:
-            create_transaction(
-                db,
-                tx_type="DISTRIBUTE",
-                from_address=nation.treasury_address,
-                to_address=item.to_address,
-                amount=item.amount,
-                memo=payload.memo,
-            )
-            total_amount += item.amount
-            count += 1
+        append_transactions(db, [
+            Transfer("DISTRIBUTE", nation.treasury_address, item.to_address, item.amount, payload.memo)
+            for item in payload.distributions
+        ])
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    total_amount = sum(item.amount for item in payload.distributions)
+    count = len(payload.distributions)
 
     return {
         "success": True,
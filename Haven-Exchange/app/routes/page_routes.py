@@ -24,11 +24,13 @@ from app.auth import (
     verify_password,
 )
 from app.blockchain import (
+    Transfer,
+    append_transactions,
     create_transaction,
-    get_all_transactions,
+    get_chain_status,
     get_transaction_by_hash,
     get_transactions_for_address,
-    verify_chain,
+    page_transactions,
 )
 from app.config import settings
 from app.database import get_db
@@ -294,7 +296,8 @@ def register_page(
 @router.get("/ledger")
 def ledger_page(
     request: Request,
-    page: int = Query(1, ge=1),
+    before: Optional[int] = Query(None),
+    after: Optional[int] = Query(None),
     tx_type: str = Query(""),
     address: str = Query(""),
     user: Optional[User] = Depends(get_current_user),
@@ -307,34 +310,23 @@ def ledger_page(
     if tx_type and tx_type in valid_types:
         conditions.append(Transaction.tx_type == tx_type)
 
-    if address and address.strip():
-        addr = address.strip()
+    addr = address.strip() if address else ""
+    transactions, cursors = page_transactions(
+        db, *conditions, address=addr or None, limit=PER_PAGE, before=before, after=after
+    )
+
+    if addr:
         conditions.append(
             or_(
                 Transaction.from_address == addr,
                 Transaction.to_address == addr,
             )
         )
+    total = db.execute(
+        select(func.count(Transaction.id)).where(*conditions)
+    ).scalar() or 0
 
-    if conditions:
-        total = db.execute(
-            select(func.count(Transaction.id)).where(*conditions)
-        ).scalar() or 0
-        pag = _paginate(total, page)
-        transactions = list(
-            db.execute(
-                select(Transaction)
-                .where(*conditions)
-                .order_by(Transaction.created_at.desc())
-                .limit(pag["per_page"])
-                .offset(pag["offset"])
-            ).scalars().all()
-        )
-    else:
-        transactions, total = get_all_transactions(db, limit=PER_PAGE, offset=(page - 1) * PER_PAGE)
-        pag = _paginate(total, page)
-
-    chain_result = verify_chain(db)
+    chain_result = get_chain_status(db)
     name_map = _build_name_map(db)
 
     ctx = _base_context(
@@ -349,7 +341,7 @@ def ledger_page(
         tx_types=sorted(valid_types - {"GENESIS"}),
         chain_valid=chain_result["valid"],
         total_tx_count=total,
-        **pag,
+        **cursors,
     )
     return templates.TemplateResponse("ledger.html", ctx)
 
@@ -1010,25 +1002,26 @@ def nation_distribute_bulk_post(
             status_code=303,
         )
 
-    distributed_count = 0
+    # One batch: either every member is paid or none are.
     try:
-        for member in members:
-            create_transaction(
-                db,
-                tx_type="DISTRIBUTE",
-                from_address=nation.treasury_address,
-                to_address=member.wallet_address,
-                amount=amount_per_member,
-                memo=memo.strip() or None,
+        append_transactions(db, [
+            Transfer(
+                "DISTRIBUTE",
+                nation.treasury_address,
+                member.wallet_address,
+                amount_per_member,
+                memo.strip() or None,
             )
-            distributed_count += 1
+            for member in members
+        ])
     except ValueError as exc:
         error_msg = str(exc).replace(" ", "+")
         return RedirectResponse(
-            url=f"/nation/treasury?error=Bulk+distribution+failed+after+{distributed_count}+transfers:+{error_msg}",
+            url=f"/nation/treasury?error=Bulk+distribution+failed:+{error_msg}",
             status_code=303,
         )
 
+    distributed_count = len(members)
     total_distributed = amount_per_member * distributed_count
     return RedirectResponse(
         url=f"/nation/treasury?success=Distributed+{total_distributed}+{settings.CURRENCY_SHORT}+to+{distributed_count}+members",
@@ -1480,7 +1473,8 @@ def wallet_search_page(
 def wallet_lookup_page(
     address: str,
     request: Request,
-    page: int = Query(1, ge=1),
+    before: Optional[int] = Query(None),
+    after: Optional[int] = Query(None),
     user: Optional[User] = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -1529,9 +1523,8 @@ def wallet_lookup_page(
         or 0
     )
 
-    pag = _paginate(total_count, page)
-    transactions = get_transactions_for_address(
-        db, address, limit=pag["per_page"], offset=pag["offset"]
+    transactions, cursors = page_transactions(
+        db, address=address, limit=PER_PAGE, before=before, after=after
     )
 
     name_map = _build_name_map(db)
@@ -1551,7 +1544,8 @@ def wallet_lookup_page(
         name_map=name_map,
         can_send=can_send,
         nation_id=nation_id,
-        **pag,
+        total_count=total_count,
+        **cursors,
     )
     return templates.TemplateResponse("wallet_lookup.html", ctx)
 
@@ -1730,7 +1724,8 @@ def send_post(
 @router.get("/history")
 def history_page(
     request: Request,
-    page: int = Query(1, ge=1),
+    before: Optional[int] = Query(None),
+    after: Optional[int] = Query(None),
     tx_type: str = Query(""),
     direction: str = Query(""),
     date_from: str = Query(""),
@@ -1740,21 +1735,10 @@ def history_page(
 ):
     valid_types = {"MINT", "DISTRIBUTE", "TRANSFER", "PURCHASE", "BURN", "TAX", "GENESIS", "STOCK_BUY", "STOCK_SELL"}
 
-    # Build filter conditions
+    # Build filter conditions (the wallet/direction filter is applied by
+    # page_transactions so each side uses its own address index)
     conditions = []
 
-    if direction == "sent":
-        conditions.append(Transaction.from_address == user.wallet_address)
-    elif direction == "received":
-        conditions.append(Transaction.to_address == user.wallet_address)
-    else:
-        conditions.append(
-            or_(
-                Transaction.from_address == user.wallet_address,
-                Transaction.to_address == user.wallet_address,
-            )
-        )
-
     if tx_type and tx_type in valid_types:
         conditions.append(Transaction.tx_type == tx_type)
 
@@ -1772,7 +1756,28 @@ def history_page(
         except ValueError:
             pass
 
+    transactions, cursors = page_transactions(
+        db,
+        *conditions,
+        address=user.wallet_address,
+        direction=direction,
+        limit=PER_PAGE,
+        before=before,
+        after=after,
+    )
+
     # Count
+    if direction == "sent":
+        conditions.append(Transaction.from_address == user.wallet_address)
+    elif direction == "received":
+        conditions.append(Transaction.to_address == user.wallet_address)
+    else:
+        conditions.append(
+            or_(
+                Transaction.from_address == user.wallet_address,
+                Transaction.to_address == user.wallet_address,
+            )
+        )
     total_count = (
         db.execute(
             select(func.count(Transaction.id)).where(*conditions)
@@ -1780,17 +1785,6 @@ def history_page(
         or 0
     )
 
-    pag = _paginate(total_count, page)
-    transactions = list(
-        db.execute(
-            select(Transaction)
-            .where(*conditions)
-            .order_by(Transaction.created_at.desc())
-            .limit(pag["per_page"])
-            .offset(pag["offset"])
-        ).scalars().all()
-    )
-
     name_map = _build_name_map(db)
 
     ctx = _base_context(
@@ -1805,7 +1799,8 @@ def history_page(
         date_from=date_from,
         date_to=date_to,
         tx_types=sorted(valid_types - {"GENESIS"}),
-        **pag,
+        total_count=total_count,
+        **cursors,
     )
     return templates.TemplateResponse("history.html", ctx)
 
@@ -2186,7 +2181,7 @@ def mint_dashboard_page(
         or 0
     )
 
-    chain_result = verify_chain(db)
+    chain_result = get_chain_status(db)
     chain_valid = chain_result["valid"]
 
     # Recent MINT transactions (last 10)
@@ -2296,9 +2291,9 @@ def mint_stats_page(
     db: Session = Depends(get_db),
 ):
     # Chain verification
-    chain_result = verify_chain(db)
+    chain_result = get_chain_status(db)
     chain_valid = chain_result["valid"]
-    chain_errors = len(chain_result["errors"])
+    chain_errors = chain_result["error_count"]
 
     total_transactions = (
         db.execute(select(func.count(Transaction.id))).scalar() or 0
@@ -7,15 +7,15 @@ browsing the public ledger.
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
 from app.auth import require_login
 from app.config import settings
 from app.blockchain import (
     create_transaction,
-    get_all_transactions,
     get_transaction_by_hash,
+    page_transactions,
 )
 from app.database import get_db
 from app.models import Nation, Transaction, User
@@ -133,11 +133,18 @@ ledger_router = APIRouter(tags=["transactions"])
 def public_ledger(
     page: int = Query(1, ge=1),
     per_page: int = Query(25, ge=1, le=100),
+    before: int | None = Query(None),
     db: Session = Depends(get_db),
 ):
-    """Return a paginated view of all confirmed transactions (public)."""
-    offset = (page - 1) * per_page
-    transactions, total = get_all_transactions(db, limit=per_page, offset=offset)
+    """Return a paginated view of all confirmed transactions (public).
+
+    Pass the previous response's next_cursor as *before* to page through
+    the ledger; *page* still works but costs more the deeper it goes.
+    """
+    transactions, cursors = page_transactions(
+        db, limit=per_page, before=before, offset=(page - 1) * per_page
+    )
+    total = db.execute(select(func.count(Transaction.id))).scalar() or 0
 
     return {
         "transactions": [
@@ -158,4 +165,5 @@ def public_ledger(
         "total": total,
         "page": page,
         "per_page": per_page,
+        "next_cursor": cursors["next_cursor"],
     }
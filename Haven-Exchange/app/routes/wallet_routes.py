@@ -10,7 +10,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.auth import require_login
-from app.blockchain import get_transactions_for_address
+from app.blockchain import page_transactions
 from app.config import settings
 from app.database import get_db
 from app.models import Nation, User
@@ -169,9 +169,13 @@ def wallet_transactions(
     address: str,
     page: int = Query(1, ge=1),
     per_page: int = Query(25, ge=1, le=100),
+    before: int | None = Query(None),
     db: Session = Depends(get_db),
 ):
-    """Return paginated transaction history for a given address (public)."""
+    """Return paginated transaction history for a given address (public).
+
+    Pass the previous response's next_cursor as *before* for the next page.
+    """
     # Verify address exists
     if address.startswith(settings.NATION_WALLET_PREFIX):
         exists = db.execute(
@@ -185,8 +189,9 @@ def wallet_transactions(
     if exists is None:
         raise HTTPException(status_code=404, detail="Address not found.")
 
-    offset = (page - 1) * per_page
-    transactions = get_transactions_for_address(db, address, limit=per_page, offset=offset)
+    transactions, cursors = page_transactions(
+        db, address=address, limit=per_page, before=before, offset=(page - 1) * per_page
+    )
 
     return {
         "address": address,
@@ -206,4 +211,5 @@ def wallet_transactions(
         ],
         "page": page,
         "per_page": per_page,
+        "next_cursor": cursors["next_cursor"],
     }
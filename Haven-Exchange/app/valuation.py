@@ -9,8 +9,10 @@ import re
 import threading
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import distinct, func, or_, select
+from sqlalchemy import distinct, func, insert, select, update
 
+from app.blockchain import flow_window_start, get_address_flows, get_nation_flows
+from app.jobs import chunked
 from app.models import (
     Nation,
     Shop,
@@ -211,85 +213,128 @@ def create_business_stock(db, shop: Shop, num_shares: int) -> Stock:
 
 
 # ---------------------------------------------------------------------------
-# Three-pillar valuation
+# Raw pillar metrics (set-based)
 # ---------------------------------------------------------------------------
-def _score_nation_stock(db, stock: Stock, all_nation_metrics: dict) -> dict:
-    """Calculate pillar scores for a nation stock."""
-    nation_id = stock.entity_id
+def _gather_nation_stock_metrics(db, nation_ids: list[int]) -> dict[int, dict]:
+    """Return {nation_id: {population, activity, cashflow}} for *nation_ids*.
+
+    Member counts come from grouped user queries and 30-day ledger activity
+    from the address_daily_flows rollup, so the cost doesn't grow with the
+    number of nations.  Ledger activity counts each side a member (or, for
+    cash flow, the treasury) appears on.
+    """
+    if not nation_ids:
+        return {}
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
 
     # Pillar 1: Population — active members
-    member_count = (
+    population = dict(
         db.execute(
-            select(func.count(User.id)).where(
-                User.nation_id == nation_id,
+            select(User.nation_id, func.count(User.id))
+            .where(
+                User.nation_id.in_(nation_ids),
                 User.is_active == True,  # noqa: E712
             )
-        ).scalar()
-        or 0
+            .group_by(User.nation_id)
+        ).all()
     )
-
-    # Pillar 2: Activity — members active in 30 days + tx count
-    active_members = (
+    # Pillar 2: Activity — members active in 30 days + member tx count
+    active_members = dict(
         db.execute(
-            select(func.count(User.id)).where(
-                User.nation_id == nation_id,
+            select(User.nation_id, func.count(User.id))
+            .where(
+                User.nation_id.in_(nation_ids),
                 User.last_active >= thirty_days_ago,
             )
-        ).scalar()
-        or 0
+            .group_by(User.nation_id)
+        ).all()
     )
+    # Pillar 3: Cash Flow — TC flowing through members + treasury
+    flows = get_nation_flows(db, flow_window_start(30), nation_ids)
+
+    metrics = {}
+    for nation_id in nation_ids:
+        flow = flows.get(nation_id, {})
+        metrics[nation_id] = {
+            "population": population.get(nation_id, 0),
+            "activity": active_members.get(nation_id, 0) + flow.get("member_tx_count", 0),
+            "cashflow": flow.get("volume", 0),
+        }
+    return metrics
+
+
+def _gather_business_stock_metrics(db, shop_ids: list[int]) -> dict[int, dict]:
+    """Return {shop_id: {customers, activity, cashflow, has_owner}} for *shop_ids*.
+
+    Revenue comes from the address_daily_flows rollup.  Unique customers
+    and purchase counts need the buyer and the direction of each purchase,
+    which the rollup doesn't keep, so they come from one grouped query over
+    the window's PURCHASE rows.  Shops that no longer exist are absent.
+    """
+    if not shop_ids:
+        return {}
+    since = flow_window_start(30)
 
-    # Get all wallet addresses for nation members
-    member_addresses = [
-        row[0]
-        for row in db.execute(
-            select(User.wallet_address).where(User.nation_id == nation_id)
+    owners = dict(
+        db.execute(
+            select(Shop.id, User.wallet_address)
+            .outerjoin(User, User.id == Shop.owner_id)
+            .where(Shop.id.in_(shop_ids))
+        ).all()
+    )
+    purchases = {
+        to_addr: (customers, count)
+        for to_addr, customers, count in db.execute(
+            select(
+                Transaction.to_address,
+                func.count(distinct(Transaction.from_address)),
+                func.count(Transaction.id),
+            )
+            .where(
+                Transaction.tx_type == "PURCHASE",
+                Transaction.created_at >= datetime.strptime(since, "%Y-%m-%d"),
+            )
+            .group_by(Transaction.to_address)
         ).all()
-    ]
+    }
+    revenue = get_address_flows(db, since=since, tx_type="PURCHASE")
+    listings = dict(
+        db.execute(
+            select(ShopListing.shop_id, func.count(ShopListing.id))
+            .where(ShopListing.shop_id.in_(shop_ids))
+            .group_by(ShopListing.shop_id)
+        ).all()
+    )
 
-    # Also include the nation treasury address
-    nation = db.execute(
-        select(Nation).where(Nation.id == nation_id)
-    ).scalar_one_or_none()
-    treasury_addr = nation.treasury_address if nation else None
-
-    tx_count = 0
-    if member_addresses:
-        tx_count = (
-            db.execute(
-                select(func.count(Transaction.id)).where(
-                    Transaction.created_at >= thirty_days_ago,
-                    or_(
-                        Transaction.from_address.in_(member_addresses),
-                        Transaction.to_address.in_(member_addresses),
-                    ),
-                )
-            ).scalar()
-            or 0
-        )
+    metrics = {}
+    for shop_id, owner_addr in owners.items():
+        customers, purchase_count = purchases.get(owner_addr, (0, 0))
+        metrics[shop_id] = {
+            "customers": customers,
+            "activity": purchase_count + listings.get(shop_id, 0),
+            "cashflow": revenue.get(owner_addr, (0, 0, 0))[1],
+            "has_owner": owner_addr is not None,
+        }
+    return metrics
 
-    activity_metric = active_members + tx_count
-
-    # Pillar 3: Cash Flow — TC flowing through nation (not treasury balance)
-    cashflow = 0
-    all_addrs = list(member_addresses)
-    if treasury_addr:
-        all_addrs.append(treasury_addr)
-
-    if all_addrs:
-        cashflow = (
-            db.execute(
-                select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                    Transaction.created_at >= thirty_days_ago,
-                    or_(
-                        Transaction.from_address.in_(all_addrs),
-                        Transaction.to_address.in_(all_addrs),
-                    ),
-                )
-            ).scalar()
-            or 0
-        )
+
+# ---------------------------------------------------------------------------
+# Three-pillar valuation
+# ---------------------------------------------------------------------------
+def _score_nation_stock(
+    db, stock: Stock, all_nation_metrics: dict, metrics: dict | None = None
+) -> dict:
+    """Calculate pillar scores for a nation stock.
+
+    *metrics* is a _gather_nation_stock_metrics() result covering the
+    stock's nation; it is gathered on demand when omitted.
+    """
+    if metrics is None:
+        metrics = _gather_nation_stock_metrics(db, [stock.entity_id])
+    raw = metrics[stock.entity_id]
+    member_count = raw["population"]
+    activity_metric = raw["activity"]
+    cashflow = raw["cashflow"]
 
     # Normalize against max values across all nations
     max_pop = all_nation_metrics.get("max_population", 0)
@@ -320,75 +365,31 @@ def _score_nation_stock(db, stock: Stock, all_nation_metrics: dict) -> dict:
     }
 
 
-def _score_business_stock(db, stock: Stock, all_biz_metrics: dict) -> dict:
-    """Calculate pillar scores for a business stock."""
-    shop_id = stock.entity_id
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+def _score_business_stock(
+    db, stock: Stock, all_biz_metrics: dict, metrics: dict | None = None
+) -> dict:
+    """Calculate pillar scores for a business stock.
 
-    # Get shop and owner
-    shop = db.execute(select(Shop).where(Shop.id == shop_id)).scalar_one_or_none()
-    if shop is None:
+    *metrics* is a _gather_business_stock_metrics() result covering the
+    stock's shop; it is gathered on demand when omitted.
+    """
+    if metrics is None:
+        metrics = _gather_business_stock_metrics(db, [stock.entity_id])
+    raw = metrics.get(stock.entity_id)
+    if raw is None:
         return {
             "population_score": 0, "activity_score": 0,
             "cashflow_score": 0, "composite_score": 0,
         }
 
-    owner = db.execute(select(User).where(User.id == shop.owner_id)).scalar_one_or_none()
-    owner_addr = owner.wallet_address if owner else ""
-
-    # Pillar 1: Customers — unique buyers in last 30 days
-    unique_customers = (
-        db.execute(
-            select(func.count(distinct(Transaction.from_address))).where(
-                Transaction.to_address == owner_addr,
-                Transaction.tx_type == "PURCHASE",
-                Transaction.created_at >= thirty_days_ago,
-            )
-        ).scalar()
-        or 0
-    )
-
-    # Pillar 2: Activity — purchase tx count + listing count
-    purchase_count = (
-        db.execute(
-            select(func.count(Transaction.id)).where(
-                Transaction.to_address == owner_addr,
-                Transaction.tx_type == "PURCHASE",
-                Transaction.created_at >= thirty_days_ago,
-            )
-        ).scalar()
-        or 0
-    )
-    listing_count = (
-        db.execute(
-            select(func.count(ShopListing.id)).where(
-                ShopListing.shop_id == shop_id,
-            )
-        ).scalar()
-        or 0
-    )
-    activity_metric = purchase_count + listing_count
-
-    # Pillar 3: Cash Flow — sales revenue in last 30 days
-    revenue = (
-        db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                Transaction.to_address == owner_addr,
-                Transaction.tx_type == "PURCHASE",
-                Transaction.created_at >= thirty_days_ago,
-            )
-        ).scalar()
-        or 0
-    )
-
     # Normalize
     max_cust = all_biz_metrics.get("max_customers", 0)
     max_act = all_biz_metrics.get("max_activity", 0)
     max_cf = all_biz_metrics.get("max_cashflow", 0)
 
-    pop_score = round(unique_customers / max_cust * 100) if max_cust > 0 else 50
-    act_score = round(activity_metric / max_act * 100) if max_act > 0 else 50
-    cf_score = round(revenue / max_cf * 100) if max_cf > 0 else 50
+    pop_score = round(raw["customers"] / max_cust * 100) if max_cust > 0 else 50
+    act_score = round(raw["activity"] / max_act * 100) if max_act > 0 else 50
+    cf_score = round(raw["cashflow"] / max_cf * 100) if max_cf > 0 else 50
 
     pop_score = max(0, min(100, pop_score))
     act_score = max(0, min(100, act_score))
@@ -404,170 +405,45 @@ def _score_business_stock(db, stock: Stock, all_biz_metrics: dict) -> dict:
     }
 
 
-def _gather_nation_maxes(db) -> dict:
-    """Gather max metrics across all nation stocks for normalization."""
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-
-    nation_stocks = list(
+def _active_entity_ids(db, stock_type: str) -> list[int]:
+    return list(
         db.execute(
-            select(Stock).where(Stock.stock_type == "nation", Stock.is_active == True)  # noqa: E712
+            select(Stock.entity_id).where(
+                Stock.stock_type == stock_type,
+                Stock.is_active == True,  # noqa: E712
+            )
         ).scalars().all()
     )
 
-    max_pop = 0
-    max_act = 0
-    max_cf = 0
-
-    for stock in nation_stocks:
-        nation_id = stock.entity_id
-
-        pop = (
-            db.execute(
-                select(func.count(User.id)).where(
-                    User.nation_id == nation_id,
-                    User.is_active == True,  # noqa: E712
-                )
-            ).scalar()
-            or 0
-        )
-        max_pop = max(max_pop, pop)
-
-        active = (
-            db.execute(
-                select(func.count(User.id)).where(
-                    User.nation_id == nation_id,
-                    User.last_active >= thirty_days_ago,
-                )
-            ).scalar()
-            or 0
-        )
-
-        member_addrs = [
-            r[0]
-            for r in db.execute(
-                select(User.wallet_address).where(User.nation_id == nation_id)
-            ).all()
-        ]
 
-        nation = db.execute(
-            select(Nation).where(Nation.id == nation_id)
-        ).scalar_one_or_none()
-        treasury_addr = nation.treasury_address if nation else None
-
-        tx_count = 0
-        if member_addrs:
-            tx_count = (
-                db.execute(
-                    select(func.count(Transaction.id)).where(
-                        Transaction.created_at >= thirty_days_ago,
-                        or_(
-                            Transaction.from_address.in_(member_addrs),
-                            Transaction.to_address.in_(member_addrs),
-                        ),
-                    )
-                ).scalar()
-                or 0
-            )
-        max_act = max(max_act, active + tx_count)
-
-        all_addrs = list(member_addrs)
-        if treasury_addr:
-            all_addrs.append(treasury_addr)
-
-        cf = 0
-        if all_addrs:
-            cf = (
-                db.execute(
-                    select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                        Transaction.created_at >= thirty_days_ago,
-                        or_(
-                            Transaction.from_address.in_(all_addrs),
-                            Transaction.to_address.in_(all_addrs),
-                        ),
-                    )
-                ).scalar()
-                or 0
-            )
-        max_cf = max(max_cf, cf)
+def _gather_nation_maxes(db, metrics: dict[int, dict] | None = None) -> dict:
+    """Gather max metrics across all nation stocks for normalization.
 
+    Pass the active nation stocks' _gather_nation_stock_metrics() result to
+    avoid gathering it twice.
+    """
+    if metrics is None:
+        metrics = _gather_nation_stock_metrics(db, _active_entity_ids(db, "nation"))
+    rows = list(metrics.values())
     return {
-        "max_population": max_pop,
-        "max_activity": max_act,
-        "max_cashflow": max_cf,
+        "max_population": max((r["population"] for r in rows), default=0),
+        "max_activity": max((r["activity"] for r in rows), default=0),
+        "max_cashflow": max((r["cashflow"] for r in rows), default=0),
     }
 
 
-def _gather_business_maxes(db) -> dict:
-    """Gather max metrics across all business stocks for normalization."""
-    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-
-    biz_stocks = list(
-        db.execute(
-            select(Stock).where(Stock.stock_type == "business", Stock.is_active == True)  # noqa: E712
-        ).scalars().all()
-    )
-
-    max_cust = 0
-    max_act = 0
-    max_cf = 0
-
-    for stock in biz_stocks:
-        shop = db.execute(select(Shop).where(Shop.id == stock.entity_id)).scalar_one_or_none()
-        if not shop:
-            continue
-        owner = db.execute(select(User).where(User.id == shop.owner_id)).scalar_one_or_none()
-        if not owner:
-            continue
-        addr = owner.wallet_address
-
-        cust = (
-            db.execute(
-                select(func.count(distinct(Transaction.from_address))).where(
-                    Transaction.to_address == addr,
-                    Transaction.tx_type == "PURCHASE",
-                    Transaction.created_at >= thirty_days_ago,
-                )
-            ).scalar()
-            or 0
-        )
-        max_cust = max(max_cust, cust)
-
-        pcount = (
-            db.execute(
-                select(func.count(Transaction.id)).where(
-                    Transaction.to_address == addr,
-                    Transaction.tx_type == "PURCHASE",
-                    Transaction.created_at >= thirty_days_ago,
-                )
-            ).scalar()
-            or 0
-        )
-        lcount = (
-            db.execute(
-                select(func.count(ShopListing.id)).where(
-                    ShopListing.shop_id == stock.entity_id,
-                )
-            ).scalar()
-            or 0
-        )
-        max_act = max(max_act, pcount + lcount)
-
-        rev = (
-            db.execute(
-                select(func.coalesce(func.sum(Transaction.amount), 0)).where(
-                    Transaction.to_address == addr,
-                    Transaction.tx_type == "PURCHASE",
-                    Transaction.created_at >= thirty_days_ago,
-                )
-            ).scalar()
-            or 0
-        )
-        max_cf = max(max_cf, rev)
+def _gather_business_maxes(db, metrics: dict[int, dict] | None = None) -> dict:
+    """Gather max metrics across all business stocks for normalization.
 
+    Shops whose owner no longer exists are left out.
+    """
+    if metrics is None:
+        metrics = _gather_business_stock_metrics(db, _active_entity_ids(db, "business"))
+    rows = [r for r in metrics.values() if r["has_owner"]]
     return {
-        "max_customers": max_cust,
-        "max_activity": max_act,
-        "max_cashflow": max_cf,
+        "max_customers": max((r["customers"] for r in rows), default=0),
+        "max_activity": max((r["activity"] for r in rows), default=0),
+        "max_cashflow": max((r["cashflow"] for r in rows), default=0),
     }
 
 
@@ -577,28 +453,36 @@ def _gather_business_maxes(db) -> dict:
 def recalculate_all_prices(db) -> int:
     """Recalculate prices for all active stocks.
 
-    Returns the number of stocks recalculated.
+    Reads the active stocks and their metrics up front, prices everything
+    in memory, then writes the price updates and valuation snapshots as
+    bulk statements, WRITE_CHUNK stocks per commit.  Returns the number of
+    stocks recalculated.
     """
     now = datetime.now(timezone.utc)
     today = now.strftime("%Y-%m-%d")
 
-    # Gather normalization maxes
-    nation_maxes = _gather_nation_maxes(db)
-    biz_maxes = _gather_business_maxes(db)
+    stocks = db.execute(
+        select(Stock.id, Stock.stock_type, Stock.entity_id, Stock.current_price)
+        .where(Stock.is_active == True)  # noqa: E712
+    ).all()
 
-    stocks = list(
-        db.execute(
-            select(Stock).where(Stock.is_active == True)  # noqa: E712
-        ).scalars().all()
+    # Gather raw metrics once for every stock, then the normalization maxes
+    nation_metrics = _gather_nation_stock_metrics(
+        db, [s.entity_id for s in stocks if s.stock_type == "nation"]
+    )
+    biz_metrics = _gather_business_stock_metrics(
+        db, [s.entity_id for s in stocks if s.stock_type == "business"]
     )
+    nation_maxes = _gather_nation_maxes(db, nation_metrics)
+    biz_maxes = _gather_business_maxes(db, biz_metrics)
 
-    count = 0
+    priced: list[tuple[dict, dict]] = []
     for stock in stocks:
         if stock.stock_type == "nation":
-            scores = _score_nation_stock(db, stock, nation_maxes)
+            scores = _score_nation_stock(db, stock, nation_maxes, nation_metrics)
             base_price = NATION_BASE_PRICE
         elif stock.stock_type == "business":
-            scores = _score_business_stock(db, stock, biz_maxes)
+            scores = _score_business_stock(db, stock, biz_maxes, biz_metrics)
             base_price = BUSINESS_BASE_PRICE
         else:
             continue
@@ -606,26 +490,31 @@ def recalculate_all_prices(db) -> int:
         composite = scores["composite_score"]
         new_price = max(1, round(base_price * composite / 50))
 
-        # Update stock
-        stock.previous_price = stock.current_price
-        stock.current_price = new_price
-        stock.last_valued_at = now
-
-        # Save valuation snapshot
-        valuation = StockValuation(
-            stock_id=stock.id,
-            population_score=scores["population_score"],
-            activity_score=scores["activity_score"],
-            cashflow_score=scores["cashflow_score"],
-            composite_score=composite,
-            calculated_price=new_price,
-            snapshot_date=today,
-        )
-        db.add(valuation)
-        count += 1
-
-    db.commit()
-    return count
+        priced.append((
+            # Stock price update
+            {
+                "id": stock.id,
+                "previous_price": stock.current_price,
+                "current_price": new_price,
+                "last_valued_at": now,
+            },
+            # Valuation snapshot
+            {
+                "stock_id": stock.id,
+                "population_score": scores["population_score"],
+                "activity_score": scores["activity_score"],
+                "cashflow_score": scores["cashflow_score"],
+                "composite_score": composite,
+                "calculated_price": new_price,
+                "snapshot_date": today,
+            },
+        ))
+
+    for batch in chunked(priced):
+        db.execute(update(Stock), [price for price, _ in batch])
+        db.execute(insert(StockValuation), [snapshot for _, snapshot in batch])
+        db.commit()
+    return len(priced)
 
 
 def maybe_recalculate(db) -> None:
@@ -0,0 +1,99 @@
+"""Compare ledger write throughput: one create_transaction() per row versus
+append_transactions() batches.
+
+Runs against a throwaway SQLite file (never the real database), seeds a
+nation treasury and a set of member wallets, then pays every member a
+DISTRIBUTE both ways and prints rows/second for each.
+
+    python scripts/bench_ledger_append.py
+    python scripts/bench_ledger_append.py --members 5000 --batch-size 500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make `app` importable when run as a top-level script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.blockchain import (  # noqa: E402
+    Transfer,
+    append_transactions,
+    create_genesis_block,
+    create_transaction,
+    verify_chain,
+)
+from app.config import settings  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import Nation, User  # noqa: E402
+
+
+def _seed(db, members: int) -> tuple[str, list[str]]:
+    leader = User(username="bench-leader", password_hash="x", wallet_address="TRV-BENCH-LEADER")
+    db.add(leader)
+    db.flush()
+    treasury = f"{settings.NATION_WALLET_PREFIX}BENCH"
+    db.add(Nation(
+        name="Bench Nation",
+        leader_id=leader.id,
+        treasury_address=treasury,
+        treasury_balance=10 * members,
+    ))
+    wallets = [f"TRV-BENCH-{i:06d}" for i in range(members)]
+    db.add_all(
+        User(username=f"bench-{i}", password_hash="x", wallet_address=w)
+        for i, w in enumerate(wallets)
+    )
+    db.commit()
+    create_genesis_block(db)
+    return treasury, wallets
+
+
+def _rate(rows: int, seconds: float) -> str:
+    return f"{rows:>6} rows in {seconds:7.2f}s  ({rows / seconds:9.1f} rows/s)"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--members", type=int, default=2000, help="wallets paid per run")
+    parser.add_argument("--batch-size", type=int, default=250, help="transfers per append_transactions() call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+        try:
+            treasury, wallets = _seed(db, args.members)
+
+            started = time.perf_counter()
+            for wallet in wallets:
+                create_transaction(db, "DISTRIBUTE", treasury, wallet, 1, memo="bench single")
+            single = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for i in range(0, len(wallets), args.batch_size):
+                append_transactions(db, [
+                    Transfer("DISTRIBUTE", treasury, wallet, 1, "bench batch")
+                    for wallet in wallets[i:i + args.batch_size]
+                ])
+            batched = time.perf_counter() - started
+
+            chain = verify_chain(db)
+        finally:
+            db.close()
+            engine.dispose()
+
+    print(f"single  : {_rate(len(wallets), single)}")
+    print(f"batched : {_rate(len(wallets), batched)}  [batch size {args.batch_size}]")
+    print(f"speed-up: {single / batched:.1f}x   chain valid: {chain['valid']}")
+    return 0 if chain["valid"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
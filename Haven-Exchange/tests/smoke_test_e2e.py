@@ -1014,3 +1014,358 @@ class TestKeeperBotIntegration:
         )
         assert r.status_code == 404
         assert "Bank not found" in r.json()["detail"]
+
+
+# ---------------------------------------------------------------------------
+# 16. Ledger verification checkpoints
+# ---------------------------------------------------------------------------
+class TestLedgerCheckpoints:
+    def test_58_incremental_chain_verification(self, client):
+        """Scenario 58 — checkpoints advance incrementally, catch a broken
+        link in new rows, and a forged checkpoint forces a full re-verify."""
+        from app.blockchain import (
+            create_transaction,
+            get_chain_status,
+            verify_chain,
+            verify_chain_incremental,
+        )
+        from app.config import settings
+        from app.database import SessionLocal
+        from app.models import LedgerCheckpoint, Transaction
+        from sqlalchemy import func, select
+
+        mint = settings.WORLD_MINT_ADDRESS
+        db = SessionLocal()
+        try:
+            full = verify_chain(db)
+            assert full["valid"] and full["mode"] == "full"
+            base = full["total_transactions"]
+
+            tx = create_transaction(db, "MINT", mint, mint, 5, memo="checkpoint smoke")
+            inc = verify_chain_incremental(db)
+            assert inc["mode"] == "incremental" and inc["valid"]
+            assert (inc["total_transactions"], inc["last_tx_id"]) == (base + 1, tx.id)
+
+            # Badge readers use the cached checkpoint; nothing new to write.
+            n_checkpoints = db.execute(select(func.count(LedgerCheckpoint.id))).scalar()
+            assert get_chain_status(db)["last_tx_id"] == tx.id
+            assert db.execute(select(func.count(LedgerCheckpoint.id))).scalar() == n_checkpoints
+
+            # A broken link in rows past the checkpoint is caught incrementally.
+            bad = create_transaction(db, "MINT", mint, mint, 5, memo="checkpoint smoke")
+            real_prev = bad.prev_hash
+            bad.prev_hash = "f" * 64
+            db.commit()
+            broken = verify_chain_incremental(db)
+            assert not broken["valid"] and broken["error_count"] == 1
+            assert f"#{bad.id}" in broken["errors"][0]
+
+            # Invalid stays sticky until a full walk passes again.
+            bad.prev_hash = real_prev
+            db.commit()
+            assert not verify_chain_incremental(db)["valid"]
+            assert verify_chain(db)["valid"]
+
+            # A hand-edited checkpoint fails its signature -> full re-verify.
+            latest = db.execute(
+                select(LedgerCheckpoint).order_by(LedgerCheckpoint.id.desc()).limit(1)
+            ).scalar_one()
+            latest.valid = False
+            db.commit()
+            status = get_chain_status(db)
+            assert status["valid"] and status["mode"] == "full"
+            assert status["total_transactions"] == db.execute(
+                select(func.count(Transaction.id))
+            ).scalar()
+        finally:
+            db.close()
+
+    def test_59_keyset_cursor_pagination(self, client):
+        """Scenario 59 — wallet and ledger APIs page with next_cursor and
+        agree with the page-numbered listing; the pages accept cursors."""
+        from app.blockchain import create_transaction
+        from app.config import settings
+        from app.database import SessionLocal
+
+        mint = settings.WORLD_MINT_ADDRESS
+        db = SessionLocal()
+        try:
+            for _ in range(3):
+                create_transaction(db, "MINT", mint, mint, 1, memo="cursor smoke")
+        finally:
+            db.close()
+
+        url = f"/api/wallet/{mint}/transactions"
+        expected = [t["tx_hash"] for t in client.get(url, params={"per_page": 100}).json()["transactions"]]
+        assert len(expected) >= 5
+
+        seen, cursor = [], None
+        while True:
+            params = {"per_page": 2}
+            if cursor is not None:
+                params["before"] = cursor
+            body = client.get(url, params=params).json()
+            seen += [t["tx_hash"] for t in body["transactions"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == expected
+
+        first = client.get("/api/ledger", params={"per_page": 2}).json()
+        second = client.get("/api/ledger", params={"per_page": 2, "before": first["next_cursor"]}).json()
+        by_page = client.get("/api/ledger", params={"per_page": 2, "page": 2}).json()
+        assert [t["tx_hash"] for t in second["transactions"]] == [t["tx_hash"] for t in by_page["transactions"]]
+
+        page = client.get("/ledger", params={"before": first["next_cursor"]})
+        assert page.status_code == 200 and "/ledger?after=" in page.text
+        assert client.get(f"/wallet/{mint}", params={"after": first["next_cursor"]}).status_code == 200
+        with _as(client, admin_token(client)):
+            r = client.get("/history", params={"direction": "received", "before": first["next_cursor"]})
+        assert r.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# 17. Batched ledger appends
+# ---------------------------------------------------------------------------
+class TestLedgerBatchAppend:
+    def test_60_batch_append_is_chained_and_atomic(self, client):
+        """Scenario 60 — a batch validates against its own earlier legs,
+        chains in order, and a failing leg leaves nothing behind."""
+        from app.blockchain import Transfer, append_transactions, verify_chain
+        from app.config import settings
+        from app.database import SessionLocal
+        from app.models import Transaction, User
+        from sqlalchemy import func, select
+
+        mint = settings.WORLD_MINT_ADDRESS
+        db = SessionLocal()
+        try:
+            user = db.execute(
+                select(User).where(User.wallet_address != mint).limit(1)
+            ).scalar_one()
+            start = user.balance
+
+            # The TRANSFER is only fundable because of the MINT before it.
+            txs = append_transactions(db, [
+                Transfer("MINT", mint, user.wallet_address, start + 20, "batch smoke"),
+                ("TRANSFER", user.wallet_address, mint, start + 15, "batch smoke"),
+            ])
+            assert txs[1].prev_hash == txs[0].tx_hash
+            db.refresh(user)
+            assert user.balance == start + 5
+
+            count = db.execute(select(func.count(Transaction.id))).scalar()
+            with pytest.raises(ValueError, match="Transfer 2 of 2: Insufficient balance"):
+                append_transactions(db, [
+                    Transfer("TRANSFER", user.wallet_address, mint, 3),
+                    Transfer("TRANSFER", user.wallet_address, mint, start + 3),
+                ])
+            db.refresh(user)
+            assert user.balance == start + 5
+            assert db.execute(select(func.count(Transaction.id))).scalar() == count
+            assert verify_chain(db)["valid"]
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------------
+# 18. Daily flow rollup
+# ---------------------------------------------------------------------------
+class TestDailyFlowRollup:
+    def test_61_rollup_matches_ledger_and_feeds_jobs(self, client):
+        """Scenario 61 — the rollup kept on append equals a rebuild from the
+        ledger, and the daily jobs read the ledger's numbers from it, with a
+        nation's internal transfers counted once."""
+        from datetime import datetime
+
+        from app.blockchain import Transfer, append_transactions, flow_window_start, rebuild_address_daily_flows
+        from app.config import settings
+        from app.database import SessionLocal
+        from app.gdp import _calculate_nation_gdp, _gather_gdp_maxes, recalculate_all_gdp
+        from app.models import AddressDailyFlow, Nation, Shop, Transaction, User
+        from app.valuation import (
+            _gather_business_stock_metrics,
+            _gather_nation_stock_metrics,
+            recalculate_all_prices,
+        )
+        from app.wallet_health import recalculate_wallet_health
+        from sqlalchemy import func, or_, select
+
+        mint = settings.WORLD_MINT_ADDRESS
+        db = SessionLocal()
+        try:
+            user = db.execute(
+                select(User).where(User.wallet_address != mint).limit(1)
+            ).scalar_one()
+            addr = user.wallet_address
+            append_transactions(db, [
+                Transfer("MINT", mint, addr, 9, "rollup smoke"),
+                Transfer("TRANSFER", addr, mint, 4, "rollup smoke"),
+            ])
+
+            def snapshot():
+                return sorted(
+                    (r.address, r.day, r.tx_type, r.inflow, r.outflow, r.tx_count)
+                    for r in db.execute(select(AddressDailyFlow)).scalars()
+                )
+
+            live = snapshot()
+            assert rebuild_address_daily_flows(db) == len(live)
+            assert snapshot() == live
+
+            # Wallet health reconciles to the per-side ledger count.
+            assert recalculate_wallet_health(db) >= 1
+            rows = db.execute(
+                select(Transaction.from_address, Transaction.to_address, Transaction.amount).where(
+                    Transaction.tx_type != "GENESIS",
+                    or_(Transaction.from_address == addr, Transaction.to_address == addr),
+                )
+            ).all()
+            sides = [amt for f, t, amt in rows for side in (f, t) if side == addr]
+            db.refresh(user)
+            assert (user.transaction_count_30d, user.volume_30d) == (len(sides), sum(sides))
+
+            # A fresh nation: a transfer between two members and a treasury
+            # payout are internal and must count once, as in the ledger.
+            members = [
+                User(username=f"smoke_roll_{n}", password_hash="x", wallet_address=f"TRV-SMOKEROLL-{n}")
+                for n in ("A", "B", "C")
+            ]
+            db.add_all(members)
+            db.flush()
+            nation = Nation(
+                name="Smoke Rollup Nation",
+                leader_id=members[0].id,
+                treasury_address="TRV-NATION-SMOKEROLL",
+                status="approved",
+            )
+            db.add(nation)
+            db.flush()
+            members[0].nation_id = members[1].nation_id = nation.id
+            shop = Shop(owner_id=members[0].id, nation_id=nation.id, name="Smoke Rollup Shop", status="approved")
+            db.add(shop)
+            db.commit()
+            a, b, outsider = (m.wallet_address for m in members)
+            append_transactions(db, [
+                Transfer("MINT", mint, a, 40, "rollup smoke"),
+                Transfer("MINT", mint, outsider, 30, "rollup smoke"),
+                Transfer("MINT", mint, nation.treasury_address, 20, "rollup smoke"),
+            ])
+            append_transactions(db, [
+                Transfer("TRANSFER", a, b, 6, "rollup smoke"),
+                Transfer("DISTRIBUTE", nation.treasury_address, b, 5, "rollup smoke"),
+                Transfer("PURCHASE", outsider, a, 7, "rollup smoke"),
+                Transfer("PURCHASE", outsider, a, 3, "rollup smoke"),
+            ])
+
+            since = datetime.strptime(flow_window_start(30), "%Y-%m-%d")
+
+            def ledger(addrs, tx_type=None):
+                stmt = select(func.count(Transaction.id), func.coalesce(func.sum(Transaction.amount), 0)).where(
+                    Transaction.created_at >= since,
+                    or_(Transaction.from_address.in_(addrs), Transaction.to_address.in_(addrs)),
+                )
+                if tx_type:
+                    stmt = stmt.where(Transaction.tx_type == tx_type, Transaction.to_address.in_(addrs))
+                return tuple(db.execute(stmt).one())
+
+            nation_count, nation_volume = ledger([a, b, nation.treasury_address])
+            member_count, _ = ledger([a, b])
+            _, shop_revenue = ledger([a], "PURCHASE")
+            assert (nation_count, nation_volume, member_count, shop_revenue) == (6, 81, 5, 10)
+
+            assert recalculate_all_gdp(db) >= 1
+            raw = _calculate_nation_gdp(db, nation, _gather_gdp_maxes(db))["raw"]
+            assert (raw["tx_count"], raw["revenue"]) == (nation_count, shop_revenue)
+
+            assert recalculate_all_prices(db) >= 0
+            nation_stock = _gather_nation_stock_metrics(db, [nation.id])[nation.id]
+            assert nation_stock["cashflow"] == nation_volume
+            assert nation_stock["activity"] == 2 + member_count  # both members just transacted
+            assert _gather_business_stock_metrics(db, [shop.id])[shop.id]["cashflow"] == shop_revenue
+        finally:
+            db.close()
+
+
+# ---------------------------------------------------------------------------
+# 19. Bulk daily jobs and job history
+# ---------------------------------------------------------------------------
+class TestBulkDailyJobs:
+    def test_62_bulk_jobs_record_history(self, client):
+        """Scenario 62 — demurrage and interest run as bulk passes, and each
+        recorded run lands in job_runs with its duration, rows and queries."""
+        from datetime import datetime, timedelta, timezone
+
+        from app.database import SessionLocal
+        from app.demurrage import apply_all_demurrage
+        from app.interest import accrue_daily_interest
+        from app.jobs import record_job
+        from app.models import JobRun, Loan, Nation, User
+        from sqlalchemy import select
+
+        now = datetime.now(timezone.utc)
+        db = SessionLocal()
+        try:
+            idle = User(
+                username="smoke_idle_wallet",
+                password_hash="x",
+                wallet_address="TRV-SMOKEIDLE",
+                balance=1000,
+                created_at=now - timedelta(days=40),
+            )
+            db.add(idle)
+            db.flush()
+            nation = Nation(
+                name="Smoke Demurrage Nation",
+                leader_id=idle.id,
+                treasury_address="TRV-NATION-SMOKEDEM",
+                status="approved",
+                demurrage_enabled=True,
+                demurrage_rate_bps=100,
+            )
+            db.add(nation)
+            db.flush()
+            idle.nation_id = nation.id
+            loan = Loan(
+                bank_id=0,
+                lender_type="treasury",
+                borrower_id=idle.id,
+                principal=36500,
+                outstanding=36500,
+                cap_amount=36500,
+                interest_rate=1000,  # 10 TC/day
+                burn_rate_snapshot=0,
+                opened_at=now - timedelta(days=3),
+            )
+            db.add(loan)
+            db.commit()
+
+            with record_job(db, "demurrage") as run:
+                run.summary = apply_all_demurrage(db)
+                run.rows_touched = run.summary["wallets_charged"]
+            assert run.summary["wallets_charged"] >= 1
+            db.refresh(idle)
+            assert idle.balance == 990
+
+            first = accrue_daily_interest(db)
+            again = accrue_daily_interest(db)
+            db.refresh(loan)
+            assert loan.accrued_interest == 30
+            assert first["loans_updated"] >= 1 and again["total_interest_added"] == 0
+
+            with pytest.raises(RuntimeError):
+                with record_job(db, "smoke_failing_job"):
+                    raise RuntimeError("boom")
+
+            runs = {
+                r.job_name: r for r in db.execute(
+                    select(JobRun).where(JobRun.job_name.in_(["demurrage", "smoke_failing_job"]))
+                ).scalars()
+            }
+            ok = runs["demurrage"]
+            assert ok.status == "ok" and ok.rows_touched == run.rows_touched
+            assert ok.queries > 0 and ok.duration_ms >= 0
+            assert runs["smoke_failing_job"].status == "error"
+            assert "boom" in runs["smoke_failing_job"].error
+        finally:
+            db.close()
@@ -47,6 +47,14 @@ ACTIVITY_LOG_MAX = 500  # Keep only the last N activity logs
 SESSION_TIMEOUT_MINUTES = 60
 SESSION_COOKIE_SECONDS = SESSION_TIMEOUT_MINUTES * 60
 
+# API key verification is served from an in-process cache for this long;
+# revoking or editing a key through routes/extractor.py invalidates it
+# immediately, the TTL only bounds changes made straight in the DB.
+API_KEY_CACHE_TTL_SECONDS = 60
+# api_keys.last_used_at is buffered in memory and written in one batch this
+# often (and on shutdown) instead of one write transaction per request.
+API_KEY_LAST_USED_FLUSH_SECONDS = 30
+
 # Super admin credentials
 # NOTE: INTENTIONAL DESIGN - 'Haven' is Parker's personal login, not a generic default
 SUPER_ADMIN_USERNAME = "Haven"
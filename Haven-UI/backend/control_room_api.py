@@ -4,7 +4,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Optional
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from contextlib import contextmanager
 import json
 import sqlite3
 import os
@@ -91,7 +90,7 @@ from image_processor import process_image
 
 from constants import (
     DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, ACTIVITY_LOG_MAX,
-    SESSION_TIMEOUT_MINUTES, SESSION_COOKIE_SECONDS,
+    SESSION_TIMEOUT_MINUTES, SESSION_COOKIE_SECONDS, API_KEY_LAST_USED_FLUSH_SECONDS,
     GRADE_THRESHOLDS, score_to_grade,
     NO_LIFE_BIOMES,
     TIER_SUPER_ADMIN, TIER_PARTNER, TIER_SUB_ADMIN, TIER_MEMBER, TIER_MEMBER_READONLY,
@@ -111,6 +110,8 @@ from db import (
     build_mismatch_flags, merge_system_data,
     snapshot_child_name_maps, capture_discovery_links, restore_discovery_links,
     set_base_fields,
+    run_write, close_db_pools, sync_facet_tokens, sync_body_resources,
+    begin_request_scope, end_request_scope, db_pool_stats,
     PHOTOS_DIR, LOGS_DIR,
 )
 
@@ -124,14 +125,15 @@ from services.auth_service import (
     get_submitter_identity, check_self_submission,
     get_super_admin_password_hash, set_super_admin_password_hash,
     get_personal_color, set_personal_color,
-    hash_api_key, generate_api_key, verify_api_key,
+    hash_api_key, generate_api_key, verify_api_key, flush_api_key_last_used,
     normalize_username_for_dedup, _levenshtein_distance,
     find_fuzzy_profile_matches, get_or_create_profile,
+    contributor_key, sync_system_contributor_key,
 )
 
 from services.completeness import (
     _is_filled, _life_descriptor_filled,
-    calculate_completeness_score, update_completeness_score,
+    calculate_completeness_score, calculate_completeness_scores, update_completeness_score,
 )
 
 from services.restrictions import (
@@ -141,6 +143,9 @@ from services.restrictions import (
 )
 
 from services.events import resolve_submission_event_id
+from services.map_snapshot import current_change_seq
+from services.payload_cache import PayloadCache
+from services.filter_facets import invalidate_filter_options
 from services.discoveries import (
     _sanitize_discoveries_draft,
     _promote_draft_discoveries,
@@ -223,6 +228,24 @@ async def refresh_session_cookie(request, call_next):
         response.headers['X-Session-Expires'] = expires_at.isoformat()
     return response
 
+
+# ============================================================================
+# Request-scoped DB connection reuse
+# ============================================================================
+# Registered after refresh_session_cookie so it wraps it (Starlette runs the
+# last-registered middleware outermost) — the session lookup above shares the
+# request's connection too. Every get_db_connection() in the handler and the
+# helpers it calls (add_activity_log, verify_api_key, restrictions, ...) gets
+# the same pooled connection; it goes back to the pool when the response is
+# done. See db.begin_request_scope.
+@app.middleware("http")
+async def db_request_scope(request, call_next):
+    token = begin_request_scope()
+    try:
+        return await call_next(request)
+    finally:
+        end_request_scope(token)
+
 # Determine Haven UI directory using centralized path config
 if haven_paths:
     HAVEN_UI_DIR = haven_paths.haven_ui_dir
@@ -778,29 +801,10 @@ def get_db_path() -> Path:
     return HAVEN_UI_DIR / 'data' / 'haven_ui.db'
 
 
-def get_db_connection():
-    """Create a properly configured database connection with timeout and WAL mode.
-
-    This ensures all connections use consistent settings to avoid database locks.
-    """
-    db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path), timeout=30.0)
-    conn.execute('PRAGMA journal_mode=WAL')
-    conn.execute('PRAGMA busy_timeout=30000')
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-@contextmanager
-def get_db():
-    """Context manager for database connections - ensures proper cleanup even on exceptions."""
-    conn = None
-    try:
-        conn = get_db_connection()
-        yield conn
-    finally:
-        if conn:
-            conn.close()
+# get_db_connection() / get_db() come from db.py (imported above) — pooled,
+# request-scoped connections. The local copies that used to live here opened a
+# fresh, partially-configured connection (no foreign_keys, no norm_token) on
+# every call and shadowed the shared ones for every endpoint in this module.
 
 
 def parse_station_data(station_row):
@@ -1665,6 +1669,10 @@ async def on_startup():
     # Pi freeze, where a long-held reader kept the WAL from rolling back.
     asyncio.create_task(_periodic_wal_checkpoint())
 
+    # Batched api_keys.last_used_at writes — verify_api_key only records the
+    # timestamp in memory. See services/auth_service.py.
+    asyncio.create_task(_periodic_api_key_flush())
+
     # Periodic poster cache eviction. Walks Haven-UI/data/posters/, totals
     # disk usage every 30 minutes, evicts oldest cache rows when over the
     # 4 GB ceiling down to 3.5 GB floor. See services/poster_service.py.
@@ -1677,12 +1685,25 @@ async def on_startup():
 
 @app.on_event('shutdown')
 async def on_shutdown():
-    """Tear down Playwright cleanly on app shutdown."""
+    """Tear down Playwright and the pooled DB connections on app shutdown."""
     try:
         from services.poster_service import shutdown_browser
         await shutdown_browser()
     except Exception as e:
         logger.warning('Poster service: shutdown error (non-fatal): %s', e)
+    try:
+        await run_write(flush_api_key_last_used)
+    except Exception as e:
+        logger.warning('API key last_used_at flush on shutdown failed: %s', e)
+    close_db_pools()
+
+
+def _wal_checkpoint(conn):
+    """PRAGMA wal_checkpoint(TRUNCATE) → (busy, log_pages, checkpointed_pages)."""
+    cur = conn.cursor()
+    cur.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    row = cur.fetchone()
+    return tuple(row) if row else None
 
 
 async def _periodic_wal_checkpoint(interval_seconds: int = 1800):
@@ -1698,22 +1719,33 @@ async def _periodic_wal_checkpoint(interval_seconds: int = 1800):
             db_path = get_db_path()
             if not db_path.exists():
                 continue
-            conn = sqlite3.connect(str(db_path), timeout=10.0)
-            try:
-                cur = conn.cursor()
-                cur.execute('PRAGMA wal_checkpoint(TRUNCATE)')
-                row = cur.fetchone()
-                logger.info('WAL checkpoint: busy=%s log_pages=%s checkpointed=%s',
-                            row[0] if row else '?', row[1] if row else '?',
-                            row[2] if row else '?')
-            finally:
-                conn.close()
+            # On the writer connection, off the event loop: a TRUNCATE
+            # checkpoint can take seconds on the Pi and must not stall requests.
+            row = await run_write(_wal_checkpoint)
+            logger.info('WAL checkpoint: busy=%s log_pages=%s checkpointed=%s',
+                        row[0] if row else '?', row[1] if row else '?',
+                        row[2] if row else '?')
         except asyncio.CancelledError:
             return
         except Exception as e:
             logger.warning('Periodic WAL checkpoint failed (non-fatal): %s', e)
 
 
+async def _periodic_api_key_flush(interval_seconds: int = API_KEY_LAST_USED_FLUSH_SECONDS):
+    """Write buffered api_keys.last_used_at values in one batch per interval,
+    on the writer connection. A failed flush keeps the values for the next one."""
+    while True:
+        try:
+            await asyncio.sleep(interval_seconds)
+            if not get_db_path().exists():
+                continue
+            await run_write(flush_api_key_last_used)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.warning('API key last_used_at flush failed (non-fatal): %s', e)
+
+
 # ============================================================================
 # Mount Route Modules
 # Each module is a FastAPI APIRouter containing related endpoints.
@@ -2229,13 +2261,14 @@ async def get_system(system_id: str, session: Optional[str] = Cookie(None)):
             row = cursor.fetchone()
 
             def _disambig(cands):
+                cands = [dict(nr) for nr in cands]
+                try:
+                    scores = calculate_completeness_scores(cursor, [nd.get('id') for nd in cands])
+                except Exception:
+                    scores = {}
                 matches = []
-                for nr in cands:
-                    nd = dict(nr)
-                    try:
-                        grade = calculate_completeness_score(cursor, nd.get('id'))['grade']
-                    except Exception:
-                        grade = None
+                for nd in cands:
+                    grade = (scores.get(nd.get('id')) or {}).get('grade')
                     matches.append({
                         'id': nd.get('id'),
                         'name': nd.get('name'),
@@ -2471,6 +2504,7 @@ async def delete_system(system_id: str, session: Optional[str] = Cookie(None)):
                 cursor.execute('DELETE FROM planets WHERE system_id = ?', (system_id,))
             cursor.execute('DELETE FROM systems WHERE id = ?', (system_id,))
             conn.commit()
+            invalidate_filter_options()
 
             # Add activity log
             add_activity_log(
@@ -3265,7 +3299,7 @@ async def save_system(payload: dict, session: Optional[str] = Cookie(None)):
                 or payload.get('discovered_by')
                 or 'Unknown'
             )
-            _mirror_norm = normalize_username_for_dedup(_mirror_raw)
+            _mirror_norm = contributor_key(_mirror_raw)
             _mirror_expedition_id = payload.get('expedition_id')
             try:
                 _mirror_expedition_id = int(_mirror_expedition_id) if _mirror_expedition_id else None
@@ -3367,7 +3401,11 @@ async def save_system(payload: dict, session: Optional[str] = Cookie(None)):
 
         # Calculate and store completeness score
         update_completeness_score(cursor, sys_id)
+        sync_system_contributor_key(cursor, sys_id)
+        sync_facet_tokens(cursor, sys_id)
+        sync_body_resources(cursor, sys_id)
         conn.commit()
+        invalidate_filter_options()
         logger.info(f"Saved system '{name}' to database (ID: {sys_id})")
 
         # Add audit log entry for direct saves (so super admin can track everything)
@@ -3718,6 +3756,67 @@ async def run_test(payload: dict):
         return {'returncode': -1, 'stdout': '', 'stderr': str(e)}
 
 
+# No-cache headers shared by the server-rendered map pages (v1.68.5) so a
+# browser never serves its own stale copy of a page whose HTML or injected
+# data has changed.
+_MAP_NO_CACHE_HEADERS = {
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+}
+
+
+class _SplitTemplate:
+    """A map HTML page with one `window.X = ...;` data slot, split once into
+    prefix/suffix so per-request injection is a string concat instead of a
+    regex pass over the whole file. Re-split when the file's mtime changes
+    (a `vite build` rewrites dist/). A page without the slot renders as-is.
+    """
+
+    def __init__(self, pattern: str):
+        self._pattern = re.compile(pattern, re.S)
+        self._parts = {}  # path -> (mtime_ns, html, prefix, suffix); prefix None = no slot
+
+    def _load(self, path: Path):
+        mtime = path.stat().st_mtime_ns
+        cached = self._parts.get(path)
+        if cached and cached[0] == mtime:
+            return cached
+        html = path.read_text(encoding='utf-8')
+        m = self._pattern.search(html)
+        parts = (mtime, html, None, None) if m is None else (mtime, html, html[:m.start()], html[m.end():])
+        self._parts[path] = parts
+        return parts
+
+    def version(self, path: Path) -> int:
+        return self._load(path)[0]
+
+    def has_slot(self, path: Path) -> bool:
+        return self._load(path)[2] is not None
+
+    def render(self, path: Path, assignment: Optional[str] = None) -> str:
+        """Page HTML with the slot replaced by `assignment` (a full JS
+        statement), or the untouched page when there's nothing to inject."""
+        _, html, prefix, suffix = self._load(path)
+        if prefix is None or assignment is None:
+            return html
+        return prefix + assignment + suffix
+
+
+_MAP_LATEST_TEMPLATE = _SplitTemplate(r"window\.DISCOVERIES_DATA\s*=\s*\[.*?\];")
+_REGION_MAP_TEMPLATE = _SplitTemplate(r"window\.REGION_DATA\s*=\s*\{[^}]*region_x[^}]*\};")
+_SYSTEM_VIEW_TEMPLATE = _SplitTemplate(r"window\.SYSTEM_DATA\s*=\s*null;")
+
+# Rendered /map/region pages, keyed on (rx, ry, rz, template mtime, map change
+# seq). The seq comes from map_change_log (migration 1.100.0), which moves on
+# any write to systems/planets in any region — coarse, but a single PK lookup.
+# Columns outside the log's trigger set (e.g. completeness flags) can lag by up
+# to the TTL. `data` keeps the unrestricted systems so viewers with data
+# restrictions still get a per-request filtered render.
+_REGION_MAP_CACHE = PayloadCache('map_region', max_bytes=16 * 1024 * 1024,
+                                 ttl_seconds=300, media_type='text/html')
+
+
 @app.get('/map/latest')
 async def get_map():
     """Serve the Three.js-based galaxy map.
@@ -3737,27 +3836,19 @@ async def get_map():
         return HTMLResponse('<h1>Map Not Available</h1>')
 
     try:
-        html = mapfile.read_text(encoding='utf-8')
         # Only inject discoveries data (small payload, still needed for discovery markers)
-        # Systems data is now fetched asynchronously via /api/map/regions-aggregated
-        db_path = get_db_path()
-        if db_path.exists():
-            discoveries = query_discoveries_from_db()
-            discoveries_json = json.dumps(discoveries, ensure_ascii=True)
-            html = re.sub(r"window\.DISCOVERIES_DATA\s*=\s*\[.*?\];", lambda m: f"window.DISCOVERIES_DATA = {discoveries_json};", html, flags=re.S)
+        # Systems data is now fetched asynchronously via /api/map/regions-aggregated.
+        # Pages without the DISCOVERIES_DATA slot (the Cartographer) skip the query.
+        assignment = None
+        if _MAP_LATEST_TEMPLATE.has_slot(mapfile) and get_db_path().exists():
+            discoveries_json = json.dumps(query_discoveries_from_db(), ensure_ascii=True)
+            assignment = f"window.DISCOVERIES_DATA = {discoveries_json};"
+        html = _MAP_LATEST_TEMPLATE.render(mapfile, assignment)
         # v1.68.5 — same no-cache headers as /map/system/{id} so the page
         # always reflects the latest HTML in dist/. Without this the
         # browser was happily serving its own stale cached copy from
         # before the focus chip / focus pipeline shipped.
-        return HTMLResponse(
-            html,
-            media_type='text/html',
-            headers={
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0',
-            }
-        )
+        return HTMLResponse(html, media_type='text/html', headers=_MAP_NO_CACHE_HEADERS)
     except Exception as e:
         logger.error('Failed to render map latest: %s', e)
         return HTMLResponse('<h1>Map Error</h1>')
@@ -3770,7 +3861,7 @@ async def get_haven_ui_map():
 
 
 @app.get('/map/region')
-async def get_region_map(rx: int = 0, ry: int = 0, rz: int = 0,
+async def get_region_map(request: Request, rx: int = 0, ry: int = 0, rz: int = 0,
                           session: Optional[str] = Cookie(None)):
     """Serve the Region View - shows all star systems within a specific region.
 
@@ -3792,67 +3883,68 @@ async def get_region_map(rx: int = 0, ry: int = 0, rz: int = 0,
     if not mapfile.exists():
         return HTMLResponse('<h1>Region Map Not Available</h1>')
 
+    conn = None
     try:
-        html = mapfile.read_text(encoding='utf-8')
-
-        # Load systems for this region from DB
         db_path = get_db_path()
-        if db_path.exists():
-            conn = get_db_connection()
-            cursor = conn.cursor()
+        if not db_path.exists():
+            return HTMLResponse(_REGION_MAP_TEMPLATE.render(mapfile),
+                                media_type='text/html', headers=_MAP_NO_CACHE_HEADERS)
 
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cache_key = (rx, ry, rz, _REGION_MAP_TEMPLATE.version(mapfile), current_change_seq(cursor))
+        page = _REGION_MAP_CACHE.get(cache_key)
+        if page is None:
+            # Systems + all of their planets in two queries (was one
+            # correlated COUNT(*) per system plus one planets query per system).
             cursor.execute('''
-                SELECT s.*,
-                    (SELECT COUNT(*) FROM planets WHERE system_id = s.id) as planet_count
-                FROM systems s
+                SELECT s.* FROM systems s
                 WHERE s.region_x = ? AND s.region_y = ? AND s.region_z = ?
                 ORDER BY s.name
             ''', (rx, ry, rz))
-
-            rows = cursor.fetchall()
-            systems = []
-            for row in rows:
-                system = dict(row)
-                sys_id = system.get('id')
-                cursor.execute('SELECT * FROM planets WHERE system_id = ?', (sys_id,))
-                planets_rows = cursor.fetchall()
-                system['planets'] = [dict(p) for p in planets_rows]
-                systems.append(system)
-            conn.close()
-
-            # Apply map visibility restrictions
-            systems = apply_data_restrictions(systems, session_data, for_map=True)
-
-            region_data = {
-                'region_x': rx,
-                'region_y': ry,
-                'region_z': rz,
-                'systems': systems
-            }
-            region_json = json.dumps(region_data, ensure_ascii=True)
-
-            # Inject region data into HTML
-            html = re.sub(
-                r"window\.REGION_DATA\s*=\s*\{[^}]*region_x[^}]*\};",
-                lambda m: f"window.REGION_DATA = {region_json};",
-                html,
-                flags=re.S
-            )
-
-        # v1.68.5 — no-cache headers (was missing; browser was serving its
-        # stale cached copy from before the focus chip + drill-down rework).
-        return HTMLResponse(
-            html,
-            media_type='text/html',
-            headers={
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0',
-            }
-        )
+            systems = [dict(row) for row in cursor.fetchall()]
+            cursor.execute('''
+                SELECT p.* FROM planets p
+                JOIN systems s ON s.id = p.system_id
+                WHERE s.region_x = ? AND s.region_y = ? AND s.region_z = ?
+                ORDER BY p.id
+            ''', (rx, ry, rz))
+            planets_by_system = {}
+            for p in cursor.fetchall():
+                planets_by_system.setdefault(p['system_id'], []).append(dict(p))
+            for system in systems:
+                planets = planets_by_system.get(system['id'], [])
+                system['planet_count'] = len(planets)
+                system['planets'] = planets
+            page = _REGION_MAP_CACHE.put(cache_key, _render_region_page(mapfile, rx, ry, rz, systems),
+                                         data=systems)
+        conn.close()
+        conn = None
+
+        # Apply map visibility restrictions. When nothing was filtered for this
+        # viewer the cached render is exactly right; otherwise render their view.
+        systems = page.data
+        visible = apply_data_restrictions(systems, session_data, for_map=True)
+        if len(visible) == len(systems) and all(a is b for a, b in zip(visible, systems)):
+            return page.response(request.headers.get('accept-encoding'), headers=_MAP_NO_CACHE_HEADERS)
+        return HTMLResponse(_render_region_page(mapfile, rx, ry, rz, visible),
+                            media_type='text/html', headers=_MAP_NO_CACHE_HEADERS)
     except Exception as e:
         logger.error('Failed to render region map: %s', e)
         return HTMLResponse(f'<h1>Region Map Error: {e}</h1>')
+    finally:
+        if conn:
+            conn.close()
+
+
+def _render_region_page(mapfile: Path, rx: int, ry: int, rz: int, systems: list) -> str:
+    region_json = json.dumps({
+        'region_x': rx,
+        'region_y': ry,
+        'region_z': rz,
+        'systems': systems
+    }, ensure_ascii=True)
+    return _REGION_MAP_TEMPLATE.render(mapfile, f"window.REGION_DATA = {region_json};")
 
 
 @app.get('/map/cartographer')
@@ -4037,8 +4129,6 @@ async def get_system_3d_view(system_id: str):
 
     conn = None
     try:
-        html = system_view_file.read_text(encoding='utf-8')
-
         # Load system data from database
         db_path = get_db_path()
         if not db_path.exists():
@@ -4057,46 +4147,66 @@ async def get_system_3d_view(system_id: str):
         system = dict(row)
         sys_id = system.get('id')
 
-        # Load planets with their moons
-        cursor.execute('SELECT * FROM planets WHERE system_id = ?', (sys_id,))
-        planets_rows = cursor.fetchall()
-        planets = []
+        # Planets, moons and candidate discoveries in three queries total
+        # (was one moons query per planet plus one discoveries query per
+        # planet and per moon), then matched in Python.
+        cursor.execute('SELECT * FROM planets WHERE system_id = ? ORDER BY id', (sys_id,))
+        planets = [dict(p) for p in cursor.fetchall()]
+        planet_ids = [p['id'] for p in planets]
 
-        for p_row in planets_rows:
-            planet = dict(p_row)
+        moons_by_planet = {}
+        if planet_ids:
+            marks = ','.join('?' * len(planet_ids))
+            cursor.execute(f'SELECT * FROM moons WHERE planet_id IN ({marks}) ORDER BY id', planet_ids)
+            for m in cursor.fetchall():
+                moons_by_planet.setdefault(m['planet_id'], []).append(dict(m))
+        moon_ids = [m['id'] for ms in moons_by_planet.values() for m in ms]
+
+        # Every discovery any of the per-body rules below could match.
+        body_ids = planet_ids + moon_ids
+        where = ['system_id = ?']
+        params = [sys_id]
+        if body_ids:
+            marks = ','.join('?' * len(body_ids))
+            where.append(f'planet_id IN ({marks})')
+            params.extend(body_ids)
+        if moon_ids:
+            marks = ','.join('?' * len(moon_ids))
+            where.append(f'moon_id IN ({marks})')
+            params.extend(moon_ids)
+        cursor.execute(f"SELECT * FROM discoveries WHERE {' OR '.join(where)} ORDER BY id", params)
+        candidates = [dict(d) for d in cursor.fetchall()]
+
+        def _same(a, b):
+            # SQL `=` semantics for ids that may be stored as int or text.
+            return a is not None and b is not None and str(a) == str(b)
+
+        for planet in planets:
             planet_id = planet.get('id')
+            planet['moons'] = moons_by_planet.get(planet_id, [])
 
-            # Load moons for this planet
-            cursor.execute('SELECT * FROM moons WHERE planet_id = ?', (planet_id,))
-            moons_rows = cursor.fetchall()
-            planet['moons'] = [dict(m) for m in moons_rows]
-
-            # Load discoveries for planet
-            # Also match by location_name since keeper bot may submit with planet name instead of id
+            # Discoveries for planet. Also match by location_name since keeper
+            # bot may submit with planet name instead of id.
             planet_name = planet.get('name', '')
-            cursor.execute('''
-                SELECT * FROM discoveries
-                WHERE planet_id = ?
-                   OR (system_id = ? AND location_name = ? AND planet_id IS NULL AND moon_id IS NULL)
-            ''', (planet_id, sys_id, planet_name))
-            disc_rows = cursor.fetchall()
-            planet['discoveries'] = [dict(d) for d in disc_rows]
-
-            # Load discoveries for moons
+            planet['discoveries'] = [
+                d for d in candidates
+                if _same(d.get('planet_id'), planet_id)
+                or (_same(d.get('system_id'), sys_id) and d.get('location_name') == planet_name
+                    and d.get('planet_id') is None and d.get('moon_id') is None)
+            ]
+
+            # Discoveries for moons: moon_id column, planet_id column (for
+            # legacy), and location_name (for keeper bot).
             for moon in planet['moons']:
                 moon_id = moon.get('id')
                 moon_name = moon.get('name', '')
-                # Check moon_id column, planet_id column (for legacy), and location_name (for keeper bot)
-                cursor.execute('''
-                    SELECT * FROM discoveries
-                    WHERE moon_id = ?
-                       OR planet_id = ?
-                       OR (system_id = ? AND location_name = ? AND moon_id IS NULL)
-                ''', (moon_id, moon_id, sys_id, moon_name))
-                moon_disc_rows = cursor.fetchall()
-                moon['discoveries'] = [dict(d) for d in moon_disc_rows]
-
-            planets.append(planet)
+                moon['discoveries'] = [
+                    d for d in candidates
+                    if _same(d.get('moon_id'), moon_id)
+                    or _same(d.get('planet_id'), moon_id)
+                    or (_same(d.get('system_id'), sys_id) and d.get('location_name') == moon_name
+                        and d.get('moon_id') is None)
+                ]
 
         system['planets'] = planets
 
@@ -4109,24 +4219,10 @@ async def get_system_3d_view(system_id: str):
         # so the 3D viewer has data immediately without a second API call.
         # Use ensure_ascii=True to convert unicode chars to \uXXXX escapes
         system_json = json.dumps(system, ensure_ascii=True)
-        # Use a lambda replacement to avoid regex escape sequence interpretation
-        # This prevents "bad escape \u" errors when data contains emojis or unicode
-        html = re.sub(
-            r"window\.SYSTEM_DATA\s*=\s*null;",
-            lambda m: f"window.SYSTEM_DATA = {system_json};",
-            html
-        )
+        html = _SYSTEM_VIEW_TEMPLATE.render(system_view_file, f"window.SYSTEM_DATA = {system_json};")
 
         # Add no-cache headers to ensure fresh data is always fetched
-        return HTMLResponse(
-            html,
-            media_type='text/html',
-            headers={
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-        )
+        return HTMLResponse(html, media_type='text/html', headers=_MAP_NO_CACHE_HEADERS)
 
     except HTTPException:
         raise
@@ -4280,6 +4376,25 @@ async def admin_health(session: Optional[str] = Cookie(None)):
         except (FileNotFoundError, OSError):
             pass
 
+    # Connection-pool counters: checkouts, cumulative/max wait for a free
+    # connection, open vs idle vs in-use, overflow opens on the shared pool.
+    health['db_pool'] = db_pool_stats()
+
+    # Serialized-payload caches (map snapshot, ...): size vs byte budget,
+    # hit ratio, evictions. See services/payload_cache.py.
+    try:
+        from services.payload_cache import payload_cache_stats
+        health['payload_caches'] = payload_cache_stats()
+    except Exception as e:
+        health['payload_caches_error'] = str(e)
+
+    # Cartographer snapshot states: full builds vs in-place patches per scope.
+    try:
+        from services.map_snapshot import snapshot_state_stats
+        health['map_snapshot'] = snapshot_state_stats()
+    except Exception as e:
+        health['map_snapshot_error'] = str(e)
+
     health['timestamp'] = datetime.now().isoformat()
     return health
 
@@ -4296,15 +4411,12 @@ async def admin_wal_checkpoint(session: Optional[str] = Cookie(None)):
     if not is_super_admin(session):
         raise HTTPException(status_code=403, detail='Super admin access required')
     try:
-        with get_db() as conn:
-            cur = conn.cursor()
-            cur.execute('PRAGMA wal_checkpoint(TRUNCATE)')
-            row = cur.fetchone()
-            return {
-                'busy': row[0] if row else None,
-                'log_pages': row[1] if row else None,
-                'checkpointed_pages': row[2] if row else None,
-            }
+        row = await run_write(_wal_checkpoint)
+        return {
+            'busy': row[0] if row else None,
+            'log_pages': row[1] if row else None,
+            'checkpointed_pages': row[2] if row else None,
+        }
     except Exception as e:
         logger.exception('WAL checkpoint failed')
         raise HTTPException(status_code=500, detail=f'WAL checkpoint failed: {e}')
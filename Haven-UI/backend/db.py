@@ -5,17 +5,24 @@ Provides connection helpers, context managers, and shared data-access utilities.
 All database access should go through get_db() or get_db_connection().
 """
 
+import asyncio
+import functools
 import json
 import logging
 import os
 import re
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from constants import BACKEND_DIR, HAVEN_UI_DIR, ACTIVITY_LOG_MAX, normalize_discovery_coords
+from resource_catalog import normalize_materials
 
 logger = logging.getLogger('control.room')
 
@@ -67,8 +74,14 @@ def norm_token(value):
     return ''.join(ch for ch in str(value).lower() if ch.isalnum())
 
 
-def get_db_connection():
-    """Create a properly configured database connection with timeout and WAL mode.
+def _open_connection(check_same_thread: bool = True, query_only: bool = False):
+    """Open a new SQLite connection with the standard PRAGMAs and UDFs applied.
+
+    Shared by the connection pools below (get_db_connection, run_read, run_write) so
+    every connection in the process is configured identically. Pooled
+    connections pass check_same_thread=False because they are handed between
+    the event loop and the DB worker threads (never used by two threads at
+    once — the pool guarantees exclusive checkout).
 
     PRAGMA notes:
     - synchronous=NORMAL trades one fsync per commit for ~2x write throughput.
@@ -79,9 +92,11 @@ def get_db_connection():
     - cache_size=-64000 sets a 64 MB page cache (negative means KiB).
     - mmap_size=256 MB enables memory-mapped I/O for read-heavy workloads.
     - temp_store=MEMORY keeps temp btrees off disk for the duration of a query.
+    - query_only=ON (reader pool only) makes an accidental write on a reader
+      connection fail loudly instead of silently bypassing the single writer.
     """
     db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    conn = sqlite3.connect(str(db_path), timeout=30.0, check_same_thread=check_same_thread)
     conn.execute('PRAGMA journal_mode=WAL')
     conn.execute('PRAGMA busy_timeout=30000')
     conn.execute('PRAGMA synchronous=NORMAL')
@@ -101,10 +116,280 @@ def get_db_connection():
         # deterministic functions (NotSupportedError). Plain registration works
         # everywhere — this factory must never throw.
         conn.create_function('norm_token', 1, norm_token)
+    if query_only:
+        conn.execute('PRAGMA query_only=ON')
     conn.row_factory = sqlite3.Row
     return conn
 
 
+# ============================================================================
+# Connection Pools
+# ============================================================================
+#
+# Opening a connection is not free: sqlite3.connect plus eight PRAGMAs plus
+# the norm_token UDF registration, and a single request used to pay that
+# several times over (the handler, add_activity_log, verify_api_key,
+# get_restrictions_batch ... each opened their own). Connections are now
+# opened once, configured once, and recycled through three pools:
+#
+#   - shared: backs get_db_connection()/get_db() for the synchronous route
+#     code, whose callers freely mix reads and writes. Never blocks — sync
+#     callers run on the event loop — so when every idle connection is out it
+#     opens an overflow connection and closes it again on release.
+#   - reader / writer: back the awaitable run_read()/run_write() path below.
+#
+# Inside an HTTP request (see begin_request_scope) every get_db_connection()
+# call from the same task/thread returns the SAME underlying connection, so a
+# request never holds more than one. Helpers that commit therefore commit the
+# caller's pending work too — the same thing a single connection threaded
+# through by hand would do, and it removes the old self-deadlock where a
+# helper's second connection waited busy_timeout on the caller's write lock.
+
+DB_POOL_SIZE = max(1, int(os.getenv('HAVEN_DB_POOL_SIZE', '8')))
+DB_READER_POOL_SIZE = max(1, int(os.getenv('HAVEN_DB_READERS', '4')))
+
+
+class _ConnectionPool:
+    """Pool of configured SQLite connections with checkout metrics.
+
+    Connections are opened lazily up to `size`. When all are checked out,
+    acquire() either blocks until one is released (reader/writer pools — only
+    ever called from DB worker threads; a size-1 pool is how the writer is
+    serialized) or, with overflow=True, opens a temporary extra connection
+    that is closed on release instead of being kept idle.
+    """
+
+    def __init__(self, name: str, size: int, query_only: bool = False, overflow: bool = False):
+        self.name = name
+        self.size = size
+        self.query_only = query_only
+        self.overflow = overflow
+        self._idle = []
+        self._open = 0
+        self._in_use = 0
+        # RLock: a leaked proxy's __del__ can run release() from inside a GC
+        # pass triggered while this same thread already holds the lock.
+        self._cond = threading.Condition(threading.RLock())
+        self.checkouts = 0
+        self.opened_total = 0
+        self.overflow_opens = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def acquire(self):
+        started = time.monotonic()
+        with self._cond:
+            while not self._idle and self._open >= self.size and not self.overflow:
+                self._cond.wait()
+            waited = time.monotonic() - started
+            self.checkouts += 1
+            self._in_use += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+            self.opened_total += 1
+            if self._open > self.size:
+                self.overflow_opens += 1
+        try:
+            return _open_connection(check_same_thread=False, query_only=self.query_only)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard: bool = False):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # ProgrammingError on a closed handle, or a rollback failure —
+            # either way the connection is not safe to hand out again.
+            discard = True
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._open > self.size:
+                self._open -= 1
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            else:
+                conn.row_factory = sqlite3.Row
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            for conn in self._idle:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._open -= len(self._idle)
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'checkouts': self.checkouts,
+                'opened_total': self.opened_total,
+                'overflow_opens': self.overflow_opens,
+                'wait_ms_total': round(self.wait_seconds_total * 1000, 1),
+                'wait_ms_max': round(self.wait_seconds_max * 1000, 1),
+            }
+
+
+_shared_pool = _ConnectionPool('shared', DB_POOL_SIZE, overflow=True)
+_reader_pool = _ConnectionPool('reader', DB_READER_POOL_SIZE, query_only=True)
+_writer_pool = _ConnectionPool('writer', 1)
+
+
+class _PooledConnection:
+    """Caller-facing handle on a pooled sqlite3 connection.
+
+    Behaves like the sqlite3.Connection it wraps (attribute access is
+    delegated), except that close() hands the connection back instead of
+    closing it, and `with get_db_connection() as conn:` releases on exit after
+    the usual commit/rollback. Each handle is closed independently; the
+    underlying connection goes back to the pool when its last handle closes.
+    """
+
+    __slots__ = ('_conn', '_release', '_closed')
+
+    def __init__(self, conn, release):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_release', release)
+        object.__setattr__(self, '_closed', False)
+
+    def __getattr__(self, name):
+        if self._closed:
+            raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def close(self):
+        if not self._closed:
+            object.__setattr__(self, '_closed', True)
+            self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for handles that are never closed (the pre-pool code
+        # leaned on GC to close them); without it the pool would leak.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _RequestScope:
+    """Per-request connection reuse, keyed by the asyncio task or thread that
+    asks. Background tasks and to_thread workers spawned by the request get
+    their own key, so they never interleave transactions with the handler."""
+
+    def __init__(self):
+        self.active = True
+        self.entries = {}  # key -> [raw_conn, open_handle_count]
+        self.lock = threading.RLock()  # RLock for the same GC reason as the pool
+
+    def handle(self):
+        key = _scope_key()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [_shared_pool.acquire(), 0]
+            entry[1] += 1
+        return _PooledConnection(entry[0], functools.partial(self._release, key))
+
+    def _release(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0 or self.active:
+                return
+            del self.entries[key]
+        _shared_pool.release(entry[0])
+
+    def finish(self):
+        with self.lock:
+            self.active = False
+            idle = [k for k, e in self.entries.items() if e[1] <= 0]
+            conns = [self.entries.pop(k)[0] for k in idle]
+        for conn in conns:
+            _shared_pool.release(conn)
+
+
+def _scope_key():
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return ('task', id(task)) if task is not None else ('thread', threading.get_ident())
+
+
+_request_scope: ContextVar = ContextVar('haven_db_request_scope', default=None)
+
+
+def begin_request_scope():
+    """Start request-scoped connection reuse. Returns the token to pass to
+    end_request_scope(). Called by the HTTP middleware in control_room_api."""
+    return _request_scope.set(_RequestScope())
+
+
+def end_request_scope(token):
+    """Release the request's pooled connections. Handles still open (e.g. a
+    background task that outlives the response) release on their own close."""
+    scope = _request_scope.get()
+    _request_scope.reset(token)
+    if scope is not None:
+        scope.finish()
+
+
+def get_db_connection():
+    """Return a properly configured (WAL, busy_timeout, norm_token, ...)
+    database connection from the shared pool.
+
+    Call close() (or use get_db()) when done — that returns it to the pool.
+    Within an HTTP request, repeated calls reuse one connection. Async
+    handlers that run a heavy query should prefer `await run_read(...)` /
+    `await run_write(...)` below so the query runs off the event loop.
+    """
+    scope = _request_scope.get()
+    if scope is not None and scope.active:
+        return scope.handle()
+    conn = _shared_pool.acquire()
+    return _PooledConnection(conn, functools.partial(_shared_pool.release, conn))
+
+
+def db_pool_stats() -> dict:
+    """Checkout / wait / open-connection counters for /api/admin/health."""
+    return {pool.name: pool.stats() for pool in (_shared_pool, _reader_pool, _writer_pool)}
+
+
 @contextmanager
 def get_db():
     """Context manager for database connections - ensures proper cleanup even on exceptions."""
@@ -117,6 +402,89 @@ def get_db():
             conn.close()
 
 
+# ============================================================================
+# Async Access Layer (pooled readers + one serialized writer)
+# ============================================================================
+#
+# Route handlers are `async def`, so a synchronous sqlite3 query inside one
+# runs ON the event loop: while a slow analytics aggregate is scanning, every
+# other request on the Pi (including cheap health probes) queues behind it.
+# `run_read` / `run_write` move the query onto a small dedicated thread pool:
+#
+#   - Readers: a bounded pool of long-lived query_only connections. WAL lets
+#     them read concurrently, so N slow readers no longer serialize.
+#   - Writer: exactly one connection. SQLite only admits one writer at a time
+#     anyway; funnelling writes through one connection turns busy_timeout
+#     spinning into an orderly queue.
+#
+# The callable receives the connection as its first argument and runs
+# entirely in a worker thread — it must not touch the event loop. run_write
+# commits on success and rolls back on exception; run_read always rolls back
+# so a reader never pins an old WAL snapshot between checkouts.
+
+_db_executor = None
+_db_executor_lock = threading.Lock()
+
+
+def _get_db_executor():
+    """Lazily create the DB worker pool (readers + the writer, so a queued
+    write never waits for a free thread behind a wall of reads)."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=DB_READER_POOL_SIZE + 1, thread_name_prefix='haven-db')
+        return _db_executor
+
+
+def _run_pooled(pool, commit, fn, args, kwargs):
+    conn = pool.acquire()
+    try:
+        result = fn(conn, *args, **kwargs)
+        if commit:
+            conn.commit()
+        return result
+    finally:
+        # release() rolls back anything uncommitted and discards a handle the
+        # callable closed, so a failed call never poisons the pool.
+        pool.release(conn)
+
+
+async def run_read(fn, *args, **kwargs):
+    """Run `fn(conn, *args, **kwargs)` on a pooled read-only connection in a
+    worker thread and return its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_db_executor(),
+        functools.partial(_run_pooled, _reader_pool, False, fn, args, kwargs))
+
+
+async def run_write(fn, *args, **kwargs):
+    """Run `fn(conn, *args, **kwargs)` on the single writer connection in a
+    worker thread. Commits on success, rolls back on exception."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_db_executor(),
+        functools.partial(_run_pooled, _writer_pool, True, fn, args, kwargs))
+
+
+def close_db_pools():
+    """Close idle pooled connections and stop the DB worker threads.
+
+    Called from app shutdown. Safe to call repeatedly; the pools and executor
+    are re-created lazily on the next run_read/run_write (the test harness
+    starts and stops the app several times per process).
+    """
+    global _db_executor
+    with _db_executor_lock:
+        executor, _db_executor = _db_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    _reader_pool.close_all()
+    _writer_pool.close_all()
+    _shared_pool.close_all()
+
+
 def _row_to_dict(row):
     """Convert a sqlite3.Row to a plain dictionary."""
     if row is None:
@@ -593,6 +961,90 @@ def archived_civ_filter(alias: str = 's') -> str:
     return ARCHIVED_CIV_FILTER_SQL.format(alias=alias)
 
 
+# ============================================================================
+# Stored Facet Tokens
+# ============================================================================
+
+# Categorical filter columns with a stored norm_token() copy in `<col>_norm`
+# (migration 1.104.0), so the advanced filters can seek an index instead of
+# calling the UDF on every row. Write paths call sync_facet_tokens(); an
+# UPDATE trigger NULLs a stale copy when its source column changes on a path
+# that doesn't, and the filters fall back to norm_token() for NULL rows only.
+SYSTEM_FACET_COLUMNS = (
+    'star_type', 'economy_type', 'economy_level', 'conflict_level',
+    'dominant_lifeform', 'stellar_classification',
+)
+PLANET_FACET_COLUMNS = ('biome', 'weather', 'sentinel')
+
+
+def sync_facet_tokens(cursor, system_id) -> None:
+    """Recompute the stored facet tokens of one system and its planets.
+    Call after any INSERT or UPDATE that can change the facet columns."""
+    cursor.execute(
+        f"SELECT {', '.join(SYSTEM_FACET_COLUMNS)} FROM systems WHERE id = ?", (system_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return
+    cursor.execute(
+        f"UPDATE systems SET {', '.join(f'{c}_norm = ?' for c in SYSTEM_FACET_COLUMNS)} WHERE id = ?",
+        [norm_token(v) for v in row] + [system_id]
+    )
+    cursor.execute(
+        f"SELECT id, {', '.join(PLANET_FACET_COLUMNS)} FROM planets WHERE system_id = ?", (system_id,)
+    )
+    cursor.executemany(
+        f"UPDATE planets SET {', '.join(f'{c}_norm = ?' for c in PLANET_FACET_COLUMNS)} WHERE id = ?",
+        [[norm_token(v) for v in r[1:]] + [r[0]] for r in cursor.fetchall()]
+    )
+
+
+def resource_tokens(*cells) -> set:
+    """Lower-cased resource tokens in one or more `materials`-style cells,
+    split and canonicalized by resource_catalog.normalize_materials."""
+    tokens = set()
+    for cell in cells:
+        for part in normalize_materials(cell).split(','):
+            tok = part.strip().lower()
+            if tok:
+                tokens.add(tok)
+    return tokens
+
+
+def sync_body_resources(cursor, system_id) -> None:
+    """Rebuild the body_resources rows (migration 1.105.0) of one system from
+    its planets' and moons' resource columns. Call after writing a system's
+    bodies; deleting a planet, moon or system clears its rows by trigger."""
+    cursor.execute("DELETE FROM body_resources WHERE system_id = ?", (system_id,))
+    rows = []
+    cursor.execute(
+        "SELECT id, materials, common_resource, uncommon_resource, rare_resource"
+        " FROM planets WHERE system_id = ?", (system_id,)
+    )
+    for r in cursor.fetchall():
+        rows.extend((system_id, 'planet', r[0], tok) for tok in resource_tokens(*r[1:]))
+    cursor.execute(
+        "SELECT m.id, m.materials FROM moons m JOIN planets p ON m.planet_id = p.id"
+        " WHERE p.system_id = ?", (system_id,)
+    )
+    for r in cursor.fetchall():
+        rows.extend((system_id, 'moon', r[0], tok) for tok in resource_tokens(r[1]))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO body_resources (system_id, body_kind, body_id, resource_token)"
+        " VALUES (?, ?, ?, ?)", rows
+    )
+
+
+def _facet_match(alias: str, column: str, tokens: list, params: list) -> str:
+    """SQL matching `alias.column` against already-normalized tokens through its
+    stored `_norm` copy, with the norm_token() fallback for unsynced rows."""
+    marks = ','.join(['?'] * len(tokens))
+    params.extend(tokens)
+    params.extend(tokens)
+    return (f"({alias}.{column}_norm IN ({marks})"
+            f" OR ({alias}.{column}_norm IS NULL AND norm_token({alias}.{column}) IN ({marks})))")
+
+
 # ============================================================================
 # Advanced Filter SQL Builder (shared by systems, regions, galaxies endpoints)
 # ============================================================================
@@ -618,31 +1070,27 @@ def _build_advanced_filter_clauses(params_dict, where_clauses, params):
             return None
         return [p.strip() for p in s.split(',') if p.strip()]
 
-    # Categorical fields are matched through norm_token() (case / spacing /
+    # Categorical fields are matched on norm_token() (case / spacing /
     # punctuation-insensitive) so a dropdown option that the filter-options dedup
     # collapsed ("Power Generation") still matches every stored variant
-    # ("PowerGeneration", "power-generation", ...). Same normalizer on both sides.
+    # ("PowerGeneration", "power-generation", ...). Same normalizer on both sides;
+    # the stored `_norm` columns make the match an index seek (_facet_match).
     star_types = _split_csv(params_dict.get('star_type'))
     if star_types:
-        where_clauses.append(f"norm_token(s.star_type) IN ({','.join(['?'] * len(star_types))})")
-        params.extend(norm_token(v) for v in star_types)
+        where_clauses.append(_facet_match('s', 'star_type', [norm_token(v) for v in star_types], params))
     if params_dict.get('economy_type'):
-        where_clauses.append("norm_token(s.economy_type) = ?")
-        params.append(norm_token(params_dict['economy_type']))
+        where_clauses.append(_facet_match('s', 'economy_type', [norm_token(params_dict['economy_type'])], params))
     economy_levels = _split_csv(params_dict.get('economy_level'))
     if economy_levels:
-        where_clauses.append(f"norm_token(s.economy_level) IN ({','.join(['?'] * len(economy_levels))})")
-        params.extend(norm_token(v) for v in economy_levels)
+        where_clauses.append(_facet_match('s', 'economy_level', [norm_token(v) for v in economy_levels], params))
     conflict_levels = _split_csv(params_dict.get('conflict_level'))
     if conflict_levels:
-        where_clauses.append(f"norm_token(s.conflict_level) IN ({','.join(['?'] * len(conflict_levels))})")
-        params.extend(norm_token(v) for v in conflict_levels)
+        where_clauses.append(_facet_match('s', 'conflict_level', [norm_token(v) for v in conflict_levels], params))
     if params_dict.get('dominant_lifeform'):
-        where_clauses.append("norm_token(s.dominant_lifeform) = ?")
-        params.append(norm_token(params_dict['dominant_lifeform']))
+        where_clauses.append(_facet_match('s', 'dominant_lifeform', [norm_token(params_dict['dominant_lifeform'])], params))
     if params_dict.get('stellar_classification'):
-        where_clauses.append("norm_token(s.stellar_classification) = ?")
-        params.append(norm_token(params_dict['stellar_classification']))
+        where_clauses.append(_facet_match(
+            's', 'stellar_classification', [norm_token(params_dict['stellar_classification'])], params))
     is_complete_val = params_dict.get('is_complete')
     if is_complete_val is not None:
         grade_thresholds = {'S': (85, 100), 'A': (65, 84), 'B': (40, 64), 'C': (0, 39)}
@@ -663,39 +1111,24 @@ def _build_advanced_filter_clauses(params_dict, where_clauses, params):
             where_clauses.append("s.is_complete >= 65")
         else:
             where_clauses.append("s.is_complete < 65")
-    if params_dict.get('biome'):
-        where_clauses.append("EXISTS (SELECT 1 FROM planets p WHERE p.system_id = s.id AND norm_token(p.biome) = ?)")
-        params.append(norm_token(params_dict['biome']))
-    if params_dict.get('weather'):
-        where_clauses.append("EXISTS (SELECT 1 FROM planets p WHERE p.system_id = s.id AND norm_token(p.weather) = ?)")
-        params.append(norm_token(params_dict['weather']))
-    if params_dict.get('sentinel_level'):
-        where_clauses.append("EXISTS (SELECT 1 FROM planets p WHERE p.system_id = s.id AND norm_token(p.sentinel) = ?)")
-        params.append(norm_token(params_dict['sentinel_level']))
+    # Planet facets: collect matching system ids from the (token, system_id)
+    # index rather than probing every system's planets.
+    for param, column in (('biome', 'biome'), ('weather', 'weather'), ('sentinel_level', 'sentinel')):
+        if params_dict.get(param):
+            match = _facet_match('p', column, [norm_token(params_dict[param])], params)
+            where_clauses.append(f"s.id IN (SELECT p.system_id FROM planets p WHERE {match})")
     resources = _split_csv(params_dict.get('resource'))
     if resources:
-        # The real resource data lives in planets.materials / moons.materials
-        # (", "-joined lists, normalized to canonical names by migration 1.93.0);
-        # the dedicated common/uncommon/rare columns are ~empty and don't exist on
-        # moons, so materials is the real source there. Match each resource as a
-        # whole comma-bounded token (LIKE is case-insensitive in SQLite),
-        # normalizing the two stray separators ("." and " and ") inline so
-        # pre-normalization rows still match. Multi-select is OR-logic ("any of");
-        # a system matches if ANY planet OR moon carries the resource.
-        def _mats_norm(col):
-            return f"', ' || REPLACE(REPLACE(COALESCE({col}, ''), '. ', ', '), ' and ', ', ') || ', '"
-        res_clauses = []
-        for res in resources:
-            res_clauses.append(
-                "(EXISTS (SELECT 1 FROM planets p WHERE p.system_id = s.id AND ("
-                f"{_mats_norm('p.materials')} LIKE '%, ' || ? || ', %'"
-                " OR p.common_resource = ? OR p.uncommon_resource = ? OR p.rare_resource = ?))"
-                " OR EXISTS (SELECT 1 FROM planets p2 JOIN moons m ON m.planet_id = p2.id"
-                " WHERE p2.system_id = s.id AND ("
-                f"{_mats_norm('m.materials')} LIKE '%, ' || ? || ', %')))"
-            )
-            params.extend([res, res, res, res, res])
-        where_clauses.append("(" + " OR ".join(res_clauses) + ")")
+        # Resources are matched through the body_resources inverted index
+        # (migration 1.105.0): one row per (planet or moon, resource) parsed
+        # from materials and the planet common/uncommon/rare columns, tokens
+        # lower-cased. Multi-select is OR-logic ("any of"); a system matches if
+        # ANY planet OR moon carries the resource.
+        marks = ','.join(['?'] * len(resources))
+        where_clauses.append(
+            f"s.id IN (SELECT br.system_id FROM body_resources br WHERE br.resource_token IN ({marks}))"
+        )
+        params.extend(r.lower() for r in resources)
     if params_dict.get('has_moons') is not None:
         if params_dict['has_moons']:
             where_clauses.append("EXISTS (SELECT 1 FROM planets p JOIN moons m ON m.planet_id = p.id WHERE p.system_id = s.id)")
@@ -7006,23 +7006,15 @@ def migration_1_90_0(conn):
     prev_factory = conn.row_factory
     conn.row_factory = sqlite3.Row
     try:
-        from services.completeness import update_completeness_score
-        id_cursor = conn.cursor()
-        id_cursor.execute("SELECT id FROM systems")
-        system_ids = [row[0] for row in id_cursor.fetchall()]
-        score_cursor = conn.cursor()
+        from services.completeness import rescore_all_systems
         logger.info(
-            f"Migration 1.90.0: re-scoring {len(system_ids)} systems "
-            f"(description dropped from System Extra) + running S+ checklist..."
+            "Migration 1.90.0: re-scoring systems "
+            "(description dropped from System Extra) + running S+ checklist..."
         )
-        splus = 0
-        for sys_id in system_ids:
-            result = update_completeness_score(score_cursor, sys_id)
-            if result.get('is_fully_charted'):
-                splus += 1
+        result = rescore_all_systems(conn, label="Migration 1.90.0", commit=False)
         logger.info(
-            f"Migration 1.90.0: re-scored {len(system_ids)} systems; "
-            f"{splus} qualify as S+ (fully charted)"
+            f"Migration 1.90.0: re-scored {result['systems']} systems; "
+            f"{result['fully_charted']} qualify as S+ (fully charted)"
         )
     finally:
         conn.row_factory = prev_factory
@@ -7063,20 +7055,12 @@ def migration_1_91_0(conn):
     prev_factory = conn.row_factory
     conn.row_factory = sqlite3.Row
     try:
-        from services.completeness import update_completeness_score
-        id_cursor = conn.cursor()
-        id_cursor.execute("SELECT id FROM systems")
-        system_ids = [row[0] for row in id_cursor.fetchall()]
-        score_cursor = conn.cursor()
-        logger.info(f"Migration 1.91.0: re-scoring {len(system_ids)} systems to repair S+ drift...")
-        splus = 0
-        for sys_id in system_ids:
-            result = update_completeness_score(score_cursor, sys_id)
-            if result.get('is_fully_charted'):
-                splus += 1
+        from services.completeness import rescore_all_systems
+        logger.info("Migration 1.91.0: re-scoring systems to repair S+ drift...")
+        result = rescore_all_systems(conn, label="Migration 1.91.0", commit=False)
         logger.info(
-            f"Migration 1.91.0: re-scored {len(system_ids)} systems; "
-            f"{splus} now qualify as S+ (fully charted)"
+            f"Migration 1.91.0: re-scored {result['systems']} systems; "
+            f"{result['fully_charted']} now qualify as S+ (fully charted)"
         )
     finally:
         conn.row_factory = prev_factory
@@ -7613,18 +7597,11 @@ def migration_1_96_0(conn):
     # Re-score affected systems (stripping a material may change life-coverage).
     if affected_system_ids:
         try:
-            from services.completeness import update_completeness_score
+            from services.completeness import rescore_systems
         except ImportError:
-            from completeness import update_completeness_score  # pragma: no cover
-        score_cur = conn.cursor()
-        rescored = 0
-        for sys_id in affected_system_ids:
-            try:
-                update_completeness_score(score_cur, sys_id)
-                rescored += 1
-            except Exception as e:  # noqa: BLE001 — one bad row shouldn't abort the migration
-                logger.warning(f"Migration 1.96.0: re-score failed for {sys_id}: {e}")
-        logger.info(f"Migration 1.96.0: re-scored {rescored} affected system(s)")
+            from completeness import rescore_systems  # pragma: no cover
+        results, _ = rescore_systems(conn.cursor(), list(affected_system_ids), label="Migration 1.96.0")
+        logger.info(f"Migration 1.96.0: re-scored {len(results)} affected system(s)")
 
 
 @register_migration("1.97.0", "Base lat/long on planets+moons (+moon base_location); re-score for the reworked X checklist (one-body wonder, base via coords/discovery)")
@@ -7670,23 +7647,12 @@ def migration_1_97_0(conn):
     prev_factory = conn.row_factory
     conn.row_factory = sqlite3.Row
     try:
-        from services.completeness import update_completeness_score
-        id_cursor = conn.cursor()
-        id_cursor.execute("SELECT id FROM systems")
-        system_ids = [row[0] for row in id_cursor.fetchall()]
-        score_cursor = conn.cursor()
-        logger.info(f"Migration 1.97.0: re-scoring {len(system_ids)} systems for the reworked X checklist...")
-        x_count = 0
-        for sys_id in system_ids:
-            try:
-                result = update_completeness_score(score_cursor, sys_id)
-                if result.get('is_fully_charted'):
-                    x_count += 1
-            except Exception as e:  # noqa: BLE001 — one bad row shouldn't abort the migration
-                logger.warning(f"Migration 1.97.0: re-score failed for {sys_id}: {e}")
+        from services.completeness import rescore_all_systems
+        logger.info("Migration 1.97.0: re-scoring systems for the reworked X checklist...")
+        result = rescore_all_systems(conn, label="Migration 1.97.0", commit=False)
         logger.info(
-            f"Migration 1.97.0: re-scored {len(system_ids)} systems; "
-            f"{x_count} now qualify as X (fully charted)"
+            f"Migration 1.97.0: re-scored {result['systems']} systems; "
+            f"{result['fully_charted']} now qualify as X (fully charted)"
         )
     finally:
         conn.row_factory = prev_factory
@@ -7712,18 +7678,10 @@ def migration_1_98_0(conn):
     prev_factory = conn.row_factory
     conn.row_factory = sqlite3.Row
     try:
-        from services.completeness import update_completeness_score
-        id_cursor = conn.cursor()
-        id_cursor.execute("SELECT id FROM systems")
-        system_ids = [row[0] for row in id_cursor.fetchall()]
-        score_cursor = conn.cursor()
-        logger.info(f"Migration 1.98.0: re-scoring {len(system_ids)} systems for moon-weighted planet grading...")
-        for sys_id in system_ids:
-            try:
-                update_completeness_score(score_cursor, sys_id)
-            except Exception as e:  # noqa: BLE001 — one bad row shouldn't abort the migration
-                logger.warning(f"Migration 1.98.0: re-score failed for {sys_id}: {e}")
-        logger.info(f"Migration 1.98.0: re-scored {len(system_ids)} systems (moon-weighted)")
+        from services.completeness import rescore_all_systems
+        logger.info("Migration 1.98.0: re-scoring systems for moon-weighted planet grading...")
+        result = rescore_all_systems(conn, label="Migration 1.98.0", commit=False)
+        logger.info(f"Migration 1.98.0: re-scored {result['systems']} systems (moon-weighted)")
     finally:
         conn.row_factory = prev_factory
 
@@ -7744,17 +7702,1215 @@ def migration_1_99_0(conn):
     prev_factory = conn.row_factory
     conn.row_factory = sqlite3.Row
     try:
-        from services.completeness import update_completeness_score
-        id_cursor = conn.cursor()
-        id_cursor.execute("SELECT id FROM systems")
-        system_ids = [row[0] for row in id_cursor.fetchall()]
-        score_cursor = conn.cursor()
-        logger.info(f"Migration 1.99.0: re-scoring {len(system_ids)} systems for conflict_level 'None' credit...")
-        for sys_id in system_ids:
-            try:
-                update_completeness_score(score_cursor, sys_id)
-            except Exception as e:  # noqa: BLE001 — one bad row shouldn't abort the migration
-                logger.warning(f"Migration 1.99.0: re-score failed for {sys_id}: {e}")
-        logger.info(f"Migration 1.99.0: re-scored {len(system_ids)} systems (conflict 'None' credit)")
+        from services.completeness import rescore_all_systems
+        logger.info("Migration 1.99.0: re-scoring systems for conflict_level 'None' credit...")
+        result = rescore_all_systems(conn, label="Migration 1.99.0", commit=False)
+        logger.info(f"Migration 1.99.0: re-scored {result['systems']} systems (conflict 'None' credit)")
     finally:
         conn.row_factory = prev_factory
+
+
+@register_migration("1.100.0", "map_change_log + triggers for incremental Cartographer snapshot updates")
+def migration_1_100_0(conn):
+    """
+    /api/map/snapshot used to rebuild its whole typed-array bundle whenever any
+    system changed. services/map_snapshot.py now patches the decoded arrays in
+    place instead, and needs to know which systems changed since it last looked.
+
+    `map_change_log` is an append-only journal of touched system ids, filled by
+    triggers so every write path (approvals, edits, extractor uploads, admin
+    tools) is captured without each one calling into the map code — the same
+    reasoning as the 1.73.0 glyph_code_suffix triggers. Triggers only fire on
+    the columns the snapshot actually reads, so completeness re-scores and
+    similar bookkeeping UPDATEs don't churn the log.
+
+    Civilization and region-name changes can't be attributed to individual
+    systems (archiving a civ hides all of its systems), so they log the '*'
+    marker, which makes the next read rebuild.
+
+    `system_id` is declared without a type: systems.id holds both legacy
+    integers and UUID strings, and no column affinity means each value is
+    stored exactly as systems.id had it, so lookups match by type.
+
+    The log trims itself: every 1000th insert drops entries more than 50000
+    seqs old. A snapshot state older than the trimmed window just rebuilds.
+
+    NOTE: a future migration that DROP + recreates systems/planets/moons/
+    space_stations (like 1.54.0) drops these triggers with the table and must
+    re-create them.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS map_change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            system_id NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    triggers = {
+        'trg_map_systems_insert': """
+            AFTER INSERT ON systems FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.id);
+            END
+        """,
+        'trg_map_systems_update': """
+            AFTER UPDATE OF name, description, x, y, z, star_type, discord_tag,
+                            glyph_code, region_x, region_y, region_z, reality, galaxy
+            ON systems FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.id);
+            END
+        """,
+        'trg_map_systems_delete': """
+            AFTER DELETE ON systems FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (OLD.id);
+            END
+        """,
+        'trg_map_planets_insert': """
+            AFTER INSERT ON planets FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.system_id);
+            END
+        """,
+        'trg_map_planets_update': """
+            AFTER UPDATE OF system_id, name, biome, planet_size, sentinel_level,
+                            planet_index, is_moon, has_rings, is_gas_giant, water_world,
+                            is_bubble, is_floating_islands, is_dissonant, is_infested,
+                            extreme_weather
+            ON planets FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.system_id);
+                INSERT INTO map_change_log (system_id)
+                    SELECT OLD.system_id WHERE OLD.system_id IS NOT NEW.system_id;
+            END
+        """,
+        'trg_map_planets_delete': """
+            AFTER DELETE ON planets FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (OLD.system_id);
+            END
+        """,
+        'trg_map_moons_insert': """
+            AFTER INSERT ON moons FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id)
+                    SELECT system_id FROM planets WHERE id = NEW.planet_id;
+            END
+        """,
+        'trg_map_moons_update': """
+            AFTER UPDATE OF planet_id ON moons FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id)
+                    SELECT system_id FROM planets WHERE id IN (OLD.planet_id, NEW.planet_id);
+            END
+        """,
+        'trg_map_moons_delete': """
+            AFTER DELETE ON moons FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id)
+                    SELECT system_id FROM planets WHERE id = OLD.planet_id;
+            END
+        """,
+        'trg_map_stations_insert': """
+            AFTER INSERT ON space_stations FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.system_id);
+            END
+        """,
+        'trg_map_stations_update': """
+            AFTER UPDATE OF system_id ON space_stations FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (NEW.system_id);
+                INSERT INTO map_change_log (system_id)
+                    SELECT OLD.system_id WHERE OLD.system_id IS NOT NEW.system_id;
+            END
+        """,
+        'trg_map_stations_delete': """
+            AFTER DELETE ON space_stations FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES (OLD.system_id);
+            END
+        """,
+        'trg_map_civilizations_change': """
+            AFTER UPDATE OF tag, is_active ON civilizations FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES ('*');
+            END
+        """,
+        'trg_map_civilizations_delete': """
+            AFTER DELETE ON civilizations FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES ('*');
+            END
+        """,
+        'trg_map_regions_insert': """
+            AFTER INSERT ON regions FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES ('*');
+            END
+        """,
+        'trg_map_regions_update': """
+            AFTER UPDATE OF custom_name, region_x, region_y, region_z ON regions FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES ('*');
+            END
+        """,
+        'trg_map_regions_delete': """
+            AFTER DELETE ON regions FOR EACH ROW
+            BEGIN
+                INSERT INTO map_change_log (system_id) VALUES ('*');
+            END
+        """,
+        'trg_map_change_log_trim': """
+            AFTER INSERT ON map_change_log FOR EACH ROW
+            WHEN NEW.seq % 1000 = 0
+            BEGIN
+                DELETE FROM map_change_log WHERE seq <= NEW.seq - 50000;
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    conn.commit()
+    logger.info(f"map_change_log installed with {len(triggers)} triggers")
+
+
+def _rollup_name_key_sql(raw: str) -> str:
+    """SQL that folds a contributor name the way routes/analytics.py groups
+    discoverers: strip '#', trim, drop a trailing 4-digit discriminator, lower."""
+    trimmed = f"TRIM(REPLACE({raw}, '#', ''))"
+    return f"""LOWER(TRIM(
+        CASE
+            WHEN LENGTH({trimmed}) > 4
+                AND SUBSTR({trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
+                AND (LENGTH({trimmed}) = 4
+                    OR SUBSTR({trimmed}, -5, 1) NOT GLOB '[0-9]')
+            THEN SUBSTR({trimmed}, 1, LENGTH({trimmed}) - 4)
+            ELSE {trimmed}
+        END
+    ))"""
+
+
+@register_migration("1.101.0", "Daily analytics rollup tables for submissions and discoveries, trigger-maintained")
+def migration_1_101_0(conn):
+    """
+    The analytics dashboards and public community stats re-aggregated the whole
+    of pending_systems / discoveries on every request. Two rollup tables hold
+    the same counts pre-grouped by day x community x contributor x source
+    (submissions) and day x community x contributor x type (discoveries):
+
+      analytics_submission_daily — total/approved/rejected/pending per
+          (day, discord_tag, contributor, source). contributor is the
+          indexed pending_systems.username_normalized (1.72.0); source is
+          COALESCE(source, 'manual') so legacy NULL rows count as manual.
+      analytics_discovery_daily — total per (day, discord_tag, contributor,
+          type_slug). contributor is the discoverer folded with the same SQL
+          rule the discovery leaderboard groups by.
+
+    NULL discord_tag / username_normalized are stored as '' so the composite
+    primary keys stay unique. display_name, first_at and last_at are
+    high-water marks (MAX name, MIN/MAX timestamp) — they only move outward
+    on writes; services.analytics_rollups.rebuild_analytics_rollups()
+    recomputes them exactly.
+
+    Like map_change_log (1.100.0) the tables are kept current by triggers so
+    every write path — submit, approve, reject, extractor upload, edits and
+    deletes — is covered without each one calling into analytics. Status
+    flips move a row between the approved/rejected/pending columns of the
+    same bucket; key changes (retag, rename) move it between buckets. Buckets
+    that drop to zero are deleted.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_submission_daily (
+            day TEXT NOT NULL,
+            discord_tag TEXT NOT NULL DEFAULT '',
+            contributor TEXT NOT NULL DEFAULT '',
+            source TEXT NOT NULL DEFAULT 'manual',
+            total INTEGER NOT NULL DEFAULT 0,
+            approved INTEGER NOT NULL DEFAULT 0,
+            rejected INTEGER NOT NULL DEFAULT 0,
+            pending INTEGER NOT NULL DEFAULT 0,
+            display_name TEXT,
+            first_at TEXT,
+            last_at TEXT,
+            PRIMARY KEY (day, discord_tag, contributor, source)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_submission_daily_tag ON analytics_submission_daily(discord_tag, day)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_submission_daily_contributor ON analytics_submission_daily(contributor)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics_discovery_daily (
+            day TEXT NOT NULL,
+            discord_tag TEXT NOT NULL DEFAULT '',
+            contributor TEXT NOT NULL DEFAULT '',
+            type_slug TEXT NOT NULL DEFAULT 'other',
+            total INTEGER NOT NULL DEFAULT 0,
+            display_name TEXT,
+            first_at TEXT,
+            last_at TEXT,
+            PRIMARY KEY (day, discord_tag, contributor, type_slug)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_discovery_daily_tag ON analytics_discovery_daily(discord_tag, day)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_discovery_daily_contributor ON analytics_discovery_daily(contributor)")
+
+    # Per-row key/value expressions, written against a row alias (NEW/OLD or
+    # a bare table reference for the backfill).
+    def sub_cols(r):
+        raw = f"""COALESCE(
+            NULLIF(NULLIF({r}submitted_by, 'Anonymous'), 'anonymous'),
+            {r}personal_discord_username,
+            CASE WHEN json_valid({r}system_data) THEN json_extract({r}system_data, '$.discovered_by') END,
+            'Unknown'
+        )"""
+        return {
+            'day': f"COALESCE(SUBSTR({r}submission_date, 1, 10), '')",
+            'discord_tag': f"COALESCE({r}discord_tag, '')",
+            'contributor': f"COALESCE({r}username_normalized, '')",
+            'source': f"COALESCE({r}source, 'manual')",
+            'approved': f"CASE {r}status WHEN 'approved' THEN 1 ELSE 0 END",
+            'rejected': f"CASE {r}status WHEN 'rejected' THEN 1 ELSE 0 END",
+            'pending': f"CASE {r}status WHEN 'pending' THEN 1 ELSE 0 END",
+            'display_name': raw,
+            'at': f"{r}submission_date",
+        }
+
+    def disc_cols(r):
+        raw = f"COALESCE(NULLIF(NULLIF({r}discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
+        return {
+            'day': f"COALESCE(SUBSTR({r}submission_timestamp, 1, 10), '')",
+            'discord_tag': f"COALESCE({r}discord_tag, '')",
+            'contributor': _rollup_name_key_sql(raw),
+            'type_slug': f"COALESCE({r}type_slug, 'other')",
+            'display_name': f"{r}discovered_by",
+            'at': f"{r}submission_timestamp",
+        }
+
+    # High-water merge for the descriptive columns: NULL-safe MIN/MAX.
+    merge = """
+                display_name = MAX(COALESCE(display_name, excluded.display_name), COALESCE(excluded.display_name, display_name)),
+                first_at = MIN(COALESCE(first_at, excluded.first_at), COALESCE(excluded.first_at, first_at)),
+                last_at = MAX(COALESCE(last_at, excluded.last_at), COALESCE(excluded.last_at, last_at))"""
+
+    def sub_add(r):
+        c = sub_cols(r)
+        return f"""
+            INSERT INTO analytics_submission_daily
+                (day, discord_tag, contributor, source, total, approved, rejected, pending,
+                 display_name, first_at, last_at)
+            VALUES ({c['day']}, {c['discord_tag']}, {c['contributor']}, {c['source']}, 1,
+                    {c['approved']}, {c['rejected']}, {c['pending']},
+                    {c['display_name']}, {c['at']}, {c['at']})
+            ON CONFLICT (day, discord_tag, contributor, source) DO UPDATE SET
+                total = total + 1,
+                approved = approved + excluded.approved,
+                rejected = rejected + excluded.rejected,
+                pending = pending + excluded.pending,{merge};"""
+
+    def sub_remove(r):
+        c = sub_cols(r)
+        key = (f"day = {c['day']} AND discord_tag = {c['discord_tag']}"
+               f" AND contributor = {c['contributor']} AND source = {c['source']}")
+        return f"""
+            UPDATE analytics_submission_daily
+            SET total = total - 1,
+                approved = approved - ({c['approved']}),
+                rejected = rejected - ({c['rejected']}),
+                pending = pending - ({c['pending']})
+            WHERE {key};
+            DELETE FROM analytics_submission_daily WHERE {key} AND total <= 0;"""
+
+    def disc_add(r):
+        c = disc_cols(r)
+        return f"""
+            INSERT INTO analytics_discovery_daily
+                (day, discord_tag, contributor, type_slug, total, display_name, first_at, last_at)
+            VALUES ({c['day']}, {c['discord_tag']}, {c['contributor']}, {c['type_slug']}, 1,
+                    {c['display_name']}, {c['at']}, {c['at']})
+            ON CONFLICT (day, discord_tag, contributor, type_slug) DO UPDATE SET
+                total = total + 1,{merge};"""
+
+    def disc_remove(r):
+        c = disc_cols(r)
+        key = (f"day = {c['day']} AND discord_tag = {c['discord_tag']}"
+               f" AND contributor = {c['contributor']} AND type_slug = {c['type_slug']}")
+        return f"""
+            UPDATE analytics_discovery_daily SET total = total - 1 WHERE {key};
+            DELETE FROM analytics_discovery_daily WHERE {key} AND total <= 0;"""
+
+    sub_keys = ('status', 'discord_tag', 'username_normalized', 'source', 'submission_date')
+    disc_keys = ('discord_tag', 'discovered_by', 'type_slug', 'submission_timestamp')
+    triggers = {
+        'trg_rollup_pending_systems_insert': f"""
+            AFTER INSERT ON pending_systems FOR EACH ROW
+            BEGIN {sub_add('NEW.')}
+            END
+        """,
+        'trg_rollup_pending_systems_update': f"""
+            AFTER UPDATE OF {', '.join(sub_keys)} ON pending_systems FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{k} IS NOT NEW.{k}' for k in sub_keys)}
+            BEGIN {sub_remove('OLD.')}{sub_add('NEW.')}
+            END
+        """,
+        'trg_rollup_pending_systems_delete': f"""
+            AFTER DELETE ON pending_systems FOR EACH ROW
+            BEGIN {sub_remove('OLD.')}
+            END
+        """,
+        'trg_rollup_discoveries_insert': f"""
+            AFTER INSERT ON discoveries FOR EACH ROW
+            BEGIN {disc_add('NEW.')}
+            END
+        """,
+        'trg_rollup_discoveries_update': f"""
+            AFTER UPDATE OF {', '.join(disc_keys)} ON discoveries FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{k} IS NOT NEW.{k}' for k in disc_keys)}
+            BEGIN {disc_remove('OLD.')}{disc_add('NEW.')}
+            END
+        """,
+        'trg_rollup_discoveries_delete': f"""
+            AFTER DELETE ON discoveries FOR EACH ROW
+            BEGIN {disc_remove('OLD.')}
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    # Backfill from history.
+    c = sub_cols('')
+    cursor.execute("DELETE FROM analytics_submission_daily")
+    cursor.execute(f"""
+        INSERT INTO analytics_submission_daily
+            (day, discord_tag, contributor, source, total, approved, rejected, pending,
+             display_name, first_at, last_at)
+        SELECT {c['day']} AS d, {c['discord_tag']} AS t, {c['contributor']} AS u, {c['source']} AS s,
+               COUNT(*), SUM({c['approved']}), SUM({c['rejected']}), SUM({c['pending']}),
+               MAX({c['display_name']}), MIN({c['at']}), MAX({c['at']})
+        FROM pending_systems
+        GROUP BY d, t, u, s
+    """)
+    sub_rows = cursor.rowcount
+
+    c = disc_cols('')
+    cursor.execute("DELETE FROM analytics_discovery_daily")
+    cursor.execute(f"""
+        INSERT INTO analytics_discovery_daily
+            (day, discord_tag, contributor, type_slug, total, display_name, first_at, last_at)
+        SELECT {c['day']} AS d, {c['discord_tag']} AS t, {c['contributor']} AS u, {c['type_slug']} AS k,
+               COUNT(*), MAX({c['display_name']}), MIN({c['at']}), MAX({c['at']})
+        FROM discoveries
+        GROUP BY d, t, u, k
+    """)
+    disc_rows = cursor.rowcount
+
+    conn.commit()
+    logger.info(f"Analytics rollups installed: {sub_rows} submission buckets, {disc_rows} discovery buckets")
+
+
+@register_migration("1.102.0", "Indexed canonical contributor key (username_normalized) on systems and discoveries")
+def migration_1_102_0(conn):
+    """
+    Extends the 1.72.0 username_normalized column from pending_systems to
+    systems and discoveries, so the per-contributor public endpoints
+    (/api/public/user-stats, /api/public/voyager-fingerprint, contributors)
+    can seek an index instead of scanning with LOWER()/REPLACE() predicates.
+
+    Values come from services.auth_service.contributor_key — the same
+    normalize_username_for_dedup rule user_profiles uses — written by the
+    INSERT/UPDATE sites and backfilled here in Python:
+      systems      discovered_by -> personal_discord_username -> last_updated_by
+      discoveries  discovered_by
+    Any pending_systems rows still NULL from older write paths are filled too.
+
+    The discovery rollup (1.101.0) now buckets by this key, so discovery and
+    submission leaderboards group a contributor the same way. Rows written
+    without the column (raw SQL imports) fall back to the SQL fold.
+    """
+    cursor = conn.cursor()
+
+    for table in ('systems', 'discoveries'):
+        cursor.execute(f"PRAGMA table_info({table})")
+        cols = {row[1] for row in cursor.fetchall()}
+        if 'username_normalized' not in cols:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN username_normalized TEXT")
+            logger.info(f"Added username_normalized column to {table}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_systems_username_normalized ON systems(username_normalized)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_discoveries_username_normalized ON discoveries(username_normalized)")
+
+    try:
+        import sys
+        from pathlib import Path as _P
+        backend_dir = _P(__file__).parent
+        if str(backend_dir) not in sys.path:
+            sys.path.insert(0, str(backend_dir))
+        from services.auth_service import contributor_key
+    except Exception as e:
+        logger.warning(f"Could not import contributor_key for backfill: {e}")
+        conn.commit()
+        return
+
+    backfills = {
+        'systems': "SELECT id, discovered_by, personal_discord_username, last_updated_by FROM systems WHERE username_normalized IS NULL",
+        'discoveries': "SELECT id, discovered_by FROM discoveries WHERE username_normalized IS NULL",
+        'pending_systems': """
+            SELECT id, NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'), personal_discord_username,
+                   CASE WHEN json_valid(system_data) THEN json_extract(system_data, '$.discovered_by') END
+            FROM pending_systems WHERE username_normalized IS NULL
+        """,
+    }
+    for table, select in backfills.items():
+        cursor.execute(select)
+        updates = [(contributor_key(*row[1:]), row[0]) for row in cursor.fetchall()]
+        cursor.executemany(f"UPDATE {table} SET username_normalized = ? WHERE id = ?", updates)
+        logger.info(f"Backfilled username_normalized for {len(updates)} {table} rows")
+
+    # Re-key the discovery rollup on the stored column.
+    contributor = "COALESCE({r}username_normalized, " + _rollup_name_key_sql(
+        "COALESCE(NULLIF(NULLIF({r}discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')") + ")"
+
+    def disc_cols(r):
+        return {
+            'day': f"COALESCE(SUBSTR({r}submission_timestamp, 1, 10), '')",
+            'discord_tag': f"COALESCE({r}discord_tag, '')",
+            'contributor': contributor.replace('{r}', r),
+            'type_slug': f"COALESCE({r}type_slug, 'other')",
+            'display_name': f"{r}discovered_by",
+            'at': f"{r}submission_timestamp",
+        }
+
+    merge = """
+                display_name = MAX(COALESCE(display_name, excluded.display_name), COALESCE(excluded.display_name, display_name)),
+                first_at = MIN(COALESCE(first_at, excluded.first_at), COALESCE(excluded.first_at, first_at)),
+                last_at = MAX(COALESCE(last_at, excluded.last_at), COALESCE(excluded.last_at, last_at))"""
+
+    def disc_add(r):
+        c = disc_cols(r)
+        return f"""
+            INSERT INTO analytics_discovery_daily
+                (day, discord_tag, contributor, type_slug, total, display_name, first_at, last_at)
+            VALUES ({c['day']}, {c['discord_tag']}, {c['contributor']}, {c['type_slug']}, 1,
+                    {c['display_name']}, {c['at']}, {c['at']})
+            ON CONFLICT (day, discord_tag, contributor, type_slug) DO UPDATE SET
+                total = total + 1,{merge};"""
+
+    def disc_remove(r):
+        c = disc_cols(r)
+        key = (f"day = {c['day']} AND discord_tag = {c['discord_tag']}"
+               f" AND contributor = {c['contributor']} AND type_slug = {c['type_slug']}")
+        return f"""
+            UPDATE analytics_discovery_daily SET total = total - 1 WHERE {key};
+            DELETE FROM analytics_discovery_daily WHERE {key} AND total <= 0;"""
+
+    disc_keys = ('discord_tag', 'discovered_by', 'username_normalized', 'type_slug', 'submission_timestamp')
+    triggers = {
+        'trg_rollup_discoveries_insert': f"""
+            AFTER INSERT ON discoveries FOR EACH ROW
+            BEGIN {disc_add('NEW.')}
+            END
+        """,
+        'trg_rollup_discoveries_update': f"""
+            AFTER UPDATE OF {', '.join(disc_keys)} ON discoveries FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{k} IS NOT NEW.{k}' for k in disc_keys)}
+            BEGIN {disc_remove('OLD.')}{disc_add('NEW.')}
+            END
+        """,
+        'trg_rollup_discoveries_delete': f"""
+            AFTER DELETE ON discoveries FOR EACH ROW
+            BEGIN {disc_remove('OLD.')}
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    c = disc_cols('')
+    cursor.execute("DELETE FROM analytics_discovery_daily")
+    cursor.execute(f"""
+        INSERT INTO analytics_discovery_daily
+            (day, discord_tag, contributor, type_slug, total, display_name, first_at, last_at)
+        SELECT {c['day']} AS d, {c['discord_tag']} AS t, {c['contributor']} AS u, {c['type_slug']} AS k,
+               COUNT(*), MAX({c['display_name']}), MIN({c['at']}), MAX({c['at']})
+        FROM discoveries
+        GROUP BY d, t, u, k
+    """)
+    disc_rows = cursor.rowcount
+
+    conn.commit()
+    logger.info(f"Discovery rollup re-keyed on username_normalized: {disc_rows} buckets")
+
+
+@register_migration("1.103.0", "Trigram FTS5 search index over systems (systems_search + systems_fts), trigger-maintained")
+def migration_1_103_0(conn):
+    """
+    /api/systems/search and the /api/search popover matched free text with
+    nine OR'd `LIKE '%q%'` predicates plus an EXISTS on system_coauthors — a
+    full scan of systems per keystroke. This adds a trigram FTS5 index over
+    the same columns (see services/system_search.py):
+
+      systems_search — one row of searchable text per system. Explicit
+          INTEGER PRIMARY KEY because the FTS rowid must survive VACUUM, and
+          an untyped system_id (same reasoning as map_change_log, 1.100.0).
+      systems_fts — FTS5 external-content table over systems_search,
+          tokenize='trigram' so any 3+ char substring matches case-folded,
+          with bm25 weights favouring name and glyph hits.
+
+    Like 1.100.0, triggers keep it current from every write path: systems
+    insert/update/delete, region renames (region_name column) and
+    system_coauthors changes (coauthors column). The update trigger only
+    fires on the indexed columns so completeness re-scores don't churn it.
+
+    SQLite builds without FTS5 skip this migration's index; the endpoints
+    check for systems_fts and keep the LIKE scan when it is missing.
+
+    NOTE: a future migration that DROP + recreates systems, regions or
+    system_coauthors drops these triggers with the table and must re-create
+    them.
+    """
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x, tokenize='trigram')")
+        cursor.execute("DROP TABLE IF EXISTS temp.fts5_probe")
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 trigram tokenizer unavailable ({e}); system search stays on LIKE")
+        conn.commit()
+        return
+
+    columns = ('name', 'glyph_code', 'galaxy', 'region_name', 'discord_tag',
+               'discovered_by', 'personal_discord_username', 'coauthors')
+    weights = (10.0, 8.0, 1.0, 4.0, 3.0, 3.0, 3.0, 2.0)
+    col_list = ', '.join(columns)
+
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS systems_search (
+            id INTEGER PRIMARY KEY,
+            system_id UNIQUE NOT NULL,
+            {', '.join(f'{c} TEXT' for c in columns)}
+        )
+    """)
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS systems_fts USING fts5(
+            {col_list},
+            content='systems_search', content_rowid='id',
+            tokenize='trigram'
+        )
+    """)
+    cursor.execute(
+        "INSERT INTO systems_fts(systems_fts, rank) VALUES ('rank', ?)",
+        (f"bm25({', '.join(str(w) for w in weights)})",)
+    )
+
+    row_sql = """
+        s.id, s.name, s.glyph_code, s.galaxy,
+        (SELECT r.custom_name FROM regions r
+         WHERE r.region_x = s.region_x AND r.region_y = s.region_y AND r.region_z = s.region_z
+           AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal')
+           AND COALESCE(r.galaxy, 'Euclid') = COALESCE(s.galaxy, 'Euclid')
+         LIMIT 1),
+        s.discord_tag, s.discovered_by, s.personal_discord_username,
+        (SELECT GROUP_CONCAT(ca.username || ' ' || ca.username_normalized, ' ')
+         FROM system_coauthors ca WHERE ca.system_id = s.id)"""
+
+    def refresh(where):
+        # Upsert the search rows of every system matching `where`.
+        return f"""
+            INSERT INTO systems_search (system_id, {col_list})
+            SELECT {row_sql} FROM systems s WHERE {where}
+            ON CONFLICT (system_id) DO UPDATE SET
+                {', '.join(f'{c} = excluded.{c}' for c in columns)};"""
+
+    def in_region(r):
+        return f"s.region_x = {r}.region_x AND s.region_y = {r}.region_y AND s.region_z = {r}.region_z"
+
+    sys_keys = ('id', 'name', 'glyph_code', 'galaxy', 'reality', 'region_x', 'region_y', 'region_z',
+                'discord_tag', 'discovered_by', 'personal_discord_username')
+    region_keys = ('custom_name', 'region_x', 'region_y', 'region_z', 'reality', 'galaxy')
+    fts_new = ', '.join(f'NEW.{c}' for c in columns)
+    fts_old = ', '.join(f'OLD.{c}' for c in columns)
+    triggers = {
+        # systems_search -> systems_fts (standard external-content sync)
+        'trg_systems_search_ai': f"""
+            AFTER INSERT ON systems_search BEGIN
+                INSERT INTO systems_fts(rowid, {col_list}) VALUES (NEW.id, {fts_new});
+            END
+        """,
+        'trg_systems_search_ad': f"""
+            AFTER DELETE ON systems_search BEGIN
+                INSERT INTO systems_fts(systems_fts, rowid, {col_list}) VALUES ('delete', OLD.id, {fts_old});
+            END
+        """,
+        'trg_systems_search_au': f"""
+            AFTER UPDATE ON systems_search BEGIN
+                INSERT INTO systems_fts(systems_fts, rowid, {col_list}) VALUES ('delete', OLD.id, {fts_old});
+                INSERT INTO systems_fts(rowid, {col_list}) VALUES (NEW.id, {fts_new});
+            END
+        """,
+        # systems / regions / system_coauthors -> systems_search
+        'trg_search_systems_insert': f"""
+            AFTER INSERT ON systems FOR EACH ROW
+            BEGIN {refresh('s.id = NEW.id')}
+            END
+        """,
+        'trg_search_systems_update': f"""
+            AFTER UPDATE OF {', '.join(sys_keys)} ON systems FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{k} IS NOT NEW.{k}' for k in sys_keys)}
+            BEGIN
+                DELETE FROM systems_search WHERE system_id = OLD.id AND OLD.id IS NOT NEW.id;
+                {refresh('s.id = NEW.id')}
+            END
+        """,
+        'trg_search_systems_delete': """
+            AFTER DELETE ON systems FOR EACH ROW
+            BEGIN
+                DELETE FROM systems_search WHERE system_id = OLD.id;
+            END
+        """,
+        'trg_search_regions_insert': f"""
+            AFTER INSERT ON regions FOR EACH ROW
+            BEGIN {refresh(in_region('NEW'))}
+            END
+        """,
+        'trg_search_regions_update': f"""
+            AFTER UPDATE OF {', '.join(region_keys)} ON regions FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{k} IS NOT NEW.{k}' for k in region_keys)}
+            BEGIN {refresh(in_region('OLD'))}{refresh(in_region('NEW'))}
+            END
+        """,
+        'trg_search_regions_delete': f"""
+            AFTER DELETE ON regions FOR EACH ROW
+            BEGIN {refresh(in_region('OLD'))}
+            END
+        """,
+        'trg_search_coauthors_insert': f"""
+            AFTER INSERT ON system_coauthors FOR EACH ROW
+            BEGIN {refresh('s.id = NEW.system_id')}
+            END
+        """,
+        'trg_search_coauthors_update': f"""
+            AFTER UPDATE ON system_coauthors FOR EACH ROW
+            BEGIN {refresh('s.id = OLD.system_id')}{refresh('s.id = NEW.system_id')}
+            END
+        """,
+        'trg_search_coauthors_delete': f"""
+            AFTER DELETE ON system_coauthors FOR EACH ROW
+            BEGIN {refresh('s.id = OLD.system_id')}
+            END
+        """,
+    }
+    for name in triggers:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    # Backfill before the sync triggers exist, then build the index in one pass.
+    cursor.execute("DELETE FROM systems_search")
+    cursor.execute(f"INSERT INTO systems_search (system_id, {col_list}) SELECT {row_sql} FROM systems s")
+    indexed = cursor.rowcount
+    cursor.execute("INSERT INTO systems_fts(systems_fts) VALUES ('rebuild')")
+
+    for name, body in triggers.items():
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    conn.commit()
+    logger.info(f"Systems search index installed: {indexed} systems")
+
+
+@register_migration("1.104.0", "Stored, indexed norm_token() columns for the categorical advanced filters")
+def migration_1_104_0(conn):
+    """
+    The advanced filters (db._build_advanced_filter_clauses, used by
+    /api/systems, /api/systems/search, /api/regions/grouped and
+    /api/galaxies/summary) matched categorical fields as
+    `norm_token(s.star_type) IN (...)` and planet fields through
+    `EXISTS (... norm_token(p.biome) = ?)`, calling back into the Python UDF
+    for every systems / planets row — a full scan per filter.
+
+    Adds a `<col>_norm` copy holding norm_token(<col>) for:
+      systems  star_type, economy_type, economy_level, conflict_level,
+               dominant_lifeform, stellar_classification
+      planets  biome, weather, sentinel
+    indexed on systems(<col>_norm) and planets(<col>_norm, system_id).
+
+    Tokens are computed in Python (db.sync_facet_tokens at write time, the
+    backfill here) — not with triggers or expression indexes, which would
+    make norm_token a hard dependency of every connection that writes these
+    tables (the migration runner and the CLI tools open plain connections).
+    Instead an UPDATE trigger resets a `_norm` copy to NULL when its source
+    column changes, and the filters treat NULL as "not synced yet" and fall
+    back to norm_token() for those rows only. NULL source values store ''.
+
+    NOTE: a future migration that DROP + recreates systems or planets drops
+    these triggers with the table and must re-create them.
+    """
+    cursor = conn.cursor()
+
+    facets = {
+        'systems': ('star_type', 'economy_type', 'economy_level', 'conflict_level',
+                    'dominant_lifeform', 'stellar_classification'),
+        'planets': ('biome', 'weather', 'sentinel'),
+    }
+
+    try:
+        import sys
+        from pathlib import Path as _P
+        backend_dir = _P(__file__).parent
+        if str(backend_dir) not in sys.path:
+            sys.path.insert(0, str(backend_dir))
+        from db import norm_token
+    except Exception as e:
+        logger.warning(f"Could not import norm_token for facet backfill: {e}")
+        conn.commit()
+        return
+
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _facet_token_map (raw TEXT PRIMARY KEY, token TEXT NOT NULL)")
+    for table, columns in facets.items():
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for col in columns:
+            if f'{col}_norm' not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col}_norm TEXT")
+
+            # Backfill through a raw -> token map of the (few) distinct values.
+            cursor.execute("DELETE FROM _facet_token_map")
+            cursor.execute(f"SELECT DISTINCT {col} FROM {table} WHERE {col} IS NOT NULL")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO _facet_token_map (raw, token) VALUES (?, ?)",
+                [(row[0], norm_token(row[0])) for row in cursor.fetchall()]
+            )
+            cursor.execute(f"""
+                UPDATE {table} SET {col}_norm = COALESCE(
+                    (SELECT token FROM _facet_token_map WHERE raw = {table}.{col}), '')
+            """)
+
+            if table == 'systems':
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_systems_{col}_norm ON systems({col}_norm)")
+            else:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_planets_{col}_norm ON planets({col}_norm, system_id)")
+        logger.info(f"Backfilled facet tokens on {table}: {', '.join(columns)}")
+    cursor.execute("DROP TABLE IF EXISTS _facet_token_map")
+
+    for table, columns in facets.items():
+        name = f'trg_facet_tokens_{table}_update'
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER UPDATE OF {', '.join(columns)} ON {table} FOR EACH ROW
+            WHEN {' OR '.join(f'OLD.{c} IS NOT NEW.{c}' for c in columns)}
+            BEGIN
+                UPDATE {table} SET
+                    {', '.join(f'{c}_norm = CASE WHEN OLD.{c} IS NOT NEW.{c} THEN NULL ELSE {c}_norm END' for c in columns)}
+                WHERE rowid = NEW.rowid;
+            END
+        """)
+
+    conn.commit()
+
+
+@register_migration("1.105.0", "body_resources inverted index for the resource filter and dropdown")
+def migration_1_105_0(conn):
+    """
+    The `resource` advanced filter matched each requested resource with two
+    EXISTS subqueries running nested REPLACE() rewrites and
+    `LIKE '%, ' || ? || ', %'` over planets.materials / moons.materials, and
+    /api/systems/filter-options re-split every distinct materials cell in
+    Python to build the resource dropdown.
+
+    Adds body_resources, one row per (planet or moon, resource):
+      system_id       owning system (planets.system_id)
+      body_kind       'planet' | 'moon'
+      body_id         planets.id / moons.id
+      resource_token  lower-cased canonical resource name, as produced by
+                      resource_catalog.normalize_materials
+    indexed on (resource_token, system_id) for the filter and (system_id) for
+    the per-system rebuild. db.sync_body_resources rebuilds a system's rows at
+    write time; the backfill here covers existing bodies. Tokenizing needs
+    Python, so only the DELETE side is trigger-maintained.
+
+    NOTE: a future migration that DROP + recreates planets, moons or systems
+    drops these triggers with the table and must re-create them.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS body_resources (
+            system_id NOT NULL,
+            body_kind TEXT NOT NULL,
+            body_id INTEGER NOT NULL,
+            resource_token TEXT NOT NULL,
+            PRIMARY KEY (body_kind, body_id, resource_token)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_body_resources_token ON body_resources(resource_token, system_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_body_resources_system ON body_resources(system_id)")
+
+    cursor.execute("DROP TRIGGER IF EXISTS trg_body_resources_planet_delete")
+    cursor.execute("""
+        CREATE TRIGGER trg_body_resources_planet_delete
+        AFTER DELETE ON planets FOR EACH ROW
+        BEGIN
+            DELETE FROM body_resources WHERE body_kind = 'planet' AND body_id = OLD.id;
+        END
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_body_resources_moon_delete")
+    cursor.execute("""
+        CREATE TRIGGER trg_body_resources_moon_delete
+        AFTER DELETE ON moons FOR EACH ROW
+        BEGIN
+            DELETE FROM body_resources WHERE body_kind = 'moon' AND body_id = OLD.id;
+        END
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_body_resources_system_delete")
+    cursor.execute("""
+        CREATE TRIGGER trg_body_resources_system_delete
+        AFTER DELETE ON systems FOR EACH ROW
+        BEGIN
+            DELETE FROM body_resources WHERE system_id = OLD.id;
+        END
+    """)
+
+    try:
+        import sys
+        from pathlib import Path as _P
+        backend_dir = _P(__file__).parent
+        if str(backend_dir) not in sys.path:
+            sys.path.insert(0, str(backend_dir))
+        from db import resource_tokens
+    except Exception as e:
+        logger.warning(f"Could not import resource_tokens for body_resources backfill: {e}")
+        conn.commit()
+        return
+
+    # Materials cells repeat heavily across bodies; tokenize each distinct
+    # cell once.
+    cache = {}
+
+    def _tokens(*cells):
+        if cells not in cache:
+            cache[cells] = resource_tokens(*cells)
+        return cache[cells]
+
+    cursor.execute("DELETE FROM body_resources")
+    rows = []
+    cursor.execute("SELECT id, system_id, materials, common_resource, uncommon_resource, rare_resource FROM planets")
+    for r in cursor.fetchall():
+        rows.extend((r[1], 'planet', r[0], tok) for tok in _tokens(*r[2:]))
+    cursor.execute("SELECT m.id, p.system_id, m.materials FROM moons m JOIN planets p ON m.planet_id = p.id")
+    for r in cursor.fetchall():
+        rows.extend((r[1], 'moon', r[0], tok) for tok in _tokens(r[2]))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO body_resources (system_id, body_kind, body_id, resource_token) VALUES (?, ?, ?, ?)",
+        rows
+    )
+    logger.info(f"Backfilled {len(rows)} body_resources rows")
+
+    conn.commit()
+
+
+@register_migration("1.106.0", "region_stats summary table for /api/regions/grouped keyset paging")
+def migration_1_106_0(conn):
+    """
+    /api/regions/grouped aggregated every populated region of the scope with
+    GROUP BY over systems, fetched them all and sliced the page in Python.
+
+    Adds region_stats, one row per (reality, galaxy, region_x, region_y,
+    region_z, discord_tag) with system_count, first_system_date
+    (MIN(created_at)) and first_system_id (MIN(id)). Reality, galaxy and
+    discord_tag are stored COALESCEd ('Normal' / 'Euclid' / '') so the key
+    columns are NOT NULL; systems without region coords are not counted.
+    Partitioning by discord_tag keeps the community and archived-civ filters
+    answerable from the summary (see services/region_stats.py).
+
+    Triggers on systems re-aggregate the affected partition(s) from systems
+    (through idx_systems_region) on insert, delete, and updates of the key
+    columns or created_at, so every write path keeps it current. Recomputing
+    a partition rather than adjusting counters keeps MIN() exact on delete.
+
+    NOTE: a future migration that DROP + recreates systems drops these
+    triggers with the table and must re-create them.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS region_stats (
+            reality TEXT NOT NULL,
+            galaxy TEXT NOT NULL,
+            region_x INTEGER NOT NULL,
+            region_y INTEGER NOT NULL,
+            region_z INTEGER NOT NULL,
+            discord_tag TEXT NOT NULL,
+            system_count INTEGER NOT NULL,
+            first_system_date TEXT,
+            first_system_id,
+            PRIMARY KEY (reality, galaxy, region_x, region_y, region_z, discord_tag)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_region_stats_region ON region_stats(region_x, region_y, region_z)")
+
+    def refresh(ref):
+        key = (f"COALESCE({ref}.reality, 'Normal'), COALESCE({ref}.galaxy, 'Euclid'), "
+               f"{ref}.region_x, {ref}.region_y, {ref}.region_z, COALESCE({ref}.discord_tag, '')")
+        return f"""
+                DELETE FROM region_stats
+                WHERE (reality, galaxy, region_x, region_y, region_z, discord_tag) = ({key});
+                INSERT INTO region_stats (reality, galaxy, region_x, region_y, region_z, discord_tag,
+                                          system_count, first_system_date, first_system_id)
+                SELECT {key}, COUNT(*), MIN(s.created_at), MIN(s.id)
+                FROM systems s
+                WHERE s.region_x = {ref}.region_x AND s.region_y = {ref}.region_y
+                  AND s.region_z = {ref}.region_z
+                  AND COALESCE(s.reality, 'Normal') = COALESCE({ref}.reality, 'Normal')
+                  AND COALESCE(s.galaxy, 'Euclid') = COALESCE({ref}.galaxy, 'Euclid')
+                  AND COALESCE(s.discord_tag, '') = COALESCE({ref}.discord_tag, '')
+                HAVING COUNT(*) > 0;"""
+
+    triggers = {
+        'trg_region_stats_insert': f"""
+            AFTER INSERT ON systems FOR EACH ROW
+            WHEN NEW.region_x IS NOT NULL AND NEW.region_y IS NOT NULL AND NEW.region_z IS NOT NULL
+            BEGIN{refresh('NEW')}
+            END
+        """,
+        'trg_region_stats_delete': f"""
+            AFTER DELETE ON systems FOR EACH ROW
+            WHEN OLD.region_x IS NOT NULL AND OLD.region_y IS NOT NULL AND OLD.region_z IS NOT NULL
+            BEGIN{refresh('OLD')}
+            END
+        """,
+        'trg_region_stats_update': f"""
+            AFTER UPDATE OF region_x, region_y, region_z, reality, galaxy, discord_tag, created_at
+            ON systems FOR EACH ROW
+            BEGIN{refresh('OLD')}{refresh('NEW')}
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    cursor.execute("DELETE FROM region_stats")
+    cursor.execute("""
+        INSERT INTO region_stats (reality, galaxy, region_x, region_y, region_z, discord_tag,
+                                  system_count, first_system_date, first_system_id)
+        SELECT COALESCE(reality, 'Normal'), COALESCE(galaxy, 'Euclid'),
+               region_x, region_y, region_z, COALESCE(discord_tag, ''),
+               COUNT(*), MIN(created_at), MIN(id)
+        FROM systems
+        WHERE region_x IS NOT NULL AND region_y IS NOT NULL AND region_z IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """)
+    logger.info(f"Backfilled {cursor.rowcount} region_stats rows")
+
+    conn.commit()
+
+
+@register_migration("1.107.0", "region_stats: grade counts, display coords and contributors for every region reader")
+def migration_1_107_0(conn):
+    """
+    Extends region_stats (1.106.0) so the other region-level readers —
+    /api/map/regions-aggregated, the /api/regions/grouped card footer,
+    poster_service._prewarm_targets and the war-room territory endpoints —
+    read summary rows instead of GROUP BY region over systems:
+
+      region_stats         + grade_s_count      is_complete >= 85
+                           + grade_splus_count  ... AND is_fully_charted
+                           + min_x/min_y/min_z  the map's display coords
+      region_contributors  one row per distinct contributor of a partition:
+                           'p:<profile_id>' when the system / co-author row
+                           has one, else 'u:<username_normalized>' (1.102.0
+                           contributor key). COUNT(DISTINCT contributor) over
+                           the partitions in scope is the unique-contributor
+                           count.
+
+    Galaxies / realities present and the dominant discord_tag fall out of the
+    partition key. The systems triggers are re-created to refresh both tables
+    and to fire on the new source columns; system_coauthors triggers refresh
+    the owning system's partition. Partitions are still re-aggregated, not
+    patched, so counts and MIN()s stay exact.
+    services/region_stats.rebuild_region_stats() recomputes both tables.
+
+    NOTE: a future migration that DROP + recreates systems or
+    system_coauthors drops these triggers with the table and must re-create
+    them.
+    """
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(region_stats)")
+    existing = {row[1] for row in cursor.fetchall()}
+    for col, decl in (('grade_s_count', 'INTEGER NOT NULL DEFAULT 0'),
+                      ('grade_splus_count', 'INTEGER NOT NULL DEFAULT 0'),
+                      ('min_x', 'REAL'), ('min_y', 'REAL'), ('min_z', 'REAL')):
+        if col not in existing:
+            cursor.execute(f"ALTER TABLE region_stats ADD COLUMN {col} {decl}")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS region_contributors (
+            reality TEXT NOT NULL,
+            galaxy TEXT NOT NULL,
+            region_x INTEGER NOT NULL,
+            region_y INTEGER NOT NULL,
+            region_z INTEGER NOT NULL,
+            discord_tag TEXT NOT NULL,
+            contributor TEXT NOT NULL,
+            PRIMARY KEY (reality, galaxy, region_x, region_y, region_z, discord_tag, contributor)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_region_contributors_region "
+                   "ON region_contributors(region_x, region_y, region_z)")
+
+    key_cols = 'reality, galaxy, region_x, region_y, region_z, discord_tag'
+    stats_cols = (f'{key_cols}, system_count, first_system_date, first_system_id, '
+                  'grade_s_count, grade_splus_count, min_x, min_y, min_z')
+    stats_aggs = ("COUNT(*), MIN(s.created_at), MIN(s.id), "
+                  "SUM(CASE WHEN s.is_complete >= 85 THEN 1 ELSE 0 END), "
+                  "SUM(CASE WHEN s.is_complete >= 85 AND s.is_fully_charted THEN 1 ELSE 0 END), "
+                  "MIN(s.x), MIN(s.y), MIN(s.z)")
+    system_contributor = ("CASE WHEN s.profile_id IS NOT NULL THEN 'p:' || s.profile_id "
+                          "WHEN COALESCE(s.username_normalized, 'unknown') NOT IN ('', 'unknown') "
+                          "THEN 'u:' || s.username_normalized END")
+    coauthor_contributor = ("CASE WHEN ca.profile_id IS NOT NULL THEN 'p:' || ca.profile_id "
+                            "WHEN COALESCE(ca.username_normalized, '') != '' "
+                            "THEN 'u:' || ca.username_normalized END")
+
+    def key(a):
+        return (f"COALESCE({a}.reality, 'Normal'), COALESCE({a}.galaxy, 'Euclid'), "
+                f"{a}.region_x, {a}.region_y, {a}.region_z, COALESCE({a}.discord_tag, '')")
+
+    match = ("s.region_x = o.region_x AND s.region_y = o.region_y AND s.region_z = o.region_z "
+             "AND COALESCE(s.reality, 'Normal') = COALESCE(o.reality, 'Normal') "
+             "AND COALESCE(s.galaxy, 'Euclid') = COALESCE(o.galaxy, 'Euclid') "
+             "AND COALESCE(s.discord_tag, '') = COALESCE(o.discord_tag, '')")
+
+    def refresh(origin, stats=True):
+        """Trigger body re-aggregating every partition named by `origin`, a
+        FROM source (alias o) yielding the key columns of the touched rows."""
+        body = ""
+        if stats:
+            body += f"""
+                DELETE FROM region_stats WHERE ({key_cols}) IN (SELECT {key('o')} FROM {origin});
+                INSERT INTO region_stats ({stats_cols})
+                SELECT {key('o')}, {stats_aggs}
+                FROM {origin} JOIN systems s ON {match}
+                GROUP BY 1, 2, 3, 4, 5, 6;"""
+        body += f"""
+                DELETE FROM region_contributors WHERE ({key_cols}) IN (SELECT {key('o')} FROM {origin});
+                INSERT OR IGNORE INTO region_contributors ({key_cols}, contributor)
+                SELECT {key('o')}, {system_contributor}
+                FROM {origin} JOIN systems s ON {match}
+                WHERE {system_contributor} IS NOT NULL
+                UNION
+                SELECT {key('o')}, {coauthor_contributor}
+                FROM {origin} JOIN systems s ON {match}
+                JOIN system_coauthors ca ON ca.system_id = s.id
+                WHERE {coauthor_contributor} IS NOT NULL;"""
+        return body
+
+    def row_origin(*refs):
+        # Normalized keys, so an OLD/NEW pair that only differs by NULL vs
+        # the default (galaxy NULL -> 'Euclid') collapses to one UNION row
+        # instead of joining the same partition twice.
+        return "(" + " UNION ".join(
+            f"SELECT COALESCE({r}.reality, 'Normal') AS reality, COALESCE({r}.galaxy, 'Euclid') AS galaxy, "
+            f"{r}.region_x AS region_x, {r}.region_y AS region_y, {r}.region_z AS region_z, "
+            f"COALESCE({r}.discord_tag, '') AS discord_tag"
+            for r in refs) + ") o"
+
+    def owner_origin(*refs):
+        ids = ", ".join(f"{r}.system_id" for r in refs)
+        return (f"(SELECT reality, galaxy, region_x, region_y, region_z, discord_tag "
+                f"FROM systems WHERE id IN ({ids})) o")
+
+    triggers = {
+        'trg_region_stats_insert': f"""
+            AFTER INSERT ON systems FOR EACH ROW
+            WHEN NEW.region_x IS NOT NULL AND NEW.region_y IS NOT NULL AND NEW.region_z IS NOT NULL
+            BEGIN{refresh(row_origin('NEW'))}
+            END
+        """,
+        'trg_region_stats_delete': f"""
+            AFTER DELETE ON systems FOR EACH ROW
+            WHEN OLD.region_x IS NOT NULL AND OLD.region_y IS NOT NULL AND OLD.region_z IS NOT NULL
+            BEGIN{refresh(row_origin('OLD'))}
+            END
+        """,
+        'trg_region_stats_update': f"""
+            AFTER UPDATE OF region_x, region_y, region_z, reality, galaxy, discord_tag, created_at,
+                            is_complete, is_fully_charted, x, y, z, profile_id, username_normalized
+            ON systems FOR EACH ROW
+            BEGIN{refresh(row_origin('OLD', 'NEW'))}
+            END
+        """,
+        'trg_region_contributors_coauthor_insert': f"""
+            AFTER INSERT ON system_coauthors FOR EACH ROW
+            BEGIN{refresh(owner_origin('NEW'), stats=False)}
+            END
+        """,
+        'trg_region_contributors_coauthor_delete': f"""
+            AFTER DELETE ON system_coauthors FOR EACH ROW
+            BEGIN{refresh(owner_origin('OLD'), stats=False)}
+            END
+        """,
+        'trg_region_contributors_coauthor_update': f"""
+            AFTER UPDATE ON system_coauthors FOR EACH ROW
+            BEGIN{refresh(owner_origin('OLD', 'NEW'), stats=False)}
+            END
+        """,
+    }
+    for name, body in triggers.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+    cursor.execute("DELETE FROM region_stats")
+    cursor.execute(f"""
+        INSERT INTO region_stats ({stats_cols})
+        SELECT {key('s')}, {stats_aggs}
+        FROM systems s
+        WHERE s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """)
+    regions = cursor.rowcount
+    cursor.execute("DELETE FROM region_contributors")
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO region_contributors ({key_cols}, contributor)
+        SELECT {key('s')}, {system_contributor} FROM systems s
+        WHERE s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL
+          AND {system_contributor} IS NOT NULL
+        UNION
+        SELECT {key('s')}, {coauthor_contributor}
+        FROM system_coauthors ca JOIN systems s ON s.id = ca.system_id
+        WHERE s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL
+          AND {coauthor_contributor} IS NOT NULL
+    """)
+    logger.info(f"Backfilled {regions} region_stats rows and {cursor.rowcount} region_contributors rows")
+
+    conn.commit()
+
+
+@register_migration("1.108.0", "Poster cache: verified_at column for data-hash skip-render")
+def migration_1_108_0(conn):
+    """
+    Adds `verified_at` to `poster_cache`.
+
+    When a poster's TTL lapses, poster_service compares compute_data_hash()
+    against the stored data_hash first. If the underlying data is unchanged
+    the PNG is kept and only `verified_at` moves forward, restarting the TTL.
+    `generated_at` keeps meaning "when Chromium last rendered this", which the
+    region_thumb age threshold in routes/approvals.py and the prune cron rely
+    on. NULL on existing rows (TTL counts from generated_at).
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(poster_cache)")
+    cols = {row[1] for row in cursor.fetchall()}
+    if 'verified_at' not in cols:
+        cursor.execute("ALTER TABLE poster_cache ADD COLUMN verified_at TEXT")
+        logger.info("Added poster_cache.verified_at")
+    conn.commit()
@@ -0,0 +1,63 @@
+"""
+Rebuild the daily analytics rollup tables from history.
+
+analytics_submission_daily and analytics_discovery_daily (migration 1.101.0)
+are kept current by triggers, so this is only needed after writes made with
+triggers bypassed (bulk imports into a copy of the DB, restores from an older
+backup) or to tighten the display_name / first_at / last_at high-water columns
+after many deletes. Safe to run against a live DB — the rebuild is one
+transaction.
+
+Usage:
+  # Local (auto-detects paths):
+  python Haven-UI/backend/rebuild_analytics_rollups.py
+
+  # Docker Pi (explicit path):
+  python Haven-UI/backend/rebuild_analytics_rollups.py --db ~/haven-data/haven_ui.db
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from services.analytics_rollups import rebuild_analytics_rollups
+
+
+def resolve_db(args):
+    """Resolve the DB path from CLI args or haven_paths defaults."""
+    if args.db:
+        return Path(args.db).expanduser()
+    from db import get_db_path
+    return get_db_path()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild Haven analytics rollup tables")
+    parser.add_argument("--db", help="Path to haven_ui.db (e.g. ~/haven-data/haven_ui.db)")
+    args = parser.parse_args()
+
+    db_path = resolve_db(args)
+    if not db_path or not db_path.exists():
+        print(f"ERROR: Database not found at {db_path}")
+        print("  Hint: use --db to specify the path on Docker/Pi")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if 'analytics_submission_daily' not in tables:
+            print("ERROR: rollup tables missing — start the server once so migration 1.101.0 runs")
+            sys.exit(1)
+        result = rebuild_analytics_rollups(conn)
+    finally:
+        conn.close()
+
+    print(f"Rebuilt {result['submission_buckets']} submission buckets and "
+          f"{result['discovery_buckets']} discovery buckets in {result['elapsed_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
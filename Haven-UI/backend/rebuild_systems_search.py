@@ -0,0 +1,62 @@
+"""
+Rebuild the systems full-text search index.
+
+systems_search / systems_fts (migration 1.103.0) are kept current by
+triggers on systems, regions and system_coauthors, so this is only needed
+after writes made with triggers bypassed (bulk imports into a copy of the DB,
+restores from an older backup) or if FTS5's integrity-check reports
+damage. Safe to run against a live DB — the rebuild is one transaction.
+
+Usage:
+  # Local (auto-detects paths):
+  python Haven-UI/backend/rebuild_systems_search.py
+
+  # Docker Pi (explicit path):
+  python Haven-UI/backend/rebuild_systems_search.py --db ~/haven-data/haven_ui.db
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from services.system_search import FTS_TABLE, rebuild_systems_search
+
+
+def resolve_db(args):
+    """Resolve the DB path from CLI args or haven_paths defaults."""
+    if args.db:
+        return Path(args.db).expanduser()
+    from db import get_db_path
+    return get_db_path()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the Haven systems search index")
+    parser.add_argument("--db", help="Path to haven_ui.db (e.g. ~/haven-data/haven_ui.db)")
+    args = parser.parse_args()
+
+    db_path = resolve_db(args)
+    if not db_path or not db_path.exists():
+        print(f"ERROR: Database not found at {db_path}")
+        print("  Hint: use --db to specify the path on Docker/Pi")
+        sys.exit(1)
+
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if FTS_TABLE not in tables:
+            print("ERROR: search index missing — start the server once so migration 1.103.0 runs "
+                  "(it is skipped when this SQLite build lacks FTS5)")
+            sys.exit(1)
+        result = rebuild_systems_search(conn)
+    finally:
+        conn.close()
+
+    print(f"Indexed {result['systems']} systems in {result['elapsed_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Re-score completeness (is_complete / is_fully_charted) for every system.
+
+The cached score is written on every approval and edit, so this is only
+needed after a scoring-rule change that ships without its own rescore
+migration, or after bulk edits made outside the API. Systems are scored in
+batches with services.completeness.rescore_all_systems (a handful of queries
+per batch) and each batch commits on its own, so the DB is never locked for
+the whole pass.
+
+Usage:
+  # Local (auto-detects paths):
+  python Haven-UI/backend/rescore_completeness.py
+
+  # Docker Pi (explicit path, smaller batches):
+  python Haven-UI/backend/rescore_completeness.py --db ~/haven-data/haven_ui.db --batch-size 200
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+from services.completeness import RESCORE_BATCH_SIZE, rescore_all_systems
+
+
+def resolve_db(args):
+    """Resolve the DB path from CLI args or haven_paths defaults."""
+    if args.db:
+        return Path(args.db).expanduser()
+    from db import get_db_path
+    return get_db_path()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score completeness for every Haven system")
+    parser.add_argument("--db", help="Path to haven_ui.db (e.g. ~/haven-data/haven_ui.db)")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE,
+                        help=f"Systems per batch/commit (default {RESCORE_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    db_path = resolve_db(args)
+    if not db_path or not db_path.exists():
+        print(f"ERROR: Database not found at {db_path}")
+        print("  Hint: use --db to specify the path on Docker/Pi")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        result = rescore_all_systems(conn, batch_size=max(1, args.batch_size))
+    finally:
+        conn.close()
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    print(f"Re-scored {result['systems']} systems ({result['fully_charted']} fully charted, "
+          f"{result['failed']} failed) in {elapsed_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
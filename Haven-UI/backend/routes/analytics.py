@@ -6,9 +6,10 @@ from typing import Optional
 
 from fastapi import APIRouter, Cookie, HTTPException
 
-from constants import normalize_discord_username, score_to_grade, GRADE_THRESHOLDS
-from db import get_db_connection
-from services.auth_service import get_session, is_super_admin
+from constants import normalize_discord_username, score_to_grade, GRADE_THRESHOLDS, DISCOVERY_SLUG_TO_EMOJI
+from db import get_db_connection, run_read
+from services.analytics_rollups import rollup_date_filter, rollup_source_filter, rollup_tag_filter
+from services.auth_service import contributor_key, get_session, is_super_admin
 
 logger = logging.getLogger('control.room')
 
@@ -69,6 +70,20 @@ def _scope_analytics_discord_tag(session_data: Optional[dict], requested_tag: Op
     return legacy_tag or user_tags[0]
 
 
+def _discovery_type_rows(rows):
+    """Shape (type_slug, count) rollup rows for the type-breakdown endpoints.
+    The rollup is keyed by slug only, so the display type is the slug's
+    canonical emoji."""
+    return [
+        {
+            'type_slug': row['type_slug'],
+            'discovery_type': DISCOVERY_SLUG_TO_EMOJI.get(row['type_slug'], 'Other'),
+            'count': row['count'],
+        }
+        for row in rows
+    ]
+
+
 # ============================================================================
 # Analytics Endpoints (System Submissions)
 # Partner-scoped: partners are auto-filtered to their community's data.
@@ -113,75 +128,32 @@ async def get_submission_leaderboard(
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Build date filter based on period or explicit dates
-        date_filter = ''
-        date_params = []
-
-        if period == 'week':
-            date_filter = " AND submission_date >= date('now', '-7 days')"
-        elif period == 'month':
-            date_filter = " AND submission_date >= date('now', '-30 days')"
-        elif period == 'year':
-            date_filter = " AND submission_date >= date('now', '-365 days')"
-        elif start_date:
-            date_filter = " AND submission_date >= ?"
-            date_params.append(start_date)
-            if end_date:
-                date_filter += " AND submission_date <= ?"
-                date_params.append(end_date + 'T23:59:59')
-
-        # Build community filter
-        tag_filter = ''
-        tag_params = []
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            tag_params = [discord_tag]
+        date_filter, date_params = rollup_date_filter(period, start_date, end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
+        source_filter, source_params = rollup_source_filter(source)
 
-        # Build source filter (manual includes legacy NULL rows)
-        source_filter = ''
-        source_params = []
-        if source:
-            if source == 'manual':
-                source_filter = " AND COALESCE(source, 'manual') = 'manual'"
-            else:
-                source_filter = ' AND source = ?'
-                source_params = [source]
-
-        # Query for leaderboard from pending_systems (includes both approved and rejected).
-        # Uses the indexed `username_normalized` column populated at write time by the canonical
-        # services.auth_service.normalize_username_for_dedup helper (migration v1.72.0).
-        # Previously this GROUP BY ran a multi-step LOWER(TRIM(CASE WHEN SUBSTR(...) GLOB ...))
-        # expression that defeated every index and forced a full pending_systems scan.
-
-        # Raw username display (we still need a representative original-form name to render)
-        raw_username = '''COALESCE(
-            NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'),
-            personal_discord_username,
-            json_extract(system_data, '$.discovered_by'),
-            'Unknown'
-        )'''
-
-        # Use COALESCE to convert NULL/empty discord_tag to 'Personal' for grouping
+        # Ranked from analytics_submission_daily (migration 1.101.0): one row per
+        # day x community x contributor x source, kept current by triggers, so
+        # this groups a few thousand pre-counted buckets instead of scanning
+        # pending_systems. contributor is the indexed username_normalized
+        # (v1.72.0); '' holds legacy rows the backfill couldn't resolve.
         tag_display = "COALESCE(NULLIF(discord_tag, ''), 'Personal')"
 
-        # Filter out rows with NULL or empty username_normalized (legacy rows the
-        # backfill couldn't resolve, and the explicit 'unknown' bucket).
         query = f'''
             SELECT
-                MAX({raw_username}) as username,
-                username_normalized as normalized_name,
+                MAX(display_name) as username,
+                contributor as normalized_name,
                 GROUP_CONCAT(DISTINCT {tag_display}) as discord_tags,
-                COUNT(*) as total_submissions,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected,
-                MIN(submission_date) as first_submission,
-                MAX(submission_date) as last_submission
-            FROM pending_systems
-            WHERE username_normalized IS NOT NULL
-              AND username_normalized != ''
-              AND username_normalized != 'unknown'
+                SUM(total) as total_submissions,
+                SUM(approved) as approved,
+                SUM(rejected) as rejected,
+                MIN(first_at) as first_submission,
+                MAX(last_at) as last_submission
+            FROM analytics_submission_daily
+            WHERE contributor != ''
+              AND contributor != 'unknown'
               {tag_filter} {date_filter} {source_filter}
-            GROUP BY username_normalized
+            GROUP BY contributor
             ORDER BY total_submissions DESC
             LIMIT ?
         '''
@@ -223,11 +195,11 @@ async def get_submission_leaderboard(
                 breakdown_query = f'''
                     SELECT
                         {tag_display} as discord_tag,
-                        COUNT(*) as total,
-                        SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved,
-                        SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected
-                    FROM pending_systems
-                    WHERE username_normalized = ?
+                        SUM(total) as total,
+                        SUM(approved) as approved,
+                        SUM(rejected) as rejected
+                    FROM analytics_submission_daily
+                    WHERE contributor = ?
                       {date_filter} {source_filter}
                     GROUP BY {tag_display}
                     ORDER BY total DESC
@@ -243,10 +215,10 @@ async def get_submission_leaderboard(
         # Get totals
         totals_query = f'''
             SELECT
-                COUNT(*) as total_submissions,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as total_approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as total_rejected
-            FROM pending_systems
+                SUM(total) as total_submissions,
+                SUM(approved) as total_approved,
+                SUM(rejected) as total_rejected
+            FROM analytics_submission_daily
             WHERE 1=1 {tag_filter} {date_filter} {source_filter}
         '''
         cursor.execute(totals_query, tag_params + date_params + source_params)
@@ -441,39 +413,27 @@ async def get_submissions_timeline(
         if not end_date:
             end_date = datetime.now().strftime('%Y-%m-%d')
 
-        # Build date grouping based on granularity
+        # Build date grouping based on granularity (rollup buckets are whole days)
         if granularity == 'week':
-            date_format = "strftime('%Y-W%W', submission_date)"
+            date_format = "strftime('%Y-W%W', day)"
         elif granularity == 'month':
-            date_format = "strftime('%Y-%m', submission_date)"
+            date_format = "strftime('%Y-%m', day)"
         else:  # day
-            date_format = "date(submission_date)"
+            date_format = "day"
 
-        # Build filters
-        tag_filter = ''
-        params = [start_date, end_date + 'T23:59:59']
-
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            params.append(discord_tag)
-
-        # Build source filter (manual includes legacy NULL rows)
-        source_filter = ''
-        if source:
-            if source == 'manual':
-                source_filter = " AND COALESCE(source, 'manual') = 'manual'"
-            else:
-                source_filter = ' AND source = ?'
-                params.append(source)
+        date_filter, params = rollup_date_filter(start_date=start_date, end_date=end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
+        source_filter, source_params = rollup_source_filter(source)
+        params += tag_params + source_params
 
         query = f'''
             SELECT
                 {date_format} as date,
-                COUNT(*) as submissions,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected
-            FROM pending_systems
-            WHERE submission_date >= ? AND submission_date <= ? {tag_filter} {source_filter}
+                SUM(total) as submissions,
+                SUM(approved) as approved,
+                SUM(rejected) as rejected
+            FROM analytics_submission_daily
+            WHERE 1=1 {date_filter} {tag_filter} {source_filter}
             GROUP BY {date_format}
             ORDER BY date ASC
         '''
@@ -513,27 +473,8 @@ async def get_source_breakdown(
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ''
-        date_params = []
-        if period == 'week':
-            date_filter = " AND submission_date >= date('now', '-7 days')"
-        elif period == 'month':
-            date_filter = " AND submission_date >= date('now', '-30 days')"
-        elif period == 'year':
-            date_filter = " AND submission_date >= date('now', '-365 days')"
-        elif start_date:
-            date_filter = " AND submission_date >= ?"
-            date_params.append(start_date)
-            if end_date:
-                date_filter += " AND submission_date <= ?"
-                date_params.append(end_date + 'T23:59:59')
-
-        tag_filter = ''
-        tag_params = []
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            tag_params = [discord_tag]
+        date_filter, date_params = rollup_date_filter(period, start_date, end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
 
         # Group by source, treating NULL and companion_app as manual
         cursor.execute(f'''
@@ -542,11 +483,11 @@ async def get_source_breakdown(
                     WHEN source = 'haven_extractor' THEN 'haven_extractor'
                     ELSE 'manual'
                 END as source_type,
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected,
-                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
-            FROM pending_systems
+                SUM(total) as total,
+                SUM(approved) as approved,
+                SUM(rejected) as rejected,
+                SUM(pending) as pending
+            FROM analytics_submission_daily
             WHERE 1=1 {tag_filter} {date_filter}
             GROUP BY source_type
             ORDER BY total DESC
@@ -596,19 +537,15 @@ async def get_extractor_summary(
         active_users_7d = cursor.fetchone()[0]
 
         # Total extractor submissions (with optional community filter)
-        tag_filter = ''
-        tag_params = []
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            tag_params = [discord_tag]
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
 
         cursor.execute(f'''
             SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected,
-                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
-            FROM pending_systems
+                COALESCE(SUM(total), 0) as total,
+                SUM(approved) as approved,
+                SUM(rejected) as rejected,
+                SUM(pending) as pending
+            FROM analytics_submission_daily
             WHERE source = 'haven_extractor' {tag_filter}
         ''', tag_params)
         ext_stats = dict(cursor.fetchone())
@@ -720,57 +657,25 @@ async def get_discovery_leaderboard(
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ''
-        date_params = []
-
-        if period == 'week':
-            date_filter = " AND submission_timestamp >= date('now', '-7 days')"
-        elif period == 'month':
-            date_filter = " AND submission_timestamp >= date('now', '-30 days')"
-        elif period == 'year':
-            date_filter = " AND submission_timestamp >= date('now', '-365 days')"
-        elif start_date:
-            date_filter = " AND submission_timestamp >= ?"
-            date_params.append(start_date)
-            if end_date:
-                date_filter += " AND submission_timestamp <= ?"
-                date_params.append(end_date + 'T23:59:59')
-
-        # Build community filter
-        tag_filter = ''
-        tag_params = []
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            tag_params = [discord_tag]
-
-        # Normalize discovered_by: trim, remove #, strip trailing 4-digit discriminator, lowercase
-        raw_name = "COALESCE(NULLIF(NULLIF(discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
-        trimmed_name = f"TRIM(REPLACE({raw_name}, '#', ''))"
-        normalized_name = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({trimmed_name}) > 4
-                    AND SUBSTR({trimmed_name}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({trimmed_name}) = 4
-                        OR SUBSTR({trimmed_name}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({trimmed_name}, 1, LENGTH({trimmed_name}) - 4)
-                ELSE {trimmed_name}
-            END
-        ))"""
+        date_filter, date_params = rollup_date_filter(period, start_date, end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
 
+        # Grouped from analytics_discovery_daily (migration 1.101.0), whose
+        # contributor column already holds discovered_by folded the way this
+        # leaderboard always grouped it (trim, drop '#' and a trailing 4-digit
+        # discriminator, lowercase).
         query = f'''
             SELECT
-                MAX(discovered_by) as discoverer,
-                {normalized_name} as normalized_name,
-                COUNT(*) as total_discoveries,
+                MAX(display_name) as discoverer,
+                contributor as normalized_name,
+                SUM(total) as total_discoveries,
                 COUNT(DISTINCT type_slug) as unique_types,
                 GROUP_CONCAT(DISTINCT type_slug) as type_slugs,
-                MIN(submission_timestamp) as first_discovery,
-                MAX(submission_timestamp) as last_discovery
-            FROM discoveries
-            WHERE 1=1 {tag_filter} {date_filter}
-            GROUP BY {normalized_name}
-            HAVING {normalized_name} != 'unknown'
+                MIN(first_at) as first_discovery,
+                MAX(last_at) as last_discovery
+            FROM analytics_discovery_daily
+            WHERE contributor != 'unknown' {tag_filter} {date_filter}
+            GROUP BY contributor
             ORDER BY total_discoveries DESC
             LIMIT ?
         '''
@@ -788,9 +693,9 @@ async def get_discovery_leaderboard(
 
         # Get totals
         total_query = f'''
-            SELECT COUNT(*) as total_discoveries,
-                   COUNT(DISTINCT {normalized_name}) as total_discoverers
-            FROM discoveries
+            SELECT COALESCE(SUM(total), 0) as total_discoveries,
+                   COUNT(DISTINCT contributor) as total_discoverers
+            FROM analytics_discovery_daily
             WHERE 1=1 {tag_filter} {date_filter}
         '''
         cursor.execute(total_query, tag_params + date_params)
@@ -835,29 +740,26 @@ async def get_discovery_timeline(
         if not end_date:
             end_date = datetime.now().strftime('%Y-%m-%d')
 
-        # Date grouping
+        # Date grouping (rollup buckets are whole days)
         if granularity == 'week':
-            date_format = "strftime('%Y-W%W', submission_timestamp)"
+            date_format = "strftime('%Y-W%W', day)"
         elif granularity == 'month':
-            date_format = "strftime('%Y-%m', submission_timestamp)"
+            date_format = "strftime('%Y-%m', day)"
         else:
-            date_format = "date(submission_timestamp)"
+            date_format = "day"
 
-        tag_filter = ''
-        params = [start_date, end_date + 'T23:59:59']
-
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            params.append(discord_tag)
+        date_filter, params = rollup_date_filter(start_date=start_date, end_date=end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
+        params += tag_params
 
         query = f'''
             SELECT
                 {date_format} as date,
-                COUNT(*) as discoveries,
+                SUM(total) as discoveries,
                 COUNT(DISTINCT type_slug) as unique_types,
-                COUNT(DISTINCT LOWER(TRIM(discovered_by))) as unique_discoverers
-            FROM discoveries
-            WHERE submission_timestamp >= ? AND submission_timestamp <= ? {tag_filter}
+                COUNT(DISTINCT contributor) as unique_discoverers
+            FROM analytics_discovery_daily
+            WHERE 1=1 {date_filter} {tag_filter}
             GROUP BY {date_format}
             ORDER BY date ASC
         '''
@@ -897,45 +799,19 @@ async def get_discovery_type_breakdown(
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ''
-        date_params = []
+        date_filter, date_params = rollup_date_filter(period, start_date, end_date)
+        tag_filter, tag_params = rollup_tag_filter(discord_tag)
 
-        if period == 'week':
-            date_filter = " AND submission_timestamp >= date('now', '-7 days')"
-        elif period == 'month':
-            date_filter = " AND submission_timestamp >= date('now', '-30 days')"
-        elif period == 'year':
-            date_filter = " AND submission_timestamp >= date('now', '-365 days')"
-        elif start_date:
-            date_filter = " AND submission_timestamp >= ?"
-            date_params.append(start_date)
-            if end_date:
-                date_filter += " AND submission_timestamp <= ?"
-                date_params.append(end_date + 'T23:59:59')
-
-        tag_filter = ''
-        tag_params = []
-        if discord_tag:
-            tag_filter = ' AND discord_tag = ?'
-            tag_params = [discord_tag]
-
-        query = f'''
-            SELECT
-                COALESCE(type_slug, 'other') as type_slug,
-                COALESCE(discovery_type, 'Other') as discovery_type,
-                COUNT(*) as count
-            FROM discoveries
+        cursor.execute(f'''
+            SELECT type_slug, SUM(total) as count
+            FROM analytics_discovery_daily
             WHERE 1=1 {tag_filter} {date_filter}
             GROUP BY type_slug
             ORDER BY count DESC
-        '''
-
-        params = tag_params + date_params
-        cursor.execute(query, params)
+        ''', tag_params + date_params)
         rows = cursor.fetchall()
 
-        breakdown = [dict(row) for row in rows]
+        breakdown = _discovery_type_rows(rows)
 
         # Calculate percentages
         total = sum(item['count'] for item in breakdown)
@@ -972,208 +848,128 @@ async def get_partner_overview(
     is_super = session_data.get('user_type') == 'super_admin'
     discord_tag = _scope_analytics_discord_tag(session_data, discord_tag)
 
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Build date filter for pending_systems
-        sub_date_filter = ''
-        sub_date_params = []
-        disc_date_filter = ''
-        disc_date_params = []
-
-        if period == 'week':
-            sub_date_filter = " AND submission_date >= date('now', '-7 days')"
-            disc_date_filter = " AND submission_timestamp >= date('now', '-7 days')"
-        elif period == 'month':
-            sub_date_filter = " AND submission_date >= date('now', '-30 days')"
-            disc_date_filter = " AND submission_timestamp >= date('now', '-30 days')"
-        elif period == 'year':
-            sub_date_filter = " AND submission_date >= date('now', '-365 days')"
-            disc_date_filter = " AND submission_timestamp >= date('now', '-365 days')"
-        elif start_date:
-            sub_date_filter = " AND submission_date >= ?"
-            sub_date_params.append(start_date)
-            disc_date_filter = " AND submission_timestamp >= ?"
-            disc_date_params.append(start_date)
-            if end_date:
-                sub_date_filter += " AND submission_date <= ?"
-                sub_date_params.append(end_date + 'T23:59:59')
-                disc_date_filter += " AND submission_timestamp <= ?"
-                disc_date_params.append(end_date + 'T23:59:59')
-
-        sub_tag_filter = ''
-        sub_tag_params = []
-        disc_tag_filter = ''
-        disc_tag_params = []
-        if discord_tag:
-            sub_tag_filter = ' AND discord_tag = ?'
-            sub_tag_params = [discord_tag]
-            disc_tag_filter = ' AND discord_tag = ?'
-            disc_tag_params = [discord_tag]
-
-        # Build source filter for submission queries (manual includes legacy NULL rows)
-        sub_source_filter = ''
-        sub_source_params = []
-        if source:
-            if source == 'manual':
-                sub_source_filter = " AND COALESCE(source, 'manual') = 'manual'"
-            else:
-                sub_source_filter = ' AND source = ?'
-                sub_source_params = [source]
-
-        # --- System submission stats ---
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as total_submissions,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as total_approved,
-                SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as total_rejected,
-                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as total_pending
-            FROM pending_systems
-            WHERE 1=1 {sub_tag_filter} {sub_date_filter} {sub_source_filter}
-        ''', sub_tag_params + sub_date_params + sub_source_params)
-        sub_stats = dict(cursor.fetchone())
-
-        # Active submitters (unique normalized usernames)
-        raw_username = '''COALESCE(
-            NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'),
-            personal_discord_username,
-            json_extract(system_data, '$.discovered_by'),
-            'Unknown'
-        )'''
-        trimmed_username = f"TRIM(REPLACE({raw_username}, '#', ''))"
-        normalized_sub = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({trimmed_username}) > 4
-                    AND SUBSTR({trimmed_username}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({trimmed_username}) = 4
-                        OR SUBSTR({trimmed_username}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({trimmed_username}, 1, LENGTH({trimmed_username}) - 4)
-                ELSE {trimmed_username}
-            END
-        ))"""
-
-        cursor.execute(f'''
-            SELECT COUNT(DISTINCT {normalized_sub}) as active_submitters
-            FROM pending_systems
-            WHERE 1=1 {sub_tag_filter} {sub_date_filter} {sub_source_filter}
-              AND {normalized_sub} != 'unknown'
-        ''', sub_tag_params + sub_date_params + sub_source_params)
-        active_submitters = cursor.fetchone()['active_submitters']
-
-        # --- Discovery stats ---
-        cursor.execute(f'''
-            SELECT
-                COUNT(*) as total_discoveries,
-                COUNT(DISTINCT LOWER(TRIM(discovered_by))) as active_discoverers,
-                COUNT(DISTINCT type_slug) as unique_types
-            FROM discoveries
-            WHERE 1=1 {disc_tag_filter} {disc_date_filter}
-        ''', disc_tag_params + disc_date_params)
-        disc_stats = dict(cursor.fetchone())
-
-        # --- Top 5 submitters ---
-        cursor.execute(f'''
-            SELECT
-                MAX({raw_username}) as username,
-                {normalized_sub} as normalized_name,
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as approved
-            FROM pending_systems
-            WHERE 1=1 {sub_tag_filter} {sub_date_filter} {sub_source_filter}
-            GROUP BY {normalized_sub}
-            HAVING {normalized_sub} != 'unknown'
-            ORDER BY total DESC
-            LIMIT 5
-        ''', sub_tag_params + sub_date_params + sub_source_params)
-        top_submitters = [dict(row) for row in cursor.fetchall()]
-
-        # --- Top 5 discoverers ---
-        raw_disc = "COALESCE(NULLIF(NULLIF(discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
-        trimmed_disc = f"TRIM(REPLACE({raw_disc}, '#', ''))"
-        normalized_disc = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({trimmed_disc}) > 4
-                    AND SUBSTR({trimmed_disc}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({trimmed_disc}) = 4
-                        OR SUBSTR({trimmed_disc}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({trimmed_disc}, 1, LENGTH({trimmed_disc}) - 4)
-                ELSE {trimmed_disc}
-            END
-        ))"""
-
-        cursor.execute(f'''
-            SELECT
-                MAX(discovered_by) as discoverer,
-                {normalized_disc} as normalized_name,
-                COUNT(*) as total,
-                COUNT(DISTINCT type_slug) as unique_types
-            FROM discoveries
-            WHERE 1=1 {disc_tag_filter} {disc_date_filter}
-            GROUP BY {normalized_disc}
-            HAVING {normalized_disc} != 'unknown'
-            ORDER BY total DESC
-            LIMIT 5
-        ''', disc_tag_params + disc_date_params)
-        top_discoverers = [dict(row) for row in cursor.fetchall()]
-
-        # --- Activity trend (last 7 days of submissions + discoveries) ---
-        cursor.execute(f'''
-            SELECT
-                date(submission_date) as date,
-                COUNT(*) as submissions
-            FROM pending_systems
-            WHERE submission_date >= date('now', '-7 days')
-              {sub_tag_filter} {sub_source_filter}
-            GROUP BY date(submission_date)
-            ORDER BY date ASC
-        ''', sub_tag_params + sub_source_params)
-        sub_trend = {row['date']: row['submissions'] for row in cursor.fetchall()}
-
-        cursor.execute(f'''
-            SELECT
-                date(submission_timestamp) as date,
-                COUNT(*) as discoveries
-            FROM discoveries
-            WHERE submission_timestamp >= date('now', '-7 days')
-              {disc_tag_filter}
-            GROUP BY date(submission_timestamp)
-            ORDER BY date ASC
-        ''', disc_tag_params)
-        disc_trend = {row['date']: row['discoveries'] for row in cursor.fetchall()}
-
-        # Merge trends
-        all_dates = sorted(set(list(sub_trend.keys()) + list(disc_trend.keys())))
-        activity_trend = [
-            {
-                'date': d,
-                'submissions': sub_trend.get(d, 0),
-                'discoveries': disc_trend.get(d, 0)
-            }
-            for d in all_dates
-        ]
-
-        return {
-            'submissions': {
-                'total': sub_stats.get('total_submissions', 0),
-                'approved': sub_stats.get('total_approved', 0),
-                'rejected': sub_stats.get('total_rejected', 0),
-                'pending': sub_stats.get('total_pending', 0),
-                'active_submitters': active_submitters
-            },
-            'discoveries': {
-                'total': disc_stats.get('total_discoveries', 0),
-                'active_discoverers': disc_stats.get('active_discoverers', 0),
-                'unique_types': disc_stats.get('unique_types', 0)
-            },
-            'top_submitters': top_submitters,
-            'top_discoverers': top_discoverers,
-            'activity_trend': activity_trend
+    return await run_read(_partner_overview_query, discord_tag, source,
+                          start_date, end_date, period)
+
+
+def _partner_overview_query(conn, discord_tag, source, start_date, end_date, period):
+    """Query half of /api/analytics/partner-overview. Runs on a pooled reader
+    connection in a DB worker thread (see db.run_read) — this is the heaviest
+    dashboard aggregate and used to stall the event loop for every request."""
+    cursor = conn.cursor()
+
+    # Every aggregate here reads the daily rollups (migration 1.101.0) rather
+    # than pending_systems / discoveries.
+    date_filter, date_params = rollup_date_filter(period, start_date, end_date)
+    tag_filter, tag_params = rollup_tag_filter(discord_tag)
+    source_filter, source_params = rollup_source_filter(source)
+    sub_params = tag_params + date_params + source_params
+    disc_params = tag_params + date_params
+
+    # --- System submission stats ---
+    cursor.execute(f'''
+        SELECT
+            COALESCE(SUM(total), 0) as total_submissions,
+            SUM(approved) as total_approved,
+            SUM(rejected) as total_rejected,
+            SUM(pending) as total_pending,
+            COUNT(DISTINCT CASE WHEN contributor NOT IN ('', 'unknown') THEN contributor END) as active_submitters
+        FROM analytics_submission_daily
+        WHERE 1=1 {tag_filter} {date_filter} {source_filter}
+    ''', sub_params)
+    sub_stats = dict(cursor.fetchone())
+    active_submitters = sub_stats.pop('active_submitters')
+
+    # --- Discovery stats ---
+    cursor.execute(f'''
+        SELECT
+            COALESCE(SUM(total), 0) as total_discoveries,
+            COUNT(DISTINCT contributor) as active_discoverers,
+            COUNT(DISTINCT type_slug) as unique_types
+        FROM analytics_discovery_daily
+        WHERE 1=1 {tag_filter} {date_filter}
+    ''', disc_params)
+    disc_stats = dict(cursor.fetchone())
+
+    # --- Top 5 submitters ---
+    cursor.execute(f'''
+        SELECT
+            MAX(display_name) as username,
+            contributor as normalized_name,
+            SUM(total) as total,
+            SUM(approved) as approved
+        FROM analytics_submission_daily
+        WHERE contributor NOT IN ('', 'unknown') {tag_filter} {date_filter} {source_filter}
+        GROUP BY contributor
+        ORDER BY total DESC
+        LIMIT 5
+    ''', sub_params)
+    top_submitters = [dict(row) for row in cursor.fetchall()]
+
+    # --- Top 5 discoverers ---
+    cursor.execute(f'''
+        SELECT
+            MAX(display_name) as discoverer,
+            contributor as normalized_name,
+            SUM(total) as total,
+            COUNT(DISTINCT type_slug) as unique_types
+        FROM analytics_discovery_daily
+        WHERE contributor != 'unknown' {tag_filter} {date_filter}
+        GROUP BY contributor
+        ORDER BY total DESC
+        LIMIT 5
+    ''', disc_params)
+    top_discoverers = [dict(row) for row in cursor.fetchall()]
+
+    # --- Activity trend (last 7 days of submissions + discoveries) ---
+    cursor.execute(f'''
+        SELECT day as date, SUM(total) as submissions
+        FROM analytics_submission_daily
+        WHERE day >= date('now', '-7 days')
+          {tag_filter} {source_filter}
+        GROUP BY day
+        ORDER BY date ASC
+    ''', tag_params + source_params)
+    sub_trend = {row['date']: row['submissions'] for row in cursor.fetchall()}
+
+    cursor.execute(f'''
+        SELECT day as date, SUM(total) as discoveries
+        FROM analytics_discovery_daily
+        WHERE day >= date('now', '-7 days')
+          {tag_filter}
+        GROUP BY day
+        ORDER BY date ASC
+    ''', tag_params)
+    disc_trend = {row['date']: row['discoveries'] for row in cursor.fetchall()}
+
+    # Merge trends
+    all_dates = sorted(set(list(sub_trend.keys()) + list(disc_trend.keys())))
+    activity_trend = [
+        {
+            'date': d,
+            'submissions': sub_trend.get(d, 0),
+            'discoveries': disc_trend.get(d, 0)
         }
-    finally:
-        if conn:
-            conn.close()
+        for d in all_dates
+    ]
+
+    return {
+        'submissions': {
+            'total': sub_stats.get('total_submissions', 0),
+            'approved': sub_stats.get('total_approved', 0),
+            'rejected': sub_stats.get('total_rejected', 0),
+            'pending': sub_stats.get('total_pending', 0),
+            'active_submitters': active_submitters
+        },
+        'discoveries': {
+            'total': disc_stats.get('total_discoveries', 0),
+            'active_discoverers': disc_stats.get('active_discoverers', 0),
+            'unique_types': disc_stats.get('unique_types', 0)
+        },
+        'top_submitters': top_submitters,
+        'top_discoverers': top_discoverers,
+        'activity_trend': activity_trend
+    }
 
 
 # ============================================================================
@@ -1211,22 +1007,22 @@ async def public_community_overview():
         ''')
         sys_rows = {r['tag']: dict(r) for r in cursor.fetchall()}
 
-        # Discoveries aggregate per normalized tag
+        # Discoveries aggregate per normalized tag (daily rollup; NULL tags are stored as '')
         cursor.execute(f'''
             SELECT {norm} AS tag,
-                   COUNT(*) AS total_discoveries
-            FROM discoveries
+                   SUM(total) AS total_discoveries
+            FROM analytics_discovery_daily
             GROUP BY tag
         ''')
         disc_rows = {r['tag']: dict(r) for r in cursor.fetchall()}
 
-        # Upload method split per normalized tag (from approved pending_systems only)
+        # Upload method split per normalized tag (approved submissions, from the daily rollup)
         cursor.execute(f'''
             SELECT {norm} AS tag,
-                   SUM(CASE WHEN COALESCE(source, 'manual') = 'manual' THEN 1 ELSE 0 END) AS manual_systems,
-                   SUM(CASE WHEN source = 'haven_extractor' THEN 1 ELSE 0 END) AS extractor_systems
-            FROM pending_systems
-            WHERE status = 'approved'
+                   SUM(CASE WHEN source = 'manual' THEN approved ELSE 0 END) AS manual_systems,
+                   SUM(CASE WHEN source = 'haven_extractor' THEN approved ELSE 0 END) AS extractor_systems
+            FROM analytics_submission_daily
+            WHERE approved > 0
             GROUP BY tag
         ''')
         source_rows = {r['tag']: dict(r) for r in cursor.fetchall()}
@@ -1336,24 +1132,14 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
             tag_filter = ' AND discord_tag = ?'
             tag_params = [community]
 
-        # Username normalization (same pattern as admin leaderboard)
+        # Contributor key: the indexed username_normalized column (1.72.0 /
+        # 1.102.0), written by services.auth_service.contributor_key.
         raw_username = '''COALESCE(
             NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'),
             personal_discord_username,
             json_extract(system_data, '$.discovered_by'),
             'Unknown'
         )'''
-        trimmed_username = f"TRIM(REPLACE({raw_username}, '#', ''))"
-        normalized_username = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({trimmed_username}) > 4
-                    AND SUBSTR({trimmed_username}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({trimmed_username}) = 4
-                        OR SUBSTR({trimmed_username}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({trimmed_username}, 1, LENGTH({trimmed_username}) - 4)
-                ELSE {trimmed_username}
-            END
-        ))"""
 
         tag_display = "COALESCE(NULLIF(discord_tag, ''), 'Personal')"
 
@@ -1361,7 +1147,7 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
         query = f'''
             SELECT
                 MAX({raw_username}) as username,
-                {normalized_username} as normalized_name,
+                username_normalized as normalized_name,
                 GROUP_CONCAT(DISTINCT {tag_display}) as discord_tags,
                 SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) as total_systems,
                 SUM(CASE WHEN status = 'approved' AND COALESCE(source, 'manual') = 'manual' THEN 1 ELSE 0 END) as manual_count,
@@ -1369,8 +1155,9 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
                 MAX(submission_date) as last_activity
             FROM pending_systems
             WHERE status = 'approved' {tag_filter}
-            GROUP BY {normalized_username}
-            HAVING {normalized_username} != 'unknown' AND total_systems > 0
+              AND username_normalized IS NOT NULL AND username_normalized != 'unknown'
+            GROUP BY username_normalized
+            HAVING total_systems > 0
             ORDER BY total_systems DESC
             LIMIT ?
         '''
@@ -1386,19 +1173,6 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
             contributors[norm]['total_discoveries'] = 0
 
         # Discovery counts per contributor
-        disc_raw = "COALESCE(NULLIF(NULLIF(discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
-        disc_trimmed = f"TRIM(REPLACE({disc_raw}, '#', ''))"
-        disc_normalized = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({disc_trimmed}) > 4
-                    AND SUBSTR({disc_trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({disc_trimmed}) = 4
-                        OR SUBSTR({disc_trimmed}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({disc_trimmed}, 1, LENGTH({disc_trimmed}) - 4)
-                ELSE {disc_trimmed}
-            END
-        ))"""
-
         disc_tag_filter = ''
         disc_tag_params = []
         if community:
@@ -1406,10 +1180,10 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
             disc_tag_params = [community]
 
         disc_query = f'''
-            SELECT {disc_normalized} as normalized_name, COUNT(*) as total_discoveries
+            SELECT username_normalized as normalized_name, COUNT(*) as total_discoveries
             FROM discoveries
-            WHERE 1=1 {disc_tag_filter}
-            GROUP BY {disc_normalized}
+            WHERE username_normalized IS NOT NULL {disc_tag_filter}
+            GROUP BY username_normalized
         '''
         cursor.execute(disc_query, disc_tag_params)
         for row in cursor.fetchall():
@@ -1424,10 +1198,10 @@ async def public_contributors(community: Optional[str] = None, limit: int = 50):
 
         # Total unique contributors
         count_query = f'''
-            SELECT COUNT(DISTINCT {normalized_username}) as cnt
+            SELECT COUNT(DISTINCT username_normalized) as cnt
             FROM pending_systems
             WHERE status = 'approved' {tag_filter}
-              AND {normalized_username} != 'unknown'
+              AND username_normalized != 'unknown'
         '''
         cursor.execute(count_query, tag_params)
         total = cursor.fetchone()['cnt'] or 0
@@ -1462,44 +1236,31 @@ async def public_activity_timeline(granularity: str = 'week', months: int = 6):
 
         date_cutoff = f"date('now', '-{months} months')"
 
-        # Manual systems timeline (source column is on pending_systems, not systems)
-        manual_query = f'''
-            SELECT strftime('{date_fmt}', submission_date) as date,
-                   COUNT(*) as count
-            FROM pending_systems
-            WHERE submission_date >= {date_cutoff}
-              AND status = 'approved'
-              AND COALESCE(source, 'manual') = 'manual'
-            GROUP BY date
-            ORDER BY date
-        '''
-        cursor.execute(manual_query)
-        manual_data = {r['date']: r['count'] for r in cursor.fetchall()}
-
-        # Extractor systems timeline
-        extractor_query = f'''
-            SELECT strftime('{date_fmt}', submission_date) as date,
-                   COUNT(*) as count
-            FROM pending_systems
-            WHERE submission_date >= {date_cutoff}
-              AND status = 'approved'
-              AND source = 'haven_extractor'
+        # Systems timeline by source (source column is on pending_systems, not
+        # systems — read through the daily submission rollup)
+        cursor.execute(f'''
+            SELECT strftime('{date_fmt}', day) as date,
+                   SUM(CASE WHEN source = 'manual' THEN approved ELSE 0 END) as manual,
+                   SUM(CASE WHEN source = 'haven_extractor' THEN approved ELSE 0 END) as extractor
+            FROM analytics_submission_daily
+            WHERE day >= {date_cutoff}
             GROUP BY date
+            HAVING manual > 0 OR extractor > 0
             ORDER BY date
-        '''
-        cursor.execute(extractor_query)
-        extractor_data = {r['date']: r['count'] for r in cursor.fetchall()}
+        ''')
+        sys_rows = cursor.fetchall()
+        manual_data = {r['date']: r['manual'] for r in sys_rows if r['manual']}
+        extractor_data = {r['date']: r['extractor'] for r in sys_rows if r['extractor']}
 
         # Discoveries timeline
-        disc_query = f'''
-            SELECT strftime('{date_fmt}', submission_timestamp) as date,
-                   COUNT(*) as discoveries
-            FROM discoveries
-            WHERE submission_timestamp >= {date_cutoff}
+        cursor.execute(f'''
+            SELECT strftime('{date_fmt}', day) as date,
+                   SUM(total) as discoveries
+            FROM analytics_discovery_daily
+            WHERE day >= {date_cutoff}
             GROUP BY date
             ORDER BY date
-        '''
-        cursor.execute(disc_query)
+        ''')
         disc_data = {r['date']: r['discoveries'] for r in cursor.fetchall()}
 
         # Merge into combined timeline
@@ -1531,16 +1292,13 @@ async def public_discovery_breakdown():
         cursor = conn.cursor()
 
         cursor.execute('''
-            SELECT
-                COALESCE(type_slug, 'other') as type_slug,
-                COALESCE(discovery_type, 'Other') as discovery_type,
-                COUNT(*) as count
-            FROM discoveries
+            SELECT type_slug, SUM(total) as count
+            FROM analytics_discovery_daily
             GROUP BY type_slug
             ORDER BY count DESC
         ''')
         rows = cursor.fetchall()
-        breakdown = [dict(row) for row in rows]
+        breakdown = _discovery_type_rows(rows)
 
         total = sum(item['count'] for item in breakdown)
         for item in breakdown:
@@ -1639,36 +1397,18 @@ async def public_user_stats(username: str):
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Normalize the input username (same logic as leaderboard)
-        input_clean = username.replace('#', '').strip()
-        # Strip trailing 4-digit Discord discriminator
-        if (len(input_clean) > 4
-                and input_clean[-4:].isdigit()
-                and (len(input_clean) == 4 or not input_clean[-5].isdigit())):
-            input_clean = input_clean[:-4]
-        input_normalized = input_clean.lower().strip()
-
+        # Normalize the input the same way the stored contributor keys were
+        # written, so both lookups below are index seeks on username_normalized.
+        input_normalized = contributor_key(username)
         if not input_normalized:
             raise HTTPException(status_code=400, detail="Invalid username")
 
-        # Username normalization SQL (matches /api/public/contributors exactly)
         raw_username = '''COALESCE(
             NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'),
             personal_discord_username,
             json_extract(system_data, '$.discovered_by'),
             'Unknown'
         )'''
-        trimmed_username = f"TRIM(REPLACE({raw_username}, '#', ''))"
-        normalized_username = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({trimmed_username}) > 4
-                    AND SUBSTR({trimmed_username}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({trimmed_username}) = 4
-                        OR SUBSTR({trimmed_username}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({trimmed_username}, 1, LENGTH({trimmed_username}) - 4)
-                ELSE {trimmed_username}
-            END
-        ))"""
 
         # Systems stats from pending_systems (approved only)
         cursor.execute(f'''
@@ -1680,31 +1420,18 @@ async def public_user_stats(username: str):
                 SUM(CASE WHEN source = 'haven_extractor' THEN 1 ELSE 0 END) as extractor_count,
                 MAX(submission_date) as last_system_activity
             FROM pending_systems
-            WHERE status = 'approved' AND {normalized_username} = ?
+            WHERE username_normalized = ? AND status = 'approved'
         ''', (input_normalized,))
         sys_row = cursor.fetchone()
 
         total_systems = sys_row['total_systems'] if sys_row and sys_row['total_systems'] else 0
 
         # Discovery stats
-        disc_raw = "COALESCE(NULLIF(NULLIF(discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
-        disc_trimmed = f"TRIM(REPLACE({disc_raw}, '#', ''))"
-        disc_normalized = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({disc_trimmed}) > 4
-                    AND SUBSTR({disc_trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({disc_trimmed}) = 4
-                        OR SUBSTR({disc_trimmed}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({disc_trimmed}, 1, LENGTH({disc_trimmed}) - 4)
-                ELSE {disc_trimmed}
-            END
-        ))"""
-
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT COUNT(*) as total_discoveries,
                    MAX(submission_timestamp) as last_discovery_activity
             FROM discoveries
-            WHERE {disc_normalized} = ?
+            WHERE username_normalized = ?
         ''', (input_normalized,))
         disc_row = cursor.fetchone()
 
@@ -1764,15 +1491,10 @@ async def public_voyager_fingerprint(username: str):
     if not username:
         raise HTTPException(status_code=400, detail='username required')
 
-    # Same normalization as /api/public/user-stats and the contributor leaderboard.
-    # URL slugs use hyphens for spaces (so /voyager/hiroki-rinn resolves to
-    # "Hiroki Rinn") — convert hyphens back to spaces before the DB lookup.
-    input_clean = username.replace('#', '').strip()
-    if (len(input_clean) > 4
-            and input_clean[-4:].isdigit()
-            and (len(input_clean) == 4 or not input_clean[-5].isdigit())):
-        input_clean = input_clean[:-4]
-    input_normalized = input_clean.lower().replace('-', ' ').strip()
+    # Same contributor key as /api/public/user-stats and the stored
+    # username_normalized columns. It drops spaces and hyphens, so URL slugs
+    # (/voyager/hiroki-rinn) resolve to "Hiroki Rinn" without special casing.
+    input_normalized = contributor_key(username)
     if not input_normalized:
         raise HTTPException(status_code=400, detail='Invalid username')
 
@@ -1782,19 +1504,6 @@ async def public_voyager_fingerprint(username: str):
         json_extract(system_data, '$.discovered_by'),
         'Unknown'
     )'''
-    trimmed = f"TRIM(REPLACE({raw_username}, '#', ''))"
-    # Outer REPLACE collapses hyphens to spaces so DB names containing hyphens
-    # match slug input as well (rare, but keeps the two sides symmetric).
-    norm = f"""REPLACE(LOWER(TRIM(
-        CASE
-            WHEN LENGTH({trimmed}) > 4
-                AND SUBSTR({trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                AND (LENGTH({trimmed}) = 4
-                    OR SUBSTR({trimmed}, -5, 1) NOT GLOB '[0-9]')
-            THEN SUBSTR({trimmed}, 1, LENGTH({trimmed}) - 4)
-            ELSE {trimmed}
-        END
-    )), '-', ' ')"""
 
     conn = None
     try:
@@ -1812,7 +1521,7 @@ async def public_voyager_fingerprint(username: str):
                 MIN(submission_date) as first_submission,
                 MAX(submission_date) as last_submission
             FROM pending_systems
-            WHERE status = 'approved' AND {norm} = ?
+            WHERE username_normalized = ? AND status = 'approved'
             GROUP BY community
         ''', (input_normalized,))
         community_rows = [dict(r) for r in cursor.fetchall()]
@@ -1831,12 +1540,14 @@ async def public_voyager_fingerprint(username: str):
         primary = max(community_rows, key=lambda r: (r['systems'], -1 if not r['first_submission'] else 0))
 
         # ----- Rank within primary community -----
-        cursor.execute(f'''
-            SELECT {norm} as nname, COUNT(*) as cnt
-            FROM pending_systems
-            WHERE status = 'approved'
-              AND COALESCE(NULLIF(discord_tag, ''), 'Personal') = ?
-            GROUP BY {norm}
+        # Ranks come from the daily submission rollup (1.101.0), which is
+        # already grouped by the same contributor key.
+        cursor.execute('''
+            SELECT contributor as nname, SUM(approved) as cnt
+            FROM analytics_submission_daily
+            WHERE COALESCE(NULLIF(discord_tag, ''), 'Personal') = ?
+            GROUP BY contributor
+            HAVING cnt > 0
             ORDER BY cnt DESC
         ''', (primary['community'],))
         primary_ranks = [(r['nname'], r['cnt']) for r in cursor.fetchall()]
@@ -1845,12 +1556,12 @@ async def public_voyager_fingerprint(username: str):
         primary_pct = round(primary['systems'] / community_total * 100, 1) if community_total else 0
 
         # ----- Global rank across all communities -----
-        cursor.execute(f'''
-            SELECT {norm} as nname, COUNT(*) as cnt
-            FROM pending_systems
-            WHERE status = 'approved'
-            GROUP BY {norm}
-            HAVING {norm} != 'unknown'
+        cursor.execute('''
+            SELECT contributor as nname, SUM(approved) as cnt
+            FROM analytics_submission_daily
+            WHERE contributor NOT IN ('', 'unknown')
+            GROUP BY contributor
+            HAVING cnt > 0
             ORDER BY cnt DESC
         ''')
         global_ranks = [(r['nname'], r['cnt']) for r in cursor.fetchall()]
@@ -1858,10 +1569,10 @@ async def public_voyager_fingerprint(username: str):
         community_count = len(community_rows)
 
         # ----- Galaxy reach (top 5 by system count + tail count) -----
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT COALESCE(galaxy, 'Euclid') as galaxy, COUNT(*) as systems
             FROM pending_systems
-            WHERE status = 'approved' AND {norm} = ?
+            WHERE username_normalized = ? AND status = 'approved'
             GROUP BY galaxy
             ORDER BY systems DESC
         ''', (input_normalized,))
@@ -1871,30 +1582,19 @@ async def public_voyager_fingerprint(username: str):
         # ----- Per-user identifier on the systems table -----
         # Most pending_systems rows for legacy CSV imports have NULL glyph_code/region_x,
         # so joining ps→systems via glyph yields nothing. Identify the user's systems
-        # directly via discovered_by/personal_discord_username on the systems row,
-        # using the same normalization. Counts here are independent of the leaderboard
-        # (which is why we keep pending_systems as the canonical "systems contributed"
-        # number) but they're correct for region/lifeform/completeness analysis.
-        sys_raw = "COALESCE(NULLIF(NULLIF(s.discovered_by, 'Anonymous'), 'anonymous'), s.personal_discord_username, s.last_updated_by, 'Unknown')"
-        sys_trimmed = f"TRIM(REPLACE({sys_raw}, '#', ''))"
-        sys_norm = f"""LOWER(TRIM(
-            CASE
-                WHEN LENGTH({sys_trimmed}) > 4
-                    AND SUBSTR({sys_trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
-                    AND (LENGTH({sys_trimmed}) = 4
-                        OR SUBSTR({sys_trimmed}, -5, 1) NOT GLOB '[0-9]')
-                THEN SUBSTR({sys_trimmed}, 1, LENGTH({sys_trimmed}) - 4)
-                ELSE {sys_trimmed}
-            END
-        ))"""
+        # directly via systems.username_normalized (discovered_by →
+        # personal_discord_username → last_updated_by, same key). Counts here are
+        # independent of the leaderboard (which is why we keep pending_systems as
+        # the canonical "systems contributed" number) but they're correct for
+        # region/lifeform/completeness analysis.
 
         # ----- Lifeform balance (from systems table directly) -----
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT
                 LOWER(COALESCE(s.dominant_lifeform, 'Unknown')) as lifeform,
                 COUNT(*) as cnt
             FROM systems s
-            WHERE {sys_norm} = ?
+            WHERE s.username_normalized = ?
               AND s.dominant_lifeform IS NOT NULL
               -- Exclude no-race answers from a "races encountered" rollup.
               -- Both 'None' (never had a race) and 'Abandoned' (race left)
@@ -1912,7 +1612,7 @@ async def public_voyager_fingerprint(username: str):
             lifeforms.append({'name': r['lifeform'].title(), 'systems': r['cnt'], 'pct': pct})
 
         # ----- Top named regions (from systems → regions JOIN) -----
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT
                 r.custom_name as region_name,
                 COUNT(*) as systems
@@ -1922,7 +1622,7 @@ async def public_voyager_fingerprint(username: str):
                 AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
                 AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
             WHERE r.custom_name IS NOT NULL AND r.custom_name != ''
-              AND {sys_norm} = ?
+              AND s.username_normalized = ?
             GROUP BY s.region_x, s.region_y, s.region_z
             ORDER BY systems DESC
         ''', (input_normalized,))
@@ -1931,7 +1631,7 @@ async def public_voyager_fingerprint(username: str):
         top_regions = [{'name': r['region_name'], 'systems': r['systems']} for r in named_region_rows[:3]]
 
         # ----- First-charted system (from systems table) -----
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT
                 COALESCE(s.name, 'Unknown') as name,
                 r.custom_name as region,
@@ -1942,7 +1642,7 @@ async def public_voyager_fingerprint(username: str):
                 AND s.region_y = r.region_y AND s.region_z = r.region_z
                 AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
                 AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
-            WHERE {sys_norm} = ?
+            WHERE s.username_normalized = ?
               AND COALESCE(s.created_at, s.discovered_at) IS NOT NULL
             ORDER BY COALESCE(s.created_at, s.discovered_at) ASC
             LIMIT 1
@@ -1954,7 +1654,7 @@ async def public_voyager_fingerprint(username: str):
         # Thresholds match score_to_grade() in constants.py: S>=85, A 65-84, B 40-64, C<40.
         # S+ ("fully charted") splits out of S via is_fully_charted so the two
         # are mutually-exclusive buckets (grade_s = S but NOT S+).
-        cursor.execute(f'''
+        cursor.execute('''
             SELECT
                 AVG(COALESCE(s.is_complete, 0)) as avg_score,
                 SUM(CASE WHEN s.is_complete >= 85 AND COALESCE(s.is_fully_charted, 0) = 1 THEN 1 ELSE 0 END) as grade_splus,
@@ -1964,7 +1664,7 @@ async def public_voyager_fingerprint(username: str):
                 SUM(CASE WHEN s.is_complete < 40 THEN 1 ELSE 0 END) as grade_c,
                 COUNT(*) as total_scored
             FROM systems s
-            WHERE {sys_norm} = ?
+            WHERE s.username_normalized = ?
         ''', (input_normalized,))
         grades = dict(cursor.fetchone() or {})
         avg_score = round(grades.get('avg_score') or 0, 1)
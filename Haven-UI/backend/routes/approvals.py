@@ -33,6 +33,9 @@ from db import (
     capture_discovery_links,
     restore_discovery_links,
     set_base_fields,
+    sync_facet_tokens,
+    sync_body_resources,
+    run_write,
 )
 from glyph_decoder import (
     decode_glyph_to_coords,
@@ -53,14 +56,17 @@ from services.auth_service import (
     get_submitter_identity,
     verify_api_key,
     get_or_create_profile,
-    normalize_username_for_dedup,
+    contributor_key,
+    sync_system_contributor_key,
 )
 from services.completeness import (
     calculate_completeness_score,
+    rescore_systems,
     update_completeness_score,
 )
 from services.civilizations import civ_scope_filter, user_can_act_for_civ
 from services.dispatch import fire_and_forget
+from services.filter_facets import invalidate_filter_options
 from services.events import resolve_submission_event_id
 from services.namegen_service import generate_names, looks_like_placeholder_name
 from services.discoveries import (
@@ -331,14 +337,13 @@ async def submit_system(
 
         # Compute username_normalized using the same chain the analytics leaderboard uses
         # (submitted_by → personal_discord_username → discovered_by JSON → 'Unknown'),
-        # via the canonical normalize_username_for_dedup helper. Stored at write time
+        # via the shared contributor_key helper. Stored at write time
         # so the leaderboard can GROUP BY an indexed column.
-        _raw_for_norm = (
-            submitter_identity['username'] if submitter_identity['username'] else submitted_by
+        username_normalized = contributor_key(
+            submitter_identity['username'] if submitter_identity['username'] else submitted_by,
+            personal_discord_username,
+            payload.get('discovered_by'),
         )
-        if not _raw_for_norm or _raw_for_norm in ('Anonymous', 'anonymous'):
-            _raw_for_norm = personal_discord_username or payload.get('discovered_by') or 'Unknown'
-        username_normalized = normalize_username_for_dedup(_raw_for_norm)
 
         # ----- Wizard v1 fields (May 2026 rebuild) -----
         # game_version, submitter_notes, expedition_id are stored as dedicated
@@ -1719,6 +1724,9 @@ async def approve_system(
 
         # Calculate and store completeness score
         update_completeness_score(cursor, system_id)
+        sync_system_contributor_key(cursor, system_id)
+        sync_facet_tokens(cursor, system_id)
+        sync_body_resources(cursor, system_id)
 
         # Promote any co-submitted discoveries drafts now that planets/moons
         # have IDs we can resolve names against. Runs inside the same
@@ -1772,6 +1780,7 @@ async def approve_system(
         ))
 
         conn.commit()
+        invalidate_filter_options()
 
         action = 'updated' if is_edit else 'added'
         logger.info(f"Approved system submission: '{system_data.get('name')}' (ID: {submission_id}) - {action} by {current_username}")
@@ -2219,6 +2228,7 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
     failed = 0
     failures = []
     approved_meta = []  # for post-job poster invalidation
+    pending_meta = []  # approved since the last commit, not yet scored
 
     def _update_progress(conn, status=None):
         cur = conn.cursor()
@@ -2236,6 +2246,25 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
             ''', (processed, failed, json.dumps(failures), job_id))
         conn.commit()
 
+    def _commit_approved(conn, status=None):
+        # Score the systems approved since the last commit in one bulk pass
+        # (a handful of queries instead of N+1 per system), then commit them
+        # with the progress row, so an approved system is never visible
+        # unscored. Runs after their drafts were promoted, so those
+        # discoveries count toward S+.
+        scored_ids = list(dict.fromkeys(m['system_id'] for m in pending_meta if m.get('system_id') is not None))
+        if scored_ids:
+            try:
+                _, score_failed = rescore_systems(conn.cursor(), scored_ids, label=f"Batch job {job_id}")
+                if score_failed:
+                    logger.warning(f"Batch job {job_id}: {score_failed} system(s) left unscored")
+            except Exception as score_err:
+                logger.warning(f"Batch job {job_id}: completeness scoring failed: {score_err}")
+        _update_progress(conn, status)
+        approved_meta.extend(pending_meta)
+        pending_meta.clear()
+        invalidate_filter_options()
+
     conn = None
     try:
         conn = get_db_connection()
@@ -2244,6 +2273,9 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
         cursor = conn.cursor()
 
         for idx, submission_id in enumerate(submission_ids):
+            # Atomic per submission: a mid-write failure rolls back just this
+            # one, not the approvals waiting for the next commit.
+            cursor.execute('SAVEPOINT batch_item')
             try:
                 cursor.execute('SELECT * FROM pending_systems WHERE id = ?', (submission_id,))
                 row = cursor.fetchone()
@@ -2760,8 +2792,10 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
                             f"re-pointed {_batch_relinked} discovery link(s) after planet rebuild"
                         )
 
-                # Calculate and store completeness score
-                update_completeness_score(cursor, system_id)
+                # Completeness is scored for the whole batch after the loop.
+                sync_system_contributor_key(cursor, system_id)
+                sync_facet_tokens(cursor, system_id)
+                sync_body_resources(cursor, system_id)
 
                 # Promote any co-submitted discoveries drafts (Wizard v1.64.0).
                 # Same transactional guarantee as the planets/moons inserts —
@@ -2816,10 +2850,6 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
                     submission.get('source', 'manual')
                 ))
 
-                # Commit per-submission so a later failure doesn't roll back
-                # successfully-approved earlier ones in the batch.
-                conn.commit()
-
                 processed += 1
                 _rcoords = None
                 try:
@@ -2828,7 +2858,7 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
                         _rcoords = (int(rx_), int(ry_), int(rz_))
                 except (TypeError, ValueError):
                     pass
-                approved_meta.append({
+                pending_meta.append({
                     'submitted_by': submission.get('submitted_by') or submission.get('personal_discord_username'),
                     'galaxy': system_data.get('galaxy', 'Euclid'),
                     'discord_tag': submission.get('discord_tag'),
@@ -2840,24 +2870,26 @@ def _process_batch_approvals_sync(job_id: str, submission_ids: list, session_sna
             except Exception as e:
                 logger.error(f"Batch job {job_id}: error processing submission {submission_id}: {e}")
                 logger.exception("Per-submission failure")
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass
+                cursor.execute('ROLLBACK TO batch_item')
                 failed += 1
                 failures.append({
                     'id': submission_id,
                     'index': idx,
                     'error': str(e)[:500],
                 })
+            finally:
+                cursor.execute('RELEASE batch_item')
 
-            # Periodic progress flush so the polling endpoint sees movement.
+            # Periodic commit + progress flush so the polling endpoint sees
+            # movement. Approvals become visible here, already scored.
             if (idx + 1) % PROGRESS_FLUSH == 0:
                 try:
-                    _update_progress(conn)
+                    _commit_approved(conn)
                 except Exception as flush_err:
                     logger.warning(f"Batch job {job_id}: progress flush failed: {flush_err}")
 
+        _commit_approved(conn)
+
         # Mark job complete
         completed_at = datetime.now(timezone.utc).isoformat()
         cursor.execute('''
@@ -3269,66 +3301,93 @@ async def check_glyph_codes(
 # - It routes to pending_systems queue (same as public submissions), not direct save
 # - Duplicate glyph_codes update the existing pending row rather than creating a new one
 
-@router.post('/api/extraction')
-async def receive_extraction(
-    payload: dict,
-    request: Request,
-    x_api_key: Optional[str] = Header(None, alias='X-API-Key')
-):
-    """
-    Receive extraction data from Haven Extractor (running in-game via pymhf).
-    This endpoint accepts the JSON extraction format and converts it to a system submission.
-
-    Expected payload format (from Haven Extractor v10+):
-    {
-        "extraction_time": "2024-01-15T12:00:00",
-        "extractor_version": "10.0.0",
-        "glyph_code": "0123456789AB",
-        "galaxy_name": "Euclid",
-        "galaxy_index": 0,
-        "voxel_x": 100,
-        "voxel_y": 50,
-        "voxel_z": -200,
-        "solar_system_index": 123,
-        "system_name": "System Name",
-        "star_type": "Yellow",
-        "economy_type": "Trading",
-        "economy_strength": "Wealthy",
-        "conflict_level": "Low",
-        "dominant_lifeform": "Gek",
-        "reality": "Normal",
-        "discord_username": "TurpitZz",
-        "personal_id": "123456789012345678",
-        "discord_tag": "Haven",
-        "planets": [
-            {
-                "planet_index": 0,
-                "planet_name": "Planet Name",
-                "biome": "Lush",
-                "biome_subtype": "Standard",
-                "weather": "Pleasant",
-                "sentinel_level": "Low",
-                "flora_level": "High",
-                "fauna_level": "Medium",
-                "planet_size": "Large",
-                "common_resource": "Copper",
-                "uncommon_resource": "Carbon",
-                "rare_resource": "Gold",
-                "is_moon": false
-            }
-        ]
+# Largest export /api/extraction/batch takes in one request — same cap as
+# /api/check_glyph_codes, which the extractor calls on the same batch first.
+MAX_EXTRACTION_BATCH = 100
+
+
+def _extraction_body_entry(planet_data: dict) -> dict:
+    """Convert one extractor planet/moon dict to the submission body format."""
+    return {
+        'name': planet_data.get('planet_name', f"Planet_{planet_data.get('planet_index', 0) + 1}"),
+        'biome': planet_data.get('biome', 'Unknown'),
+        'biome_subtype': planet_data.get('biome_subtype', 'Unknown'),
+        'weather': planet_data.get('weather', 'Unknown'),
+        'climate': planet_data.get('weather', 'Unknown'),  # Alias for Haven UI compatibility
+        'sentinels': planet_data.get('sentinel_level', 'Unknown'),
+        'sentinel': planet_data.get('sentinel_level', 'Unknown'),  # Alias for Haven UI compatibility
+        'flora': planet_data.get('flora_level', 'Unknown'),
+        'fauna': planet_data.get('fauna_level', 'Unknown'),
+        'planet_size': planet_data.get('planet_size', 'Unknown'),
+        'common_resource': planet_data.get('common_resource') if planet_data.get('common_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('common_resource'), str) and len(planet_data.get('common_resource', '')) >= 2 else None,
+        'uncommon_resource': planet_data.get('uncommon_resource') if planet_data.get('uncommon_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('uncommon_resource'), str) and len(planet_data.get('uncommon_resource', '')) >= 2 else None,
+        'rare_resource': planet_data.get('rare_resource') if planet_data.get('rare_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('rare_resource'), str) and len(planet_data.get('rare_resource', '')) >= 2 else None,
+        'materials': ', '.join([
+            r for r in [
+                planet_data.get('plant_resource'),
+                planet_data.get('common_resource'),
+                planet_data.get('uncommon_resource'),
+                planet_data.get('rare_resource')
+            ] if r and isinstance(r, str) and len(r) >= 2 and r[0].isalpha()
+               and r not in ('Unknown', 'None')
+        ]),  # Comma-separated for Haven UI display
+        # Planet specials + valuable resources
+        'has_rings': planet_data.get('has_rings'),
+        'is_dissonant': planet_data.get('is_dissonant') or planet_data.get('dissonance'),
+        'is_infested': planet_data.get('is_infested') or planet_data.get('infested'),
+        'extreme_weather': planet_data.get('extreme_weather') or planet_data.get('is_weather_extreme'),
+        'water_world': planet_data.get('water_world'),
+        'vile_brood': planet_data.get('vile_brood'),
+        'ancient_bones': planet_data.get('ancient_bones'),
+        'salvageable_scrap': planet_data.get('salvageable_scrap'),
+        'storm_crystals': planet_data.get('storm_crystals'),
+        'gravitino_balls': planet_data.get('gravitino_balls'),
+        'is_gas_giant': planet_data.get('is_gas_giant'),
+        'exotic_trophy': planet_data.get('exotic_trophy'),
+        'is_bubble': planet_data.get('is_bubble'),
+        'is_floating_islands': planet_data.get('is_floating_islands'),
+        # Additional fields the extractor sends that approval persists but
+        # planet_entry was previously dropping silently. Falls through to
+        # None when the extractor doesn't send them so legacy submissions
+        # don't change behavior.
+        'planet_index': planet_data.get('planet_index'),
+        'fauna_count': planet_data.get('fauna_count'),
+        'flora_count': planet_data.get('flora_count'),
+        'has_water': planet_data.get('has_water'),
+        'description': planet_data.get('description'),
+        'storm_frequency': planet_data.get('storm_frequency'),
+        'weather_intensity': planet_data.get('weather_intensity'),
+        'building_density': planet_data.get('building_density'),
+        'hazard_temperature': planet_data.get('hazard_temperature'),
+        'hazard_radiation': planet_data.get('hazard_radiation'),
+        'hazard_toxicity': planet_data.get('hazard_toxicity'),
+        'weather_text': planet_data.get('weather_text'),
+        'sentinels_text': planet_data.get('sentinels_text'),
+        'flora_text': planet_data.get('flora_text'),
+        'fauna_text': planet_data.get('fauna_text'),
+        'base_location': planet_data.get('base_location'),
+        'photo': planet_data.get('photo'),
+        'notes': planet_data.get('notes'),
+        'plant_resource': planet_data.get('plant_resource'),
+        # Wonders Page Notes (migration 1.76.0) — extractor doesn't send
+        # these today but adding now so when it does they aren't dropped
+        'estimated_age': planet_data.get('estimated_age'),
+        'core_element': planet_data.get('core_element'),
+        'lore_notes': planet_data.get('lore_notes'),
+        'root_structure': planet_data.get('root_structure'),
+        'nutrient_source': planet_data.get('nutrient_source'),
     }
-    """
-    # Validate API key if provided
-    api_key_info = verify_api_key(x_api_key) if x_api_key else None
 
-    # Get client IP for tracking
-    client_ip = request.client.host if request.client else "unknown"
 
-    # Extract required fields
+def _prepare_extraction(payload: dict, api_key_info: Optional[dict]) -> dict:
+    """Validate one Haven Extractor payload and convert it to submission format.
+
+    Pure (no DB). Raises ValueError for a missing or malformed glyph_code.
+    Shared by /api/extraction and /api/extraction/batch.
+    """
     glyph_code = payload.get('glyph_code')
-    if not glyph_code or len(glyph_code) != 12:
-        raise HTTPException(status_code=400, detail="Invalid or missing glyph_code")
+    if not isinstance(glyph_code, str) or len(glyph_code) != 12:
+        raise ValueError("Invalid or missing glyph_code")
 
     # Decode glyph to get region coordinates
     try:
@@ -3346,8 +3405,6 @@ async def receive_extraction(
     discord_tag = payload.get('discord_tag', 'personal')  # Default to personal if not specified
     reality = normalize_reality(payload.get('reality'))
     game_mode = payload.get('game_mode', 'Normal')  # v1.6.8: difficulty preset tracking
-    # Profile ID: from payload (new extractor) or resolve from username/api_key
-    submitter_profile_id = payload.get('profile_id')
 
     # Accept both star_color (v10+) and star_type (legacy)
     star_color = payload.get('star_color') or payload.get('star_type', 'Unknown')
@@ -3414,76 +3471,7 @@ async def receive_extraction(
     planets = []
     moons = []
     for planet_data in payload.get('planets', []):
-        planet_entry = {
-            'name': planet_data.get('planet_name', f"Planet_{planet_data.get('planet_index', 0) + 1}"),
-            'biome': planet_data.get('biome', 'Unknown'),
-            'biome_subtype': planet_data.get('biome_subtype', 'Unknown'),
-            'weather': planet_data.get('weather', 'Unknown'),
-            'climate': planet_data.get('weather', 'Unknown'),  # Alias for Haven UI compatibility
-            'sentinels': planet_data.get('sentinel_level', 'Unknown'),
-            'sentinel': planet_data.get('sentinel_level', 'Unknown'),  # Alias for Haven UI compatibility
-            'flora': planet_data.get('flora_level', 'Unknown'),
-            'fauna': planet_data.get('fauna_level', 'Unknown'),
-            'planet_size': planet_data.get('planet_size', 'Unknown'),
-            'common_resource': planet_data.get('common_resource') if planet_data.get('common_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('common_resource'), str) and len(planet_data.get('common_resource', '')) >= 2 else None,
-            'uncommon_resource': planet_data.get('uncommon_resource') if planet_data.get('uncommon_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('uncommon_resource'), str) and len(planet_data.get('uncommon_resource', '')) >= 2 else None,
-            'rare_resource': planet_data.get('rare_resource') if planet_data.get('rare_resource') not in ('Unknown', 'None', '', None) and isinstance(planet_data.get('rare_resource'), str) and len(planet_data.get('rare_resource', '')) >= 2 else None,
-            'materials': ', '.join([
-                r for r in [
-                    planet_data.get('plant_resource'),
-                    planet_data.get('common_resource'),
-                    planet_data.get('uncommon_resource'),
-                    planet_data.get('rare_resource')
-                ] if r and isinstance(r, str) and len(r) >= 2 and r[0].isalpha()
-                   and r not in ('Unknown', 'None')
-            ]),  # Comma-separated for Haven UI display
-            # Planet specials + valuable resources
-            'has_rings': planet_data.get('has_rings'),
-            'is_dissonant': planet_data.get('is_dissonant') or planet_data.get('dissonance'),
-            'is_infested': planet_data.get('is_infested') or planet_data.get('infested'),
-            'extreme_weather': planet_data.get('extreme_weather') or planet_data.get('is_weather_extreme'),
-            'water_world': planet_data.get('water_world'),
-            'vile_brood': planet_data.get('vile_brood'),
-            'ancient_bones': planet_data.get('ancient_bones'),
-            'salvageable_scrap': planet_data.get('salvageable_scrap'),
-            'storm_crystals': planet_data.get('storm_crystals'),
-            'gravitino_balls': planet_data.get('gravitino_balls'),
-            'is_gas_giant': planet_data.get('is_gas_giant'),
-            'exotic_trophy': planet_data.get('exotic_trophy'),
-            'is_bubble': planet_data.get('is_bubble'),
-            'is_floating_islands': planet_data.get('is_floating_islands'),
-            # Additional fields the extractor sends that approval persists but
-            # planet_entry was previously dropping silently. Falls through to
-            # None when the extractor doesn't send them so legacy submissions
-            # don't change behavior.
-            'planet_index': planet_data.get('planet_index'),
-            'fauna_count': planet_data.get('fauna_count'),
-            'flora_count': planet_data.get('flora_count'),
-            'has_water': planet_data.get('has_water'),
-            'description': planet_data.get('description'),
-            'storm_frequency': planet_data.get('storm_frequency'),
-            'weather_intensity': planet_data.get('weather_intensity'),
-            'building_density': planet_data.get('building_density'),
-            'hazard_temperature': planet_data.get('hazard_temperature'),
-            'hazard_radiation': planet_data.get('hazard_radiation'),
-            'hazard_toxicity': planet_data.get('hazard_toxicity'),
-            'weather_text': planet_data.get('weather_text'),
-            'sentinels_text': planet_data.get('sentinels_text'),
-            'flora_text': planet_data.get('flora_text'),
-            'fauna_text': planet_data.get('fauna_text'),
-            'base_location': planet_data.get('base_location'),
-            'photo': planet_data.get('photo'),
-            'notes': planet_data.get('notes'),
-            'plant_resource': planet_data.get('plant_resource'),
-            # Wonders Page Notes (migration 1.76.0) — extractor doesn't send
-            # these today but adding now so when it does they aren't dropped
-            'estimated_age': planet_data.get('estimated_age'),
-            'core_element': planet_data.get('core_element'),
-            'lore_notes': planet_data.get('lore_notes'),
-            'root_structure': planet_data.get('root_structure'),
-            'nutrient_source': planet_data.get('nutrient_source'),
-        }
-
+        planet_entry = _extraction_body_entry(planet_data)
         if planet_data.get('is_moon', False):
             moons.append(planet_entry)
         else:
@@ -3492,244 +3480,371 @@ async def receive_extraction(
     submission_data['planets'] = planets
     submission_data['moons'] = moons
 
-    # Store in pending_systems for admin review
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+    return {
+        'payload': payload,
+        'glyph_code': glyph_code,
+        'region': (region_x, region_y, region_z),
+        'discord_username': discord_username,
+        'personal_id': personal_id,
+        'discord_tag': discord_tag,
+        'reality': reality,
+        'game_mode': game_mode,
+        # Profile ID: from payload (new extractor) or resolved at store time
+        'profile_id': payload.get('profile_id'),
+        'submission': submission_data,
+        'gen_region_name': gen_region_name,
+    }
 
-        # Canonical dedup: last 11 glyph chars + galaxy + reality
-        # Check approved systems first
-        edit_system_id = None
-        mismatch_flags = []
-        existing_system_row = find_matching_system(
-            cursor, glyph_code, submission_data['galaxy'], reality
-        )
-        if existing_system_row:
-            edit_system_id = existing_system_row[0]
-            # Build mismatch flags for approver review
-            cursor.execute('SELECT * FROM systems WHERE id = ?', (existing_system_row[0],))
-            existing_sys = cursor.fetchone()
-            if existing_sys:
-                existing_dict = dict(existing_sys)
-                cursor.execute('SELECT id, name FROM planets WHERE system_id = ?', (existing_system_row[0],))
-                planet_rows = cursor.fetchall()
-                existing_dict['planets'] = [{'name': r['name']} for r in planet_rows]
-                moon_names = []
-                for p in planet_rows:
-                    for m in cursor.execute('SELECT name FROM moons WHERE planet_id = ?', (p[0],)).fetchall():
-                        moon_names.append({'name': m['name']})
-                existing_dict['moons'] = moon_names
-                mismatch_flags = build_mismatch_flags(existing_dict, submission_data)
-            if mismatch_flags:
-                submission_data['_mismatch_flags'] = mismatch_flags
-            logger.info(f"Extraction matches existing system '{existing_system_row[1]}' "
-                        f"(ID: {edit_system_id}) via coordinate match - marking as edit"
-                        + (f" with mismatches: {mismatch_flags}" if mismatch_flags else ""))
-
-        # Check for duplicate in pending submissions (same canonical dedup)
-        existing_pending = find_matching_pending_system(
-            cursor, glyph_code, submission_data['galaxy'], reality
-        )
 
-        if existing_pending:
-            # MERGE: preserve manual-only fields from existing pending, overwrite with extractor data
-            try:
-                existing_system_data = json.loads(existing_pending[3])  # system_data column
-            except (json.JSONDecodeError, TypeError):
-                existing_system_data = {}
+def _queue_region_proposal(cursor, region: tuple, reality: str, galaxy: str, proposed_name: str,
+                           submitted_by: str, client_ip: str, discord_tag: Optional[str],
+                           discord_username: Optional[str], submitter_profile_id, source: str,
+                           rename: bool = False) -> str:
+    """Queue a region-name proposal unless the region has a pending proposal or
+    is already named. Returns 'submitted', 'already_named' or 'already_pending'.
 
-            merged_data = merge_system_data(existing_system_data, submission_data)
-            # Preserve mismatch flags if we found them
-            if mismatch_flags:
-                merged_data['_mismatch_flags'] = mismatch_flags
+    Explicit proposals (/api/regions/{rx}/{ry}/{rz}/submit and the `regions`
+    array of /api/extraction/batch) pass rename=True: a named region can
+    still be proposed a different name, and only its current name counts as
+    already named. The per-system safety net leaves it False so it only names
+    unnamed regions.
 
-            cursor.execute('''
-                UPDATE pending_systems
-                SET raw_json = ?, system_data = ?, submission_timestamp = ?,
-                    discord_tag = ?, personal_discord_username = ?, personal_id = ?,
-                    system_name = ?, galaxy = ?, reality = ?, glyph_code = ?,
-                    region_x = ?, region_y = ?, region_z = ?,
-                    x = ?, y = ?, z = ?, edit_system_id = ?
-                WHERE id = ?
-            ''', (
-                json.dumps(merged_data),
-                json.dumps(merged_data),
-                datetime.now(timezone.utc).isoformat(),
-                discord_tag if discord_tag else None,
-                discord_username if discord_username else None,
-                personal_id if personal_id else None,
-                submission_data['name'],
-                submission_data['galaxy'],
-                reality,
-                glyph_code,
-                region_x,
-                region_y,
-                region_z,
-                submission_data['x'],
-                submission_data['y'],
-                submission_data['z'],
-                edit_system_id,
-                existing_pending[0]
-            ))
-            conn.commit()
-
-            logger.info(f"Merged extraction into pending submission for {glyph_code} (discord_tag={discord_tag})")
-            return JSONResponse({
-                'status': 'updated',
-                'message': f'Extraction merged for {glyph_code}',
-                'submission_id': existing_pending[0],
-                'planet_count': len(planets),
-                'moon_count': len(moons)
-            })
-
-        # Insert new pending submission with all fields
-        now = datetime.now(timezone.utc).isoformat()
-        raw_json_str = json.dumps(submission_data)
-
-        # Resolve submitter_profile_id from payload, api_key, or username
-        if not submitter_profile_id:
-            # Try from API key link
-            if api_key_info and api_key_info.get('profile_id'):
-                submitter_profile_id = api_key_info['profile_id']
-            # Fallback: look up or create profile from discord_username
-            elif discord_username:
-                submitter_profile_id = get_or_create_profile(
-                    conn, discord_username,
-                    discord_snowflake_id=personal_id or None,
-                    default_civ_tag=discord_tag if discord_tag != 'personal' else None,
-                    created_by='extraction'
-                )
-
-        # Get API key name for tracking (if authenticated)
-        api_key_name = api_key_info.get('name') if api_key_info else None
-        # Tag submissions from the old shared key as "unregistered"
-        if api_key_info and api_key_info.get('key_type') == 'system':
-            api_key_name = f"{api_key_info['name']} (unregistered)"
-
-        submitter_display = discord_username if discord_username else 'HavenExtractor'
+    The "one pending per voxel" check keeps it idempotent, so the per-system
+    safety net and an explicit client proposal for the same region can't
+    create duplicates. Does not commit.
+    """
+    region_x, region_y, region_z = region
+    cursor.execute('''
+        SELECT custom_name FROM regions
+        WHERE region_x = ? AND region_y = ? AND region_z = ?
+          AND reality = ? AND galaxy = ? AND custom_name IS NOT NULL
+    ''', (region_x, region_y, region_z, reality, galaxy))
+    named = cursor.fetchone()
+    if named and (not rename or named[0] == proposed_name[:50]):
+        return 'already_named'
+    cursor.execute('''
+        SELECT 1 FROM pending_region_names
+        WHERE region_x = ? AND region_y = ? AND region_z = ?
+          AND reality = ? AND galaxy = ? AND status = 'pending'
+    ''', (region_x, region_y, region_z, reality, galaxy))
+    if cursor.fetchone():
+        return 'already_pending'
+    cursor.execute('''
+        INSERT INTO pending_region_names
+        (region_x, region_y, region_z, proposed_name, submitted_by,
+         submitted_by_ip, submission_date, status, discord_tag,
+         personal_discord_username, reality, galaxy,
+         submitter_profile_id, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?, ?, ?)
+    ''', (
+        region_x, region_y, region_z, proposed_name[:50],
+        submitted_by, client_ip,
+        datetime.now(timezone.utc).isoformat(),
+        discord_tag if discord_tag else None,
+        discord_username if discord_username else None,
+        reality, galaxy,
+        submitter_profile_id, source,
+    ))
+    return 'submitted'
+
+
+def _store_extraction(conn, item: dict, api_key_info: Optional[dict], client_ip: str) -> dict:
+    """Dedup one prepared extraction against systems / pending_systems and merge
+    or insert it. Returns the per-system response body. Does not commit.
+    """
+    cursor = conn.cursor()
+    payload = item['payload']
+    glyph_code = item['glyph_code']
+    region_x, region_y, region_z = item['region']
+    discord_username = item['discord_username']
+    personal_id = item['personal_id']
+    discord_tag = item['discord_tag']
+    reality = item['reality']
+    game_mode = item['game_mode']
+    submitter_profile_id = item['profile_id']
+    submission_data = item['submission']
+    planets = submission_data['planets']
+    moons = submission_data['moons']
+
+    # Canonical dedup: last 11 glyph chars + galaxy + reality
+    # Check approved systems first
+    edit_system_id = None
+    mismatch_flags = []
+    existing_system_row = find_matching_system(
+        cursor, glyph_code, submission_data['galaxy'], reality
+    )
+    if existing_system_row:
+        edit_system_id = existing_system_row[0]
+        # Build mismatch flags for approver review
+        cursor.execute('SELECT * FROM systems WHERE id = ?', (existing_system_row[0],))
+        existing_sys = cursor.fetchone()
+        if existing_sys:
+            existing_dict = dict(existing_sys)
+            cursor.execute('SELECT id, name FROM planets WHERE system_id = ?', (existing_system_row[0],))
+            planet_rows = cursor.fetchall()
+            existing_dict['planets'] = [{'name': r['name']} for r in planet_rows]
+            moon_names = []
+            for p in planet_rows:
+                for m in cursor.execute('SELECT name FROM moons WHERE planet_id = ?', (p[0],)).fetchall():
+                    moon_names.append({'name': m['name']})
+            existing_dict['moons'] = moon_names
+            mismatch_flags = build_mismatch_flags(existing_dict, submission_data)
+        if mismatch_flags:
+            submission_data['_mismatch_flags'] = mismatch_flags
+        logger.info(f"Extraction matches existing system '{existing_system_row[1]}' "
+                    f"(ID: {edit_system_id}) via coordinate match - marking as edit"
+                    + (f" with mismatches: {mismatch_flags}" if mismatch_flags else ""))
+
+    # Check for duplicate in pending submissions (same canonical dedup)
+    existing_pending = find_matching_pending_system(
+        cursor, glyph_code, submission_data['galaxy'], reality
+    )
 
-        # Source attribution via the canonical resolver. Keeper bot keys
-        # (Keeper 2.0 / Keeper Bot) bucket as 'keeper_bot'; everything else
-        # authenticated buckets as 'haven_extractor'.
-        submission_source = resolve_source(api_key_info.get('name') if api_key_info else None)
+    if existing_pending:
+        # MERGE: preserve manual-only fields from existing pending, overwrite with extractor data
+        try:
+            existing_system_data = json.loads(existing_pending[3])  # system_data column
+        except (json.JSONDecodeError, TypeError):
+            existing_system_data = {}
 
-        # Compute the indexed username_normalized column at write time.
-        username_normalized = normalize_username_for_dedup(
-            submitter_display if submitter_display and submitter_display != 'HavenExtractor'
-            else (discord_username or 'Unknown')
-        )
+        merged_data = merge_system_data(existing_system_data, submission_data)
+        # Preserve mismatch flags if we found them
+        if mismatch_flags:
+            merged_data['_mismatch_flags'] = mismatch_flags
 
         cursor.execute('''
-            INSERT INTO pending_systems (
-                system_name, glyph_code, galaxy, reality, x, y, z,
-                region_x, region_y, region_z,
-                submitter_name, submitted_by, submission_timestamp, submission_date, status, source,
-                raw_json, system_data, discord_tag, personal_discord_username, personal_id,
-                submitted_by_ip, api_key_name, edit_system_id, game_mode, submitter_profile_id,
-                username_normalized
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            UPDATE pending_systems
+            SET raw_json = ?, system_data = ?, submission_timestamp = ?,
+                discord_tag = ?, personal_discord_username = ?, personal_id = ?,
+                system_name = ?, galaxy = ?, reality = ?, glyph_code = ?,
+                region_x = ?, region_y = ?, region_z = ?,
+                x = ?, y = ?, z = ?, edit_system_id = ?
+            WHERE id = ?
         ''', (
+            json.dumps(merged_data),
+            json.dumps(merged_data),
+            datetime.now(timezone.utc).isoformat(),
+            discord_tag if discord_tag else None,
+            discord_username if discord_username else None,
+            personal_id if personal_id else None,
             submission_data['name'],
-            glyph_code,
             submission_data['galaxy'],
             reality,
-            submission_data['x'],
-            submission_data['y'],
-            submission_data['z'],
+            glyph_code,
             region_x,
             region_y,
             region_z,
-            submitter_display,
-            submitter_display,  # submitted_by - was missing, caused "Anonymous" display
-            now,
-            now,  # submission_date
-            'pending',
-            submission_source,
-            raw_json_str,
-            raw_json_str,  # system_data (same as raw_json)
-            discord_tag if discord_tag else None,
-            discord_username if discord_username else None,
-            personal_id if personal_id else None,
-            client_ip,
-            api_key_name,
+            submission_data['x'],
+            submission_data['y'],
+            submission_data['z'],
             edit_system_id,
-            game_mode,
-            submitter_profile_id,
-            username_normalized,
+            existing_pending[0]
         ))
-        conn.commit()
-        submission_id = cursor.lastrowid
-
-        # Update per-key submission stats
-        if api_key_info:
-            try:
-                cursor.execute("""
-                    UPDATE api_keys
-                    SET total_submissions = COALESCE(total_submissions, 0) + 1,
-                        last_submission_at = ?
-                    WHERE id = ?
-                """, (now, api_key_info['id']))
-                conn.commit()
-            except Exception:
-                pass  # Non-critical, don't fail the submission
-
-        # --- Deferred region-name proposal (server-side safety net) ---
-        # Mirror the Wizard's Option B: if this region is genuinely unnamed and
-        # has no pending proposal, queue the procedural region name (or a
-        # client-supplied `proposed_region_name`) for approval. The "one pending
-        # per voxel" check keeps it idempotent, so a parallel client region
-        # submit (e.g. the extractor's own) can't create a duplicate. Never
-        # blocks the system submission.
-        proposed_region = (payload.get('proposed_region_name') or '').strip() or (gen_region_name or '')
-        if proposed_region and region_x is not None:
-            try:
-                cursor.execute('''
-                    SELECT 1 FROM regions
-                    WHERE region_x = ? AND region_y = ? AND region_z = ?
-                      AND reality = ? AND galaxy = ? AND custom_name IS NOT NULL
-                ''', (region_x, region_y, region_z, reality, submission_data['galaxy']))
-                already_named = cursor.fetchone()
-                cursor.execute('''
-                    SELECT 1 FROM pending_region_names
-                    WHERE region_x = ? AND region_y = ? AND region_z = ?
-                      AND reality = ? AND galaxy = ? AND status = 'pending'
-                ''', (region_x, region_y, region_z, reality, submission_data['galaxy']))
-                already_pending = cursor.fetchone()
-                if not already_named and not already_pending:
-                    cursor.execute('''
-                        INSERT INTO pending_region_names
-                        (region_x, region_y, region_z, proposed_name, submitted_by,
-                         submitted_by_ip, submission_date, status, discord_tag,
-                         personal_discord_username, reality, galaxy,
-                         submitter_profile_id, source)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        region_x, region_y, region_z, proposed_region[:50],
-                        submitter_display, client_ip,
-                        datetime.now(timezone.utc).isoformat(),
-                        discord_tag if discord_tag else None,
-                        discord_username if discord_username else None,
-                        reality, submission_data['galaxy'],
-                        submitter_profile_id, submission_source,
-                    ))
-                    conn.commit()
-                    logger.info(
-                        f"Extraction queued region name '{proposed_region}' for "
-                        f"({region_x},{region_y},{region_z})/{submission_data['galaxy']}/{reality}"
-                    )
-            except Exception as region_err:
-                logger.warning(f"Extraction deferred region name insert failed: {region_err}")
-
-        logger.info(f"Received extraction from Haven Extractor: {glyph_code} with {len(planets)} planets, {len(moons)} moons (discord_tag={discord_tag}, user={discord_username})")
 
-        return JSONResponse({
-            'status': 'ok',
-            'message': f'Extraction received for {glyph_code}',
-            'submission_id': submission_id,
+        logger.info(f"Merged extraction into pending submission for {glyph_code} (discord_tag={discord_tag})")
+        return {
+            'status': 'updated',
+            'message': f'Extraction merged for {glyph_code}',
+            'submission_id': existing_pending[0],
             'planet_count': len(planets),
             'moon_count': len(moons)
-        }, status_code=201)
+        }
+
+    # Insert new pending submission with all fields
+    now = datetime.now(timezone.utc).isoformat()
+    raw_json_str = json.dumps(submission_data)
+
+    # Resolve submitter_profile_id from payload, api_key, or username
+    if not submitter_profile_id:
+        # Try from API key link
+        if api_key_info and api_key_info.get('profile_id'):
+            submitter_profile_id = api_key_info['profile_id']
+        # Fallback: look up or create profile from discord_username
+        elif discord_username:
+            submitter_profile_id = get_or_create_profile(
+                conn, discord_username,
+                discord_snowflake_id=personal_id or None,
+                default_civ_tag=discord_tag if discord_tag != 'personal' else None,
+                created_by='extraction'
+            )
+
+    # Get API key name for tracking (if authenticated)
+    api_key_name = api_key_info.get('name') if api_key_info else None
+    # Tag submissions from the old shared key as "unregistered"
+    if api_key_info and api_key_info.get('key_type') == 'system':
+        api_key_name = f"{api_key_info['name']} (unregistered)"
+
+    submitter_display = discord_username if discord_username else 'HavenExtractor'
+
+    # Source attribution via the canonical resolver. Keeper bot keys
+    # (Keeper 2.0 / Keeper Bot) bucket as 'keeper_bot'; everything else
+    # authenticated buckets as 'haven_extractor'.
+    submission_source = resolve_source(api_key_info.get('name') if api_key_info else None)
+
+    # Compute the indexed username_normalized column at write time.
+    username_normalized = contributor_key(
+        submitter_display if submitter_display != 'HavenExtractor' else None,
+        discord_username,
+    )
+
+    cursor.execute('''
+        INSERT INTO pending_systems (
+            system_name, glyph_code, galaxy, reality, x, y, z,
+            region_x, region_y, region_z,
+            submitter_name, submitted_by, submission_timestamp, submission_date, status, source,
+            raw_json, system_data, discord_tag, personal_discord_username, personal_id,
+            submitted_by_ip, api_key_name, edit_system_id, game_mode, submitter_profile_id,
+            username_normalized
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (
+        submission_data['name'],
+        glyph_code,
+        submission_data['galaxy'],
+        reality,
+        submission_data['x'],
+        submission_data['y'],
+        submission_data['z'],
+        region_x,
+        region_y,
+        region_z,
+        submitter_display,
+        submitter_display,  # submitted_by - was missing, caused "Anonymous" display
+        now,
+        now,  # submission_date
+        'pending',
+        submission_source,
+        raw_json_str,
+        raw_json_str,  # system_data (same as raw_json)
+        discord_tag if discord_tag else None,
+        discord_username if discord_username else None,
+        personal_id if personal_id else None,
+        client_ip,
+        api_key_name,
+        edit_system_id,
+        game_mode,
+        submitter_profile_id,
+        username_normalized,
+    ))
+    submission_id = cursor.lastrowid
+
+    # --- Deferred region-name proposal (server-side safety net) ---
+    # Mirror the Wizard's Option B: if this region is genuinely unnamed and
+    # has no pending proposal, queue the procedural region name (or a
+    # client-supplied `proposed_region_name`) for approval. Never blocks the
+    # system submission.
+    proposed_region = (payload.get('proposed_region_name') or '').strip() or (item['gen_region_name'] or '')
+    if proposed_region and region_x is not None:
+        try:
+            queued = _queue_region_proposal(
+                cursor, item['region'], reality, submission_data['galaxy'], proposed_region,
+                submitter_display, client_ip, discord_tag, discord_username,
+                submitter_profile_id, submission_source,
+            )
+            if queued == 'submitted':
+                logger.info(
+                    f"Extraction queued region name '{proposed_region}' for "
+                    f"({region_x},{region_y},{region_z})/{submission_data['galaxy']}/{reality}"
+                )
+        except Exception as region_err:
+            logger.warning(f"Extraction deferred region name insert failed: {region_err}")
+
+    logger.info(f"Received extraction from Haven Extractor: {glyph_code} with {len(planets)} planets, {len(moons)} moons (discord_tag={discord_tag}, user={discord_username})")
+
+    return {
+        'status': 'ok',
+        'message': f'Extraction received for {glyph_code}',
+        'submission_id': submission_id,
+        'planet_count': len(planets),
+        'moon_count': len(moons)
+    }
+
+
+def _record_api_key_submissions(conn, api_key_info: Optional[dict], count: int) -> None:
+    """Bump the key's submission counters. Non-critical, never raises. Does not commit."""
+    if not api_key_info or count <= 0:
+        return
+    try:
+        conn.execute("""
+            UPDATE api_keys
+            SET total_submissions = COALESCE(total_submissions, 0) + ?,
+                last_submission_at = ?
+            WHERE id = ?
+        """, (count, datetime.now(timezone.utc).isoformat(), api_key_info['id']))
+    except Exception:
+        pass  # Non-critical, don't fail the submission
+
+
+@router.post('/api/extraction')
+async def receive_extraction(
+    payload: dict,
+    request: Request,
+    x_api_key: Optional[str] = Header(None, alias='X-API-Key')
+):
+    """
+    Receive extraction data from Haven Extractor (running in-game via pymhf).
+    This endpoint accepts the JSON extraction format and converts it to a system submission.
+
+    Expected payload format (from Haven Extractor v10+):
+    {
+        "extraction_time": "2024-01-15T12:00:00",
+        "extractor_version": "10.0.0",
+        "glyph_code": "0123456789AB",
+        "galaxy_name": "Euclid",
+        "galaxy_index": 0,
+        "voxel_x": 100,
+        "voxel_y": 50,
+        "voxel_z": -200,
+        "solar_system_index": 123,
+        "system_name": "System Name",
+        "star_type": "Yellow",
+        "economy_type": "Trading",
+        "economy_strength": "Wealthy",
+        "conflict_level": "Low",
+        "dominant_lifeform": "Gek",
+        "reality": "Normal",
+        "discord_username": "TurpitZz",
+        "personal_id": "123456789012345678",
+        "discord_tag": "Haven",
+        "planets": [
+            {
+                "planet_index": 0,
+                "planet_name": "Planet Name",
+                "biome": "Lush",
+                "biome_subtype": "Standard",
+                "weather": "Pleasant",
+                "sentinel_level": "Low",
+                "flora_level": "High",
+                "fauna_level": "Medium",
+                "planet_size": "Large",
+                "common_resource": "Copper",
+                "uncommon_resource": "Carbon",
+                "rare_resource": "Gold",
+                "is_moon": false
+            }
+        ]
+    }
+    """
+    # Validate API key if provided
+    api_key_info = verify_api_key(x_api_key) if x_api_key else None
+
+    # Get client IP for tracking
+    client_ip = request.client.host if request.client else "unknown"
+
+    try:
+        item = _prepare_extraction(payload, api_key_info)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Store in pending_systems for admin review
+    conn = None
+    try:
+        conn = get_db_connection()
+        result = _store_extraction(conn, item, api_key_info, client_ip)
+        conn.commit()
+        if result['status'] == 'ok':
+            _record_api_key_submissions(conn, api_key_info, 1)
+            conn.commit()
+        return JSONResponse(result, status_code=201 if result['status'] == 'ok' else 200)
 
     except Exception as e:
         logger.error(f"Error storing extraction: {e}")
@@ -3738,3 +3853,149 @@ async def receive_extraction(
     finally:
         if conn:
             conn.close()
+
+
+def _ingest_extraction_batch(conn, items: list, regions: list, api_key_info: Optional[dict],
+                             client_ip: str) -> tuple[list, list]:
+    """Store a batch of prepared extractions in one transaction (run_write).
+
+    Each system runs under its own SAVEPOINT so a failure rolls back only that
+    system. Items are handled in request order on one connection, so two
+    systems in the batch with the same canonical glyph merge into one pending
+    row exactly as two sequential /api/extraction calls would.
+    """
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+    results = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            results.append({'index': index, 'status': 'invalid', 'message': item})
+            continue
+        conn.execute('SAVEPOINT extraction_item')
+        try:
+            result = _store_extraction(conn, item, api_key_info, client_ip)
+        except Exception as e:
+            conn.execute('ROLLBACK TO extraction_item')
+            logger.exception(f"Batch extraction failed for {item['glyph_code']}: {e}")
+            result = {'status': 'error', 'message': 'Internal server error'}
+        conn.execute('RELEASE extraction_item')
+        results.append({'index': index, 'glyph_code': item['glyph_code'], **result})
+
+    source = resolve_source(api_key_info.get('name') if api_key_info else None)
+    cursor = conn.cursor()
+    region_results = []
+    for region in regions:
+        region_results.append(_ingest_batch_region(cursor, region, client_ip, source))
+
+    _record_api_key_submissions(conn, api_key_info, sum(1 for r in results if r['status'] == 'ok'))
+    return results, region_results
+
+
+def _ingest_batch_region(cursor, region, client_ip: str, source: str) -> dict:
+    """Validate and queue one entry of the batch `regions` array."""
+    if not isinstance(region, dict):
+        return {'status': 'invalid', 'message': 'Region entry must be an object'}
+    proposed_name = (region.get('proposed_name') or '').strip()
+    try:
+        coords = (int(region['region_x']), int(region['region_y']), int(region['region_z']))
+    except (KeyError, TypeError, ValueError):
+        return {'status': 'invalid', 'proposed_name': proposed_name, 'message': 'region_x/y/z required'}
+    entry = {'region_x': coords[0], 'region_y': coords[1], 'region_z': coords[2], 'proposed_name': proposed_name}
+    if not proposed_name:
+        return {**entry, 'status': 'invalid', 'message': 'Proposed name is required'}
+    if len(proposed_name) > 50:
+        return {**entry, 'status': 'invalid', 'message': 'Region name must be 50 characters or less'}
+    discord_username = (region.get('personal_discord_username') or '').strip() or None
+    status = _queue_region_proposal(
+        cursor, coords, normalize_reality(region.get('reality')), region.get('galaxy') or 'Euclid',
+        proposed_name, (region.get('submitted_by') or '').strip() or discord_username or 'anonymous',
+        client_ip, region.get('discord_tag'), discord_username,
+        region.get('submitter_profile_id'), source, rename=True,
+    )
+    return {**entry, 'status': status}
+
+
+@router.post('/api/extraction/batch')
+async def receive_extraction_batch(
+    payload: dict,
+    request: Request,
+    x_api_key: Optional[str] = Header(None, alias='X-API-Key')
+):
+    """
+    Receive a whole Haven Extractor export in one request.
+
+    Payload:
+    {
+        "systems": [<same object /api/extraction takes>, ...],   # 0..MAX_EXTRACTION_BATCH
+        "regions": [                                             # optional
+            {"region_x": 1, "region_y": 2, "region_z": 3, "proposed_name": "...",
+             "galaxy": "Euclid", "reality": "Normal", "submitted_by": "...",
+             "personal_discord_username": "...", "discord_tag": "Haven"}
+        ]
+    }
+
+    Every system gets the same validation, dedup and merge as /api/extraction,
+    all on the writer connection in one transaction. Invalid or failing
+    systems are reported per item and don't affect the rest. Region entries
+    follow /api/regions/{rx}/{ry}/{rz}/submit: queued unless the region has a
+    pending proposal or already carries that name. `systems` may be empty
+    when `regions` is not — the extractor sends the names of regions it got
+    accepted systems into after the last system chunk. The API key's hourly
+    rate limit is charged one token per system.
+
+    Returns:
+    {
+        "results": [{"index": 0, "glyph_code": "...", "status": "ok" | "updated" | "invalid" | "error",
+                     "submission_id": 12, "message": "..."}, ...],
+        "regions": [{"region_x": 1, ..., "status": "submitted" | "already_named" | "already_pending" | "invalid"}],
+        "summary": {"ok": 3, "updated": 1, "invalid": 0, "error": 0, "total": 4}
+    }
+    """
+    systems = payload.get('systems')
+    regions = payload.get('regions') or []
+    if not isinstance(regions, list) or len(regions) > MAX_EXTRACTION_BATCH:
+        raise HTTPException(status_code=400, detail=f"regions must be an array of at most {MAX_EXTRACTION_BATCH}")
+    if not isinstance(systems, list) or not (systems or regions):
+        raise HTTPException(status_code=400, detail="systems array is required")
+    if len(systems) > MAX_EXTRACTION_BATCH:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_EXTRACTION_BATCH} systems per batch")
+
+    api_key_info = verify_api_key(x_api_key, cost=len(systems)) if x_api_key else None
+    client_ip = request.client.host if request.client else "unknown"
+
+    items = []
+    for system in systems:
+        if not isinstance(system, dict):
+            items.append("System entry must be an object")
+            continue
+        try:
+            items.append(_prepare_extraction(system, api_key_info))
+        except ValueError as e:
+            items.append(str(e))
+
+    try:
+        results, region_results = await run_write(
+            _ingest_extraction_batch, items, regions, api_key_info, client_ip)
+    except Exception as e:
+        logger.error(f"Error storing extraction batch: {e}")
+        logger.exception("Internal server error")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    summary = {'ok': 0, 'updated': 0, 'invalid': 0, 'error': 0, 'total': len(results)}
+    for r in results:
+        summary[r['status']] += 1
+    queued_regions = sum(1 for r in region_results if r['status'] == 'submitted')
+    logger.info(
+        f"Received extraction batch from {client_ip}: {summary['ok']} new, {summary['updated']} merged, "
+        f"{summary['invalid'] + summary['error']} rejected, {queued_regions} region name(s) queued"
+    )
+    if queued_regions:
+        add_activity_log(
+            'region_submitted',
+            f"{queued_regions} region name(s) submitted for approval",
+            details="Haven Extractor batch upload",
+            user_name=next((s.get('discord_username') for s in systems
+                            if isinstance(s, dict) and s.get('discord_username')), 'HavenExtractor'),
+        )
+
+    return JSONResponse({'results': results, 'regions': region_results, 'summary': summary})
@@ -12,11 +12,12 @@ from fastapi import APIRouter, Cookie, File, Form, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 
 from constants import HAVEN_UI_DIR
-from db import get_db_connection, add_activity_log
+from db import get_db_connection, add_activity_log, sync_facet_tokens, sync_body_resources
 from glyph_decoder import decode_glyph_to_coords, galactic_coords_to_glyph
 from image_processor import process_image
-from services.auth_service import get_session
+from services.auth_service import get_session, sync_system_contributor_key
 from services.completeness import update_completeness_score
+from services.filter_facets import invalidate_filter_options
 
 logger = logging.getLogger('control.room')
 
@@ -656,6 +657,7 @@ async def import_csv(file: UploadFile = File(...), column_mapping: Optional[str]
                     sys_data.get('dominant_lifeform'),
                     logged_by,
                 ))
+                sync_system_contributor_key(cursor, sys_id)
 
                 for planet in sys_data.get('planets', []):
                     # 1.79.0: Ancient Bones / Salvageable Scrap / Vile Brood are
@@ -702,6 +704,8 @@ async def import_csv(file: UploadFile = File(...), column_mapping: Optional[str]
                         1 if planet.get('aggressive_sentinel_activity') else 0,
                     ))
 
+                sync_facet_tokens(cursor, sys_id)
+                sync_body_resources(cursor, sys_id)
                 try:
                     update_completeness_score(conn, sys_id)
                 except Exception:
@@ -732,6 +736,7 @@ async def import_csv(file: UploadFile = File(...), column_mapping: Optional[str]
 
         conn.commit()
         conn.close()
+        invalidate_filter_options()
 
         if region_name and imported_count > 0 and imported_region_coords:
             conn = get_db_connection()
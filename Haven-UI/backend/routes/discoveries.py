@@ -23,6 +23,7 @@ from services.auth_service import (
     require_feature,
     check_self_submission,
     verify_api_key,
+    contributor_key,
 )
 from services.civilizations import civ_scope_filter, user_can_act_for_civ
 from services.completeness import update_completeness_score
@@ -280,6 +281,8 @@ async def create_discovery(
             'discovery_id': submission_id,
         }, status_code=201)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error queueing discovery: {e}")
         logger.exception("Internal server error")
@@ -1425,6 +1428,7 @@ def _apply_discovery_approval(cursor, submission, session_data):
         discovery_id = edit_discovery_id
         is_edit = True
     else:
+        discoverer = discovery_data.get('discord_username') or submission.get('submitted_by') or 'anonymous'
         cursor.execute('''
             INSERT INTO discoveries (
                 discovery_type, discovery_name, system_id, planet_id, moon_id,
@@ -1433,8 +1437,8 @@ def _apply_discovery_approval(cursor, submission, session_data):
                 mystery_tier, analysis_status, pattern_matches,
                 discord_user_id, discord_guild_id,
                 photo_url, evidence_url, type_slug, discord_tag, type_metadata, profile_id, source,
-                latitude, longitude, event_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                latitude, longitude, event_id, username_normalized
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             discovery_type,
             discovery_name,
@@ -1445,7 +1449,7 @@ def _apply_discovery_approval(cursor, submission, session_data):
             discovery_data.get('location_name') or '',
             discovery_data.get('description') or '',
             discovery_data.get('significance') or 'Notable',
-            discovery_data.get('discord_username') or submission.get('submitted_by') or 'anonymous',
+            discoverer,
             submission.get('submission_date') or datetime.now(timezone.utc).isoformat(),
             discovery_data.get('mystery_tier') or 1,
             'approved',
@@ -1462,6 +1466,7 @@ def _apply_discovery_approval(cursor, submission, session_data):
             latitude,
             longitude,
             submission.get('event_id') if submission.get('event_id') is not None else discovery_data.get('event_id'),
+            contributor_key(discoverer),
         ))
         discovery_id = cursor.lastrowid
         parent_system_id = discovery_data.get('system_id')
@@ -15,6 +15,7 @@ from services.auth_service import (
     generate_api_key,
     hash_api_key,
     get_or_create_profile,
+    invalidate_api_key_cache,
 )
 
 logger = logging.getLogger('control.room')
@@ -184,6 +185,7 @@ async def revoke_api_key(key_id: int, session: Optional[str] = Cookie(None)):
 
         cursor.execute('UPDATE api_keys SET is_active = 0 WHERE id = ?', (key_id,))
         conn.commit()
+        invalidate_api_key_cache(key_id)
 
         logger.info(f"Revoked API key: {row['name']} (ID: {key_id})")
 
@@ -245,6 +247,7 @@ async def update_api_key(key_id: int, payload: dict, session: Optional[str] = Co
             params.append(key_id)
             cursor.execute(f"UPDATE api_keys SET {', '.join(updates)} WHERE id = ?", params)
             conn.commit()
+            invalidate_api_key_cache(key_id)
 
         return {'status': 'ok', 'message': 'API key updated'}
 
@@ -308,6 +311,7 @@ async def register_extractor(request: Request):
                     if profile_id:
                         cursor.execute("UPDATE api_keys SET profile_id = ? WHERE id = ?", (profile_id, existing['id']))
                         conn.commit()
+                        invalidate_api_key_cache(existing['id'])
                 return {
                     'status': 'already_registered',
                     'key_prefix': existing['key_prefix'],
@@ -558,6 +562,7 @@ async def reissue_extractor_key(key_id: int, session: Optional[str] = Cookie(Non
             logger.warning(f"Could not write audit log for key reissue: {audit_err}")
 
         conn.commit()
+        invalidate_api_key_cache(key_id)
 
         logger.info(
             f"API key reissued for extractor user '{key_row['discord_username']}' "
@@ -627,6 +632,7 @@ async def update_extractor_user(key_id: int, request: Request, session: Optional
         params.append(key_id)
         cursor.execute(f"UPDATE api_keys SET {', '.join(updates)} WHERE id = ?", params)
         conn.commit()
+        invalidate_api_key_cache(key_id)
 
         action = 'updated'
         if 'is_active' in body:
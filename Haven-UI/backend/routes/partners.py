@@ -26,11 +26,13 @@ from services.civilizations import user_can_act_for_civ
 from db import (
     get_db_connection,
     add_activity_log,
+    sync_facet_tokens,
 )
 
 from services.restrictions import (
     get_restrictions_by_discord_tag,
 )
+from services.filter_facets import invalidate_filter_options
 
 from constants import (
     RESTRICTABLE_FIELDS,
@@ -769,6 +771,7 @@ async def approve_edit_request(request_id: int, session: Optional[str] = Cookie(
             set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
             values = list(updates.values()) + [system_id]
             cursor.execute(f"UPDATE systems SET {set_clause} WHERE id = ?", values)
+            sync_facet_tokens(cursor, system_id)
             applied_fields = list(updates.keys())
 
         # Mark as approved with the real reviewer username
@@ -809,6 +812,7 @@ async def approve_edit_request(request_id: int, session: Optional[str] = Cookie(
             logger.warning(f"Failed to audit-log edit approval: {audit_err}")
 
         conn.commit()
+        invalidate_filter_options()
 
         add_activity_log(
             'edit_approved',
@@ -43,7 +43,8 @@ async def get_poster_png(poster_type: str, cache_key: str):
     """Return the rendered PNG for (type, key).
 
     Cache hit → serve from disk.
-    Cache miss / stale → render via Playwright, cache, serve.
+    Cache stale → serve the old PNG, refresh in the background.
+    Cache miss → render via Playwright (shared with concurrent requests), cache, serve.
     Render failure → fall back to last good cache if any, else 503.
 
     Public for all types unless the template marks itself non-public.
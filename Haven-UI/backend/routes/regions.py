@@ -18,7 +18,6 @@ from services.auth_service import (
     is_super_admin,
     require_feature,
     verify_api_key,
-    normalize_username_for_dedup,
     check_self_submission,
 )
 from services.civilizations import civ_scope_filter
@@ -27,6 +26,19 @@ from services.restrictions import (
     get_restriction_for_system,
     can_bypass_restriction,
     apply_data_restrictions,
+    has_hidden_systems,
+)
+from services.region_stats import (
+    coauthor_contributor,
+    decode_region_cursor,
+    encode_region_cursor,
+    region_card_stats,
+    region_page,
+    region_sort_key,
+    region_stats_ready,
+    region_stats_scope,
+    region_summary_ready,
+    system_contributor,
 )
 
 
@@ -89,8 +101,15 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                                min_planets: int = None,
                                max_planets: int = None,
                                is_complete: str = None,
+                               after: str = None,
                                session: Optional[str] = Cookie(None)):
-    """Return all regions with their systems grouped together."""
+    """Return all regions with their systems grouped together.
+
+    Paged by `page`/`limit`, or by keyset: pass a previous response's
+    `next_cursor` as `after` to continue just past its last region. When the
+    filters allow it the page is read from region_stats (see
+    services/region_stats.py) instead of aggregating every system in scope.
+    """
     session_data = get_session(session)
 
     conn = None
@@ -127,6 +146,7 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
             filter_params.append(galaxy)
 
         # Advanced filters (system-level and planet-level)
+        advanced_clauses = []
         _build_advanced_filter_clauses({
             'star_type': star_type, 'economy_type': economy_type,
             'economy_level': economy_level, 'conflict_level': conflict_level,
@@ -134,50 +154,91 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
             'biome': biome, 'weather': weather, 'sentinel_level': sentinel_level,
             'resource': resource, 'has_moons': has_moons,
             'min_planets': min_planets, 'max_planets': max_planets, 'is_complete': is_complete,
-        }, filter_clauses, filter_params)
+        }, advanced_clauses, filter_params)
+        filter_clauses.extend(advanced_clauses)
 
         # Hide systems from archived civilizations for non-super-admins
-        if not (session_data and session_data.get('user_type') == 'super_admin'):
+        is_super = bool(session_data and session_data.get('user_type') == 'super_admin')
+        if not is_super:
             filter_clauses.append(archived_civ_filter('s'))
 
+        after_key = None
+        if after:
+            try:
+                after_key = decode_region_cursor(after)
+            except ValueError:
+                raise HTTPException(status_code=400, detail='Invalid cursor')
+
         # Combine filters
         combined_filter = ""
         if filter_clauses:
             combined_filter = " AND " + " AND ".join(filter_clauses)
 
-        # STEP 1: Get all regions with aggregated counts in a SINGLE query
-        cursor.execute(f'''
-            SELECT
-                s.region_x, s.region_y, s.region_z,
-                r.custom_name,
-                r.id as region_id,
-                MIN(s.created_at) as first_system_date,
-                MIN(s.id) as first_system_id,
-                COUNT(DISTINCT s.id) as system_count
-            FROM systems s
-            LEFT JOIN regions r ON s.region_x = r.region_x
-                AND s.region_y = r.region_y AND s.region_z = r.region_z
-            WHERE s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL
-                {combined_filter}
-            GROUP BY s.region_x, s.region_y, s.region_z
-            ORDER BY
-                CASE
-                    WHEN r.custom_name = 'Sea of Gidzenuf' THEN 0
-                    WHEN r.custom_name IS NOT NULL THEN 1
-                    ELSE 2
-                END ASC,
-                COUNT(DISTINCT s.id) DESC,
-                first_system_date ASC NULLS FIRST,
-                first_system_id ASC
-        ''', filter_params)
-
-        region_rows = cursor.fetchall()
-        all_region_rows = list(region_rows)
+        # STEP 1: The ordered region list. region_stats answers the community /
+        # reality / galaxy / archived-civ filters with SQL-side paging, but not
+        # the system- and planet-level advanced filters. Its counts also can't
+        # see per-viewer restrictions, which the summary path folds into the
+        # totals, so that path only uses it when no system in scope is hidden
+        # from this viewer. Otherwise aggregate every region in scope.
+        use_stats = (not advanced_clauses and region_stats_ready(cursor)
+                     and (include_systems or not has_hidden_systems(cursor, session_data, reality, galaxy)))
+        if use_stats:
+            stats_clauses, stats_params = region_stats_scope(discord_tag, reality, galaxy, hide_archived=not is_super)
+            stats_total, all_region_rows = region_page(cursor, stats_clauses, stats_params, limit, page, after_key)
+        else:
+            cursor.execute(f'''
+                SELECT
+                    s.region_x, s.region_y, s.region_z,
+                    r.custom_name,
+                    r.id as region_id,
+                    MIN(s.created_at) as first_system_date,
+                    MIN(s.id) as first_system_id,
+                    COUNT(DISTINCT s.id) as system_count
+                FROM systems s
+                LEFT JOIN regions r ON s.region_x = r.region_x
+                    AND s.region_y = r.region_y AND s.region_z = r.region_z
+                WHERE s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL
+                    {combined_filter}
+                GROUP BY s.region_x, s.region_y, s.region_z
+                ORDER BY
+                    CASE
+                        WHEN r.custom_name = 'Sea of Gidzenuf' THEN 0
+                        WHEN r.custom_name IS NOT NULL THEN 1
+                        ELSE 2
+                    END ASC,
+                    COUNT(DISTINCT s.id) DESC,
+                    first_system_date ASC NULLS FIRST,
+                    first_system_id ASC
+            ''', filter_params)
+
+            region_rows = cursor.fetchall()
+            all_region_rows = list(region_rows)
+
+        def _paginate(rows, total):
+            """(page rows, total_pages, page) for the requested window.
+            1-based pages; limit=0 is a back-compat sentinel meaning "return
+            everything" — used by callers that want the full list in one shot
+            (CLAUDE.md note: Dashboard still passes its own tiny limit; new
+            callers default to 24). region_page() already windowed the
+            region_stats rows."""
+            if limit <= 0:
+                return rows, (1 if total else 0), 1
+            total_pages = max(1, (total + limit - 1) // limit) if total else 0
+            if use_stats:
+                return rows, total_pages, max(1, page)
+            if after_key is not None:
+                return [r for r in rows if region_sort_key(r) > after_key][:limit], total_pages, max(1, page)
+            offset = (max(1, page) - 1) * limit
+            return rows[offset:offset + limit], total_pages, max(1, page)
+
+        def _next_cursor(rows):
+            return encode_region_cursor(rows[-1]) if limit > 0 and len(rows) == limit else None
 
         regions = []
 
         if not include_systems:
             # Fast path: return just region summaries without nested data.
+            # With region_stats, all_region_rows is already just this page.
             # The SELECT pulls the few extra fields the card footer needs
             # (score for Grade S, submitter for contributor count) so we
             # don't have to make a second pass over the systems table.
@@ -189,8 +250,20 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
             grade_s_counts = {}
             grade_splus_counts = {}  # S+ ("fully charted") — subset of grade_s
             contributor_sets = {}
-
-            if all_region_coords:
+            contributor_counts = {}
+
+            if all_region_coords and use_stats and region_summary_ready(cursor):
+                # Nothing in scope is hidden from this viewer (see use_stats),
+                # so the summary's counts are the visible counts.
+                card_stats = region_card_stats(cursor, stats_clauses, stats_params, all_region_coords)
+                for row in all_region_rows:
+                    key = (row['region_x'], row['region_y'], row['region_z'])
+                    visible_counts[key] = row['system_count']
+                    grade_s, grade_splus, contributor_count = card_stats.get(key, (0, 0, 0))
+                    grade_s_counts[key] = grade_s
+                    grade_splus_counts[key] = grade_splus
+                    contributor_counts[key] = contributor_count
+            elif all_region_coords:
                 cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _tmp_region_coords (rx INTEGER, ry INTEGER, rz INTEGER)")
                 cursor.execute("DELETE FROM _tmp_region_coords")
                 cursor.executemany("INSERT INTO _tmp_region_coords VALUES (?, ?, ?)", all_region_coords)
@@ -201,13 +274,13 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                 # downstream Python still calls .get('completeness_score')
                 # first as a forward-compat shim; that returns None here and
                 # falls through to is_complete cleanly.
-                # `submitter_id` is pulled too because a few legacy rows
-                # have it set but lack personal_discord_username — without
-                # it those contributors would be invisible.
+                # Contributor identity follows region_stats.system_contributor
+                # (profile_id, then the username_normalized contributor key),
+                # the rule the summary path's region_contributors rows are
+                # written with.
                 cursor.execute(f'''
                     SELECT s.id, s.discord_tag, s.region_x, s.region_y, s.region_z,
-                           s.is_complete, s.is_fully_charted, s.profile_id, s.submitter_id,
-                           s.personal_discord_username, s.discovered_by
+                           s.is_complete, s.is_fully_charted, s.profile_id, s.username_normalized
                     FROM systems s
                     INNER JOIN _tmp_region_coords t ON s.region_x = t.rx AND s.region_y = t.ry AND s.region_z = t.rz
                     WHERE 1=1 {combined_filter}
@@ -241,23 +314,13 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                         if system.get('is_fully_charted'):
                             grade_splus_counts[key] = grade_splus_counts.get(key, 0) + 1
                     # Primary submitter — exactly ONE identity per system
-                    # row. profile_id is preferred (canonical FK), then a
-                    # normalized username from either column. submitter_id
-                    # is only used when nothing else is available because
-                    # the same person commonly has both profile_id AND a
-                    # username on the row — counting all three would
+                    # row. The same person commonly has both profile_id AND
+                    # a username on the row — counting both would
                     # multi-count one person.
                     s = contributor_sets.setdefault(key, set())
-                    pid = system.get('profile_id')
-                    if pid:
-                        s.add(('p', pid))
-                    else:
-                        norm = (normalize_username_for_dedup(system.get('personal_discord_username') or '')
-                                or normalize_username_for_dedup(system.get('discovered_by') or ''))
-                        if norm:
-                            s.add(('u', norm))
-                        elif system.get('submitter_id'):
-                            s.add(('s', system['submitter_id']))
+                    contributor = system_contributor(system)
+                    if contributor:
+                        s.add(contributor)
 
                 # Co-author rows. Wizard v1 (migration 1.75.0) introduced
                 # system_coauthors so multi-member submissions credit the
@@ -274,29 +337,14 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                         key = system_id_to_key.get(ca_row['system_id'])
                         if key is None:
                             continue
-                        s = contributor_sets.setdefault(key, set())
-                        if ca_row['profile_id']:
-                            s.add(('p', ca_row['profile_id']))
-                        elif ca_row['username_normalized']:
-                            s.add(('u', ca_row['username_normalized']))
-
-            true_total_regions = sum(1 for r in all_region_rows if visible_counts.get((r['region_x'], r['region_y'], r['region_z']), 0) > 0)
+                        contributor = coauthor_contributor(ca_row)
+                        if contributor:
+                            contributor_sets.setdefault(key, set()).add(contributor)
+                contributor_counts = {key: len(s) for key, s in contributor_sets.items()}
 
             visible_region_rows = [r for r in all_region_rows if visible_counts.get((r['region_x'], r['region_y'], r['region_z']), 0) > 0]
-            # 1-based pagination. limit=0 is a back-compat sentinel meaning
-            # "return everything" — used by callers that want the full list
-            # in one shot (CLAUDE.md note: Dashboard still passes its own
-            # tiny limit; new callers default to 24).
-            if limit > 0:
-                page_idx = max(1, page) - 1
-                offset = page_idx * limit
-                region_rows_paginated = visible_region_rows[offset:offset + limit]
-                total_pages_out = max(1, (true_total_regions + limit - 1) // limit) if true_total_regions else 0
-                page_out = max(1, page)
-            else:
-                region_rows_paginated = visible_region_rows
-                total_pages_out = 1 if true_total_regions else 0
-                page_out = 1
+            true_total_regions = stats_total if use_stats else len(visible_region_rows)
+            region_rows_paginated, total_pages_out, page_out = _paginate(visible_region_rows, true_total_regions)
 
             for region_row in region_rows_paginated:
                 region = dict(region_row)
@@ -311,7 +359,7 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                 region['system_count'] = visible_counts.get(key, 0)
                 region['grade_s_count'] = grade_s_counts.get(key, 0)
                 region['grade_splus_count'] = grade_splus_counts.get(key, 0)
-                region['contributor_count'] = len(contributor_sets.get(key, set()))
+                region['contributor_count'] = contributor_counts.get(key, 0)
                 region['systems'] = []
                 regions.append(region)
 
@@ -322,24 +370,15 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                 'page': page_out,
                 'total_pages': total_pages_out,
                 'limit': limit,
+                'next_cursor': _next_cursor(region_rows_paginated),
                 'applied_filter': discord_tag or 'all',
                 'reality': reality,
                 'galaxy': galaxy
             }
 
         # STEP 2: Load all systems for all regions in ONE query (include_systems=True path)
-        total_regions = len(all_region_rows)
-        # 1-based pagination, matching the fast path.
-        if limit > 0:
-            page_idx = max(1, page) - 1
-            offset = page_idx * limit
-            paginated_region_rows = all_region_rows[offset:offset + limit]
-            total_pages_out = max(1, (total_regions + limit - 1) // limit) if total_regions else 0
-            page_out = max(1, page)
-        else:
-            paginated_region_rows = all_region_rows
-            total_pages_out = 1 if total_regions else 0
-            page_out = 1
+        total_regions = stats_total if use_stats else len(all_region_rows)
+        paginated_region_rows, total_pages_out, page_out = _paginate(all_region_rows, total_regions)
 
         region_coords = [(r['region_x'], r['region_y'], r['region_z']) for r in paginated_region_rows]
         if not region_coords:
@@ -350,6 +389,7 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                 'page': page_out,
                 'total_pages': total_pages_out,
                 'limit': limit,
+                'next_cursor': None,
                 'applied_filter': discord_tag or 'all',
                 'reality': reality,
                 'galaxy': galaxy,
@@ -454,9 +494,10 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
             # footer. Uses the same logic as the fast path so numbers match.
             #   - Grade S: score >= 85 from `is_complete` (v1.34.0 repurposed).
             #   - Contributors: union of primary submitter identities on each
-            #     system row + every system_coauthors row for those systems.
-            #     Usernames pass through normalize_username_for_dedup so
-            #     `turpitzz` and `turpitzz#9999` count as one person.
+            #     system row + every system_coauthors row for those systems,
+            #     keyed like region_contributors. username_normalized is the
+            #     normalize_username_for_dedup key, so `turpitzz` and
+            #     `turpitzz#9999` count as one person.
             grade_s = 0
             grade_splus = 0  # S+ ("fully charted") — subset of grade_s
             contributors = set()
@@ -470,19 +511,12 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                     grade_s += 1
                     if s.get('is_fully_charted'):
                         grade_splus += 1
-                # One identity per system: profile_id preferred, then a
-                # normalized username, then submitter_id as last resort.
-                # Adding all three would count one person N times.
-                pid = s.get('profile_id')
-                if pid:
-                    contributors.add(('p', pid))
-                else:
-                    norm = (normalize_username_for_dedup(s.get('personal_discord_username') or '')
-                            or normalize_username_for_dedup(s.get('discovered_by') or ''))
-                    if norm:
-                        contributors.add(('u', norm))
-                    elif s.get('submitter_id'):
-                        contributors.add(('s', s['submitter_id']))
+                # One identity per system (region_stats.system_contributor).
+                # Adding both profile and username would count one person
+                # twice.
+                contributor = system_contributor(s)
+                if contributor:
+                    contributors.add(contributor)
 
             # Fold in coauthors for these systems. system_coauthors stores
             # username_normalized directly, so no further normalization.
@@ -494,10 +528,9 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
                     WHERE system_id IN ({placeholders})
                 ''', sys_ids_in_region)
                 for ca_row in cursor.fetchall():
-                    if ca_row['profile_id']:
-                        contributors.add(('p', ca_row['profile_id']))
-                    elif ca_row['username_normalized']:
-                        contributors.add(('u', ca_row['username_normalized']))
+                    contributor = coauthor_contributor(ca_row)
+                    if contributor:
+                        contributors.add(contributor)
 
             region['grade_s_count'] = grade_s
             region['grade_splus_count'] = grade_splus
@@ -517,11 +550,14 @@ async def api_regions_grouped(include_systems: bool = False, page: int = 1, limi
             'page': page_out,
             'total_pages': total_pages_out,
             'limit': limit,
+            'next_cursor': _next_cursor(paginated_region_rows),
             'applied_filter': discord_tag or 'all',
             'reality': reality,
             'galaxy': galaxy
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         logger.error(f"Error fetching grouped regions: {e}")
@@ -1259,29 +1295,20 @@ async def api_submit_region_name(
         # UNIQUE(custom_name) was dropped in migration 1.88.0). So we no longer
         # reject a proposal just because the name is used by, or pending for,
         # another region. We DO still keep one pending submission per voxel as
-        # queue hygiene (below).
-        cursor.execute('''
-            SELECT id FROM pending_region_names
-            WHERE region_x = ? AND region_y = ? AND region_z = ?
-              AND reality = ? AND galaxy = ?
-              AND status = 'pending'
-        ''', (rx, ry, rz, reality, galaxy))
-        pending = cursor.fetchone()
-        if pending:
+        # queue hygiene. Same rule as the `regions` array of
+        # /api/extraction/batch.
+        from routes.approvals import _queue_region_proposal
+        status = _queue_region_proposal(
+            cursor, (rx, ry, rz), reality, galaxy, proposed_name, submitted_by, client_ip,
+            discord_tag, personal_discord_username, submitter_profile_id, source, rename=True,
+        )
+        if status == 'already_pending':
             raise HTTPException(
                 status_code=409,
                 detail='There is already a pending name submission for this region. Please wait for it to be reviewed.'
             )
-
-        cursor.execute('''
-            INSERT INTO pending_region_names
-            (region_x, region_y, region_z, proposed_name, submitted_by, submitted_by_ip,
-             submission_date, status, discord_tag, personal_discord_username, reality, galaxy,
-             submitter_profile_id, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?, ?, ?)
-        ''', (rx, ry, rz, proposed_name, submitted_by, client_ip,
-              datetime.now(timezone.utc).isoformat(), discord_tag, personal_discord_username,
-              reality, galaxy, submitter_profile_id, source))
+        if status == 'already_named':
+            raise HTTPException(status_code=409, detail='This region already has that name.')
 
         conn.commit()
 
@@ -1,15 +1,13 @@
 """Systems browsing, search, galaxy, glyph, and stats endpoints."""
 
 import asyncio
-import base64
-import hashlib
 import json
 import logging
+import os
 import re
 from typing import Optional
 
-from fastapi import APIRouter, Cookie, Header, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Cookie, Header, HTTPException, Request
 
 from constants import (
     GALAXY_BY_INDEX,
@@ -47,6 +45,11 @@ from services.completeness import (
 )
 from services.restrictions import apply_data_restrictions
 from services.namegen_service import generate_names
+from services.payload_cache import PayloadCache
+from services.map_snapshot import STAR_TYPE_ORDER, get_snapshot_state, parse_token
+from services.system_search import fts_hits_join
+from services.region_stats import map_region_rows, region_stats_scope, region_summary_ready
+from services.filter_facets import get_filter_options_payload
 from option_catalog import get_option_catalog
 
 logger = logging.getLogger('control.room')
@@ -59,7 +62,7 @@ router = APIRouter()
 # ============================================================================
 
 # _build_advanced_filter_clauses lives in db.py (shared across systems, regions, galaxies)
-from db import _build_advanced_filter_clauses, archived_civ_filter, norm_token
+from db import _build_advanced_filter_clauses, archived_civ_filter
 
 
 # ============================================================================
@@ -258,21 +261,11 @@ async def api_map_regions_aggregated(
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Build WHERE clause with optional filters
-        where_clauses = ["s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL"]
-        params = []
-
-        if reality:
-            where_clauses.append("s.reality = ?")
-            params.append(reality)
-        if galaxy:
-            where_clauses.append("s.galaxy = ?")
-            params.append(galaxy)
-
-        # Hide systems from archived civilizations (public endpoint)
-        where_clauses.append(archived_civ_filter('s'))
-
-        where_sql = " AND ".join(where_clauses)
+        # region_stats (migrations 1.106.0 / 1.107.0) holds one summary row
+        # per region partition, so the map reads O(regions) rows instead of
+        # grouping every system. The systems aggregate is the fallback for a
+        # DB that hasn't run the migrations yet.
+        use_summary = region_summary_ready(cursor)
 
         # Pre-compute the set of focused region coord tuples so the per-row
         # is_focused flag is an O(1) lookup. Done as a second query to keep
@@ -280,13 +273,20 @@ async def api_map_regions_aggregated(
         # small (one civ's territory, or one user's submissions).
         focused_keys = set()
         if focus_civ:
-            cursor.execute(
-                "SELECT DISTINCT region_x, region_y, region_z "
-                "FROM systems "
-                "WHERE region_x IS NOT NULL AND region_y IS NOT NULL AND region_z IS NOT NULL "
-                "AND discord_tag = ? COLLATE NOCASE",
-                (focus_civ,)
-            )
+            if use_summary:
+                cursor.execute(
+                    "SELECT DISTINCT region_x, region_y, region_z "
+                    "FROM region_stats WHERE discord_tag = ? COLLATE NOCASE",
+                    (focus_civ,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT DISTINCT region_x, region_y, region_z "
+                    "FROM systems "
+                    "WHERE region_x IS NOT NULL AND region_y IS NOT NULL AND region_z IS NOT NULL "
+                    "AND discord_tag = ? COLLATE NOCASE",
+                    (focus_civ,)
+                )
             focused_keys = {(r['region_x'], r['region_y'], r['region_z']) for r in cursor.fetchall()}
         elif focus_user:
             # Match contributor by either column. Case-insensitive — the
@@ -301,32 +301,53 @@ async def api_map_regions_aggregated(
             )
             focused_keys = {(r['region_x'], r['region_y'], r['region_z']) for r in cursor.fetchall()}
 
-        # Single aggregated query - returns one row per populated region
-        # Includes discord_tag info for custom region coloring
-        cursor.execute(f'''
-            SELECT
-                s.region_x,
-                s.region_y,
-                s.region_z,
-                r.custom_name as region_name,
-                COUNT(*) as system_count,
-                MIN(s.x) as display_x,
-                MIN(s.y) as display_y,
-                MIN(s.z) as display_z,
-                GROUP_CONCAT(DISTINCT s.galaxy) as galaxies,
-                GROUP_CONCAT(DISTINCT s.reality) as realities,
-                GROUP_CONCAT(DISTINCT s.discord_tag) as discord_tags
-            FROM systems s
-            LEFT JOIN regions r ON s.region_x = r.region_x
-                AND s.region_y = r.region_y AND s.region_z = r.region_z
-                AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
-                AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
-            WHERE {where_sql}
-            GROUP BY s.region_x, s.region_y, s.region_z
-            ORDER BY system_count DESC
-        ''', params)
+        if use_summary:
+            # The scope hides archived civilizations by default (public endpoint)
+            stats_clauses, stats_params = region_stats_scope(reality=reality, galaxy=galaxy)
+            rows = map_region_rows(cursor, stats_clauses, stats_params)
+        else:
+            # Build WHERE clause with optional filters
+            where_clauses = ["s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL"]
+            params = []
+
+            if reality:
+                where_clauses.append("s.reality = ?")
+                params.append(reality)
+            if galaxy:
+                where_clauses.append("s.galaxy = ?")
+                params.append(galaxy)
+
+            # Hide systems from archived civilizations (public endpoint)
+            where_clauses.append(archived_civ_filter('s'))
+
+            where_sql = " AND ".join(where_clauses)
+
+            # Single aggregated query - returns one row per populated region
+            # Includes discord_tag info for custom region coloring
+            cursor.execute(f'''
+                SELECT
+                    s.region_x,
+                    s.region_y,
+                    s.region_z,
+                    r.custom_name as region_name,
+                    COUNT(*) as system_count,
+                    MIN(s.x) as display_x,
+                    MIN(s.y) as display_y,
+                    MIN(s.z) as display_z,
+                    GROUP_CONCAT(DISTINCT s.galaxy) as galaxies,
+                    GROUP_CONCAT(DISTINCT s.reality) as realities,
+                    GROUP_CONCAT(DISTINCT s.discord_tag) as discord_tags
+                FROM systems s
+                LEFT JOIN regions r ON s.region_x = r.region_x
+                    AND s.region_y = r.region_y AND s.region_z = r.region_z
+                    AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
+                    AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
+                WHERE {where_sql}
+                GROUP BY s.region_x, s.region_y, s.region_z
+                ORDER BY system_count DESC
+            ''', params)
+            rows = cursor.fetchall()
 
-        rows = cursor.fetchall()
         total_systems = 0
         regions = []
 
@@ -347,7 +368,8 @@ async def api_map_regions_aggregated(
             if region.get('discord_tags'):
                 tags = [t for t in region['discord_tags'].split(',') if t and t != 'None']
                 region['discord_tags'] = tags
-                # Set dominant_tag as the first non-null tag (most common in the region)
+                # Set dominant_tag as the first non-null tag (region_stats
+                # orders the tags by system count, most common first)
                 region['dominant_tag'] = tags[0] if tags else None
             else:
                 region['discord_tags'] = []
@@ -381,49 +403,68 @@ async def api_map_regions_aggregated(
 # Map snapshot — single bulk bundle for the Cartographer v10 galaxy map
 # ============================================================================
 
-# In-memory cache for the built snapshot. Keyed on (reality, galaxy, token)
-# where token = systems row count + newest modified_at, so any approval/edit
-# invalidates it on the next request without a manual bust. v1 cache per the
-# integration dispatch — see docs/cartographer-integration-notes.md.
-_SNAPSHOT_CACHE: dict = {}
+# In-memory cache for the serialized snapshot. Keyed on (reality, galaxy, token)
+# where token = the scope's SnapshotState lineage + change-log seq, so any
+# approval/edit moves it on the next request without a manual bust. Entries are
+# the serialized JSON plus gzip/brotli variants (~2 MB raw each), held in a
+# byte-budgeted LRU so tokens superseded by approvals age out instead of
+# piling up for the life of the process. The TTL bounds staleness of inputs
+# the token doesn't cover (tag_colors). See services/payload_cache.py.
+_SNAPSHOT_CACHE = PayloadCache(
+    'map_snapshot',
+    max_bytes=int(os.getenv('HAVEN_SNAPSHOT_CACHE_MB', '24')) * 1024 * 1024,
+    ttl_seconds=int(os.getenv('HAVEN_SNAPSHOT_CACHE_TTL', '900')),
+)
 
+# Deltas are small and every open map polls with the same `since` after an
+# approval, so one serialization serves them all.
+_SNAPSHOT_DELTA_CACHE = PayloadCache(
+    'map_snapshot_delta',
+    max_bytes=4 * 1024 * 1024,
+    ttl_seconds=int(os.getenv('HAVEN_SNAPSHOT_CACHE_TTL', '900')),
+)
 
-def _spread_star(rx: int, ry: int, rz: int, sss: int) -> tuple:
-    """Deterministic intra-region spread — mirrors glyph_decoder.calculate_star_position_in_region.
 
-    Systems within the same NMS region share identical (x, y, z) glyph coordinates.
-    The SSS (solar system index) has no spatial meaning, so we hash it against the
-    region address to spread systems WITHIN their own voxel.
+def _empty_snapshot(token: str = '') -> dict:
+    """Empty-DB envelope keeps the shape stable so parseSnapshot() never NPEs."""
+    return {
+        'n': 0, 'pos': '', 'st': '', 'ti': '', 'hp': '', 'hs': '', 'ri': '',
+        'rpos': '', 'rcount': '', 'rn': 0, 'galaxies': [], 'regions': [], 'names': [],
+        'glyphs': [], 'star_types': list(STAR_TYPE_ORDER), 'tag_pool': [''],
+        'tag_colors': {}, 'biomes': [''], 'sizes': [''], 'sentinel': [''],
+        'planets_by_idx': {}, 'token': token,
+    }
 
-    TRUE SCALE: world unit = 1 region voxel (= ~400 ly in NMS). A region is a
-    single 400 ly cube, so its systems must stay inside ±0.5 voxel — otherwise
-    they smear across neighbouring regions and destroy all spatial locality.
-    (The previous ±64-voxel spread was ~128× too large: it scattered one
-    region's systems across ~25,600 ly of space.) We use ±0.45 so stars fill
-    the voxel without sitting exactly on its faces.
-    """
-    h = hashlib.sha256(f"NMS:{rx}:{ry}:{rz}:{sss}".encode()).digest()
-    ox = (int.from_bytes(h[0:4], 'big') / 0xFFFFFFFF - 0.5) * 0.9
-    oy = (int.from_bytes(h[4:8], 'big') / 0xFFFFFFFF - 0.5) * 0.9
-    oz = (int.from_bytes(h[8:12], 'big') / 0xFFFFFFFF - 0.5) * 0.9
-    bx = rx if rx <= 0x7FF else rx - 0x1000
-    by = ry if ry <= 0x7F  else ry - 0x100
-    bz = rz if rz <= 0x7FF else rz - 0x1000
-    return bx + ox, by + oy, bz + oz
 
+async def _snapshot_tag_colors() -> dict:
+    """tag_colors: reuse the canonical /api/discord_tag_colors source so the map
+    tints match the rest of the site. Lazy import avoids any module-load
+    circular dependency between route modules."""
+    try:
+        from routes.partners import get_discord_tag_colors
+        return (await get_discord_tag_colors()).get('colors', {})
+    except Exception as e:
+        logger.warning("snapshot: tag_colors lookup failed: %s", e)
+        return {}
 
-# Canonical star-type order — matches the mockup's `star_types` pool and the
-# in-page legend / shader palette. NULL or unmapped star types fall into an
-# 'Unknown' bucket appended on demand so unscanned systems still render.
-_STAR_TYPE_ORDER = ['Yellow', 'Red', 'Green', 'Blue', 'Purple']
 
-# Canonical planet-size order, pre-seeded so common sizes get low stable indices
-# (mockup pool was ['', 'Small', 'Medium', 'Large']).
-_SIZE_ORDER = ['Small', 'Medium', 'Large', 'Giant', 'Moon']
+def _snapshot_galaxies(cursor, reality: Optional[str]) -> list:
+    """Full galaxy list for the map's Galaxy dropdown. Reality-scoped but NOT
+    galaxy-scoped, so the dropdown keeps every option even when the snapshot
+    itself is narrowed to one galaxy."""
+    gal_where = ["galaxy IS NOT NULL AND TRIM(galaxy) != ''"]
+    gal_params = []
+    if reality:
+        gal_where.append("COALESCE(reality, 'Normal') = ?")
+        gal_params.append(reality)
+    cursor.execute(
+        f"SELECT DISTINCT galaxy FROM systems WHERE {' AND '.join(gal_where)} ORDER BY galaxy",
+        gal_params)
+    return [r[0] for r in cursor.fetchall() if r[0]]
 
 
 @router.get('/api/map/snapshot')
-async def api_map_snapshot(reality: str = None, galaxy: str = None):
+async def api_map_snapshot(request: Request, reality: str = None, galaxy: str = None):
     """Bulk galaxy snapshot for the Cartographer v10 map.
 
     Replaces the mockup's baked `<script id="snapshot">` blob — the response
@@ -434,323 +475,87 @@ async def api_map_snapshot(reality: str = None, galaxy: str = None):
     surface. Per-system hot data is base64-packed little-endian typed arrays;
     categorical fields are string pools indexed by Uint8/Uint16 arrays; the
     detail panel reads a sparse planets_by_idx. Optional reality/galaxy filters
-    mirror /api/map/regions-aggregated.
+    mirror /api/map/regions-aggregated. `token` identifies this version for
+    /api/map/snapshot/delta.
+
+    The arrays come from a per-scope SnapshotState that is patched in place
+    from map_change_log after approvals/edits rather than rebuilt (see
+    services/map_snapshot.py).
 
     Field contract documented in docs/cartographer-integration-notes.md.
     """
-    import numpy as np
-
-    # Empty-DB envelope keeps the shape stable so parseSnapshot() never NPEs.
-    empty = {
-        'n': 0, 'pos': '', 'st': '', 'ti': '', 'hp': '', 'hs': '', 'ri': '',
-        'rpos': '', 'rcount': '', 'rn': 0, 'galaxies': [], 'regions': [], 'names': [],
-        'glyphs': [], 'star_types': list(_STAR_TYPE_ORDER), 'tag_pool': [''],
-        'tag_colors': {}, 'biomes': [''], 'sizes': [''], 'sentinel': [''],
-        'planets_by_idx': {},
-    }
-
     conn = None
     try:
         db_path = get_db_path()
         if not db_path.exists():
-            return empty
+            return _empty_snapshot()
 
         conn = get_db_connection()
         cursor = conn.cursor()
+        state = get_snapshot_state(cursor, reality, galaxy)
+        cache_key = (reality or '', galaxy or '', state.token)
+        accept_encoding = request.headers.get('accept-encoding')
+        cached = _SNAPSHOT_CACHE.get(cache_key)
+        if cached is not None:
+            # Cached value is the already-serialized (and pre-compressed) JSON,
+            # so a warm hit skips re-serialization of a ~2 MB payload and
+            # per-request compression.
+            return cached.response(accept_encoding)
+        if state.n == 0:
+            return _empty_snapshot(state.token)
+
+        galaxies = _snapshot_galaxies(cursor, reality)
+        result = state.to_snapshot(await _snapshot_tag_colors(), galaxies)
+
+        # Serialize once and cache the bytes (not the dict) so warm hits are a
+        # straight byte return; the LRU's byte budget bounds growth across
+        # reality/galaxy/token combinations.
+        payload = json.dumps(result, ensure_ascii=True)
+        return _SNAPSHOT_CACHE.put(cache_key, payload).response(accept_encoding)
 
-        # --- Cache token: row count + newest write. Cheap, index-friendly. ---
-        cursor.execute("SELECT COUNT(*), COALESCE(MAX(modified_at), '') FROM systems")
-        meta = cursor.fetchone()
-        token = f"{meta[0]}::{meta[1]}"
-        cache_key = (reality or '', galaxy or '', token)
-        if cache_key in _SNAPSHOT_CACHE:
-            # Cached value is the already-serialized JSON string, so a warm hit
-            # skips both the DB build and re-serialization of a ~2 MB payload.
-            return Response(content=_SNAPSHOT_CACHE[cache_key],
-                            media_type='application/json')
-
-        # --- Optional reality/galaxy scope (same filters as regions-aggregated) ---
-        where = ["s.x IS NOT NULL AND s.y IS NOT NULL AND s.z IS NOT NULL"]
-        params = []
-        if reality:
-            where.append("s.reality = ?")
-            params.append(reality)
-        if galaxy:
-            where.append("s.galaxy = ?")
-            params.append(galaxy)
-        where.append(archived_civ_filter('s'))
-        where.append("s.glyph_code IS NOT NULL AND LENGTH(s.glyph_code) = 12")
-        where_sql = " AND ".join(where)
-
-        # --- Systems in stable id order. The row position IS the snapshot
-        #     index that every per-system array and planets_by_idx key uses. ---
-        cursor.execute(f"""
-            SELECT s.id,
-                   COALESCE(NULLIF(TRIM(s.name), ''),
-                            NULLIF(TRIM(s.description), ''),
-                            'System ' || s.glyph_code) AS name,
-                   s.x, s.y, s.z, s.star_type, s.discord_tag,
-                   s.glyph_code, s.region_x, s.region_y, s.region_z
-            FROM systems s
-            WHERE {where_sql}
-            ORDER BY s.id
-        """, params)
-        systems = cursor.fetchall()
-        n = len(systems)
-        if n == 0:
-            return empty
-
-        # --- hasPlanets / hasStation as set lookups (one query each, not n) ---
-        cursor.execute("SELECT DISTINCT system_id FROM planets")
-        planet_systems = {r[0] for r in cursor.fetchall()}
-        cursor.execute("SELECT DISTINCT system_id FROM space_stations")
-        station_systems = {r[0] for r in cursor.fetchall()}
-
-        # --- Per-system arrays + categorical pools (built while walking rows) ---
-        star_index = {name: i for i, name in enumerate(_STAR_TYPE_ORDER)}
-        star_types = list(_STAR_TYPE_ORDER)
-        unknown_star_idx = None
-        tag_index = {'': 0}   # '' = untagged, index 0 (matches mockup pool)
-        tag_pool = ['']
-
-        positions = np.empty(n * 3, dtype='<f4')  # little-endian f32, JS-compatible
-        st = np.zeros(n, dtype=np.uint8)
-        ti = np.zeros(n, dtype=np.uint8)
-        hp = np.zeros(n, dtype=np.uint8)
-        hs = np.zeros(n, dtype=np.uint8)
-        names = []
-        glyphs = []
-        id_to_idx = {}
-        # Per-system region voxel key, captured in row order so we can emit a
-        # per-system region index (ri) once the region pool below is built. The
-        # Cartographer uses this to derive which regions contain a filter match.
-        sys_region_keys = []
-
-        for i, s in enumerate(systems):
-            sid = s['id']
-            id_to_idx[sid] = i
-            glyph = s['glyph_code'] or ''
-            rx = s['region_x']
-            sys_region_keys.append((s['region_x'], s['region_y'], s['region_z']))
-            if len(glyph) == 12 and rx is not None:
-                # Spread systems within their region using the same deterministic
-                # hash as glyph_decoder.calculate_star_position_in_region so every
-                # system has a unique visible position when the camera zooms in.
-                sss = int(glyph[1:4], 16)
-                px, py, pz = _spread_star(rx, s['region_y'] or 0, s['region_z'] or 0, sss)
-            else:
-                px, py, pz = (s['x'] or 0.0), (s['y'] or 0.0), (s['z'] or 0.0)
-            positions[i * 3]     = px
-            positions[i * 3 + 1] = py
-            positions[i * 3 + 2] = pz
-
-            stype = s['star_type']
-            if stype in star_index:
-                st[i] = star_index[stype]
-            else:
-                # NULL / unmapped star type -> lazily-created 'Unknown' bucket
-                if unknown_star_idx is None:
-                    unknown_star_idx = len(star_types)
-                    star_types.append('Unknown')
-                st[i] = unknown_star_idx
-
-            tag = s['discord_tag'] or ''
-            if tag not in tag_index:
-                tag_index[tag] = len(tag_pool)
-                tag_pool.append(tag)
-            ti[i] = tag_index[tag]
-
-            hp[i] = 1 if sid in planet_systems else 0
-            hs[i] = 1 if sid in station_systems else 0
-            names.append(s['name'] or '(unnamed)')
-            glyphs.append(s['glyph_code'] or '')
-
-        # --- planets_by_idx + biome / size / sentinel pools ---
-        biome_index = {'': 0}
-        biomes = ['']
-        size_index = {'': 0}
-        sizes = ['']
-        sent_index = {'': 0}
-        sentinel = ['']
-
-        def pool_idx(value, index_map, pool):
-            """Intern a categorical string into its pool, returning its index."""
-            v = value or ''
-            if v not in index_map:
-                index_map[v] = len(pool)
-                pool.append(v)
-            return index_map[v]
-
-        # Pre-seed sizes so common values keep low, stable indices.
-        for sz in _SIZE_ORDER:
-            pool_idx(sz, size_index, sizes)
-
-        # Single LEFT JOIN + GROUP BY for moon counts — avoids one correlated
-        # subquery per planet row (~30k) which is slow on the Pi's SD-card I/O.
-        cursor.execute("""
-            SELECT p.id, p.system_id, p.name, p.biome, p.planet_size,
-                   p.sentinel_level, p.planet_index, p.is_moon,
-                   p.has_rings, p.is_gas_giant, p.water_world, p.is_bubble,
-                   p.is_floating_islands, p.is_dissonant, p.is_infested,
-                   p.extreme_weather,
-                   COUNT(m.id) AS moon_count
-            FROM planets p
-            LEFT JOIN moons m ON m.planet_id = p.id
-            GROUP BY p.id
-            ORDER BY p.system_id, p.planet_index
-        """)
-        planets_by_idx = {}
-        for p in cursor.fetchall():
-            idx = id_to_idx.get(p['system_id'])
-            if idx is None:
-                continue  # planet of a system outside the filtered / archived set
-            # Pack special features into the bitfield the mockup decodes.
-            flags = 0
-            if p['has_rings']:           flags |= 1
-            if p['is_gas_giant']:        flags |= 2
-            if p['water_world']:         flags |= 4
-            if p['is_bubble']:           flags |= 8
-            if p['is_floating_islands']: flags |= 16
-            if p['is_dissonant']:        flags |= 32
-            if p['is_infested']:         flags |= 64
-            if p['extreme_weather']:     flags |= 128
-            planet_tuple = [
-                p['name'] or '',
-                pool_idx(p['biome'], biome_index, biomes),
-                pool_idx(p['planet_size'], size_index, sizes),
-                pool_idx(p['sentinel_level'], sent_index, sentinel),
-                flags,
-                p['moon_count'] or 0,
-                p['planet_index'] or 0,
-                1 if p['is_moon'] else 0,
-            ]
-            planets_by_idx.setdefault(str(idx), []).append(planet_tuple)
-
-        # --- Region aggregation: centroid (avg) position, count, dominant tag,
-        #     custom name. Same join shape as /api/map/regions-aggregated. ---
-        rwhere = ["s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL"]
-        rparams = []
-        if reality:
-            rwhere.append("s.reality = ?"); rparams.append(reality)
-        if galaxy:
-            rwhere.append("s.galaxy = ?"); rparams.append(galaxy)
-        rwhere.append(archived_civ_filter('s'))
-        rwhere_sql = " AND ".join(rwhere)
-
-        cursor.execute(f"""
-            SELECT s.region_x, s.region_y, s.region_z,
-                   r.custom_name AS region_name,
-                   COUNT(*) AS system_count,
-                   AVG(s.x) AS cx, AVG(s.y) AS cy, AVG(s.z) AS cz,
-                   GROUP_CONCAT(DISTINCT s.discord_tag) AS tags
-            FROM systems s
-            LEFT JOIN regions r ON s.region_x = r.region_x
-                AND s.region_y = r.region_y AND s.region_z = r.region_z
-                AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
-                AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
-            WHERE {rwhere_sql}
-            GROUP BY s.region_x, s.region_y, s.region_z
-            ORDER BY system_count DESC
-        """, rparams)
-        region_rows = cursor.fetchall()
-        rn = len(region_rows)
-        rpos = np.empty(rn * 3, dtype='<f4')
-        rcount = np.empty(rn, dtype='<u2')  # little-endian uint16
-        regions = []
-        for i, r in enumerate(region_rows):
-            rpos[i * 3]     = r['cx'] or 0.0
-            rpos[i * 3 + 1] = r['cy'] or 0.0
-            rpos[i * 3 + 2] = r['cz'] or 0.0
-            cnt = r['system_count'] or 0
-            rcount[i] = min(cnt, 65535)  # clamp to Uint16 range
-            # Dominant tag = first non-null tag in the region (matches the
-            # existing regions-aggregated convention).
-            dom_tag = None
-            if r['tags']:
-                for t in r['tags'].split(','):
-                    if t and t != 'None':
-                        dom_tag = t
-                        break
-            regions.append({
-                'rx': r['region_x'], 'ry': r['region_y'], 'rz': r['region_z'],
-                'name': r['region_name'] or '',
-                'count': cnt,
-                'tag': dom_tag,
-            })
+    except Exception as e:
+        logger.error("Map snapshot error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="snapshot build failed")
+    finally:
+        if conn:
+            conn.close()
 
-        # --- Per-system region index (ri): aligned to the per-system arrays,
-        #     valued by position in the `regions` pool above. 65535 = no region
-        #     (system with NULL region coords). Lets the Cartographer filter map
-        #     a matched system back to its region for region-layer hiding. ---
-        region_key_to_idx = {(reg['rx'], reg['ry'], reg['rz']): i
-                             for i, reg in enumerate(regions)}
-        ri = np.fromiter(
-            (region_key_to_idx.get(k, 65535) for k in sys_region_keys),
-            dtype='<u2', count=n)
-
-        # --- tag_colors: reuse the canonical /api/discord_tag_colors source so
-        #     the map tints match the rest of the site. Lazy import avoids any
-        #     module-load circular dependency between route modules. ---
-        try:
-            from routes.partners import get_discord_tag_colors
-            tag_colors = (await get_discord_tag_colors()).get('colors', {})
-        except Exception as e:
-            logger.warning("snapshot: tag_colors lookup failed: %s", e)
-            tag_colors = {}
-
-        # --- Full galaxy list for the map's Galaxy dropdown. Reality-scoped but
-        #     NOT galaxy-scoped, so the dropdown keeps every option even when the
-        #     snapshot itself is narrowed to one galaxy. ---
-        gal_where = ["galaxy IS NOT NULL AND TRIM(galaxy) != ''"]
-        gal_params = []
-        if reality:
-            gal_where.append("COALESCE(reality, 'Normal') = ?")
-            gal_params.append(reality)
-        cursor.execute(
-            f"SELECT DISTINCT galaxy FROM systems WHERE {' AND '.join(gal_where)} ORDER BY galaxy",
-            gal_params)
-        all_galaxies = [r[0] for r in cursor.fetchall() if r[0]]
-
-        def b64(arr):
-            return base64.b64encode(arr.tobytes()).decode('ascii')
-
-        result = {
-            'n': n,
-            'pos': b64(positions),
-            'st': b64(st),
-            'ti': b64(ti),
-            'hp': b64(hp),
-            'hs': b64(hs),
-            'ri': b64(ri),
-            'rpos': b64(rpos),
-            'rcount': b64(rcount),
-            'rn': rn,
-            'galaxies': all_galaxies,
-            'regions': regions,
-            'names': names,
-            'glyphs': glyphs,
-            'star_types': star_types,
-            'tag_pool': tag_pool,
-            'tag_colors': tag_colors,
-            'biomes': biomes,
-            'sizes': sizes,
-            'sentinel': sentinel,
-            'planets_by_idx': planets_by_idx,
-        }
 
-        # Serialize once and cache the JSON string (not the dict) so warm hits
-        # are a straight byte return. Keep only the most recent few keys so the
-        # cache can't grow unbounded across reality/galaxy/token combinations.
+@router.get('/api/map/snapshot/delta')
+async def api_map_snapshot_delta(request: Request, since: str, reality: str = None, galaxy: str = None):
+    """Systems and regions changed since a prior snapshot `token`.
+
+    Lets an open Cartographer refresh after approvals without re-downloading
+    the full bundle. Changed rows are packed exactly like the full snapshot but
+    only for the indices listed in `idx` / `region_idx`; indices at or past the
+    client's n / rn are appends. When `since` is from another lineage (server
+    restart, or a change that had to rebuild the arrays — deletions, archived
+    civs, region renames) the response is `{"full": true, "token": ...}` and the
+    client should refetch /api/map/snapshot.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        state = get_snapshot_state(cursor, reality, galaxy)
+        lineage, since_seq = parse_token(since)
+        if lineage != state.lineage or since_seq is None or not (state.base_seq <= since_seq <= state.seq):
+            return {'full': True, 'token': state.token}
+
+        cache_key = (reality or '', galaxy or '', since_seq, state.token)
+        accept_encoding = request.headers.get('accept-encoding')
+        cached = _SNAPSHOT_DELTA_CACHE.get(cache_key)
+        if cached is not None:
+            return cached.response(accept_encoding)
+
+        galaxies = _snapshot_galaxies(cursor, reality)
+        result = state.to_delta(since_seq, await _snapshot_tag_colors(), galaxies)
         payload = json.dumps(result, ensure_ascii=True)
-        _SNAPSHOT_CACHE[cache_key] = payload
-        if len(_SNAPSHOT_CACHE) > 6:
-            for k in list(_SNAPSHOT_CACHE.keys())[:-6]:
-                _SNAPSHOT_CACHE.pop(k, None)
-        return Response(content=payload, media_type='application/json')
+        return _SNAPSHOT_DELTA_CACHE.put(cache_key, payload).response(accept_encoding)
 
     except Exception as e:
-        logger.error("Map snapshot error: %s", e, exc_info=True)
-        raise HTTPException(status_code=500, detail="snapshot build failed")
+        logger.error("Map snapshot delta error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="snapshot delta failed")
     finally:
         if conn:
             conn.close()
@@ -1341,14 +1146,18 @@ async def check_duplicate(
 # ============================================================================
 
 @router.get('/api/systems/filter-options')
-async def api_systems_filter_options(reality: str = None, galaxy: str = None):
+async def api_systems_filter_options(request: Request, reality: str = None, galaxy: str = None):
     """Return distinct values for all filterable fields.
 
     Used by the AdvancedFilters component to populate dropdown options.
-    Optionally scoped by reality and/or galaxy for relevant results.
+    Optionally scoped by reality and/or galaxy for relevant results. Served
+    from a per-scope cache invalidated by approvals/edits (see
+    services/filter_facets.py).
 
     Returns:
-        Dictionary with arrays of distinct values for each filter field.
+        Dictionary with arrays of distinct values for each filter field, plus
+        `counts` mapping each field's options to the number of systems they
+        match.
     """
     conn = None
     try:
@@ -1357,103 +1166,8 @@ async def api_systems_filter_options(reality: str = None, galaxy: str = None):
             return {}
 
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Build optional WHERE clause for scoping
-        sys_where_clauses = []
-        sys_params = []
-        if reality:
-            sys_where_clauses.append("COALESCE(s.reality, 'Normal') = ?")
-            sys_params.append(reality)
-        if galaxy:
-            sys_where_clauses.append("COALESCE(s.galaxy, 'Euclid') = ?")
-            sys_params.append(galaxy)
-        sys_where = ("WHERE " + " AND ".join(sys_where_clauses)) if sys_where_clauses else ""
-
-        # Planet scope: join through system
-        planet_where_clauses = []
-        planet_params = []
-        if reality:
-            planet_where_clauses.append("COALESCE(s.reality, 'Normal') = ?")
-            planet_params.append(reality)
-        if galaxy:
-            planet_where_clauses.append("COALESCE(s.galaxy, 'Euclid') = ?")
-            planet_params.append(galaxy)
-        planet_where = ("WHERE " + " AND ".join(planet_where_clauses)) if planet_where_clauses else ""
-        planet_join = "JOIN systems s ON p.system_id = s.id" if planet_where_clauses else ""
-
-        # Collapse duplicate options that differ only by case, internal spacing,
-        # or punctuation ("Power Generation" / "PowerGeneration" / "trading" /
-        # "Trading ") into ONE entry, and drop obvious junk (single chars,
-        # pure-numeric values like "1"). The dedup key is norm_token() — the very
-        # same normalizer the filter WHERE clauses use — so a collapsed option
-        # always still matches its rows. Among the variants in a group we surface
-        # the best-formatted one (most word breaks, mixed case, then longest).
-        def _dedup_clean(values):
-            def _score(s):
-                return (s.count(' '), 0 if (s.isupper() or s.islower()) else 1, len(s))
-            groups = {}
-            for v in values:
-                if not v or not isinstance(v, str):
-                    continue
-                disp = ' '.join(v.split())  # trim + collapse internal whitespace runs
-                key = norm_token(disp)
-                if len(key) < 2 or key.isdigit():
-                    continue  # drop single-char / pure-numeric noise ("1")
-                cur = groups.get(key)
-                if cur is None or _score(disp) > _score(cur):
-                    groups[key] = disp
-            return sorted(groups.values(), key=lambda s: s.lower())
-
-        # System-level fields
-        def get_distinct_system(column):
-            cursor.execute(f"SELECT DISTINCT s.{column} FROM systems s {sys_where} ORDER BY s.{column}", sys_params)
-            return _dedup_clean(row[0] for row in cursor.fetchall())
-
-        # Planet-level fields
-        def get_distinct_planet(column):
-            cursor.execute(f"SELECT DISTINCT p.{column} FROM planets p {planet_join} {planet_where} ORDER BY p.{column}", planet_params)
-            return _dedup_clean(row[0] for row in cursor.fetchall())
-
-        # Resources come from the planets.materials AND moons.materials lists
-        # (the dedicated common/uncommon/rare columns are ~empty). Normalize each
-        # cell to canonical names (migration 1.93.0 already did this in the DB;
-        # this also covers any not-yet-normalized rows) and keep only tokens that
-        # map to a real canonical resource — so the dropdown is the clean set
-        # actually present, not the 170-entry typo/case mess. Moons are scanned
-        # too so a resource that only occurs on a moon is still listed + filterable.
-        def get_distinct_resources():
-            from resource_catalog import normalize_materials, CANONICAL_RESOURCES
-            canon_by_lower = {r.lower(): r for r in CANONICAL_RESOURCES}
-            present = set()
-
-            def _collect(sql):
-                cursor.execute(sql, planet_params)
-                for row in cursor.fetchall():
-                    mats = row[0]
-                    if not mats:
-                        continue
-                    for part in normalize_materials(mats).split(','):
-                        key = part.strip().lower()
-                        if key in canon_by_lower:
-                            present.add(canon_by_lower[key])
-
-            _collect(f"SELECT DISTINCT p.materials FROM planets p {planet_join} {planet_where}")
-            _collect(f"SELECT DISTINCT m.materials FROM moons m JOIN planets p ON m.planet_id = p.id {planet_join} {planet_where}")
-            return sorted(present)
-
-        return {
-            'star_types': get_distinct_system('star_type'),
-            'economy_types': get_distinct_system('economy_type'),
-            'economy_levels': get_distinct_system('economy_level'),
-            'conflict_levels': get_distinct_system('conflict_level'),
-            'dominant_lifeforms': get_distinct_system('dominant_lifeform'),
-            'stellar_classifications': get_distinct_system('stellar_classification'),
-            'biomes': get_distinct_planet('biome'),
-            'weather_types': get_distinct_planet('weather'),
-            'sentinel_levels': get_distinct_planet('sentinel'),
-            'resources': get_distinct_resources()
-        }
+        payload = get_filter_options_payload(conn.cursor(), reality, galaxy)
+        return payload.response(request.headers.get('accept-encoding'))
     except Exception as e:
         logger.error(f"Error fetching filter options: {e}")
         return {}
@@ -1903,6 +1617,10 @@ async def api_search(
         # Glyph-shaped queries take the indexed fast path (exact match on
         # glyph_code or glyph_code_suffix) instead of substring LIKE — this
         # is both faster and avoids spurious matches in description text.
+        # Free text goes through the trigram FTS index (v1.103.0) when it can
+        # serve the query, else the multi-column LIKE scan.
+        search_join, join_params = '', []
+        fts = fts_hits_join(cursor, q_norm) if parsed['kind'] == 'free' else None
         if parsed['kind'] == 'glyph_full':
             search_where = "(s.glyph_code = ? COLLATE NOCASE OR s.glyph_code_suffix = ?)"
             search_params = [parsed['glyph'], parsed['suffix']]
@@ -1911,6 +1629,9 @@ async def api_search(
             # nmsportal also has a full glyph; glyph_suffix only has suffix.
             full_for_match = parsed.get('glyph') or parsed['suffix']
             search_params = [parsed['suffix'], full_for_match]
+        elif fts:
+            search_join, join_params = fts
+            search_where, search_params = "1=1", []
         else:
             pattern = f'%{q_norm}%'
             search_where = (
@@ -1930,23 +1651,26 @@ async def api_search(
 
         # Count total matches
         cursor.execute(
-            f"SELECT COUNT(*) FROM systems s "
+            f"SELECT COUNT(*) FROM systems s {search_join}"
             f"LEFT JOIN regions r ON s.region_x = r.region_x "
             f"  AND s.region_y = r.region_y AND s.region_z = r.region_z "
             f"  AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal') "
             f"  AND COALESCE(r.galaxy,  'Euclid') = COALESCE(s.galaxy,  'Euclid') "
             f"WHERE {search_where} {adv_sql}",
-            (*search_params, *adv_params),
+            (*join_params, *search_params, *adv_params),
         )
         total = cursor.fetchone()[0]
 
-        # Free-text path uses LOWER(name) priority ordering for relevance.
+        # Free-text path uses LOWER(name) priority ordering for relevance,
+        # then the FTS bm25 score when the index served the query.
         # Glyph paths order by exact > suffix > anything else.
         if parsed['kind'] == 'free':
             order_sql = (
                 "CASE WHEN LOWER(s.name) = LOWER(?) THEN 0"
                 "     WHEN LOWER(s.name) LIKE LOWER(?) THEN 1"
-                "     ELSE 2 END, s.name ASC"
+                "     ELSE 2 END, "
+                + ("fts_hits.fts_rank, " if fts else "")
+                + "s.name ASC"
             )
             order_params = [q_norm, f'{q_norm}%']
         else:
@@ -1960,7 +1684,7 @@ async def api_search(
             f"       s.discovered_by, s.personal_discord_username, "
             f"       r.custom_name as region_name, "
             f"       (SELECT COUNT(*) FROM planets WHERE system_id = s.id) as planet_count "
-            f"FROM systems s "
+            f"FROM systems s {search_join}"
             f"LEFT JOIN regions r ON s.region_x = r.region_x "
             f"  AND s.region_y = r.region_y AND s.region_z = r.region_z "
             f"  AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal') "
@@ -1968,7 +1692,7 @@ async def api_search(
             f"WHERE {search_where} {adv_sql} "
             f"ORDER BY {order_sql} "
             f"LIMIT ? OFFSET ?",
-            (*search_params, *adv_params, *order_params, limit, offset),
+            (*join_params, *search_params, *adv_params, *order_params, limit, offset),
         )
 
         rows = [dict(r) for r in cursor.fetchall()]
@@ -2070,6 +1794,7 @@ async def api_unified_search(
     min_planets: int = None,
     max_planets: int = None,
     is_complete: str = None,
+    typeahead: bool = False,
     session: Optional[str] = Cookie(None),
 ):
     """Categorized search returning communities, regions, contributors, systems.
@@ -2086,8 +1811,14 @@ async def api_unified_search(
         plus DISTINCT systems.discovered_by / personal_discord_username for
         anonymous (no-profile) submitters
       - Systems: reuses /api/systems/search SQL via parse + same WHERE
+        (trigram FTS index for free text of 3+ chars)
 
     Filters and scope chips apply ONLY to the systems category.
+
+    `typeahead=true` is the per-keystroke popover mode: the systems category
+    skips its exact COUNT and reports a capped total (limit+1, same as the
+    other categories) — the popover only needs to know whether "View all"
+    has anything more to show.
     """
     session_data = get_session(session)
     q_raw = (q or '').strip()
@@ -2266,6 +1997,8 @@ async def api_unified_search(
 
         adv_sql = (" AND " + " AND ".join(adv_where)) if adv_where else ""
 
+        sys_join, join_params = '', []
+        fts = fts_hits_join(cursor, q_raw) if parsed['kind'] == 'free' else None
         if parsed['kind'] == 'glyph_full':
             sys_where = "(s.glyph_code = ? COLLATE NOCASE OR s.glyph_code_suffix = ?)"
             sys_params = [parsed['glyph'], parsed['suffix']]
@@ -2273,6 +2006,9 @@ async def api_unified_search(
             sys_where = "(s.glyph_code_suffix = ? OR s.glyph_code = ? COLLATE NOCASE)"
             full_for_match = parsed.get('glyph') or parsed['suffix']
             sys_params = [parsed['suffix'], full_for_match]
+        elif fts:
+            sys_join, join_params = fts
+            sys_where, sys_params = "1=1", []
         else:
             sys_where = (
                 "(s.name LIKE ? COLLATE NOCASE"
@@ -2289,24 +2025,27 @@ async def api_unified_search(
             )
             sys_params = [pattern] * 9
 
-        # Count + page in one go (cap+1 trick — we ask for limit+1 to know if
-        # the "View all" link should appear, then trim).
-        cursor.execute(
-            f"SELECT COUNT(*) FROM systems s "
-            f"LEFT JOIN regions r ON s.region_x = r.region_x "
-            f"  AND s.region_y = r.region_y AND s.region_z = r.region_z "
-            f"  AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal') "
-            f"  AND COALESCE(r.galaxy,  'Euclid') = COALESCE(s.galaxy,  'Euclid') "
-            f"WHERE {sys_where} {adv_sql}",
-            (*sys_params, *adv_params),
-        )
-        system_total = cursor.fetchone()[0]
+        # Full mode counts every match for the "N total" label; typeahead
+        # fetches limit+1 rows and derives a capped total from them.
+        if not typeahead:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM systems s {sys_join}"
+                f"LEFT JOIN regions r ON s.region_x = r.region_x "
+                f"  AND s.region_y = r.region_y AND s.region_z = r.region_z "
+                f"  AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal') "
+                f"  AND COALESCE(r.galaxy,  'Euclid') = COALESCE(s.galaxy,  'Euclid') "
+                f"WHERE {sys_where} {adv_sql}",
+                (*join_params, *sys_params, *adv_params),
+            )
+            system_total = cursor.fetchone()[0]
 
         if parsed['kind'] == 'free':
             order_sql = (
                 "CASE WHEN LOWER(s.name) = LOWER(?) THEN 0"
                 "     WHEN LOWER(s.name) LIKE LOWER(?) THEN 1"
-                "     ELSE 2 END, s.name ASC"
+                "     ELSE 2 END, "
+                + ("fts_hits.fts_rank, " if fts else "")
+                + "s.name ASC"
             )
             order_params = [q_raw, f'{q_raw}%']
         else:
@@ -2318,7 +2057,7 @@ async def api_unified_search(
             f"       s.galaxy, s.glyph_code, s.discord_tag, s.star_type, "
             f"       s.reality, s.is_complete, s.is_fully_charted, s.discovered_by, "
             f"       s.personal_discord_username, r.custom_name AS region_name "
-            f"FROM systems s "
+            f"FROM systems s {sys_join}"
             f"LEFT JOIN regions r ON s.region_x = r.region_x "
             f"  AND s.region_y = r.region_y AND s.region_z = r.region_z "
             f"  AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal') "
@@ -2326,9 +2065,11 @@ async def api_unified_search(
             f"WHERE {sys_where} {adv_sql} "
             f"ORDER BY {order_sql} "
             f"LIMIT ?",
-            (*sys_params, *adv_params, *order_params, limit),
+            (*join_params, *sys_params, *adv_params, *order_params, limit + 1 if typeahead else limit),
         )
         system_rows = [dict(r) for r in cursor.fetchall()]
+        if typeahead:
+            system_total = len(system_rows)
 
         for s in system_rows:
             score = s.get('is_complete', 0) or 0
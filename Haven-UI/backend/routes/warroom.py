@@ -23,6 +23,7 @@ from services.auth_service import (
     create_session,
 )
 from services.dispatch import fire_and_forget
+from services.region_stats import region_stats_ready
 
 logger = logging.getLogger('control.room')
 
@@ -3551,6 +3552,65 @@ async def update_news_article(news_id: int, request: Request, session: Optional[
 # =============================================================================
 
 
+def _territory_region_rows(cursor, galaxy: str, discord_tag: str = None) -> list:
+    """System counts per (region, discord_tag) in one galaxy, with the region
+    name and the tag's active partner.
+
+    Row columns, by position: region_x, region_y, region_z, galaxy,
+    region_name, discord_tag, system_count, owner display_name,
+    region_color, partner_id. Read from region_stats (migration 1.106.0)
+    when present, else grouped from systems.
+    """
+    tag_clause = ''
+    params = [galaxy]
+    if discord_tag:
+        params.append(discord_tag)
+    if region_stats_ready(cursor):
+        if discord_tag:
+            tag_clause = 'AND rs.discord_tag = ?'
+        cursor.execute(f'''
+            SELECT
+                rs.region_x, rs.region_y, rs.region_z, rs.galaxy,
+                MAX(r.custom_name) as region_name,
+                NULLIF(rs.discord_tag, '') as discord_tag,
+                SUM(rs.system_count) as system_count,
+                p.display_name,
+                p.region_color,
+                p.id as partner_id
+            FROM region_stats rs
+            LEFT JOIN regions r ON rs.region_x = r.region_x AND rs.region_y = r.region_y
+                AND rs.region_z = r.region_z AND COALESCE(r.galaxy, 'Euclid') = rs.galaxy
+                AND COALESCE(r.reality, 'Normal') = rs.reality
+            LEFT JOIN partner_accounts p ON rs.discord_tag = p.discord_tag AND p.is_active = 1
+            WHERE rs.galaxy = ? {tag_clause}
+            GROUP BY rs.region_x, rs.region_y, rs.region_z, rs.galaxy, rs.discord_tag
+            ORDER BY system_count DESC
+        ''', params)
+        return cursor.fetchall()
+
+    if discord_tag:
+        tag_clause = 'AND s.discord_tag = ?'
+    cursor.execute(f'''
+        SELECT
+            s.region_x, s.region_y, s.region_z, s.galaxy,
+            MAX(r.custom_name) as region_name,
+            s.discord_tag,
+            COUNT(*) as system_count,
+            p.display_name,
+            p.region_color,
+            p.id as partner_id
+        FROM systems s
+        LEFT JOIN regions r ON s.region_x = r.region_x AND s.region_y = r.region_y
+            AND s.region_z = r.region_z AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
+            AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
+        LEFT JOIN partner_accounts p ON s.discord_tag = p.discord_tag AND p.is_active = 1
+        WHERE s.galaxy = ? {tag_clause}
+        GROUP BY s.region_x, s.region_y, s.region_z, s.galaxy, s.discord_tag
+        ORDER BY system_count DESC
+    ''', params)
+    return cursor.fetchall()
+
+
 @router.get('/api/warroom/territory/by-tag')
 async def get_territory_by_discord_tag(discord_tag: str = None, session: Optional[str] = Cookie(None)):
     """Get all systems owned by a discord_tag (partner territory)."""
@@ -3699,36 +3759,7 @@ async def get_territory_regions(
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        # Get regions from systems table, grouped by coordinates
-        query = '''
-            SELECT
-                s.region_x, s.region_y, s.region_z, s.galaxy,
-                r.custom_name as region_name,
-                s.discord_tag,
-                COUNT(*) as system_count,
-                p.display_name as owner_name,
-                p.region_color as owner_color,
-                p.id as partner_id
-            FROM systems s
-            LEFT JOIN regions r ON s.region_x = r.region_x AND s.region_y = r.region_y
-                AND s.region_z = r.region_z AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
-                AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
-            LEFT JOIN partner_accounts p ON s.discord_tag = p.discord_tag AND p.is_active = 1
-            WHERE s.galaxy = ?
-        '''
-        params = [galaxy]
-
-        if discord_tag:
-            query += ' AND s.discord_tag = ?'
-            params.append(discord_tag)
-
-        query += '''
-            GROUP BY s.region_x, s.region_y, s.region_z, s.galaxy, s.discord_tag
-            ORDER BY system_count DESC
-        '''
-
-        cursor.execute(query, params)
-        results = cursor.fetchall()
+        results = _territory_region_rows(cursor, galaxy, discord_tag)
 
         # Calculate region ownership (>50% = controls region)
         region_data = {}
@@ -3795,25 +3826,7 @@ async def get_region_ownership_summary(galaxy: str = 'Euclid', session: Optional
     cursor = conn.cursor()
     try:
         # Get all systems grouped by region and discord_tag
-        cursor.execute('''
-            SELECT
-                s.region_x, s.region_y, s.region_z, s.galaxy,
-                MAX(r.custom_name) as region_name,
-                s.discord_tag,
-                COUNT(*) as system_count,
-                p.display_name,
-                p.region_color,
-                p.id as partner_id
-            FROM systems s
-            LEFT JOIN regions r ON s.region_x = r.region_x AND s.region_y = r.region_y
-                AND s.region_z = r.region_z AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
-                AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
-            LEFT JOIN partner_accounts p ON s.discord_tag = p.discord_tag AND p.is_active = 1
-            WHERE s.galaxy = ?
-            GROUP BY s.region_x, s.region_y, s.region_z, s.galaxy, s.discord_tag
-        ''', (galaxy,))
-
-        results = cursor.fetchall()
+        results = _territory_region_rows(cursor, galaxy)
 
         # Process into regions
         regions = {}
@@ -0,0 +1,158 @@
+"""
+Daily analytics rollups — query filters and the rebuild.
+
+The analytics dashboards and public community stats used to re-aggregate all
+of pending_systems / discoveries on every request. Migration 1.101.0 adds two
+pre-grouped count tables that SQLite triggers keep current on every write
+(submit, approve, reject, extractor upload, edit, delete):
+
+  analytics_submission_daily  (day, discord_tag, contributor, source)
+      -> total, approved, rejected, pending
+  analytics_discovery_daily   (day, discord_tag, contributor, type_slug)
+      -> total
+
+Each bucket also carries display_name / first_at / last_at as high-water marks.
+`day` is the first 10 chars of the submission timestamp, NULL tags and names are
+stored as '', and NULL sources count as 'manual' — the same conventions the
+endpoints already used when filtering the base tables.
+
+Contributor keys are the indexed username_normalized columns of
+pending_systems and discoveries (services.auth_service.contributor_key,
+migration 1.102.0). Discovery rows written without the column fall back to the
+SQL discriminator-stripping fold of discovered_by.
+
+rebuild_analytics_rollups() recomputes both tables from history. Run it after
+bulk imports done with triggers disabled, or to tighten the high-water columns
+after deletes:
+
+    python Haven-UI/backend/rebuild_analytics_rollups.py
+"""
+
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger('control.room')
+
+SUBMISSION_ROLLUP = 'analytics_submission_daily'
+DISCOVERY_ROLLUP = 'analytics_discovery_daily'
+
+
+def name_key_sql(raw: str) -> str:
+    """SQL folding a contributor name: strip '#', trim, drop a trailing 4-digit
+    Discord discriminator, lowercase. Same rule the discovery leaderboard uses."""
+    trimmed = f"TRIM(REPLACE({raw}, '#', ''))"
+    return f"""LOWER(TRIM(
+        CASE
+            WHEN LENGTH({trimmed}) > 4
+                AND SUBSTR({trimmed}, -4) GLOB '[0-9][0-9][0-9][0-9]'
+                AND (LENGTH({trimmed}) = 4
+                    OR SUBSTR({trimmed}, -5, 1) NOT GLOB '[0-9]')
+            THEN SUBSTR({trimmed}, 1, LENGTH({trimmed}) - 4)
+            ELSE {trimmed}
+        END
+    ))"""
+
+
+DISCOVERER_KEY_SQL = "COALESCE(username_normalized, " + name_key_sql(
+    "COALESCE(NULLIF(NULLIF(discovered_by, 'Anonymous'), 'anonymous'), 'Unknown')"
+) + ")"
+
+_SUBMITTER_DISPLAY_SQL = '''COALESCE(
+    NULLIF(NULLIF(submitted_by, 'Anonymous'), 'anonymous'),
+    personal_discord_username,
+    CASE WHEN json_valid(system_data) THEN json_extract(system_data, '$.discovered_by') END,
+    'Unknown'
+)'''
+
+
+def rollup_date_filter(period: Optional[str] = None, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None):
+    """Day-level equivalent of the endpoints' period / start_date / end_date
+    filters. Returns (sql, params) to append to a WHERE clause on a rollup."""
+    if period == 'week':
+        return " AND day >= date('now', '-7 days')", []
+    if period == 'month':
+        return " AND day >= date('now', '-30 days')", []
+    if period == 'year':
+        return " AND day >= date('now', '-365 days')", []
+    if start_date:
+        sql, params = " AND day >= ?", [start_date[:10]]
+        if end_date:
+            sql += " AND day <= ?"
+            params.append(end_date[:10])
+        return sql, params
+    return '', []
+
+
+def rollup_tag_filter(discord_tag: Optional[str]):
+    """(sql, params) restricting a rollup to one community."""
+    if discord_tag:
+        return ' AND discord_tag = ?', [discord_tag]
+    return '', []
+
+
+def rollup_source_filter(source: Optional[str]):
+    """(sql, params) restricting the submission rollup to one source. Legacy
+    NULL sources are stored as 'manual', so one equality covers both."""
+    if source:
+        return ' AND source = ?', [source]
+    return '', []
+
+
+def rebuild_analytics_rollups(conn) -> dict:
+    """Recompute both rollup tables from pending_systems and discoveries.
+
+    Runs as a single transaction on `conn`, so concurrent readers see either
+    the old or the new rollups, never a half-built one.
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"DELETE FROM {SUBMISSION_ROLLUP}")
+        cursor.execute(f"""
+            INSERT INTO {SUBMISSION_ROLLUP}
+                (day, discord_tag, contributor, source, total, approved, rejected, pending,
+                 display_name, first_at, last_at)
+            SELECT COALESCE(SUBSTR(submission_date, 1, 10), '') AS d,
+                   COALESCE(discord_tag, '') AS t,
+                   COALESCE(username_normalized, '') AS u,
+                   COALESCE(source, 'manual') AS s,
+                   COUNT(*),
+                   SUM(CASE status WHEN 'approved' THEN 1 ELSE 0 END),
+                   SUM(CASE status WHEN 'rejected' THEN 1 ELSE 0 END),
+                   SUM(CASE status WHEN 'pending' THEN 1 ELSE 0 END),
+                   MAX({_SUBMITTER_DISPLAY_SQL}),
+                   MIN(submission_date), MAX(submission_date)
+            FROM pending_systems
+            GROUP BY d, t, u, s
+        """)
+        submission_buckets = cursor.rowcount
+
+        cursor.execute(f"DELETE FROM {DISCOVERY_ROLLUP}")
+        cursor.execute(f"""
+            INSERT INTO {DISCOVERY_ROLLUP}
+                (day, discord_tag, contributor, type_slug, total, display_name, first_at, last_at)
+            SELECT COALESCE(SUBSTR(submission_timestamp, 1, 10), '') AS d,
+                   COALESCE(discord_tag, '') AS t,
+                   {DISCOVERER_KEY_SQL} AS u,
+                   COALESCE(type_slug, 'other') AS k,
+                   COUNT(*), MAX(discovered_by),
+                   MIN(submission_timestamp), MAX(submission_timestamp)
+            FROM discoveries
+            GROUP BY d, t, u, k
+        """)
+        discovery_buckets = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    result = {
+        'submission_buckets': submission_buckets,
+        'discovery_buckets': discovery_buckets,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Analytics rollups rebuilt: {result}")
+    return result
@@ -10,7 +10,10 @@ The _sessions dict is the in-memory session store shared by all routes.
 import hashlib
 import json
 import logging
+import math
 import secrets
+import threading
+import time
 import unicodedata
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional
@@ -18,6 +21,7 @@ from typing import Dict, Optional
 from fastapi import Cookie, HTTPException
 
 from constants import (
+    API_KEY_CACHE_TTL_SECONDS,
     SESSION_TIMEOUT_MINUTES,
     SUPER_ADMIN_USERNAME,
     DEFAULT_SUPER_ADMIN_PASSWORD_HASH,
@@ -366,13 +370,26 @@ def generate_api_key() -> str:
     return f"vh_live_{random_part}"
 
 
-def verify_api_key(api_key: Optional[str]) -> Optional[dict]:
-    """Verify an API key and return key info if valid."""
-    if not api_key:
-        return None
+# Verified keys are cached by hash so an authenticated request costs a dict
+# lookup instead of a SELECT + UPDATE + commit. Unknown and inactive hashes
+# are cached too (as None) so a misconfigured client can't hammer the DB.
+# key_hash -> (expires_at monotonic, key info dict or None)
+_api_key_cache: Dict[str, tuple] = {}
 
-    key_hash = hash_api_key(api_key)
+# Token bucket per key enforcing api_keys.rate_limit (requests per hour):
+# capacity rate_limit, refilled continuously at rate_limit / 3600 per second.
+# key id -> [tokens, last refill monotonic]
+_api_key_buckets: Dict[int, list] = {}
+
+# last_used_at values waiting for flush_api_key_last_used().
+# key id -> ISO timestamp of the latest use
+_api_key_last_used: Dict[int, str] = {}
+
+_api_key_lock = threading.Lock()
 
+
+def _load_api_key(key_hash: str) -> Optional[dict]:
+    """Read one active key's info from the DB, or None."""
     conn = None
     try:
         conn = get_db_connection()
@@ -383,32 +400,132 @@ def verify_api_key(api_key: Optional[str]) -> Optional[dict]:
             FROM api_keys WHERE key_hash = ?
         ''', (key_hash,))
         row = cursor.fetchone()
+        if not row or not row['is_active']:
+            return None
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'permissions': json.loads(row['permissions'] or '["submit"]'),
+            'rate_limit': row['rate_limit'],
+            'created_by': row['created_by'],
+            'discord_tag': row['discord_tag'],
+            'key_type': row['key_type'],
+            'discord_username': row['discord_username'],
+            'profile_id': row['profile_id']
+        }
+    finally:
+        if conn:
+            conn.close()
 
-        if row and row['is_active']:
-            cursor.execute(
-                'UPDATE api_keys SET last_used_at = ? WHERE id = ?',
-                (datetime.now(timezone.utc).isoformat(), row['id'])
-            )
-            conn.commit()
 
-            return {
-                'id': row['id'],
-                'name': row['name'],
-                'permissions': json.loads(row['permissions'] or '["submit"]'),
-                'rate_limit': row['rate_limit'],
-                'created_by': row['created_by'],
-                'discord_tag': row['discord_tag'],
-                'key_type': row['key_type'],
-                'discord_username': row['discord_username'],
-                'profile_id': row['profile_id']
-            }
+def _take_rate_token(key_id: int, rate_limit: Optional[int], cost: int = 1) -> Optional[float]:
+    """Spend `cost` tokens from the key's bucket. Returns None if allowed, else
+    the seconds until enough tokens are available. A NULL / non-positive
+    rate_limit means unlimited. Cost is capped at the bucket capacity so a
+    batch larger than the hourly limit still goes through on a full bucket."""
+    if not rate_limit or rate_limit <= 0:
         return None
-    except Exception as e:
-        logger.error(f"API key verification failed: {e}")
+    cost = float(min(max(cost, 1), rate_limit))
+    now = time.monotonic()
+    per_second = rate_limit / 3600.0
+    with _api_key_lock:
+        bucket = _api_key_buckets.get(key_id)
+        if bucket is None:
+            bucket = _api_key_buckets[key_id] = [float(rate_limit), now]
+        # Capacity follows rate_limit edits (picked up on cache refresh).
+        tokens = min(float(rate_limit), bucket[0] + (now - bucket[1]) * per_second)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return None
+        bucket[0] = tokens
+        return (cost - tokens) / per_second
+
+
+def verify_api_key(api_key: Optional[str], cost: int = 1) -> Optional[dict]:
+    """Verify an API key and return key info if valid.
+
+    Served from the in-process key cache (API_KEY_CACHE_TTL_SECONDS). Raises
+    429 with Retry-After once the key has used up its hourly rate_limit; a
+    batch endpoint passes `cost` = items in the batch so batching doesn't
+    multiply the limit.
+    last_used_at is recorded in memory and written by
+    flush_api_key_last_used().
+    """
+    if not api_key:
         return None
-    finally:
-        if conn:
-            conn.close()
+
+    key_hash = hash_api_key(api_key)
+
+    now = time.monotonic()
+    with _api_key_lock:
+        cached = _api_key_cache.get(key_hash)
+    if cached and cached[0] > now:
+        info = cached[1]
+    else:
+        try:
+            info = _load_api_key(key_hash)
+        except Exception as e:
+            logger.error(f"API key verification failed: {e}")
+            return None
+        with _api_key_lock:
+            _api_key_cache[key_hash] = (now + API_KEY_CACHE_TTL_SECONDS, info)
+
+    if info is None:
+        return None
+
+    retry_after = _take_rate_token(info['id'], info['rate_limit'], cost)
+    if retry_after is not None:
+        logger.warning(f"API key '{info['name']}' (id {info['id']}) over its rate limit of {info['rate_limit']}/hour")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded ({info['rate_limit']} requests/hour)",
+            headers={'Retry-After': str(math.ceil(retry_after))},
+        )
+
+    with _api_key_lock:
+        _api_key_last_used[info['id']] = datetime.now(timezone.utc).isoformat()
+
+    return {**info, 'permissions': list(info['permissions'])}
+
+
+def invalidate_api_key_cache(key_id: Optional[int] = None) -> None:
+    """Drop cached key info after a key is revoked, edited or regenerated.
+
+    With key_id, drops that key's entries plus every cached miss (a
+    regenerated key's new hash may have been cached as unknown); without it,
+    clears the whole cache. Rate-limit buckets are kept so an edit can't be
+    used to reset a key's allowance.
+    """
+    with _api_key_lock:
+        if key_id is None:
+            _api_key_cache.clear()
+            return
+        for key_hash, (_, info) in list(_api_key_cache.items()):
+            if info is None or info['id'] == key_id:
+                del _api_key_cache[key_hash]
+
+
+def flush_api_key_last_used(conn) -> int:
+    """Write buffered last_used_at values in one batch on `conn` (the caller
+    commits — run_write does). Returns the number of keys updated."""
+    with _api_key_lock:
+        pending = dict(_api_key_last_used)
+        _api_key_last_used.clear()
+    if not pending:
+        return 0
+    try:
+        conn.executemany(
+            'UPDATE api_keys SET last_used_at = ? WHERE id = ?',
+            [(used_at, key_id) for key_id, used_at in pending.items()]
+        )
+    except Exception:
+        # Put them back (keeping any newer use) for the next flush.
+        with _api_key_lock:
+            for key_id, used_at in pending.items():
+                _api_key_last_used.setdefault(key_id, used_at)
+        raise
+    return len(pending)
 
 
 # ============================================================================
@@ -430,6 +547,40 @@ def normalize_username_for_dedup(username: str) -> str:
     return normalized
 
 
+def contributor_key(*names) -> str:
+    """Canonical contributor key stored in the indexed username_normalized
+    columns of pending_systems, systems and discoveries.
+
+    Takes candidate names in priority order (e.g. submitted_by,
+    personal_discord_username, discovered_by), skips blanks and 'Anonymous',
+    and normalizes the first real one with normalize_username_for_dedup so a
+    contributor's key matches their user_profiles.username_normalized. Returns
+    'unknown' when no candidate is usable.
+    """
+    for name in names:
+        if isinstance(name, str) and name.strip() and name.strip() not in ('Anonymous', 'anonymous'):
+            key = normalize_username_for_dedup(name)
+            if key:
+                return key
+    return 'unknown'
+
+
+def sync_system_contributor_key(cursor, system_id) -> None:
+    """Recompute systems.username_normalized for one system from its identity
+    columns (discovered_by -> personal_discord_username -> last_updated_by).
+    Call after any INSERT or UPDATE that can change those columns."""
+    cursor.execute(
+        'SELECT discovered_by, personal_discord_username, last_updated_by FROM systems WHERE id = ?',
+        (system_id,)
+    )
+    row = cursor.fetchone()
+    if row:
+        cursor.execute(
+            'UPDATE systems SET username_normalized = ? WHERE id = ?',
+            (contributor_key(row[0], row[1], row[2]), system_id)
+        )
+
+
 def _levenshtein_distance(s1: str, s2: str) -> int:
     """Classic dynamic programming Levenshtein distance."""
     if len(s1) < len(s2):
@@ -3,6 +3,13 @@ Data completeness scoring and grading for star systems.
 
 Calculates a weighted score (0-100) across 6 categories, then maps to a letter grade.
 Used by approval workflow, system detail, and browse endpoints.
+
+calculate_completeness_score() loads one system with per-planet moon queries;
+calculate_completeness_scores() loads a whole batch of systems (planets, moons,
+stations, linked discoveries) in a handful of IN-list queries and runs the same
+in-memory scorer, so approvals, batch approvals and rescore passes don't pay
+N+1 queries per system. rescore_all_systems() drives it over the whole table
+in chunks (CLI: Haven-UI/backend/rescore_completeness.py).
 """
 
 import logging
@@ -149,8 +156,8 @@ def _has_base_coords(body) -> bool:
     return body.get('base_latitude') is not None and body.get('base_longitude') is not None
 
 
-def _has_base_discovery(cursor, planet_ids, moon_ids) -> bool:
-    """True if a base-type discovery is linked to any of these planets/moons.
+def _is_base_discovery(row) -> bool:
+    """A discovery row documents a base when its type is 'base'.
 
     A base can be logged as a full discovery (type 'base', which carries its own
     lat/long) instead of via the planet/moon base lat/long fields — both paths
@@ -158,6 +165,13 @@ def _has_base_discovery(cursor, planet_ids, moon_ids) -> bool:
     type column; fall back to deriving it from discovery_type for rows that
     predate type_slug.
     """
+    slug = row.get('type_slug') or get_discovery_type_slug(row.get('discovery_type') or '')
+    return slug == 'base'
+
+
+def _load_body_discoveries(cursor, planet_ids, moon_ids) -> list:
+    """Discoveries linked to any of these planets/moons, as dicts with
+    planet_id, moon_id, type_slug and discovery_type."""
     conds, params = [], []
     if planet_ids:
         conds.append(f"planet_id IN ({','.join('?' * len(planet_ids))})")
@@ -166,17 +180,55 @@ def _has_base_discovery(cursor, planet_ids, moon_ids) -> bool:
         conds.append(f"moon_id IN ({','.join('?' * len(moon_ids))})")
         params.extend(moon_ids)
     if not conds:
-        return False
+        return []
     cursor.execute(
-        f"SELECT type_slug, discovery_type FROM discoveries WHERE ({' OR '.join(conds)})",
+        f"SELECT planet_id, moon_id, type_slug, discovery_type FROM discoveries WHERE ({' OR '.join(conds)})",
         params,
     )
-    for row in cursor.fetchall():
-        row = dict(row)
-        slug = row.get('type_slug') or get_discovery_type_slug(row.get('discovery_type') or '')
-        if slug == 'base':
-            return True
-    return False
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def _splus_checklist(system, planets, moons, has_station, discoveries) -> bool:
+    """The X checklist (see check_splus_eligible) over already-loaded rows.
+
+    `planets` / `moons` are the system's body rows (base + wonder columns),
+    `discoveries` the rows linked to those bodies (_load_body_discoveries).
+    """
+    if not planets:
+        return False
+    # Station is exempt from the X checklist when the system is Abandoned OR has
+    # been explicitly marked as having no space station (no_space_station flag).
+    station_exempt = (
+        system.get('economy_type') in ('None', 'Abandoned')
+        or bool(system.get('no_space_station'))
+    )
+    bodies = planets + moons
+
+    # 3. wonder info on AT LEAST ONE body (planet or moon)
+    if not any(any(_is_filled(b.get(f)) for f in WONDER_FIELDS) for b in bodies):
+        return False
+
+    # 4. at least one documented base — base lat/long on any body, or a legacy
+    #    free-text base_location, or a base-type discovery.
+    base_documented = any(_has_base_coords(b) or _is_filled(b.get('base_location')) for b in bodies)
+    if not base_documented:
+        base_documented = any(_is_base_discovery(d) for d in discoveries)
+    if not base_documented:
+        return False
+
+    # 2a. a discovery linked to every planet (planet ids are globally unique,
+    # so match on planet_id directly rather than relying on a stamped system_id)
+    discovered_planet_ids = {d['planet_id'] for d in discoveries}
+    if any(p['id'] not in discovered_planet_ids for p in planets):
+        return False
+
+    # 2b. a discovery linked to every moon
+    discovered_moon_ids = {d['moon_id'] for d in discoveries}
+    if any(m['id'] not in discovered_moon_ids for m in moons):
+        return False
+
+    # 5. recorded station (only required when the system should have one)
+    return station_exempt or has_station
 
 
 def check_splus_eligible(cursor, system_id) -> bool:
@@ -208,12 +260,6 @@ def check_splus_eligible(cursor, system_id) -> bool:
     if not srow:
         return False
     srow = dict(srow)
-    # Station is exempt from the X checklist when the system is Abandoned OR has
-    # been explicitly marked as having no space station (no_space_station flag).
-    station_exempt = (
-        srow.get('economy_type') in ('None', 'Abandoned')
-        or bool(srow.get('no_space_station'))
-    )
 
     base_cols = ('base_location', 'base_latitude', 'base_longitude')
     wonder_cols = ', '.join(WONDER_FIELDS)
@@ -235,50 +281,11 @@ def check_splus_eligible(cursor, system_id) -> bool:
         planet_ids,
     )
     moons = [dict(r) for r in cursor.fetchall()]
-    moon_ids = [m['id'] for m in moons]
 
-    bodies = planets + moons
-
-    # 3. wonder info on AT LEAST ONE body (planet or moon)
-    if not any(any(_is_filled(b.get(f)) for f in WONDER_FIELDS) for b in bodies):
-        return False
-
-    # 4. at least one documented base — base lat/long on any body, or a legacy
-    #    free-text base_location, or a base-type discovery.
-    base_documented = any(_has_base_coords(b) or _is_filled(b.get('base_location')) for b in bodies)
-    if not base_documented:
-        base_documented = _has_base_discovery(cursor, planet_ids, moon_ids)
-    if not base_documented:
-        return False
-
-    # 2a. a discovery linked to every planet (planet ids are globally unique,
-    # so match on planet_id directly rather than relying on a stamped system_id)
-    cursor.execute(
-        f'SELECT DISTINCT planet_id FROM discoveries WHERE planet_id IN ({ph})',
-        planet_ids,
-    )
-    discovered_planet_ids = {row[0] for row in cursor.fetchall()}
-    if any(pid not in discovered_planet_ids for pid in planet_ids):
-        return False
-
-    # 2b. a discovery linked to every moon
-    if moon_ids:
-        mph = ','.join('?' * len(moon_ids))
-        cursor.execute(
-            f'SELECT DISTINCT moon_id FROM discoveries WHERE moon_id IN ({mph})',
-            moon_ids,
-        )
-        discovered_moon_ids = {row[0] for row in cursor.fetchall()}
-        if any(mid not in discovered_moon_ids for mid in moon_ids):
-            return False
-
-    # 5. recorded station (only required when the system should have one)
-    if not station_exempt:
-        cursor.execute('SELECT 1 FROM space_stations WHERE system_id = ? LIMIT 1', (system_id,))
-        if not cursor.fetchone():
-            return False
-
-    return True
+    discoveries = _load_body_discoveries(cursor, planet_ids, [m['id'] for m in moons])
+    cursor.execute('SELECT 1 FROM space_stations WHERE system_id = ? LIMIT 1', (system_id,))
+    has_station = cursor.fetchone() is not None
+    return _splus_checklist(srow, planets, moons, has_station, discoveries)
 
 
 def calculate_completeness_score(cursor, system_id) -> dict:
@@ -297,6 +304,25 @@ def calculate_completeness_score(cursor, system_id) -> dict:
     cursor.execute('SELECT * FROM planets WHERE system_id = ?', (system_id,))
     planets = [dict(row) for row in cursor.fetchall()]
 
+    moons_by_planet = {}
+    for p in planets:
+        cursor.execute('SELECT * FROM moons WHERE planet_id = ?', (p.get('id'),))
+        moons_by_planet[p.get('id')] = [dict(mrow) for mrow in cursor.fetchall()]
+
+    cursor.execute('SELECT * FROM space_stations WHERE system_id = ?', (system_id,))
+    station = cursor.fetchone()
+    station = dict(station) if station else None
+
+    return _score_system(system, planets, moons_by_planet, station,
+                         lambda: check_splus_eligible(cursor, system_id))
+
+
+def _score_system(system, planets, moons_by_planet, station, splus_check) -> dict:
+    """Score one system from its loaded rows (see calculate_completeness_score).
+
+    `moons_by_planet` maps planet id -> that planet's moon rows; `splus_check`
+    is called (no args) for the X checklist only once the score clears S.
+    """
     # Moons count as equal celestial bodies in the planet grade: each body
     # (planet OR moon) is weighted 1/(planets+moons) of the Planet Environment
     # and Planet Life categories. So a 5-planet + 1-moon system gives each body
@@ -306,19 +332,13 @@ def calculate_completeness_score(cursor, system_id) -> dict:
     bodies = []
     for p in planets:
         bodies.append({'body': p, 'label': p.get('name') or 'Unknown', 'is_moon': False})
-        cursor.execute('SELECT * FROM moons WHERE planet_id = ?', (p.get('id'),))
-        for mrow in cursor.fetchall():
-            m = dict(mrow)
+        for m in moons_by_planet.get(p.get('id'), []):
             bodies.append({
                 'body': m,
                 'label': f"🌙 {m.get('name') or 'Unknown'} (moon of {p.get('name') or 'Unknown'})",
                 'is_moon': True,
             })
 
-    cursor.execute('SELECT * FROM space_stations WHERE system_id = ?', (system_id,))
-    station = cursor.fetchone()
-    station = dict(station) if station else None
-
     FIELD_LABELS = {
         'star_type': 'Star Type', 'economy_type': 'Economy Type', 'economy_level': 'Economy Tier',
         'conflict_level': 'Conflict Level', 'dominant_lifeform': 'Dominant Lifeform',
@@ -442,7 +462,7 @@ def calculate_completeness_score(cursor, system_id) -> dict:
 
     # S+ is the "fully charted" tier on top of S — only worth checking once the
     # score itself clears the S baseline.
-    is_fully_charted = total >= 85 and check_splus_eligible(cursor, system_id)
+    is_fully_charted = total >= 85 and splus_check()
     grade = score_to_grade(total, is_fully_charted)
 
     return {
@@ -475,11 +495,149 @@ def update_completeness_score(cursor, system_id) -> dict:
 
     Persists both the 0-100 score (is_complete) and the S+ checklist outcome
     (is_fully_charted, 0/1) so SQL grade ladders can surface S+ without re-running
-    the checklist per row.
+    the checklist per row. Loads through the bulk scorer, which needs a fixed
+    handful of queries instead of one per planet.
     """
-    result = calculate_completeness_score(cursor, system_id)
+    results = calculate_completeness_scores(cursor, [system_id])
+    # Keyed by the stored id, which may differ in type from the caller's.
+    result = next(iter(results.values()), None) or calculate_completeness_score(cursor, system_id)
     cursor.execute(
         'UPDATE systems SET is_complete = ?, is_fully_charted = ? WHERE id = ?',
         (result['score'], 1 if result.get('is_fully_charted') else 0, system_id),
     )
     return result
+
+
+# ============================================================================
+# Bulk scoring
+# ============================================================================
+
+# IN-list width per query — well under SQLite's default 999 bound-parameter
+# limit on older builds.
+BULK_QUERY_CHUNK = 500
+
+# Systems per transaction for rescore_all_systems().
+RESCORE_BATCH_SIZE = 500
+
+
+def _select_in(cursor, sql: str, values: list) -> list:
+    """Run `sql` (with one `{ids}` placeholder list) over `values` in chunks
+    and return every row as a dict."""
+    rows = []
+    for i in range(0, len(values), BULK_QUERY_CHUNK):
+        chunk = values[i:i + BULK_QUERY_CHUNK]
+        cursor.execute(sql.format(ids=','.join('?' * len(chunk))), chunk)
+        rows.extend(dict(r) for r in cursor.fetchall())
+    return rows
+
+
+def calculate_completeness_scores(cursor, system_ids) -> dict:
+    """Score a batch of systems with a handful of queries.
+
+    Loads the systems, their planets, moons, stations and body-linked
+    discoveries with IN-list queries, then runs the same scorer as
+    calculate_completeness_score() per system, so results are identical.
+    Returns {system_id: result} keyed by the ids as stored in systems.id;
+    ids with no system row are omitted.
+    """
+    ids = list(dict.fromkeys(system_ids))
+    if not ids:
+        return {}
+
+    systems = _select_in(cursor, 'SELECT * FROM systems WHERE id IN ({ids})', ids)
+    planets_by_system = {}
+    planet_ids = []
+    # ORDER BY id keeps each system's planets / moons in the order the
+    # single-system queries return them, so breakdown details match too.
+    for p in _select_in(cursor, 'SELECT * FROM planets WHERE system_id IN ({ids}) ORDER BY id', ids):
+        planets_by_system.setdefault(str(p['system_id']), []).append(p)
+        planet_ids.append(p['id'])
+
+    moons_by_planet = {}
+    moon_ids = []
+    for m in _select_in(cursor, 'SELECT * FROM moons WHERE planet_id IN ({ids}) ORDER BY id', planet_ids):
+        moons_by_planet.setdefault(m['planet_id'], []).append(m)
+        moon_ids.append(m['id'])
+
+    stations = {}
+    for st in _select_in(cursor, 'SELECT * FROM space_stations WHERE system_id IN ({ids}) ORDER BY id', ids):
+        stations.setdefault(str(st['system_id']), st)
+
+    # Discoveries linked to a body, grouped by the body's system. A row linked
+    # to both a planet and a moon is seen twice; the checklist only tests
+    # membership, so that's harmless.
+    discovery_sql = 'SELECT planet_id, moon_id, type_slug, discovery_type FROM discoveries WHERE {col} IN ({{ids}})'
+    planet_system = {p['id']: sid for sid, ps in planets_by_system.items() for p in ps}
+    moon_system = {m['id']: planet_system.get(pid) for pid, ms in moons_by_planet.items() for m in ms}
+    discoveries_by_system = {}
+    for d in _select_in(cursor, discovery_sql.format(col='planet_id'), planet_ids):
+        discoveries_by_system.setdefault(planet_system.get(d['planet_id']), []).append(d)
+    for d in _select_in(cursor, discovery_sql.format(col='moon_id'), moon_ids):
+        discoveries_by_system.setdefault(moon_system.get(d['moon_id']), []).append(d)
+
+    results = {}
+    for system in systems:
+        key = str(system['id'])
+        planets = planets_by_system.get(key, [])
+        moons = [m for p in planets for m in moons_by_planet.get(p['id'], [])]
+        station = stations.get(key)
+
+        def splus_check(system=system, planets=planets, moons=moons, station=station, key=key):
+            return _splus_checklist(system, planets, moons, station is not None,
+                                    discoveries_by_system.get(key, []))
+
+        results[system['id']] = _score_system(system, planets, moons_by_planet, station, splus_check)
+    return results
+
+
+def update_completeness_scores(cursor, system_ids) -> dict:
+    """Bulk update_completeness_score(): score the batch with
+    calculate_completeness_scores() and write is_complete / is_fully_charted
+    in one executemany. Returns the {system_id: result} map."""
+    results = calculate_completeness_scores(cursor, system_ids)
+    cursor.executemany(
+        'UPDATE systems SET is_complete = ?, is_fully_charted = ? WHERE id = ?',
+        [(r['score'], 1 if r.get('is_fully_charted') else 0, sid) for sid, r in results.items()],
+    )
+    return results
+
+
+def rescore_systems(cursor, system_ids, label: str = 'Rescore') -> tuple:
+    """update_completeness_scores() with a safety net: if the batch fails it is
+    retried system-by-system, so one bad row only costs its own score
+    (logged). Returns ({system_id: result}, failed_count)."""
+    try:
+        return update_completeness_scores(cursor, system_ids), 0
+    except Exception as e:  # noqa: BLE001 — fall back to per-row so one bad row can't abort
+        logger.warning(f"{label}: batch re-score failed ({e}); retrying {len(system_ids)} systems one by one")
+    results = {}
+    failed = 0
+    for sys_id in system_ids:
+        try:
+            results[sys_id] = update_completeness_score(cursor, sys_id)
+        except Exception as e:  # noqa: BLE001
+            failed += 1
+            logger.warning(f"{label}: re-score failed for {sys_id}: {e}")
+    return results, failed
+
+
+def rescore_all_systems(conn, batch_size: int = RESCORE_BATCH_SIZE, label: str = 'Rescore',
+                        commit: bool = True) -> dict:
+    """Re-score every system in batches of `batch_size` via rescore_systems().
+
+    Commits after each batch unless `commit` is False (migrations, whose
+    runner owns the transaction). `conn` must return rows as sqlite3.Row or
+    dicts. Returns {'systems', 'fully_charted', 'failed'}.
+    """
+    cursor = conn.cursor()
+    cursor.execute('SELECT id FROM systems ORDER BY id')
+    system_ids = [row[0] for row in cursor.fetchall()]
+    scored = fully_charted = failed = 0
+    for i in range(0, len(system_ids), batch_size):
+        results, batch_failed = rescore_systems(cursor, system_ids[i:i + batch_size], label)
+        if commit:
+            conn.commit()
+        scored += len(results)
+        failed += batch_failed
+        fully_charted += sum(1 for r in results.values() if r.get('is_fully_charted'))
+    return {'systems': scored, 'fully_charted': fully_charted, 'failed': failed}
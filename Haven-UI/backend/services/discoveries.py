@@ -34,6 +34,7 @@ from constants import (
     get_discovery_type_slug,
     normalize_discovery_coords,
 )
+from services.auth_service import contributor_key
 
 logger = logging.getLogger('control.room')
 
@@ -258,8 +259,8 @@ def _promote_draft_discoveries(cursor, system_id, submission, current_username,
                     mystery_tier, analysis_status, pattern_matches,
                     discord_user_id, discord_guild_id,
                     photo_url, evidence_url, type_slug, discord_tag, type_metadata,
-                    profile_id, source, latitude, longitude, event_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    profile_id, source, latitude, longitude, event_id, username_normalized
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 entry.get('discovery_type') or 'Unknown',
                 entry.get('discovery_name'),
@@ -287,6 +288,7 @@ def _promote_draft_discoveries(cursor, system_id, submission, current_username,
                 d_lat,
                 d_lng,
                 parent_event_id,
+                contributor_key(discord_username),
             ))
             discovery_id = cursor.lastrowid
             promoted += 1
@@ -0,0 +1,157 @@
+"""
+Precomputed facets behind /api/systems/filter-options.
+
+The AdvancedFilters / FilterModal dropdowns load on every open. Building them
+runs a grouped scan per system and planet column plus the body_resources
+index, so the serialized result is cached per (reality, galaxy) scope and
+rebuilt only after a write:
+
+  - write paths that change filterable data (approvals, direct saves, CSV
+    import, edit-request approval, system delete) call
+    invalidate_filter_options() after committing;
+  - the TTL bounds staleness from paths that don't (raw SQL, CLI tools).
+
+The cache key carries a generation counter read BEFORE the build, so a build
+that races an invalidation stores under a superseded key and is never served.
+
+Each option is returned with the number of systems it would match in scope
+(`counts`), keyed by the same display string as the option list.
+"""
+
+import json
+import logging
+import os
+import threading
+
+from db import PLANET_FACET_COLUMNS, SYSTEM_FACET_COLUMNS
+from services.payload_cache import PayloadCache
+
+logger = logging.getLogger('control.room')
+
+FILTER_OPTIONS_CACHE = PayloadCache(
+    'filter_options',
+    max_bytes=2 * 1024 * 1024,
+    ttl_seconds=int(os.getenv('HAVEN_FILTER_OPTIONS_TTL', '900')),
+)
+
+# Response key for each facet column.
+FACET_KEYS = {
+    'star_type': 'star_types',
+    'economy_type': 'economy_types',
+    'economy_level': 'economy_levels',
+    'conflict_level': 'conflict_levels',
+    'dominant_lifeform': 'dominant_lifeforms',
+    'stellar_classification': 'stellar_classifications',
+    'biome': 'biomes',
+    'weather': 'weather_types',
+    'sentinel': 'sentinel_levels',
+}
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def invalidate_filter_options() -> None:
+    """Drop every cached scope. Call after committing a write that can change
+    a filterable system, planet or resource value."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    FILTER_OPTIONS_CACHE.invalidate()
+
+
+def filter_options_key(reality: str = None, galaxy: str = None) -> tuple:
+    """Cache key for one scope at the current generation."""
+    return (reality or '', galaxy or '', _generation)
+
+
+def _display_score(s):
+    # Among formatting variants of one option, prefer the best-formatted: most
+    # word breaks, mixed case, then longest.
+    return (s.count(' '), 0 if (s.isupper() or s.islower()) else 1, len(s))
+
+
+def _collect_facet(cursor, variants_sql, counts_sql, params):
+    """(options, counts) for one column. Variants are grouped by their norm
+    token — the same normalizer the filter WHERE clauses use — so a collapsed
+    option still matches every variant row. Single-character and pure-numeric
+    tokens ("1") are dropped as noise."""
+    cursor.execute(counts_sql, params)
+    totals = {row[0]: row[1] for row in cursor.fetchall()}
+    display = {}
+    cursor.execute(variants_sql, params)
+    for tok, raw in cursor.fetchall():
+        if not raw or not isinstance(raw, str) or not tok:
+            continue
+        if len(tok) < 2 or tok.isdigit():
+            continue
+        disp = ' '.join(raw.split())
+        cur = display.get(tok)
+        if cur is None or _display_score(disp) > _display_score(cur):
+            display[tok] = disp
+    options = sorted(display.values(), key=lambda s: s.lower())
+    counts = {disp: totals.get(tok, 0) for tok, disp in display.items()}
+    return options, counts
+
+
+def build_filter_options(cursor, reality: str = None, galaxy: str = None) -> dict:
+    """Distinct options and per-option system counts for every filterable
+    field, optionally scoped by reality and/or galaxy."""
+    scope = []
+    params = []
+    if reality:
+        scope.append("COALESCE(s.reality, 'Normal') = ?")
+        params.append(reality)
+    if galaxy:
+        scope.append("COALESCE(s.galaxy, 'Euclid') = ?")
+        params.append(galaxy)
+    where = ("WHERE " + " AND ".join(scope)) if scope else ""
+
+    result = {}
+    counts = {}
+    for col in SYSTEM_FACET_COLUMNS:
+        tok = f"COALESCE(s.{col}_norm, norm_token(s.{col}))"
+        result[FACET_KEYS[col]], counts[FACET_KEYS[col]] = _collect_facet(
+            cursor,
+            f"SELECT DISTINCT {tok}, s.{col} FROM systems s {where}",
+            f"SELECT {tok}, COUNT(*) FROM systems s {where} GROUP BY 1",
+            params,
+        )
+
+    planet_join = "JOIN systems s ON p.system_id = s.id" if scope else ""
+    for col in PLANET_FACET_COLUMNS:
+        tok = f"COALESCE(p.{col}_norm, norm_token(p.{col}))"
+        result[FACET_KEYS[col]], counts[FACET_KEYS[col]] = _collect_facet(
+            cursor,
+            f"SELECT DISTINCT {tok}, p.{col} FROM planets p {planet_join} {where}",
+            f"SELECT {tok}, COUNT(DISTINCT p.system_id) FROM planets p {planet_join} {where} GROUP BY 1",
+            params,
+        )
+
+    # Resources come from the body_resources inverted index. Keep only tokens
+    # that map to a real canonical resource, so the dropdown is the clean set
+    # actually present rather than every stray token.
+    from resource_catalog import CANONICAL_RESOURCES
+    canon_by_lower = {r.lower(): r for r in CANONICAL_RESOURCES}
+    resource_join = "JOIN systems s ON br.system_id = s.id" if scope else ""
+    cursor.execute(
+        f"SELECT br.resource_token, COUNT(DISTINCT br.system_id) FROM body_resources br"
+        f" {resource_join} {where} GROUP BY br.resource_token",
+        params,
+    )
+    resources = {canon_by_lower[row[0]]: row[1] for row in cursor.fetchall() if row[0] in canon_by_lower}
+    result['resources'] = sorted(resources)
+    counts['resources'] = resources
+
+    result['counts'] = counts
+    return result
+
+
+def get_filter_options_payload(cursor, reality: str = None, galaxy: str = None):
+    """Cached CachedPayload for one scope, building it on a miss."""
+    key = filter_options_key(reality, galaxy)
+    cached = FILTER_OPTIONS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    result = build_filter_options(cursor, reality, galaxy)
+    return FILTER_OPTIONS_CACHE.put(key, json.dumps(result, ensure_ascii=True))
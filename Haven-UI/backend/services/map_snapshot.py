@@ -0,0 +1,695 @@
+"""
+Cartographer map snapshot — build, incremental patch, and wire serialization.
+
+/api/map/snapshot ships the whole mapped galaxy as base64-packed typed arrays
+(positions, star type / tag / flag indices, region index) plus string pools and
+a sparse planets_by_idx. Rebuilding that bundle means a full scan of systems,
+planets and moons, so doing it after every approval is what makes batch
+approvals expensive for the map.
+
+Instead each reality/galaxy scope keeps a decoded, patchable SnapshotState:
+
+  - `map_change_log` (migration 1.100.0) is filled by SQLite triggers on every
+    write that affects the bundle — systems, planets, moons, space stations —
+    so every write path (approvals, edits, extractor uploads, admin tools) is
+    captured without each one having to call into the map code.
+  - On the next snapshot/delta request the state replays the log: it re-reads
+    only the touched systems, their planets and their regions, and patches the
+    arrays in place. New systems are appended, so existing indices stay valid.
+  - Anything that can't be expressed as an in-place update or append (a system
+    deleted or moved out of scope, a region emptied, a civ archived, a region
+    renamed, or a log gap after pruning) rebuilds the state under a new lineage.
+
+Every state carries a token `<lineage>.<seq>`. The full snapshot includes it,
+and /api/map/snapshot/delta?since=<token> returns just the systems and regions
+touched after `seq` — or `{"full": true}` when the lineage no longer matches and
+the client must refetch the full bundle.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from db import archived_civ_filter
+
+logger = logging.getLogger('control.room')
+
+# system_id written by the civilizations/regions triggers: the change can't be
+# attributed to individual systems, so the next read rebuilds.
+FULL_REBUILD_MARKER = '*'
+
+# Above this many touched systems a rebuild is cheaper than targeted re-reads.
+MAX_PATCH_SYSTEMS = int(os.getenv('HAVEN_SNAPSHOT_MAX_PATCH', '2000'))
+
+# Scopes (reality, galaxy) kept decoded in memory. Each state is roughly the
+# size of its serialized snapshot, so keep this small.
+MAX_STATES = int(os.getenv('HAVEN_SNAPSHOT_STATES', '4'))
+
+# Bind-parameter chunk for `IN (...)` lookups — stays under SQLite's default
+# SQLITE_MAX_VARIABLE_NUMBER on older builds.
+_IN_CHUNK = 500
+
+# Canonical star-type order — matches the mockup's `star_types` pool and the
+# in-page legend / shader palette. NULL or unmapped star types fall into an
+# 'Unknown' bucket appended on demand so unscanned systems still render.
+STAR_TYPE_ORDER = ['Yellow', 'Red', 'Green', 'Blue', 'Purple']
+
+# Canonical planet-size order, pre-seeded so common sizes get low stable indices
+# (mockup pool was ['', 'Small', 'Medium', 'Large']).
+SIZE_ORDER = ['Small', 'Medium', 'Large', 'Giant', 'Moon']
+
+NO_REGION = 65535
+
+
+def spread_star(rx: int, ry: int, rz: int, sss: int) -> tuple:
+    """Deterministic intra-region spread — mirrors glyph_decoder.calculate_star_position_in_region.
+
+    Systems within the same NMS region share identical (x, y, z) glyph coordinates.
+    The SSS (solar system index) has no spatial meaning, so we hash it against the
+    region address to spread systems WITHIN their own voxel.
+
+    TRUE SCALE: world unit = 1 region voxel (= ~400 ly in NMS). A region is a
+    single 400 ly cube, so its systems must stay inside ±0.5 voxel — otherwise
+    they smear across neighbouring regions and destroy all spatial locality.
+    (The previous ±64-voxel spread was ~128× too large: it scattered one
+    region's systems across ~25,600 ly of space.) We use ±0.45 so stars fill
+    the voxel without sitting exactly on its faces.
+    """
+    h = hashlib.sha256(f"NMS:{rx}:{ry}:{rz}:{sss}".encode()).digest()
+    ox = (int.from_bytes(h[0:4], 'big') / 0xFFFFFFFF - 0.5) * 0.9
+    oy = (int.from_bytes(h[4:8], 'big') / 0xFFFFFFFF - 0.5) * 0.9
+    oz = (int.from_bytes(h[8:12], 'big') / 0xFFFFFFFF - 0.5) * 0.9
+    bx = rx if rx <= 0x7FF else rx - 0x1000
+    by = ry if ry <= 0x7F  else ry - 0x100
+    bz = rz if rz <= 0x7FF else rz - 0x1000
+    return bx + ox, by + oy, bz + oz
+
+
+# Digest prefixes (12 bytes: the x/y/z words) keyed by (rx, ry, rz, sss). The
+# placement is a pure function of the key, so rebuilds after a lineage change
+# only hash systems this process hasn't seen yet. Cleared if it outgrows the cap.
+_DIGEST_MEMO: dict = {}
+_DIGEST_MEMO_MAX = 250_000
+
+
+def spread_stars(rx, ry, rz, sss) -> np.ndarray:
+    """Batched spread_star: (n, 3) float64 positions for parallel arrays of
+    region coords and solar system indices.
+
+    Bit-identical to spread_star row by row: the word -> float conversion,
+    division by 0xFFFFFFFF, -0.5, *0.9 and signed-base addition are the same
+    IEEE double operations in the same order, just over whole columns. SHA-256
+    itself can't be expressed in NumPy, so digests are produced in one tight
+    loop (memoized across builds) and decoded with a single frombuffer.
+    """
+    keys = list(zip(*(np.asarray(a, dtype=np.int64).tolist() for a in (rx, ry, rz, sss))))
+    n = len(keys)
+    if n == 0:
+        return np.empty((0, 3), dtype=np.float64)
+    memo = _DIGEST_MEMO
+    if len(memo) + n > _DIGEST_MEMO_MAX:
+        memo.clear()
+    parts = []
+    for key in keys:
+        d = memo.get(key)
+        if d is None:
+            d = hashlib.sha256("NMS:{}:{}:{}:{}".format(*key).encode()).digest()[:12]
+            memo[key] = d
+        parts.append(d)
+    words = np.frombuffer(b''.join(parts), dtype='>u4').reshape(n, 3)
+    offsets = (words / 0xFFFFFFFF - 0.5) * 0.9
+
+    coords = np.asarray(keys, dtype=np.int64)[:, :3]
+    base = np.empty((n, 3), dtype=np.int64)
+    base[:, 0] = np.where(coords[:, 0] <= 0x7FF, coords[:, 0], coords[:, 0] - 0x1000)
+    base[:, 1] = np.where(coords[:, 1] <= 0x7F, coords[:, 1], coords[:, 1] - 0x100)
+    base[:, 2] = np.where(coords[:, 2] <= 0x7FF, coords[:, 2], coords[:, 2] - 0x1000)
+    return base + offsets
+
+
+def place_systems(rows) -> np.ndarray:
+    """(n, 3) display positions for system rows: spread within the region voxel
+    when the glyph and region are known, raw x/y/z otherwise."""
+    pos = np.empty((len(rows), 3), dtype=np.float64)
+    spread_rows, spread_keys = [], []
+    for i, s in enumerate(rows):
+        glyph = s['glyph_code'] or ''
+        if len(glyph) == 12 and s['region_x'] is not None:
+            # Same deterministic hash as glyph_decoder.calculate_star_position_in_region
+            # so every system has a unique visible position when zoomed in.
+            spread_rows.append(i)
+            spread_keys.append((s['region_x'], s['region_y'] or 0, s['region_z'] or 0,
+                                int(glyph[1:4], 16)))
+        else:
+            pos[i] = ((s['x'] or 0.0), (s['y'] or 0.0), (s['z'] or 0.0))
+    if spread_keys:
+        pos[spread_rows] = spread_stars(*zip(*spread_keys))
+    return pos
+
+
+def _b64(arr) -> str:
+    return base64.b64encode(arr.tobytes()).decode('ascii')
+
+
+def _chunks(seq, size=_IN_CHUNK):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+def _scope_where(reality: Optional[str], galaxy: Optional[str]):
+    """WHERE clause + params for the mapped-system set (one row per snapshot index)."""
+    where = ["s.x IS NOT NULL AND s.y IS NOT NULL AND s.z IS NOT NULL"]
+    params = []
+    if reality:
+        where.append("s.reality = ?")
+        params.append(reality)
+    if galaxy:
+        where.append("s.galaxy = ?")
+        params.append(galaxy)
+    where.append(archived_civ_filter('s'))
+    where.append("s.glyph_code IS NOT NULL AND LENGTH(s.glyph_code) = 12")
+    return where, params
+
+
+def _region_where(reality: Optional[str], galaxy: Optional[str]):
+    """WHERE clause + params for region aggregation (same shape as /api/map/regions-aggregated)."""
+    where = ["s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL"]
+    params = []
+    if reality:
+        where.append("s.reality = ?"); params.append(reality)
+    if galaxy:
+        where.append("s.galaxy = ?"); params.append(galaxy)
+    where.append(archived_civ_filter('s'))
+    return where, params
+
+
+_SYSTEM_COLUMNS = """
+    s.id,
+    COALESCE(NULLIF(TRIM(s.name), ''),
+             NULLIF(TRIM(s.description), ''),
+             'System ' || s.glyph_code) AS name,
+    s.x, s.y, s.z, s.star_type, s.discord_tag,
+    s.glyph_code, s.region_x, s.region_y, s.region_z
+"""
+
+# Single LEFT JOIN + GROUP BY for moon counts — avoids one correlated subquery
+# per planet row (~30k) which is slow on the Pi's SD-card I/O.
+_PLANET_SQL = """
+    SELECT p.id, p.system_id, p.name, p.biome, p.planet_size,
+           p.sentinel_level, p.planet_index, p.is_moon,
+           p.has_rings, p.is_gas_giant, p.water_world, p.is_bubble,
+           p.is_floating_islands, p.is_dissonant, p.is_infested,
+           p.extreme_weather,
+           COUNT(m.id) AS moon_count
+    FROM planets p
+    LEFT JOIN moons m ON m.planet_id = p.id
+    {where}
+    GROUP BY p.id
+    ORDER BY p.system_id, p.planet_index
+"""
+
+_REGION_SQL = """
+    SELECT s.region_x, s.region_y, s.region_z,
+           r.custom_name AS region_name,
+           COUNT(*) AS system_count,
+           AVG(s.x) AS cx, AVG(s.y) AS cy, AVG(s.z) AS cz,
+           GROUP_CONCAT(DISTINCT s.discord_tag) AS tags
+    FROM systems s
+    LEFT JOIN regions r ON s.region_x = r.region_x
+        AND s.region_y = r.region_y AND s.region_z = r.region_z
+        AND COALESCE(s.reality, 'Normal') = COALESCE(r.reality, 'Normal')
+        AND COALESCE(s.galaxy, 'Euclid') = COALESCE(r.galaxy, 'Euclid')
+    WHERE {where}
+    GROUP BY s.region_x, s.region_y, s.region_z
+    {order}
+"""
+
+
+def _dominant_tag(tags: Optional[str]) -> Optional[str]:
+    """First non-null tag in the region (matches the regions-aggregated convention)."""
+    if tags:
+        for t in tags.split(','):
+            if t and t != 'None':
+                return t
+    return None
+
+
+class SnapshotState:
+    """Decoded, patchable form of one reality/galaxy-scoped snapshot.
+
+    Per-system arrays are over-allocated numpy buffers (`n` is the live length)
+    so appends during a patch don't copy on every new system. `touched` /
+    `regions_touched` record the change-log seq that last modified each index,
+    which is all a delta response needs.
+    """
+
+    def __init__(self, reality: Optional[str], galaxy: Optional[str], seq: int):
+        self.reality = reality
+        self.galaxy = galaxy
+        self.lineage = uuid.uuid4().hex[:8]
+        self.base_seq = seq
+        self.seq = seq
+        self.patches = 0
+
+        self.n = 0
+        self._cap = 0
+        self.pos = np.empty(0, dtype='<f4')   # little-endian f32, JS-compatible
+        self.st = np.zeros(0, dtype=np.uint8)
+        self.ti = np.zeros(0, dtype=np.uint8)
+        self.hp = np.zeros(0, dtype=np.uint8)
+        self.hs = np.zeros(0, dtype=np.uint8)
+        self.ri = np.zeros(0, dtype='<u2')
+        self.ids = []
+        self.id_to_idx = {}
+        self.names = []
+        self.glyphs = []
+        self.region_keys = []
+        self.touched = {}
+
+        self.star_types = list(STAR_TYPE_ORDER)
+        self.star_index = {name: i for i, name in enumerate(STAR_TYPE_ORDER)}
+        self.unknown_star_idx = None
+        self.tag_pool = ['']    # '' = untagged, index 0 (matches mockup pool)
+        self.tag_index = {'': 0}
+        self.biomes, self.biome_index = [''], {'': 0}
+        self.sizes, self.size_index = [''], {'': 0}
+        self.sentinel, self.sent_index = [''], {'': 0}
+        # Pre-seed sizes so common values keep low, stable indices.
+        for sz in SIZE_ORDER:
+            self._intern(sz, self.size_index, self.sizes)
+        self.planets_by_idx = {}
+
+        self.regions = []
+        self.region_key_to_idx = {}
+        self.rpos = []
+        self.regions_touched = {}
+
+    @property
+    def token(self) -> str:
+        return f"{self.lineage}.{self.seq}"
+
+    # --- pools / buffers ----------------------------------------------------
+
+    @staticmethod
+    def _intern(value, index_map, pool) -> int:
+        """Intern a categorical string into its pool, returning its index."""
+        v = value or ''
+        if v not in index_map:
+            index_map[v] = len(pool)
+            pool.append(v)
+        return index_map[v]
+
+    def _reserve(self, n: int) -> None:
+        if n <= self._cap:
+            return
+        cap = max(n, self._cap * 2, 64)
+        pos = np.empty(cap * 3, dtype='<f4')
+        pos[:self.n * 3] = self.pos[:self.n * 3]
+        self.pos = pos
+        for name in ('st', 'ti', 'hp', 'hs', 'ri'):
+            old = getattr(self, name)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+        self._cap = cap
+
+    def _set_system(self, i: int, s, xyz) -> None:
+        """Write one system row at index i; `xyz` comes from place_systems()."""
+        self.pos[i * 3:i * 3 + 3] = xyz
+
+        stype = s['star_type']
+        if stype in self.star_index:
+            self.st[i] = self.star_index[stype]
+        else:
+            # NULL / unmapped star type -> lazily-created 'Unknown' bucket
+            if self.unknown_star_idx is None:
+                self.unknown_star_idx = len(self.star_types)
+                self.star_types.append('Unknown')
+            self.st[i] = self.unknown_star_idx
+
+        self.ti[i] = self._intern(s['discord_tag'], self.tag_index, self.tag_pool)
+        self.names[i] = s['name'] or '(unnamed)'
+        self.glyphs[i] = s['glyph_code'] or ''
+        self.region_keys[i] = (s['region_x'], s['region_y'], s['region_z'])
+
+    def _append_system(self, s, xyz) -> int:
+        i = self.n
+        self._reserve(i + 1)
+        self.n = i + 1
+        self.ids.append(s['id'])
+        self.id_to_idx[s['id']] = i
+        self.names.append('')
+        self.glyphs.append('')
+        self.region_keys.append(None)
+        self._set_system(i, s, xyz)
+        return i
+
+    def _planet_tuple(self, p) -> list:
+        # Pack special features into the bitfield the mockup decodes.
+        flags = 0
+        if p['has_rings']:           flags |= 1
+        if p['is_gas_giant']:        flags |= 2
+        if p['water_world']:         flags |= 4
+        if p['is_bubble']:           flags |= 8
+        if p['is_floating_islands']: flags |= 16
+        if p['is_dissonant']:        flags |= 32
+        if p['is_infested']:         flags |= 64
+        if p['extreme_weather']:     flags |= 128
+        return [
+            p['name'] or '',
+            self._intern(p['biome'], self.biome_index, self.biomes),
+            self._intern(p['planet_size'], self.size_index, self.sizes),
+            self._intern(p['sentinel_level'], self.sent_index, self.sentinel),
+            flags,
+            p['moon_count'] or 0,
+            p['planet_index'] or 0,
+            1 if p['is_moon'] else 0,
+        ]
+
+    def _set_region(self, i: int, r) -> None:
+        region = {
+            'rx': r['region_x'], 'ry': r['region_y'], 'rz': r['region_z'],
+            'name': r['region_name'] or '',
+            'count': r['system_count'] or 0,
+            'tag': _dominant_tag(r['tags']),
+        }
+        centroid = (r['cx'] or 0.0, r['cy'] or 0.0, r['cz'] or 0.0)
+        if i == len(self.regions):
+            self.regions.append(region)
+            self.rpos.append(centroid)
+            self.region_key_to_idx[(region['rx'], region['ry'], region['rz'])] = i
+        else:
+            self.regions[i] = region
+            self.rpos[i] = centroid
+
+    def _region_idx(self, key) -> int:
+        return self.region_key_to_idx.get(key, NO_REGION)
+
+    # --- wire format --------------------------------------------------------
+
+    def _rpos_array(self, indices=None):
+        rows = self.rpos if indices is None else [self.rpos[i] for i in indices]
+        return np.asarray(rows, dtype='<f4').reshape(-1)
+
+    def _rcount_array(self, indices=None):
+        regions = self.regions if indices is None else [self.regions[i] for i in indices]
+        # clamp to Uint16 range
+        return np.fromiter((min(r['count'], 65535) for r in regions), dtype='<u2', count=len(regions))
+
+    def _pools(self) -> dict:
+        return {
+            'star_types': self.star_types,
+            'tag_pool': self.tag_pool,
+            'biomes': self.biomes,
+            'sizes': self.sizes,
+            'sentinel': self.sentinel,
+        }
+
+    def to_snapshot(self, tag_colors: dict, galaxies: list) -> dict:
+        """Full /api/map/snapshot body (field contract in docs/cartographer-integration-notes.md)."""
+        n = self.n
+        return {
+            'n': n,
+            'pos': _b64(self.pos[:n * 3]),
+            'st': _b64(self.st[:n]),
+            'ti': _b64(self.ti[:n]),
+            'hp': _b64(self.hp[:n]),
+            'hs': _b64(self.hs[:n]),
+            'ri': _b64(self.ri[:n]),
+            'rpos': _b64(self._rpos_array()),
+            'rcount': _b64(self._rcount_array()),
+            'rn': len(self.regions),
+            'galaxies': galaxies,
+            'regions': self.regions,
+            'names': self.names,
+            'glyphs': self.glyphs,
+            **self._pools(),
+            'tag_colors': tag_colors,
+            'planets_by_idx': self.planets_by_idx,
+            'token': self.token,
+        }
+
+    def to_delta(self, since_seq: int, tag_colors: dict, galaxies: list) -> dict:
+        """Systems and regions touched after `since_seq`, in snapshot index space.
+
+        `idx` / `region_idx` give the index each packed row belongs at; indices
+        >= the client's current n / rn are appends. Pools are sent whole (they
+        are small and only ever grow) so new pool indices always resolve.
+        """
+        idx = sorted(i for i, seq in self.touched.items() if seq > since_seq)
+        ridx = sorted(i for i, seq in self.regions_touched.items() if seq > since_seq)
+        sel = np.asarray(idx, dtype=np.intp)
+        pos_sel = (sel[:, None] * 3 + np.arange(3)).reshape(-1) if idx else sel
+        return {
+            'full': False,
+            'since': since_seq,
+            'token': self.token,
+            'n': self.n,
+            'rn': len(self.regions),
+            'idx': idx,
+            'pos': _b64(self.pos[pos_sel]),
+            'st': _b64(self.st[sel]),
+            'ti': _b64(self.ti[sel]),
+            'hp': _b64(self.hp[sel]),
+            'hs': _b64(self.hs[sel]),
+            'ri': _b64(self.ri[sel]),
+            'names': [self.names[i] for i in idx],
+            'glyphs': [self.glyphs[i] for i in idx],
+            'planets_by_idx': {str(i): self.planets_by_idx.get(str(i), []) for i in idx},
+            'region_idx': ridx,
+            'regions': [self.regions[i] for i in ridx],
+            'rpos': _b64(self._rpos_array(ridx)),
+            'rcount': _b64(self._rcount_array(ridx)),
+            'galaxies': galaxies,
+            **self._pools(),
+            'tag_colors': tag_colors,
+        }
+
+
+def current_change_seq(cursor) -> int:
+    """Newest map_change_log seq (0 for an empty log). PK lookup, O(1)."""
+    cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM map_change_log")
+    return cursor.fetchone()[0]
+
+
+def build_state(cursor, reality: Optional[str], galaxy: Optional[str], seq: int) -> SnapshotState:
+    """Full build: one pass over the mapped systems, planets and regions."""
+    state = SnapshotState(reality, galaxy, seq)
+
+    # --- Systems in stable id order. The row position IS the snapshot
+    #     index that every per-system array and planets_by_idx key uses. ---
+    where, params = _scope_where(reality, galaxy)
+    cursor.execute(f"""
+        SELECT {_SYSTEM_COLUMNS}
+        FROM systems s
+        WHERE {' AND '.join(where)}
+        ORDER BY s.id
+    """, params)
+    systems = cursor.fetchall()
+    state._reserve(len(systems))
+    positions = place_systems(systems)
+    for s, xyz in zip(systems, positions):
+        state._append_system(s, xyz)
+    if state.n == 0:
+        return state
+
+    # --- hasPlanets / hasStation as set lookups (one query each, not n) ---
+    cursor.execute("SELECT DISTINCT system_id FROM planets")
+    for r in cursor.fetchall():
+        i = state.id_to_idx.get(r[0])
+        if i is not None:
+            state.hp[i] = 1
+    cursor.execute("SELECT DISTINCT system_id FROM space_stations")
+    for r in cursor.fetchall():
+        i = state.id_to_idx.get(r[0])
+        if i is not None:
+            state.hs[i] = 1
+
+    # --- planets_by_idx + biome / size / sentinel pools ---
+    cursor.execute(_PLANET_SQL.format(where=''))
+    for p in cursor.fetchall():
+        i = state.id_to_idx.get(p['system_id'])
+        if i is None:
+            continue  # planet of a system outside the filtered / archived set
+        state.planets_by_idx.setdefault(str(i), []).append(state._planet_tuple(p))
+
+    # --- Region aggregation: centroid (avg) position, count, dominant tag,
+    #     custom name. Same join shape as /api/map/regions-aggregated. ---
+    rwhere, rparams = _region_where(reality, galaxy)
+    cursor.execute(_REGION_SQL.format(where=' AND '.join(rwhere),
+                                      order='ORDER BY system_count DESC'), rparams)
+    for r in cursor.fetchall():
+        state._set_region(len(state.regions), r)
+
+    # --- Per-system region index (ri): aligned to the per-system arrays,
+    #     valued by position in the `regions` pool above. 65535 = no region
+    #     (system with NULL region coords). Lets the Cartographer filter map
+    #     a matched system back to its region for region-layer hiding. ---
+    for i, key in enumerate(state.region_keys):
+        state.ri[i] = state._region_idx(key)
+    return state
+
+
+def patch_state(cursor, state: SnapshotState, seq: int) -> bool:
+    """Replay map_change_log (state.seq, seq] into `state` in place.
+
+    Returns False — leaving `state` untouched — when the changes can't be
+    applied as updates/appends and the caller should rebuild. All reads happen
+    before any mutation so a bail-out never leaves a half-patched state.
+    """
+    cursor.execute("SELECT MIN(seq) FROM map_change_log")
+    oldest = cursor.fetchone()[0]
+    if oldest is not None and oldest > state.seq + 1:
+        return False  # log pruned past this state — can't know what changed
+
+    cursor.execute(
+        "SELECT DISTINCT system_id FROM map_change_log WHERE seq > ? AND seq <= ?",
+        (state.seq, seq))
+    changed = [r[0] for r in cursor.fetchall()]
+    if FULL_REBUILD_MARKER in changed or len(changed) > MAX_PATCH_SYSTEMS:
+        return False
+
+    where, params = _scope_where(state.reality, state.galaxy)
+    rows = {}
+    has_planets, has_station = set(), set()
+    planets = {}
+    for chunk in _chunks(changed):
+        marks = ','.join('?' * len(chunk))
+        cursor.execute(f"""
+            SELECT {_SYSTEM_COLUMNS}
+            FROM systems s
+            WHERE {' AND '.join(where)} AND s.id IN ({marks})
+            ORDER BY s.id
+        """, params + list(chunk))
+        for s in cursor.fetchall():
+            rows[s['id']] = s
+        cursor.execute(f"SELECT DISTINCT system_id FROM planets WHERE system_id IN ({marks})", chunk)
+        has_planets.update(r[0] for r in cursor.fetchall())
+        cursor.execute(f"SELECT DISTINCT system_id FROM space_stations WHERE system_id IN ({marks})", chunk)
+        has_station.update(r[0] for r in cursor.fetchall())
+        cursor.execute(_PLANET_SQL.format(where=f"WHERE p.system_id IN ({marks})"), chunk)
+        for p in cursor.fetchall():
+            planets.setdefault(p['system_id'], []).append(p)
+
+    # A known system that no longer matches the scope was deleted, archived or
+    # moved out of this reality/galaxy. Removing it would shift every later
+    # index, so rebuild under a new lineage instead.
+    if any(sid in state.id_to_idx and sid not in rows for sid in changed):
+        return False
+
+    # Region aggregates for every region a touched system was in or is now in.
+    region_keys = set()
+    for sid, s in rows.items():
+        region_keys.add((s['region_x'], s['region_y'], s['region_z']))
+        i = state.id_to_idx.get(sid)
+        if i is not None:
+            region_keys.add(state.region_keys[i])
+    region_keys = [k for k in region_keys if None not in k]
+    rwhere, rparams = _region_where(state.reality, state.galaxy)
+    rwhere.append("s.region_x = ? AND s.region_y = ? AND s.region_z = ?")
+    region_rows = {}
+    for key in region_keys:
+        cursor.execute(_REGION_SQL.format(where=' AND '.join(rwhere), order=''),
+                       rparams + list(key))
+        r = cursor.fetchone()
+        if r is None:
+            if key in state.region_key_to_idx:
+                return False  # region emptied — same index-shift problem as above
+            continue
+        region_rows[key] = r
+
+    # --- mutate ---
+    placed = dict(zip(rows, place_systems(list(rows.values()))))
+    for key, r in region_rows.items():
+        ri = state.region_key_to_idx.get(key, len(state.regions))
+        state._set_region(ri, r)
+        state.regions_touched[ri] = seq
+
+    for sid in changed:
+        s = rows.get(sid)
+        if s is None:
+            continue  # never in scope (other galaxy, no glyph yet, ...)
+        i = state.id_to_idx.get(sid)
+        if i is None:
+            i = state._append_system(s, placed[sid])
+        else:
+            state._set_system(i, s, placed[sid])
+        state.ri[i] = state._region_idx(state.region_keys[i])
+        state.hp[i] = 1 if sid in has_planets else 0
+        state.hs[i] = 1 if sid in has_station else 0
+        tuples = [state._planet_tuple(p) for p in planets.get(sid, [])]
+        if tuples:
+            state.planets_by_idx[str(i)] = tuples
+        else:
+            state.planets_by_idx.pop(str(i), None)
+        state.touched[i] = seq
+
+    state.seq = seq
+    state.patches += 1
+    return True
+
+
+_states: 'OrderedDict[tuple, SnapshotState]' = OrderedDict()
+_states_lock = threading.RLock()
+_counters = {'builds': 0, 'patches': 0, 'patch_fallbacks': 0}
+
+
+def get_snapshot_state(cursor, reality: Optional[str] = None,
+                       galaxy: Optional[str] = None) -> SnapshotState:
+    """Current state for a scope: patched forward from the change log when
+    possible, rebuilt otherwise. Synchronous — call it before any `await` so a
+    handler never observes a half-applied patch."""
+    key = (reality or '', galaxy or '')
+    with _states_lock:
+        seq = current_change_seq(cursor)
+        state = _states.get(key)
+        if state is not None and seq > state.seq:
+            if patch_state(cursor, state, seq):
+                _counters['patches'] += 1
+            else:
+                _counters['patch_fallbacks'] += 1
+                state = None
+        if state is None:
+            state = build_state(cursor, reality, galaxy, seq)
+            _counters['builds'] += 1
+            _states[key] = state
+            while len(_states) > MAX_STATES:
+                _states.popitem(last=False)
+        _states.move_to_end(key)
+        return state
+
+
+def parse_token(token: str):
+    """Split a `<lineage>.<seq>` snapshot token. Returns (None, None) if malformed."""
+    lineage, _, seq = (token or '').partition('.')
+    try:
+        return lineage, int(seq)
+    except ValueError:
+        return None, None
+
+
+def invalidate_snapshot_states() -> None:
+    """Drop every decoded state (next request rebuilds under new lineages)."""
+    with _states_lock:
+        _states.clear()
+
+
+def snapshot_state_stats() -> dict:
+    """Build / patch counters and per-scope sizes, for /api/admin/health."""
+    with _states_lock:
+        return {
+            **_counters,
+            'scopes': {
+                f"{k[0] or '*'}/{k[1] or '*'}": {
+                    'token': s.token, 'n': s.n, 'rn': len(s.regions), 'patches': s.patches,
+                }
+                for k, s in _states.items()
+            },
+        }
@@ -0,0 +1,170 @@
+"""
+Bounded, instrumented cache for pre-serialized API payloads.
+
+Some public endpoints (the /api/map/snapshot bundle first among them) build a
+large JSON document that only changes when the underlying data does. Caching
+the serialized bytes lets a warm hit skip both the DB build and json.dumps.
+This module adds what a plain module-level dict lacks:
+
+  - a byte budget with LRU eviction, so superseded payloads (every approval
+    mints a new cache token) can't accumulate for the life of the process;
+  - a TTL, for inputs the cache key doesn't capture (e.g. civ tag colours);
+  - gzip (and brotli, when the optional `brotli` package is installed)
+    variants compressed once at insert time, so a warm hit never pays
+    per-request compression either;
+  - hit / miss / eviction counters, surfaced on /api/admin/health.
+"""
+
+import gzip
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi.responses import Response
+
+try:
+    import brotli  # optional: not in requirements.txt, gzip is always available
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('control.room')
+
+# Every PayloadCache registers itself here so the health endpoint can report
+# on all of them without each route module wiring its own stats.
+_registry: 'OrderedDict[str, PayloadCache]' = OrderedDict()
+
+
+class CachedPayload:
+    """One cached body plus its pre-compressed variants."""
+
+    __slots__ = ('body', 'gzip', 'br', 'media_type', 'created_at', 'size', 'data')
+
+    def __init__(self, body: bytes, media_type: str, compress: bool, data=None):
+        self.body = body
+        # Optional decoded form the body was rendered from, for callers that
+        # sometimes need to post-process it (e.g. per-viewer restrictions).
+        # Treat as read-only. Not counted against the byte budget.
+        self.data = data
+        self.media_type = media_type
+        self.gzip = gzip.compress(body, compresslevel=6) if compress else None
+        self.br = brotli.compress(body, quality=5) if (compress and brotli) else None
+        self.created_at = time.monotonic()
+        self.size = len(body) + len(self.gzip or b'') + len(self.br or b'')
+
+    def response(self, accept_encoding: Optional[str] = None, headers: Optional[dict] = None) -> Response:
+        """Build a Response, picking the best pre-compressed variant the client
+        accepts. `Vary: Accept-Encoding` keeps shared caches honest."""
+        accepted = {part.split(';')[0].strip().lower()
+                    for part in (accept_encoding or '').split(',') if part.strip()}
+        out_headers = {'Vary': 'Accept-Encoding'}
+        if headers:
+            out_headers.update(headers)
+        if self.br is not None and 'br' in accepted:
+            out_headers['Content-Encoding'] = 'br'
+            return Response(content=self.br, media_type=self.media_type, headers=out_headers)
+        if self.gzip is not None and 'gzip' in accepted:
+            out_headers['Content-Encoding'] = 'gzip'
+            return Response(content=self.gzip, media_type=self.media_type, headers=out_headers)
+        return Response(content=self.body, media_type=self.media_type, headers=out_headers)
+
+
+class PayloadCache:
+    """Byte-budgeted LRU of CachedPayload entries with a TTL.
+
+    Thread-safe: entries may be read or written from the event loop and from
+    DB worker threads (see db.run_read).
+    """
+
+    def __init__(self, name: str, max_bytes: int, ttl_seconds: float,
+                 media_type: str = 'application/json', compress: bool = True):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.media_type = media_type
+        self.compress = compress
+        self._entries: 'OrderedDict[object, CachedPayload]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.oversize_skips = 0
+        _registry[name] = self
+
+    def get(self, key) -> Optional[CachedPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() - entry.created_at > self.ttl_seconds:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, payload, data=None) -> CachedPayload:
+        """Insert a serialized payload (str or bytes) and return its entry.
+
+        Compression runs outside the lock. A payload larger than the whole
+        budget is returned uncached rather than flushing everything else.
+        """
+        body = payload.encode('utf-8') if isinstance(payload, str) else payload
+        entry = CachedPayload(body, self.media_type, self.compress, data)
+        with self._lock:
+            if entry.size > self.max_bytes:
+                self.oversize_skips += 1
+                logger.warning("%s cache: %d-byte payload exceeds the %d-byte budget; not cached",
+                               self.name, entry.size, self.max_bytes)
+                return entry
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, predicate: Optional[Callable[[object], bool]] = None) -> int:
+        """Drop every entry (or those whose key matches `predicate`). Returns
+        the number dropped."""
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    def _drop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'oversize_skips': self.oversize_skips,
+                'brotli': brotli is not None and self.compress,
+            }
+
+
+def payload_cache_stats() -> dict:
+    """Stats for every registered PayloadCache, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -13,7 +13,9 @@ Design invariants (poster-system-plan.md):
 """
 
 import asyncio
+import contextlib
 import hashlib
+import heapq
 import json
 import logging
 import os
@@ -24,6 +26,7 @@ from pathlib import Path
 from typing import Callable, Optional
 
 from db import get_db_connection, get_db_path
+from services.region_stats import region_page, region_stats_ready, region_stats_scope
 
 logger = logging.getLogger('control.room')
 
@@ -44,9 +47,23 @@ RENDER_TIMEOUT_S = 18
 # budget on the 8 GB Pi and roughly halves the warm-up wall time.
 RENDER_CONCURRENCY = 4
 
+# Warm pages kept per viewport (width, height). A pooled page already has the
+# SPA bundle loaded, so the next poster is a client-side route change plus a
+# data fetch instead of a full page load.
+PAGE_POOL_PER_VIEWPORT = RENDER_CONCURRENCY
+
+# Recycle a pooled page after this many renders so SPA memory growth (module
+# caches, detached nodes) can't accumulate over a long-running process.
+PAGE_MAX_RENDERS = 50
+
 # How long to wait before dropping cache rows that haven't been read
 CACHE_PRUNE_AFTER_DAYS = 90
 
+# A matching data hash extends a poster's TTL without re-rendering, but only
+# up to this age — things outside the signature (ranks, tag colours picked up
+# through another civ) still get picked up at least weekly.
+DATA_HASH_MAX_AGE_DAYS = 7
+
 # Where rendered PNGs live on disk
 def get_posters_dir() -> Path:
     """Resolve the poster cache directory under Haven-UI/data/posters/."""
@@ -229,7 +246,105 @@ def list_templates() -> list[dict]:
 
 _browser = None  # Resolved lazily; set in lifespan startup
 _browser_lock = asyncio.Lock()
-_render_semaphore = asyncio.Semaphore(RENDER_CONCURRENCY)
+
+
+# ============================================================================
+# Render gate — RENDER_CONCURRENCY slots handed out by priority
+# A plain Semaphore wakes waiters FIFO, so a visitor's poster queued behind
+# 300 pre-warm targets waited for all of them. The gate keeps the same slot
+# budget but always grants a freed slot to the most urgent waiter.
+# ============================================================================
+
+PRIORITY_INTERACTIVE = 0   # A consumer is waiting on the PNG right now
+PRIORITY_REFRESH = 1       # Stale-while-revalidate background refresh
+PRIORITY_PREWARM = 2       # Startup pre-warm
+
+_PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_REFRESH: 'refresh',
+    PRIORITY_PREWARM: 'prewarm',
+}
+
+
+class _RenderGate:
+    """Priority-ordered semaphore. Lower priority number = served first.
+
+    Waiters are heap entries (priority, seq, key, future); seq keeps FIFO
+    order within a priority. promote() re-queues a pending waiter at a more
+    urgent priority — the old heap entry is skipped lazily once the future
+    is resolved.
+    """
+
+    def __init__(self, slots: int):
+        self._free = slots
+        self._heap: list[tuple[int, int, object, asyncio.Future]] = []
+        self._seq = 0
+        self._pending: dict[object, tuple[int, asyncio.Future]] = {}
+
+    def _push(self, priority: int, key, fut: asyncio.Future) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (priority, self._seq, key, fut))
+        if key is not None:
+            self._pending[key] = (priority, fut)
+
+    async def acquire(self, priority: int, key=None) -> None:
+        if self._free > 0 and not self._pending_waiters():
+            self._free -= 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._push(priority, key, fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot was handed over just as we were cancelled — pass it on.
+                self.release()
+            raise
+        finally:
+            if key is not None and self._pending.get(key, (None, None))[1] is fut:
+                del self._pending[key]
+
+    def release(self) -> None:
+        while self._heap:
+            _, _, _, fut = heapq.heappop(self._heap)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._free += 1
+
+    def promote(self, key, priority: int) -> bool:
+        """Move a queued waiter for `key` up to `priority`. No-op if it holds a slot already."""
+        entry = self._pending.get(key)
+        if entry is None or entry[0] <= priority or entry[1].done():
+            return False
+        self._push(priority, key, entry[1])
+        return True
+
+    def _pending_waiters(self) -> bool:
+        return any(not fut.done() for _, _, _, fut in self._heap)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int, key=None):
+        await self.acquire(priority, key)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        # A promoted waiter has several heap entries; count it once, at its best priority.
+        best: dict[int, int] = {}
+        for priority, _, _, fut in self._heap:
+            if not fut.done():
+                best[id(fut)] = min(priority, best.get(id(fut), priority))
+        waiting: dict[str, int] = {}
+        for priority in best.values():
+            name = _PRIORITY_NAMES.get(priority, str(priority))
+            waiting[name] = waiting.get(name, 0) + 1
+        return {'free_slots': self._free, 'waiting': waiting}
+
+
+_render_gate = _RenderGate(RENDER_CONCURRENCY)
 
 
 async def init_browser():
@@ -260,6 +375,7 @@ async def shutdown_browser():
     global _browser
     if _browser is None:
         return
+    await _drain_page_pools()
     try:
         playwright = getattr(_browser, '_playwright_handle', None)
         await _browser.close()
@@ -290,7 +406,7 @@ def _cache_lookup(poster_type: str, cache_key: str) -> Optional[dict]:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT id, poster_type, cache_key, template_version,
-                   generated_at, data_hash, file_path, render_ms
+                   generated_at, data_hash, file_path, render_ms, verified_at
             FROM poster_cache
             WHERE poster_type = ? AND cache_key = ?
             LIMIT 1
@@ -335,7 +451,8 @@ def _cache_write(poster_type: str, cache_key: str, template_version: int,
                 data_hash = excluded.data_hash,
                 file_path = excluded.file_path,
                 render_ms = excluded.render_ms,
-                system_count_at_render = excluded.system_count_at_render
+                system_count_at_render = excluded.system_count_at_render,
+                verified_at = NULL
         ''', (
             poster_type, cache_key, template_version,
             datetime.now(timezone.utc).isoformat(),
@@ -344,6 +461,26 @@ def _cache_write(poster_type: str, cache_key: str, template_version: int,
         conn.commit()
 
 
+def _cache_touch(poster_type: str, cache_key: str) -> None:
+    """Restart the TTL of a cache row whose data hash still matches."""
+    with get_db_connection() as conn:
+        conn.execute(
+            'UPDATE poster_cache SET verified_at = ? WHERE poster_type = ? AND cache_key = ?',
+            (datetime.now(timezone.utc).isoformat(), poster_type, cache_key),
+        )
+        conn.commit()
+
+
+def _parse_cache_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
 def _cache_delete(poster_type: str, cache_key: str) -> Optional[str]:
     """DELETE a cache row, return the file_path that was removed (or None)."""
     with get_db_connection() as conn:
@@ -480,7 +617,8 @@ def is_cache_fresh(poster_type: str, cache_key: str, row: dict) -> bool:
     Fresh if:
       - template_version matches current registry version (auto-invalidates on bump)
       - file exists on disk
-      - generated_at is within the template's TTL
+      - generated_at (or verified_at, if a data-hash check kept the PNG) is
+        within the template's TTL
     """
     template = REGISTRY.get(poster_type)
     if template is None:
@@ -490,16 +628,24 @@ def is_cache_fresh(poster_type: str, cache_key: str, row: dict) -> bool:
     file_path = row.get('file_path')
     if not file_path or not Path(file_path).exists():
         return False
-    try:
-        generated_at = datetime.fromisoformat(row['generated_at'].replace('Z', '+00:00'))
-        if generated_at.tzinfo is None:
-            generated_at = generated_at.replace(tzinfo=timezone.utc)
-        age = datetime.now(timezone.utc) - generated_at
-        if age > timedelta(hours=template.ttl_hours):
-            return False
-    except (ValueError, KeyError, TypeError):
+    stamps = [t for t in (_parse_cache_time(row.get('generated_at')),
+                          _parse_cache_time(row.get('verified_at'))) if t]
+    if not stamps:
         return False
-    return True
+    age = datetime.now(timezone.utc) - max(stamps)
+    return age <= timedelta(hours=template.ttl_hours)
+
+
+def _is_servable_stale(template: PosterTemplate, row: dict) -> bool:
+    """True if an expired row can still be served while a refresh runs.
+
+    Only TTL expiry qualifies — a template version bump changes the layout,
+    so the old PNG is never served in place of the new version.
+    """
+    if row.get('template_version') != template.version:
+        return False
+    file_path = row.get('file_path')
+    return bool(file_path) and Path(file_path).exists()
 
 
 # ============================================================================
@@ -522,8 +668,131 @@ def _build_output_path(template: PosterTemplate, cache_key: str) -> Path:
     return get_posters_dir() / template.type / f'{safe_key}_v{template.version}.png'
 
 
-async def _render(template: PosterTemplate, cache_key: str, output_path: Path) -> int:
-    """Open the SPA route in headless browser, wait for ready flag, screenshot.
+@dataclass
+class _PooledPage:
+    """One warm browser context + page, bound to a single viewport."""
+    context: object
+    page: object
+    renders: int = 0
+
+
+# (width, height) -> idle warm pages. Only touched between awaits, so the
+# event loop serialises access without a lock.
+_page_pools: dict[tuple[int, int], list[_PooledPage]] = {}
+_page_counters = {'created': 0, 'recycled': 0, 'discarded': 0,
+                  'page_loads': 0, 'client_navigations': 0}
+
+# phase -> [count, total_ms, max_ms]
+RENDER_PHASES = ('queue_wait', 'navigation', 'data_ready', 'screenshot')
+_phase_stats: dict[str, list] = {phase: [0, 0, 0] for phase in RENDER_PHASES}
+
+# Client-side route change on a warm page. PosterRoute.jsx installs
+# window.__posterNavigate (clears __POSTER_READY, then react-router navigate).
+# Returns false on a page where the hook is missing so we fall back to goto().
+_CLIENT_NAVIGATE_JS = """(path) => {
+    if (typeof window.__posterNavigate !== 'function') return false
+    window.__posterNavigate(path)
+    return true
+}"""
+
+
+def _record_phase(phase: str, started: float) -> float:
+    """Add the time since `started` to `phase`; return now for chaining."""
+    now = time.monotonic()
+    ms = int((now - started) * 1000)
+    entry = _phase_stats[phase]
+    entry[0] += 1
+    entry[1] += ms
+    entry[2] = max(entry[2], ms)
+    return now
+
+
+def render_phase_stats() -> dict:
+    """Per-phase render timings for the admin queue UI."""
+    return {
+        phase: {
+            'count': count,
+            'avg_ms': int(total / count) if count else None,
+            'max_ms': peak,
+        }
+        for phase, (count, total, peak) in _phase_stats.items()
+    }
+
+
+def page_pool_stats() -> dict:
+    return {
+        'idle': {f'{w}x{h}': len(pages) for (w, h), pages in _page_pools.items()},
+        'max_per_viewport': PAGE_POOL_PER_VIEWPORT,
+        'max_renders_per_page': PAGE_MAX_RENDERS,
+        **_page_counters,
+    }
+
+
+async def _close_pooled(pooled: _PooledPage) -> None:
+    try:
+        await pooled.context.close()
+    except Exception as e:
+        logger.debug(f'Poster page pool: close failed (ignored): {e}')
+
+
+async def _checkout_page(template: PosterTemplate) -> _PooledPage:
+    """Take a warm page for the template's viewport, or open a new one."""
+    pool = _page_pools.get((template.width, template.height), [])
+    while pool:
+        pooled = pool.pop()
+        if not pooled.page.is_closed():
+            return pooled
+        _page_counters['discarded'] += 1
+    context = await _browser.new_context(
+        viewport={'width': template.width, 'height': template.height},
+        device_scale_factor=2,  # Render at 2x for crisp images
+    )
+    try:
+        page = await context.new_page()
+    except Exception:
+        await context.close()
+        raise
+    _page_counters['created'] += 1
+    return _PooledPage(context=context, page=page)
+
+
+async def _checkin_page(template: PosterTemplate, pooled: _PooledPage, ok: bool) -> None:
+    """Return a page to its pool, or close it if it failed, is worn out, or
+    the pool is full."""
+    pooled.renders += 1
+    if not ok:
+        _page_counters['discarded'] += 1
+        await _close_pooled(pooled)
+        return
+    if pooled.renders >= PAGE_MAX_RENDERS:
+        _page_counters['recycled'] += 1
+        await _close_pooled(pooled)
+        return
+    pool = _page_pools.setdefault((template.width, template.height), [])
+    if len(pool) >= PAGE_POOL_PER_VIEWPORT or not is_browser_ready():
+        await _close_pooled(pooled)
+        return
+    pool.append(pooled)
+
+
+async def _drain_page_pools() -> None:
+    pools = list(_page_pools.values())
+    _page_pools.clear()
+    for pool in pools:
+        for pooled in pool:
+            await _close_pooled(pooled)
+
+
+async def _render(template: PosterTemplate, cache_key: str, output_path: Path,
+                  priority: int = PRIORITY_INTERACTIVE) -> int:
+    """Route a warm page to the poster, wait for the ready flag, screenshot.
+
+    Waits for a render slot at `priority` (raised if an interactive request
+    joins the flight while queued). A page fresh out of the pool does a full
+    load of the SPA route; a reused one changes route client-side. Any failure
+    discards the page rather than returning it to the pool. The PNG is written
+    beside `output_path` and moved into place, so a stale copy being served is
+    never half-written.
 
     Returns render duration in milliseconds. Raises on timeout or error.
     """
@@ -531,45 +800,50 @@ async def _render(template: PosterTemplate, cache_key: str, output_path: Path) -
         await init_browser()
 
     url = _build_render_url(template, cache_key)
+    spa_path = template.spa_route.format(key=cache_key)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     logger.info(f'Rendering {template.type}/{cache_key} from {url}')
 
-    async with _render_semaphore:
-        # `start` lives INSIDE the semaphore so render_ms reflects only the
-        # actual Chromium work, not the time spent waiting in the queue.
-        # Parker (2026-05-13): before this fix, pre-warm dispatching 300
-        # tasks via asyncio.gather inflated render_ms to 60-90s — the
-        # actual render was sub-2s; the rest was queue wait. Logging the
-        # wait time too gives us a real diagnostic if the queue is hot.
-        wait_start = time.monotonic()  # set after we own the slot
-        start = wait_start
-        context = await _browser.new_context(
-            viewport={'width': template.width, 'height': template.height},
-            device_scale_factor=2,  # Render at 2x for crisp images
-        )
+    gate_key = (template.type, cache_key)
+    priority = min(priority, _flight_priority.get(gate_key, priority))
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    queued = time.monotonic()
+    async with _render_gate.slot(priority, gate_key):
+        # render_ms starts once we own the slot so it reflects only Chromium
+        # work. Parker (2026-05-13): pre-warm queue wait used to inflate it
+        # to 60-90s; queue wait is now its own phase in cache_stats().
+        start = _record_phase('queue_wait', queued)
+        pooled = await _checkout_page(template)
+        page = pooled.page
+        ok = False
         try:
-            page = await context.new_page()
-            try:
-                # Navigate and wait for the poster's ready flag
+            navigated = pooled.renders > 0 and await page.evaluate(_CLIENT_NAVIGATE_JS, spa_path)
+            if navigated:
+                _page_counters['client_navigations'] += 1
+            else:
                 await page.goto(url, wait_until='domcontentloaded', timeout=RENDER_TIMEOUT_S * 1000)
-                # Wait for the JS flag the React component sets after data + render
-                await page.wait_for_function(
-                    'window.__POSTER_READY === true',
-                    timeout=POSTER_READY_TIMEOUT_MS,
-                )
-                # Brief settle so any final layout shifts (font swap, etc.) commit
-                await page.wait_for_timeout(150)
-                await page.screenshot(
-                    path=str(output_path),
-                    full_page=False,
-                    omit_background=False,
-                    type='png',
-                    clip={'x': 0, 'y': 0, 'width': template.width, 'height': template.height},
-                )
-            finally:
-                await page.close()
+                _page_counters['page_loads'] += 1
+            phase = _record_phase('navigation', start)
+            # Wait for the JS flag the React component sets after data + render
+            await page.wait_for_function(
+                'window.__POSTER_READY === true',
+                timeout=POSTER_READY_TIMEOUT_MS,
+            )
+            # Brief settle so any final layout shifts (font swap, etc.) commit
+            await page.wait_for_timeout(150)
+            phase = _record_phase('data_ready', phase)
+            await page.screenshot(
+                path=str(tmp_path),
+                full_page=False,
+                omit_background=False,
+                type='png',
+                clip={'x': 0, 'y': 0, 'width': template.width, 'height': template.height},
+            )
+            _record_phase('screenshot', phase)
+            ok = True
         finally:
-            await context.close()
+            await _checkin_page(template, pooled, ok)
+    os.replace(tmp_path, output_path)
 
     duration_ms = int((time.monotonic() - start) * 1000)
     logger.info(f'Rendered {template.type}/{cache_key} in {duration_ms}ms')
@@ -580,45 +854,198 @@ async def _render(template: PosterTemplate, cache_key: str, output_path: Path) -
 # Data hash (skip-render optimization)
 # ============================================================================
 
+def _tag_colors_signature(cursor) -> list:
+    """Every tag-coloured poster fetches /api/discord_tag_colors."""
+    cursor.execute('''
+        SELECT c.tag, c.display_name, COALESCE(c.region_color, pa.region_color)
+        FROM civilizations c
+        LEFT JOIN partner_accounts pa
+            ON pa.discord_tag = c.tag AND pa.is_active = 1
+        WHERE c.is_active = 1
+        ORDER BY c.tag
+    ''')
+    return [tuple(r) for r in cursor.fetchall()]
+
+
+def _voyager_signature(cursor, cache_key: str) -> list:
+    # Same contributor key /api/public/voyager-fingerprint resolves the slug with.
+    from services.auth_service import contributor_key
+    key = contributor_key(cache_key)
+    cursor.execute('''
+        SELECT COUNT(*), MAX(submission_date), MAX(id)
+        FROM pending_systems
+        WHERE username_normalized = ? AND status = 'approved'
+    ''', (key,))
+    submissions = tuple(cursor.fetchone())
+    cursor.execute('''
+        SELECT COUNT(*), MAX(COALESCE(last_updated_at, created_at))
+        FROM systems WHERE username_normalized = ?
+    ''', (key,))
+    return [submissions, tuple(cursor.fetchone()), _tag_colors_signature(cursor)]
+
+
+def _atlas_signature(cursor, cache_key: str) -> list:
+    cursor.execute('''
+        SELECT COUNT(*), MAX(id), MAX(COALESCE(last_updated_at, created_at))
+        FROM systems WHERE galaxy = ?
+    ''', (cache_key,))
+    systems = tuple(cursor.fetchone())
+    cursor.execute('''
+        SELECT COUNT(*), MAX(updated_at) FROM regions
+        WHERE COALESCE(galaxy, 'Euclid') = ?
+    ''', (cache_key,))
+    return [systems, tuple(cursor.fetchone()), _tag_colors_signature(cursor)]
+
+
+def _region_signature(cursor, cache_key: str) -> Optional[list]:
+    # RegionThumb renders with its default scope (Euclid / Normal); the key is rx_ry_rz.
+    try:
+        rx, ry, rz = (int(p) for p in cache_key.split('_'))
+    except ValueError:
+        return None
+    coords = (rx, ry, rz)
+    if region_stats_ready(cursor):
+        cursor.execute('''
+            SELECT discord_tag, system_count, first_system_id FROM region_stats
+            WHERE reality = 'Normal' AND galaxy = 'Euclid'
+              AND region_x = ? AND region_y = ? AND region_z = ?
+            ORDER BY discord_tag
+        ''', coords)
+        stats = [tuple(r) for r in cursor.fetchall()]
+    else:
+        stats = []
+    cursor.execute('''
+        SELECT COUNT(*), MAX(id), MAX(COALESCE(last_updated_at, created_at))
+        FROM systems WHERE region_x = ? AND region_y = ? AND region_z = ?
+    ''', coords)
+    systems = tuple(cursor.fetchone())
+    cursor.execute('''
+        SELECT custom_name, updated_at FROM regions
+        WHERE region_x = ? AND region_y = ? AND region_z = ?
+        ORDER BY id
+    ''', coords)
+    names = [tuple(r) for r in cursor.fetchall()]
+    return [stats, systems, names, _tag_colors_signature(cursor)]
+
+
+def _system_signature(cursor, cache_key: str) -> list:
+    cursor.execute('''
+        SELECT name, discord_tag, is_complete, is_fully_charted,
+               created_at, last_updated_at
+        FROM systems WHERE id = ?
+    ''', (cache_key,))
+    row = cursor.fetchone()
+    cursor.execute('''
+        SELECT COUNT(DISTINCT p.id), COUNT(m.id)
+        FROM planets p LEFT JOIN moons m ON m.planet_id = p.id
+        WHERE p.system_id = ?
+    ''', (cache_key,))
+    return [tuple(row) if row else None, tuple(cursor.fetchone()), _tag_colors_signature(cursor)]
+
+
+def _community_signature(cursor, cache_key: str) -> list:
+    cursor.execute('''
+        SELECT COUNT(*), MAX(id), MAX(COALESCE(last_updated_at, created_at))
+        FROM systems WHERE discord_tag = ?
+    ''', (cache_key,))
+    systems = tuple(cursor.fetchone())
+    cursor.execute('''
+        SELECT COUNT(*), MAX(id) FROM pending_systems
+        WHERE discord_tag = ? AND status = 'approved'
+    ''', (cache_key,))
+    return [systems, tuple(cursor.fetchone()), _tag_colors_signature(cursor)]
+
+
+def _site_signature(cursor, cache_key: str) -> list:
+    # The public /api/db_stats counters these cards print.
+    counts = []
+    for table in ('systems', 'planets', 'moons', 'regions', 'planet_pois', 'discoveries'):
+        cursor.execute(f'SELECT COUNT(*), MAX(id) FROM {table}')
+        counts.append(tuple(cursor.fetchone()))
+    return counts
+
+
+# poster_type -> signature(cursor, cache_key). Each is a handful of indexed
+# lookups; the result only has to change whenever the poster would.
+_DATA_SIGNATURES: dict[str, Callable] = {
+    'voyager': _voyager_signature,
+    'voyager_og': _voyager_signature,
+    'atlas': _atlas_signature,
+    'atlas_thumb': _atlas_signature,
+    'region_thumb': _region_signature,
+    'system_thumb': _system_signature,
+    'og_system': _system_signature,
+    'og_community': _community_signature,
+    'og_site': _site_signature,
+    'landing_og': _site_signature,
+}
+
+
 def compute_data_hash(poster_type: str, cache_key: str) -> Optional[str]:
     """Hash of the underlying data so we can skip re-renders that wouldn't differ.
 
-    Returns None if no cheap hash source is known for this poster type — in
-    that case we always re-render when TTL elapses. Intended to be extended as
-    we add cheap data signatures (e.g., max(submission_date) for voyager).
+    Returns None if no cheap hash source is known for this poster type (or
+    the signature query fails) — in that case we always re-render when the
+    TTL elapses.
     """
-    # Future optimization: compute hashes per poster type from inexpensive
-    # SQL queries. For now we rely on TTL + event-driven invalidation.
-    return None
+    signature_fn = _DATA_SIGNATURES.get(poster_type)
+    if signature_fn is None:
+        return None
+    try:
+        with get_db_connection() as conn:
+            signature = signature_fn(conn.cursor(), cache_key)
+    except Exception as e:
+        logger.warning(f'Poster data hash failed for {poster_type}/{cache_key}: {e}')
+        return None
+    if signature is None:
+        return None
+    payload = json.dumps([poster_type, cache_key, signature], default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _hash_unchanged(template: PosterTemplate, row: Optional[dict], data_hash: Optional[str]) -> bool:
+    """True if an expired row can be kept: same data, same template, PNG on
+    disk, and rendered within DATA_HASH_MAX_AGE_DAYS."""
+    if not data_hash or not row or row.get('data_hash') != data_hash:
+        return False
+    if not _is_servable_stale(template, row):
+        return False
+    generated_at = _parse_cache_time(row.get('generated_at'))
+    return (generated_at is not None
+            and datetime.now(timezone.utc) - generated_at <= timedelta(days=DATA_HASH_MAX_AGE_DAYS))
 
 
 # ============================================================================
 # Public entry point
 # ============================================================================
 
-async def get_or_render(poster_type: str, cache_key: str) -> Optional[Path]:
-    """Return the file path to a cached or freshly-rendered poster PNG.
+# Per-key single-flight: (poster_type, cache_key) -> the one running render.
+# Every concurrent request for the same poster awaits the same task.
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+# Most urgent priority any caller has asked for, per in-flight key.
+_flight_priority: dict[tuple[str, str], int] = {}
+_render_counters = {'coalesced': 0, 'stale_served': 0, 'hash_skipped': 0}
 
-    Returns None if the poster type is unknown.
 
-    Cache lookup → return file path if fresh.
-    Else render → write cache → return file path.
+async def _render_and_store(template: PosterTemplate, cache_key: str,
+                            row: Optional[dict], priority: int) -> Path:
+    """Render one poster and UPSERT its cache row. Body of a single-flight task.
 
-    Caller (the route) handles 404, opt-in checks, headers.
+    The data hash is taken before rendering: if it matches the expired row's,
+    the PNG is kept and its TTL restarted. Hashing first also means a change
+    landing mid-render is caught by the next check rather than masked.
     """
-    template = REGISTRY.get(poster_type)
-    if template is None:
-        return None
-
-    # Check cache first
-    row = _cache_lookup(poster_type, cache_key)
-    if row and is_cache_fresh(poster_type, cache_key, row):
+    poster_type = template.type
+    data_hash = compute_data_hash(poster_type, cache_key)
+    if _hash_unchanged(template, row, data_hash):
+        _cache_touch(poster_type, cache_key)
+        _render_counters['hash_skipped'] += 1
+        logger.info(f'Poster {poster_type}/{cache_key}: data unchanged, kept cached render')
         return Path(row['file_path'])
 
-    # Render fresh
     output_path = _build_output_path(template, cache_key)
     try:
-        render_ms = await _render(template, cache_key, output_path)
+        render_ms = await _render(template, cache_key, output_path, priority)
     except Exception as e:
         logger.exception(f'Render failed for {poster_type}/{cache_key}: {e}')
         # On failure: if a stale-but-existent cache row points at a real file,
@@ -628,18 +1055,79 @@ async def get_or_render(poster_type: str, cache_key: str) -> Optional[Path]:
             return Path(row['file_path'])
         raise
 
-    data_hash = compute_data_hash(poster_type, cache_key) or ''
     _cache_write(
         poster_type=poster_type,
         cache_key=cache_key,
         template_version=template.version,
-        data_hash=data_hash,
+        data_hash=data_hash or '',
         file_path=str(output_path),
         render_ms=render_ms,
     )
     return output_path
 
 
+def _finish_flight(key: tuple[str, str], task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+        _flight_priority.pop(key, None)
+    if not task.cancelled():
+        # Mark the exception retrieved — background refreshes have no awaiter,
+        # and _render_and_store has already logged it.
+        task.exception()
+
+
+def _start_flight(template: PosterTemplate, cache_key: str,
+                  row: Optional[dict], priority: int) -> asyncio.Task:
+    """Return the running render task for (type, key), starting one if needed."""
+    key = (template.type, cache_key)
+    task = _inflight.get(key)
+    if task is not None:
+        _render_counters['coalesced'] += 1
+        if priority < _flight_priority.get(key, priority + 1):
+            _flight_priority[key] = priority
+            _render_gate.promote(key, priority)
+        return task
+    task = asyncio.create_task(_render_and_store(template, cache_key, row, priority))
+    _inflight[key] = task
+    _flight_priority[key] = priority
+    task.add_done_callback(lambda t: _finish_flight(key, t))
+    return task
+
+
+async def get_or_render(poster_type: str, cache_key: str,
+                        priority: int = PRIORITY_INTERACTIVE,
+                        stale_ok: bool = True) -> Optional[Path]:
+    """Return the file path to a cached or freshly-rendered poster PNG.
+
+    Returns None if the poster type is unknown.
+
+    Cache lookup → return file path if fresh.
+    Expired but same template version → return the old file now and refresh
+    in the background (unless stale_ok=False, e.g. pre-warm).
+    Else render → write cache → return file path. Concurrent callers for the
+    same (type, key) share one render.
+
+    Caller (the route) handles 404, opt-in checks, headers.
+    """
+    template = REGISTRY.get(poster_type)
+    if template is None:
+        return None
+
+    # Check cache first
+    row = _cache_lookup(poster_type, cache_key)
+    if row and is_cache_fresh(poster_type, cache_key, row):
+        return Path(row['file_path'])
+
+    if stale_ok and row and _is_servable_stale(template, row):
+        _render_counters['stale_served'] += 1
+        _start_flight(template, cache_key, row, PRIORITY_REFRESH)
+        return Path(row['file_path'])
+
+    # shield() so a disconnecting client doesn't cancel the render other
+    # callers (or the next request) are waiting on.
+    return await asyncio.shield(_start_flight(template, cache_key, row, priority))
+
+
 def force_refresh(poster_type: str, cache_key: str) -> bool:
     """Drop cache for (type, key) so the next request renders fresh.
 
@@ -667,6 +1155,13 @@ def cache_stats() -> dict:
         'browser_ready': is_browser_ready(),
         'render_concurrency': RENDER_CONCURRENCY,
         'render_timeout_s': RENDER_TIMEOUT_S,
+        'render_queue': _render_gate.stats(),
+        'render_phases': render_phase_stats(),
+        'page_pool': page_pool_stats(),
+        'renders_in_flight': len(_inflight),
+        'coalesced_requests': _render_counters['coalesced'],
+        'stale_served': _render_counters['stale_served'],
+        'hash_skipped': _render_counters['hash_skipped'],
         'total_cached': total,
         'per_type': per_type,
         'registry': list_templates(),
@@ -726,34 +1221,39 @@ def _prewarm_targets() -> list[tuple[str, str]]:
 
             # L3 — top regions in Euclid+Normal. Mirrors /api/regions/grouped
             # ORDER BY: Sea of Gidzenuf pin first, then named, then unnamed,
-            # ties broken by system_count DESC.
-            cursor.execute('''
-                SELECT s.region_x, s.region_y, s.region_z,
-                       r.custom_name,
-                       COUNT(DISTINCT s.id) as system_count,
-                       MIN(s.created_at) as first_system_date,
-                       MIN(s.id) as first_system_id
-                FROM systems s
-                LEFT JOIN regions r ON s.region_x = r.region_x
-                    AND s.region_y = r.region_y AND s.region_z = r.region_z
-                WHERE s.region_x IS NOT NULL
-                  AND s.region_y IS NOT NULL
-                  AND s.region_z IS NOT NULL
-                  AND COALESCE(s.reality, 'Normal') = 'Normal'
-                  AND COALESCE(s.galaxy, 'Euclid') = 'Euclid'
-                GROUP BY s.region_x, s.region_y, s.region_z
-                ORDER BY
-                    CASE
-                        WHEN r.custom_name = 'Sea of Gidzenuf' THEN 0
-                        WHEN r.custom_name IS NOT NULL THEN 1
-                        ELSE 2
-                    END ASC,
-                    system_count DESC,
-                    first_system_date ASC,
-                    first_system_id ASC
-                LIMIT ?
-            ''', (PREWARM_REGIONS_LIMIT,))
-            region_rows = cursor.fetchall()
+            # ties broken by system_count DESC. Paged from region_stats when
+            # migration 1.106.0 has run.
+            if region_stats_ready(cursor):
+                clauses, params = region_stats_scope(reality='Normal', galaxy='Euclid', hide_archived=False)
+                _, region_rows = region_page(cursor, clauses, params, PREWARM_REGIONS_LIMIT)
+            else:
+                cursor.execute('''
+                    SELECT s.region_x, s.region_y, s.region_z,
+                           r.custom_name,
+                           COUNT(DISTINCT s.id) as system_count,
+                           MIN(s.created_at) as first_system_date,
+                           MIN(s.id) as first_system_id
+                    FROM systems s
+                    LEFT JOIN regions r ON s.region_x = r.region_x
+                        AND s.region_y = r.region_y AND s.region_z = r.region_z
+                    WHERE s.region_x IS NOT NULL
+                      AND s.region_y IS NOT NULL
+                      AND s.region_z IS NOT NULL
+                      AND COALESCE(s.reality, 'Normal') = 'Normal'
+                      AND COALESCE(s.galaxy, 'Euclid') = 'Euclid'
+                    GROUP BY s.region_x, s.region_y, s.region_z
+                    ORDER BY
+                        CASE
+                            WHEN r.custom_name = 'Sea of Gidzenuf' THEN 0
+                            WHEN r.custom_name IS NOT NULL THEN 1
+                            ELSE 2
+                        END ASC,
+                        system_count DESC,
+                        first_system_date ASC,
+                        first_system_id ASC
+                    LIMIT ?
+                ''', (PREWARM_REGIONS_LIMIT,))
+                region_rows = cursor.fetchall()
             for row in region_rows:
                 key = f"{row['region_x']}_{row['region_y']}_{row['region_z']}"
                 targets.append(('region_thumb', key))
@@ -790,7 +1290,7 @@ async def _prewarm_one(poster_type: str, cache_key: str) -> tuple[str, bool, Opt
         row = _cache_lookup(poster_type, cache_key)
         if row and is_cache_fresh(poster_type, cache_key, row):
             return label, True, None
-        await get_or_render(poster_type, cache_key)
+        await get_or_render(poster_type, cache_key, priority=PRIORITY_PREWARM, stale_ok=False)
         return label, False, None
     except Exception as e:
         return label, False, str(e)
@@ -810,9 +1310,9 @@ async def prewarm_default_posters() -> None:
 
     Instead, we run PREWARM_WORKERS (= max(1, RENDER_CONCURRENCY-1)) workers
     that pull from an asyncio.Queue. That bounds in-flight prewarm work
-    *and* leaves at least one semaphore slot free for live user requests —
-    when someone navigates while pre-warm is still running, their poster
-    request can always grab a slot instead of waiting behind the prewarm.
+    *and* leaves at least one render slot free for live user requests. Pre-warm
+    renders queue at PRIORITY_PREWARM, so when the slots are full a visitor's
+    request still takes the next free one ahead of any queued pre-warm target.
     """
     if not is_browser_ready():
         logger.warning('Poster pre-warm: browser not ready, skipping')
@@ -0,0 +1,339 @@
+"""
+Per-region summary rows behind /api/regions/grouped paging.
+
+The regions list used to aggregate every populated region of the scope with
+`GROUP BY region_x, region_y, region_z` over systems and slice the page out
+in Python, so page 1 of 24 regions paid for the whole galaxy. Migration
+1.106.0 adds `region_stats`, one row per
+
+    (reality, galaxy, region_x, region_y, region_z, discord_tag)
+
+holding system_count / first_system_date / first_system_id, kept current by
+triggers on systems (insert, delete, and updates of the key columns or
+created_at). Partitioning by discord_tag lets the community filter and the
+archived-civ filter run against summary rows; summing partitions gives the
+region totals the list sorts on.
+
+The regions list is ordered by
+
+    pin_rank           0 = pinned region, 1 = named, 2 = unnamed
+    system_count DESC
+    first_system_date  NULLs first
+    first_system_id
+
+and region_page() seeks that order with a keyset cursor (`after`), or an
+OFFSET for the classic page numbers.
+
+Migration 1.107.0 widens the summary for the other region readers (map
+regions, region cards, poster pre-warm, war-room territory):
+
+  region_stats         + grade_s_count / grade_splus_count, min_x/y/z
+  region_contributors  one row per distinct contributor of a partition,
+                       'p:<profile_id>' or 'u:<username_normalized>'
+
+Unique contributors over several partitions are COUNT(DISTINCT contributor).
+rebuild_region_stats() recomputes both tables from systems; run it after
+writes made with triggers bypassed:
+
+    python Haven-UI/backend/rebuild_region_stats.py
+"""
+
+import base64
+import json
+import logging
+import time
+
+from db import archived_civ_filter
+
+logger = logging.getLogger('control.room')
+
+REGION_STATS_TABLE = 'region_stats'
+REGION_CONTRIBUTORS_TABLE = 'region_contributors'
+
+_KEY_COLS = 'reality, galaxy, region_x, region_y, region_z, discord_tag'
+_KEY_SQL = ("COALESCE(s.reality, 'Normal'), COALESCE(s.galaxy, 'Euclid'), "
+            "s.region_x, s.region_y, s.region_z, COALESCE(s.discord_tag, '')")
+_HAS_REGION_SQL = "s.region_x IS NOT NULL AND s.region_y IS NOT NULL AND s.region_z IS NOT NULL"
+
+# Contributor identity written by the 1.107.0 triggers: one per system row,
+# profile_id first, then the 1.102.0 contributor key. system_contributor() /
+# coauthor_contributor() are the Python twins used when the regions list has
+# to aggregate systems itself.
+_SYSTEM_CONTRIBUTOR_SQL = ("CASE WHEN s.profile_id IS NOT NULL THEN 'p:' || s.profile_id "
+                           "WHEN COALESCE(s.username_normalized, 'unknown') NOT IN ('', 'unknown') "
+                           "THEN 'u:' || s.username_normalized END")
+_COAUTHOR_CONTRIBUTOR_SQL = ("CASE WHEN ca.profile_id IS NOT NULL THEN 'p:' || ca.profile_id "
+                             "WHEN COALESCE(ca.username_normalized, '') != '' "
+                             "THEN 'u:' || ca.username_normalized END")
+
+# Always sorted first in the regions list.
+PINNED_REGION_NAME = 'Sea of Gidzenuf'
+
+
+def system_contributor(system: dict):
+    """Contributor identity of one systems row (see _SYSTEM_CONTRIBUTOR_SQL),
+    or None when the row has none."""
+    if system.get('profile_id') is not None:
+        return f"p:{system['profile_id']}"
+    if (system.get('username_normalized') or 'unknown') not in ('', 'unknown'):
+        return f"u:{system['username_normalized']}"
+    return None
+
+
+def coauthor_contributor(coauthor):
+    """Contributor identity of one system_coauthors row (see
+    _COAUTHOR_CONTRIBUTOR_SQL), or None when the row has none."""
+    if coauthor['profile_id'] is not None:
+        return f"p:{coauthor['profile_id']}"
+    if coauthor['username_normalized']:
+        return f"u:{coauthor['username_normalized']}"
+    return None
+
+
+def region_stats_ready(cursor) -> bool:
+    """True once migration 1.106.0 has created region_stats."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (REGION_STATS_TABLE,))
+    return cursor.fetchone() is not None
+
+
+def region_summary_ready(cursor) -> bool:
+    """True once migration 1.107.0 has added the grade / coord columns and
+    region_contributors."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (REGION_CONTRIBUTORS_TABLE,))
+    return cursor.fetchone() is not None
+
+
+def region_sort_key(row) -> list:
+    """The list's sort key for one region row (custom_name, system_count,
+    first_system_date, first_system_id), in ascending-comparable form."""
+    name = row['custom_name']
+    pin_rank = 0 if name == PINNED_REGION_NAME else (1 if name is not None else 2)
+    return [pin_rank, -row['system_count'], row['first_system_date'] or '', row['first_system_id']]
+
+
+def encode_region_cursor(row) -> str:
+    """Opaque `after` token resuming the list just past `row`."""
+    raw = json.dumps(region_sort_key(row), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_region_cursor(token: str) -> list:
+    """Inverse of encode_region_cursor. Raises ValueError on a bad token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        key = json.loads(raw)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {e}")
+    if not isinstance(key, list) or len(key) != 4:
+        raise ValueError("invalid cursor")
+    return key
+
+
+def region_stats_scope(discord_tag: str = None, reality: str = None, galaxy: str = None,
+                       hide_archived: bool = True):
+    """(clauses, params) against region_stats alias `rs`, mirroring the
+    endpoint's community / reality / galaxy / archived-civ filters."""
+    clauses = []
+    params = []
+    if discord_tag and discord_tag != 'all':
+        if discord_tag == 'untagged':
+            clauses.append("rs.discord_tag = ''")
+        else:
+            clauses.append("rs.discord_tag = ?")
+            params.append(discord_tag)
+    if reality:
+        clauses.append("rs.reality = ?")
+        params.append(reality)
+    if galaxy:
+        clauses.append("rs.galaxy = ?")
+        params.append(galaxy)
+    if hide_archived:
+        clauses.append(archived_civ_filter('rs'))
+    return clauses, params
+
+
+def region_page(cursor, clauses: list, params: list, limit: int, page: int = 1, after: list = None):
+    """(total_regions, rows) for one page of the regions list.
+
+    Rows carry region_x/y/z, custom_name, region_id, first_system_date,
+    first_system_id and system_count — the columns of the legacy aggregate.
+    `after` (a decoded cursor) takes precedence over `page`; limit <= 0
+    returns every region.
+    """
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    cte = f"""
+        WITH agg AS (
+            SELECT rs.region_x, rs.region_y, rs.region_z,
+                   SUM(rs.system_count) AS system_count,
+                   MIN(rs.first_system_date) AS first_system_date,
+                   MIN(rs.first_system_id) AS first_system_id
+            FROM region_stats rs
+            {where}
+            GROUP BY rs.region_x, rs.region_y, rs.region_z
+        ), keyed AS (
+            SELECT agg.*, r.custom_name, r.id AS region_id,
+                   CASE
+                       WHEN r.custom_name = ? THEN 0
+                       WHEN r.custom_name IS NOT NULL THEN 1
+                       ELSE 2
+                   END AS pin_rank,
+                   COALESCE(agg.first_system_date, '') AS date_key
+            FROM agg
+            LEFT JOIN regions r ON r.rowid = (
+                SELECT r2.rowid FROM regions r2
+                WHERE r2.region_x = agg.region_x AND r2.region_y = agg.region_y
+                  AND r2.region_z = agg.region_z
+                LIMIT 1)
+        )"""
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM region_stats rs {where}
+            GROUP BY rs.region_x, rs.region_y, rs.region_z)
+    """, params)
+    total = cursor.fetchone()[0]
+
+    page_params = list(params) + [PINNED_REGION_NAME]
+    seek = ""
+    if after is not None:
+        seek = "WHERE (pin_rank, -system_count, date_key, first_system_id) > (?, ?, ?, ?)"
+        page_params.extend(after)
+    window = ""
+    if limit > 0:
+        window = "LIMIT ? OFFSET ?"
+        page_params.extend([limit, 0 if after is not None else (max(1, page) - 1) * limit])
+    cursor.execute(f"""{cte}
+        SELECT region_x, region_y, region_z, custom_name, region_id,
+               first_system_date, first_system_id, system_count
+        FROM keyed
+        {seek}
+        ORDER BY pin_rank, system_count DESC, date_key, first_system_id
+        {window}
+    """, page_params)
+    return total, cursor.fetchall()
+
+
+def region_card_stats(cursor, clauses: list, params: list, coords: list) -> dict:
+    """{(rx, ry, rz): (grade_s_count, grade_splus_count, contributor_count)}
+    for the given regions, summed over the partitions matching `clauses`
+    (region_stats_scope() output, alias `rs`)."""
+    if not coords:
+        return {}
+    scope = "".join(f" AND {c}" for c in clauses)
+    in_coords = "(rs.region_x, rs.region_y, rs.region_z) IN (VALUES " + ", ".join(["(?, ?, ?)"] * len(coords)) + ")"
+    coord_params = [v for c in coords for v in c]
+    cursor.execute(f"""
+        SELECT rs.region_x, rs.region_y, rs.region_z,
+               SUM(rs.grade_s_count), SUM(rs.grade_splus_count)
+        FROM region_stats rs
+        WHERE {in_coords}{scope}
+        GROUP BY rs.region_x, rs.region_y, rs.region_z
+    """, coord_params + list(params))
+    grades = {(r[0], r[1], r[2]): (r[3], r[4]) for r in cursor.fetchall()}
+    cursor.execute(f"""
+        SELECT rs.region_x, rs.region_y, rs.region_z, COUNT(DISTINCT rs.contributor)
+        FROM region_contributors rs
+        WHERE {in_coords}{scope}
+        GROUP BY rs.region_x, rs.region_y, rs.region_z
+    """, coord_params + list(params))
+    contributors = {(r[0], r[1], r[2]): r[3] for r in cursor.fetchall()}
+    return {key: (s, splus, contributors.get(key, 0)) for key, (s, splus) in grades.items()}
+
+
+def map_region_rows(cursor, clauses: list, params: list) -> list:
+    """One row per populated region for /api/map/regions-aggregated, built
+    from the partitions matching `clauses` (region_stats_scope() output).
+
+    Columns match the legacy systems aggregate: region_x/y/z, region_name,
+    system_count, display_x/y/z (MIN of the system coords), and
+    comma-joined galaxies / realities / discord_tags. discord_tags is
+    ordered by system count, so its first entry is the dominant tag.
+    """
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    cursor.execute(f"""
+        WITH scoped AS (
+            SELECT rs.* FROM region_stats rs {where}
+        ), named AS (
+            SELECT sc.region_x, sc.region_y, sc.region_z, MAX(r.custom_name) AS region_name
+            FROM (SELECT DISTINCT reality, galaxy, region_x, region_y, region_z FROM scoped) sc
+            JOIN regions r ON r.region_x = sc.region_x AND r.region_y = sc.region_y
+                AND r.region_z = sc.region_z
+                AND COALESCE(r.reality, 'Normal') = sc.reality
+                AND COALESCE(r.galaxy, 'Euclid') = sc.galaxy
+            GROUP BY sc.region_x, sc.region_y, sc.region_z
+        ), tags AS (
+            SELECT region_x, region_y, region_z, discord_tag, SUM(system_count) AS n
+            FROM scoped WHERE discord_tag != ''
+            GROUP BY region_x, region_y, region_z, discord_tag
+        )
+        SELECT sc.region_x, sc.region_y, sc.region_z,
+               MAX(n.region_name) AS region_name,
+               SUM(sc.system_count) AS system_count,
+               MIN(sc.min_x) AS display_x,
+               MIN(sc.min_y) AS display_y,
+               MIN(sc.min_z) AS display_z,
+               GROUP_CONCAT(DISTINCT sc.galaxy) AS galaxies,
+               GROUP_CONCAT(DISTINCT sc.reality) AS realities,
+               (SELECT GROUP_CONCAT(t.discord_tag) FROM (
+                    SELECT discord_tag FROM tags
+                    WHERE tags.region_x = sc.region_x AND tags.region_y = sc.region_y
+                      AND tags.region_z = sc.region_z
+                    ORDER BY n DESC, discord_tag) t) AS discord_tags
+        FROM scoped sc
+        LEFT JOIN named n ON n.region_x = sc.region_x AND n.region_y = sc.region_y
+            AND n.region_z = sc.region_z
+        GROUP BY sc.region_x, sc.region_y, sc.region_z
+        ORDER BY system_count DESC
+    """, params)
+    return cursor.fetchall()
+
+
+def rebuild_region_stats(conn) -> dict:
+    """Recompute region_stats and region_contributors from systems.
+
+    Runs as a single transaction on `conn`, so concurrent readers see either
+    the old or the new summary, never a half-built one.
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"DELETE FROM {REGION_STATS_TABLE}")
+        cursor.execute(f"""
+            INSERT INTO {REGION_STATS_TABLE}
+                ({_KEY_COLS}, system_count, first_system_date, first_system_id,
+                 grade_s_count, grade_splus_count, min_x, min_y, min_z)
+            SELECT {_KEY_SQL}, COUNT(*), MIN(s.created_at), MIN(s.id),
+                   -- Grade S is a score >= 85, S+ is S and fully charted
+                   -- (services/completeness.py).
+                   SUM(CASE WHEN s.is_complete >= 85 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN s.is_complete >= 85 AND s.is_fully_charted THEN 1 ELSE 0 END),
+                   MIN(s.x), MIN(s.y), MIN(s.z)
+            FROM systems s
+            WHERE {_HAS_REGION_SQL}
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """)
+        regions = cursor.rowcount
+
+        cursor.execute(f"DELETE FROM {REGION_CONTRIBUTORS_TABLE}")
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO {REGION_CONTRIBUTORS_TABLE} ({_KEY_COLS}, contributor)
+            SELECT {_KEY_SQL}, {_SYSTEM_CONTRIBUTOR_SQL} FROM systems s
+            WHERE {_HAS_REGION_SQL} AND {_SYSTEM_CONTRIBUTOR_SQL} IS NOT NULL
+            UNION
+            SELECT {_KEY_SQL}, {_COAUTHOR_CONTRIBUTOR_SQL}
+            FROM system_coauthors ca JOIN systems s ON s.id = ca.system_id
+            WHERE {_HAS_REGION_SQL} AND {_COAUTHOR_CONTRIBUTOR_SQL} IS NOT NULL
+        """)
+        contributors = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    result = {
+        'regions': regions,
+        'contributors': contributors,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Region stats rebuilt: {result}")
+    return result
@@ -160,12 +160,55 @@ def apply_field_restrictions(system: dict, hidden_fields: list) -> dict:
             result['planets'] = []
             result['planet_count_only'] = planet_count
         if field_group == 'base_location' and 'planets' in result:
-            for planet in result.get('planets', []):
-                if 'base_location' in planet:
-                    del planet['base_location']
+            # Copy the planet dicts too — callers may hand in cached rows
+            # shared with other viewers.
+            result['planets'] = [
+                {k: v for k, v in planet.items() if k != 'base_location'}
+                for planet in result.get('planets', [])
+            ]
     return result
 
 
+def _viewer_civ_tags(session_data: Optional[dict]) -> set:
+    """Civ tags whose restrictions the viewer bypasses: any civ the user is a
+    member of sees its own systems. Set keeps the per-row lookup O(1)."""
+    tags = set()
+    if session_data:
+        tags.update(session_data.get('civ_tags') or [])
+        # Back-compat for sessions still on the legacy single-tag model.
+        if session_data.get('user_type') == 'partner':
+            legacy = session_data.get('discord_tag')
+            if legacy:
+                tags.add(legacy)
+    return tags
+
+
+def has_hidden_systems(cursor, session_data: Optional[dict], reality: str = None, galaxy: str = None) -> bool:
+    """True when apply_data_restrictions would drop at least one system in the
+    reality / galaxy scope for this viewer (is_hidden_from_public on a system
+    outside the viewer's civs). Lets callers skip per-system visibility work
+    when nothing can be hidden."""
+    if session_data and session_data.get('user_type') == 'super_admin':
+        return False
+    clauses = ["dr.is_hidden_from_public = 1"]
+    params = []
+    if reality:
+        clauses.append("COALESCE(s.reality, 'Normal') = ?")
+        params.append(reality)
+    if galaxy:
+        clauses.append("COALESCE(s.galaxy, 'Euclid') = ?")
+        params.append(galaxy)
+    viewer_tags = sorted(_viewer_civ_tags(session_data))
+    if viewer_tags:
+        clauses.append(f"COALESCE(s.discord_tag, '') NOT IN ({','.join('?' * len(viewer_tags))})")
+        params.extend(viewer_tags)
+    cursor.execute(f'''
+        SELECT 1 FROM data_restrictions dr JOIN systems s ON s.id = dr.system_id
+        WHERE {' AND '.join(clauses)} LIMIT 1
+    ''', params)
+    return cursor.fetchone() is not None
+
+
 def apply_data_restrictions(systems: list, session_data: Optional[dict], for_map: bool = False) -> list:
     """Filter systems based on data restrictions and viewer permissions.
 
@@ -176,16 +219,7 @@ def apply_data_restrictions(systems: list, session_data: Optional[dict], for_map
     if session_data and session_data.get('user_type') == 'super_admin':
         return systems
 
-    # Any civ the user is a member of bypasses restrictions on its own
-    # systems. Set keeps the per-row lookup O(1).
-    viewer_civ_tags = set()
-    if session_data:
-        viewer_civ_tags.update(session_data.get('civ_tags') or [])
-        # Back-compat for sessions still on the legacy single-tag model.
-        if session_data.get('user_type') == 'partner':
-            legacy = session_data.get('discord_tag')
-            if legacy:
-                viewer_civ_tags.add(legacy)
+    viewer_civ_tags = _viewer_civ_tags(session_data)
 
     system_ids = [s.get('id') for s in systems if s.get('id')]
     restrictions_map = get_restrictions_batch(system_ids) if system_ids else {}
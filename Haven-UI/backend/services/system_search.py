@@ -0,0 +1,117 @@
+"""
+Full-text index behind /api/systems/search and the /api/search popover.
+
+Free-text system search used to OR nine `LIKE '%q%'` predicates (name, glyph,
+galaxy, region name, community tag, both contributor columns and an EXISTS on
+system_coauthors), a full scan of systems on every keystroke. Migration
+1.103.0 adds a trigram FTS5 index over the same columns:
+
+  systems_search  one row per system holding the searchable text, keyed by an
+                  explicit INTEGER PRIMARY KEY (systems.id may be a UUID, and
+                  implicit rowids can be renumbered by VACUUM)
+  systems_fts     FTS5 external-content index over systems_search
+
+Triggers on systems, regions and system_coauthors keep systems_search current,
+and the usual external-content triggers mirror it into systems_fts, so every
+write path is covered without calling into search code.
+
+The trigram tokenizer matches any substring of 3+ characters, case-folded,
+which is the same contract as the LIKE scan it replaces. Shorter queries (the
+endpoints allow 2) and databases whose SQLite lacks FTS5 fall back to the
+LIKE clause.
+
+    python Haven-UI/backend/rebuild_systems_search.py
+"""
+
+import logging
+import time
+
+logger = logging.getLogger('control.room')
+
+SEARCH_TABLE = 'systems_search'
+FTS_TABLE = 'systems_fts'
+
+# Indexed columns, in FTS column order, with their bm25 weights: a hit on the
+# system name outranks a glyph hit, which outranks region / community /
+# contributor hits.
+SEARCH_COLUMNS = (
+    ('name', 10.0),
+    ('glyph_code', 8.0),
+    ('galaxy', 1.0),
+    ('region_name', 4.0),
+    ('discord_tag', 3.0),
+    ('discovered_by', 3.0),
+    ('personal_discord_username', 3.0),
+    ('coauthors', 2.0),
+)
+
+# Trigram tokens are 3 characters; anything shorter can't use the index.
+MIN_FTS_QUERY = 3
+
+# Source expressions for one systems_search row, against systems alias `s`.
+# region_name uses the same region match as the endpoints' LEFT JOIN.
+SEARCH_ROW_SQL = """
+    s.id, s.name, s.glyph_code, s.galaxy,
+    (SELECT r.custom_name FROM regions r
+     WHERE r.region_x = s.region_x AND r.region_y = s.region_y AND r.region_z = s.region_z
+       AND COALESCE(r.reality, 'Normal') = COALESCE(s.reality, 'Normal')
+       AND COALESCE(r.galaxy, 'Euclid') = COALESCE(s.galaxy, 'Euclid')
+     LIMIT 1),
+    s.discord_tag, s.discovered_by, s.personal_discord_username,
+    (SELECT GROUP_CONCAT(ca.username || ' ' || ca.username_normalized, ' ')
+     FROM system_coauthors ca WHERE ca.system_id = s.id)"""
+
+
+def fts_ready(cursor) -> bool:
+    """True when migration 1.103.0 could create the FTS index."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,))
+    return cursor.fetchone() is not None
+
+
+def match_phrase(q: str) -> str:
+    """Quote a raw query as a single FTS5 phrase. With the trigram tokenizer a
+    phrase matches wherever the text occurs as a substring."""
+    return '"' + q.replace('"', '""') + '"'
+
+
+def fts_hits_join(cursor, q: str, alias: str = 's'):
+    """(join_sql, params) restricting `alias` (systems) to index hits, exposing
+    the bm25 score as `fts_hits.fts_rank` for ORDER BY. Returns None when the
+    index can't serve the query; callers keep their LIKE clause for that."""
+    if len(q) < MIN_FTS_QUERY or not fts_ready(cursor):
+        return None
+    join_sql = (
+        f"JOIN (SELECT ss.system_id, f.rank AS fts_rank "
+        f"      FROM {FTS_TABLE} f JOIN {SEARCH_TABLE} ss ON ss.id = f.rowid "
+        f"      WHERE {FTS_TABLE} MATCH ?) fts_hits "
+        f"  ON fts_hits.system_id = {alias}.id "
+    )
+    return join_sql, [match_phrase(q)]
+
+
+def rebuild_systems_search(conn) -> dict:
+    """Recompute systems_search from systems and rebuild the FTS index.
+
+    One transaction on `conn`; searches keep reading the old index until it
+    commits.
+    """
+    started = time.perf_counter()
+    cols = ', '.join(c for c, _ in SEARCH_COLUMNS)
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} (system_id, {cols}) SELECT {SEARCH_ROW_SQL} FROM systems s")
+        rows = cursor.rowcount
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    result = {
+        'systems': rows,
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Systems search index rebuilt: {result}")
+    return result
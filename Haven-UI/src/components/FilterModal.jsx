@@ -133,6 +133,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.stellar_classification || ''}
                 onChange={(v) => setSingle('stellar_classification', v)}
                 options={options.stellar_classifications || []}
+                counts={(options.counts || {}).stellar_classifications}
                 placeholder="Any stellar class"
               />
             </Section>
@@ -143,6 +144,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.economy_type || ''}
                 onChange={(v) => setSingle('economy_type', v)}
                 options={options.economy_types || []}
+                counts={(options.counts || {}).economy_types}
                 placeholder="Any economy"
               />
               <PillToggleGroup
@@ -166,6 +168,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.dominant_lifeform || ''}
                 onChange={(v) => setSingle('dominant_lifeform', v)}
                 options={options.dominant_lifeforms || []}
+                counts={(options.counts || {}).dominant_lifeforms}
                 placeholder="Any lifeform"
               />
             </Section>
@@ -200,6 +203,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.biome || ''}
                 onChange={(v) => setSingle('biome', v)}
                 options={options.biomes || []}
+                counts={(options.counts || {}).biomes}
                 placeholder="Any biome"
               />
               <SelectField
@@ -207,6 +211,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.weather || ''}
                 onChange={(v) => setSingle('weather', v)}
                 options={options.weather_types || []}
+                counts={(options.counts || {}).weather_types}
                 placeholder="Any weather"
               />
               <SelectField
@@ -214,6 +219,7 @@ export default function FilterModal({ open, onClose }) {
                 value={filters.sentinel_level || ''}
                 onChange={(v) => setSingle('sentinel_level', v)}
                 options={options.sentinel_levels || []}
+                counts={(options.counts || {}).sentinel_levels}
                 placeholder="Any sentinel level"
               />
             </Section>
@@ -236,6 +242,7 @@ export default function FilterModal({ open, onClose }) {
                 selected={filters.resource || []}
                 onToggle={(v) => toggleMulti('resource', v)}
                 options={options.resources || []}
+                counts={(options.counts || {}).resources}
                 placeholder="Add a resource…"
               />
             </Section>
@@ -361,7 +368,14 @@ function PillToggleGroup({ label, hint, items, selected, onToggle, colorClass })
   )
 }
 
-function SelectField({ label, value, onChange, options, placeholder }) {
+// "Lush (1,204)" — counts come precomputed with the options (systems in the
+// current scope matching each option), so this never costs a request.
+function optionLabel(option, counts) {
+  const n = counts ? counts[option] : undefined
+  return n == null ? option : `${option} (${n.toLocaleString()})`
+}
+
+function SelectField({ label, value, onChange, options, counts, placeholder }) {
   // When the current reality+galaxy scope has zero values for this field,
   // surface "(no options)" instead of the optimistic "Any X" placeholder
   // so users don't waste a click expanding an empty dropdown. Per the
@@ -378,13 +392,13 @@ function SelectField({ label, value, onChange, options, placeholder }) {
         disabled={isEmpty}
       >
         <option value="">{effectivePlaceholder}</option>
-        {(options || []).map((o) => <option key={o} value={o}>{o}</option>)}
+        {(options || []).map((o) => <option key={o} value={o}>{optionLabel(o, counts)}</option>)}
       </select>
     </div>
   )
 }
 
-function MultiSelectField({ label, hint, selected, onToggle, options, placeholder }) {
+function MultiSelectField({ label, hint, selected, onToggle, options, counts, placeholder }) {
   // Dropdown-driven multi-select for long option lists (e.g. ~40 resources):
   // pick from the dropdown to add a chip, click a chip's × to remove it. The
   // dropdown only lists not-yet-selected options, so picking always adds.
@@ -424,7 +438,7 @@ function MultiSelectField({ label, hint, selected, onToggle, options, placeholde
         disabled={isEmpty}
       >
         <option value="">{isEmpty ? '(no options)' : placeholder}</option>
-        {available.map((o) => <option key={o} value={o}>{o}</option>)}
+        {available.map((o) => <option key={o} value={o}>{optionLabel(o, counts)}</option>)}
       </select>
     </div>
   )
@@ -85,7 +85,9 @@ export default function SearchOverlay() {
       return
     }
     setIsSearching(true)
-    const params = { q: trimmed, limit: POPOVER_PER_CATEGORY }
+    // typeahead: per-keystroke mode — the backend caps the systems count
+    // at limit+1 instead of counting every match.
+    const params = { q: trimmed, limit: POPOVER_PER_CATEGORY, typeahead: true }
     if (scope === 'galaxy' && galaxy) params.galaxy = galaxy
     if (scope === 'region' && region) {
       params.rx = region.region_x
@@ -253,7 +255,7 @@ export default function SearchOverlay() {
                 style={{ borderBottom: '1px solid var(--border-soft)' }}
               >
                 <span className="text-[10px] uppercase tracking-wider font-semibold" style={{ color: 'var(--muted)' }}>
-                  {grandTotal} results · scope: <span style={{ color: 'var(--app-primary)' }}>{SCOPE_LABELS[scope]}</span>
+                  {grandTotal}{grandTotal > flatRows.length ? '+' : ''} results · scope: <span style={{ color: 'var(--app-primary)' }}>{SCOPE_LABELS[scope]}</span>
                   {parsedKind && parsedKind !== 'free' && (
                     <span className="ml-1.5 mono text-[9px] px-1 py-0.5 rounded" style={{ color: 'var(--app-accent-2)', border: '1px solid var(--border-soft)' }}>
                       {parsedKind === 'nmsportal' ? 'NMSPortals link' : parsedKind === 'glyph_full' ? 'glyph' : 'glyph suffix'}
@@ -1,5 +1,5 @@
 import React, { Suspense, useEffect } from 'react'
-import { useParams } from 'react-router-dom'
+import { useLocation, useNavigate, useParams } from 'react-router-dom'
 import { getPosterEntry } from '../posters/registry'
 import { fetchTagColorsForPoster } from '../posters/_shared/colors'
 import { markPosterReady, clearPosterReady } from '../posters/_shared/ready'
@@ -10,11 +10,26 @@ import { markPosterReady, clearPosterReady } from '../posters/_shared/ready'
 // This is the URL the headless Playwright renderer opens. Real users typically
 // reach posters via friendly URLs like /voyager/:user or /atlas/:galaxy which
 // alias to the same components but bypass the registry indirection.
+//
+// The renderer keeps warm pages and moves them to the next poster by calling
+// window.__posterNavigate(path) — a client-side route change, no reload. The
+// component is keyed on location.key so every navigation remounts it with
+// fresh state, even when the path is unchanged (e.g. /poster/og_site/global).
 
 export default function PosterRoute() {
   const { type, key } = useParams()
+  const location = useLocation()
+  const navigate = useNavigate()
   const entry = getPosterEntry(type)
 
+  useEffect(() => {
+    window.__posterNavigate = (path) => {
+      clearPosterReady()
+      navigate(path)
+    }
+    return () => { delete window.__posterNavigate }
+  }, [navigate])
+
   useEffect(() => {
     clearPosterReady()
     // Pre-warm the discord_tag_colors cache before posters render so they
@@ -35,7 +50,7 @@ export default function PosterRoute() {
   const Component = entry.component
   return (
     <Suspense fallback={<PosterFallback />}>
-      <Component routeKey={key} />
+      <Component key={location.key} routeKey={key} />
     </Suspense>
   )
 }
@@ -36,6 +36,8 @@ import ctypes
 import re
 import urllib.request
 import urllib.error
+import urllib.parse
+import http.client
 import ssl
 import threading
 from datetime import datetime
@@ -130,6 +132,7 @@ except ImportError:
 DEFAULT_API_URL = "https://havenmap.online"
 _OLD_SHARED_KEY = "vh_live_HvnXtr8k9Lm2NpQ4rStUvWxYz1A3bC5dE7fG"  # Legacy shared key — kept to detect users who haven't re-registered since v1.5.0 (Feb 2026). Safe to remove once all active users have personal keys (check api_keys table for key_type='shared').
 HAVEN_EXTRACTOR_API_KEY = ""  # Per-user key loaded from config; empty = needs registration
+EXTRACTION_BATCH_SIZE = 100  # Systems per /api/extraction/batch request (server cap)
 
 # Default user config (populated by config GUI)
 DEFAULT_USER_CONFIG = {
@@ -943,8 +946,8 @@ def _rewrite_version_banners(data: bytes, version: str):
 
 class HavenExtractorMod(Mod):
     __author__ = "Voyagers Haven"
-    __version__ = "1.10.6"
-    __description__ = "Releases have moved from Parker1920/Master-Haven to Voyagers-Haven-LLC/nms-haven-extractor. The updater (UPDATE_HAVEN_EXTRACTOR.bat) can only replace files inside mod/, so it can never fix its own release URL — instead the mod rewrites the sibling .bat at startup (_repoint_updater_bat) if it still points at the old repo. Also syncs the hardcoded version banners in RUN_HAVEN_EXTRACTOR.bat / FIRST_TIME_SETUP.bat (_sync_launcher_banners) — installed launchers displayed e.g. v1.9.7 while the mod logged v1.10.6; new packages read the version live instead. No extraction/gameplay changes."
+    __version__ = "1.10.7"
+    __description__ = "Exports upload in batches of up to 100 systems to /api/extraction/batch over one keep-alive connection (servers without the endpoint get the old one-request-per-system upload). Procedural region names are sent after the systems, and only for regions that got at least one accepted system. No extraction/gameplay changes."
 
     # ==========================================================================
     # VALID ADJECTIVE LISTS FROM adjectives.js
@@ -2910,7 +2913,13 @@ class HavenExtractorMod(Mod):
             return None
 
     def _upload_systems_to_api_log(self, systems: list):
-        """Upload systems to Haven UI API with log-based progress (no tkinter)."""
+        """Upload systems to Haven UI API with log-based progress (no tkinter).
+
+        Systems go up in EXTRACTION_BATCH_SIZE chunks to /api/extraction/batch
+        over one keep-alive connection. Servers without the batch endpoint get
+        the old one-request-per-system upload. Procedural region names follow
+        the systems, only for regions that got at least one accepted system.
+        """
         total = len(systems)
         results = {"submitted": 0, "skipped": 0, "failed": 0, "errors": []}
 
@@ -2918,38 +2927,32 @@ class HavenExtractorMod(Mod):
         logger.info("--- UPLOADING TO HAVEN UI ---")
         logger.info("")
 
-        for i, system in enumerate(systems):
-            glyph = system.get('glyph_code', 'Unknown')
-            logger.info(f"[{i+1}/{total}] Uploading {glyph}...")
+        # Add user config to system data
+        for system in systems:
+            system['discord_username'] = self._discord_username
+            system['personal_id'] = self._personal_id
+            system['discord_tag'] = self._discord_tag
+            system['reality'] = self._reality
+            system['game_mode'] = self._game_mode
 
-            try:
-                # Add user config to system data
-                system['discord_username'] = self._discord_username
-                system['personal_id'] = self._personal_id
-                system['discord_tag'] = self._discord_tag
-                system['reality'] = self._reality
-                system['game_mode'] = self._game_mode
-
-                result = self._send_single_system_to_api(system)
-                if result.get('status') == 'ok':
-                    logger.info(f"  [OK] {glyph} - submitted")
-                    results["submitted"] += 1
-                elif result.get('status') == 'updated':
-                    logger.info(f"  [OK] {glyph} - updated")
-                    results["submitted"] += 1
-                elif result.get('status') == 'already_charted':
-                    logger.info(f"  [SKIP] {glyph} - already charted")
-                    results["skipped"] += 1
-                else:
-                    error_msg = result.get('message', 'unknown error')
-                    logger.warning(f"  [FAIL] {glyph} - {error_msg}")
-                    results["failed"] += 1
-                    results["errors"].append(f"{glyph}: {error_msg}")
+        batch_results = self._send_systems_in_batches(systems)
+        upload_results = batch_results
 
-            except Exception as e:
-                logger.error(f"  [FAIL] {glyph} - {str(e)}")
-                results["failed"] += 1
-                results["errors"].append(f"{glyph}: {str(e)}")
+        if batch_results is not None:
+            for system, result in zip(systems, batch_results):
+                self._record_upload_result(results, system.get('glyph_code', 'Unknown'), result)
+        else:
+            logger.info("Batch upload not supported by server - uploading one system at a time")
+            upload_results = []
+            for i, system in enumerate(systems):
+                glyph = system.get('glyph_code', 'Unknown')
+                logger.info(f"[{i+1}/{total}] Uploading {glyph}...")
+                try:
+                    result = self._send_single_system_to_api(system)
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+                upload_results.append(result)
+                self._record_upload_result(results, glyph, result)
 
         # Final results
         logger.info("")
@@ -2965,9 +2968,14 @@ class HavenExtractorMod(Mod):
         else:
             self._status_display = "Nothing to upload"
 
-        # Submit procedural region names for any new regions
         if results["submitted"] > 0:
-            self._submit_region_names(systems)
+            # Submit procedural region names, only for regions that got at
+            # least one accepted system
+            accepted = [system for system, result in zip(systems, upload_results)
+                        if result.get('status') in ('ok', 'updated')]
+            regions = self._collect_region_names(accepted)
+            if batch_results is None or not self._send_region_names_in_batches(regions):
+                self._submit_region_names(regions)
             # Keep ONLY held-back entries (galaxy still unknown) so they survive for a later
             # re-export; everything that was a candidate this run (uploaded / charted / failed)
             # is dropped, matching the prior clear-on-submit behaviour.
@@ -2982,17 +2990,152 @@ class HavenExtractorMod(Mod):
                 logger.info("Batch cleared. Submissions pending admin review.")
         logger.info("")
 
-    def _submit_region_names(self, systems: list):
-        """Submit procedural region names for regions that don't have names yet.
+    def _record_upload_result(self, results: dict, glyph: str, result: dict):
+        """Log one system's upload outcome and add it to the export counters."""
+        status = result.get('status')
+        if status == 'ok':
+            logger.info(f"  [OK] {glyph} - submitted")
+            results["submitted"] += 1
+        elif status == 'updated':
+            logger.info(f"  [OK] {glyph} - updated")
+            results["submitted"] += 1
+        elif status == 'already_charted':
+            logger.info(f"  [SKIP] {glyph} - already charted")
+            results["skipped"] += 1
+        else:
+            error_msg = result.get('message') or result.get('detail') or 'unknown error'
+            logger.warning(f"  [FAIL] {glyph} - {error_msg}")
+            results["failed"] += 1
+            results["errors"].append(f"{glyph}: {error_msg}")
+
+    def _open_api_connection(self) -> http.client.HTTPConnection:
+        """Open a keep-alive connection to the Haven API host."""
+        parts = urllib.parse.urlsplit(API_BASE_URL)
+        if parts.scheme == 'https':
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            return http.client.HTTPSConnection(parts.netloc, timeout=60, context=ctx)
+        return http.client.HTTPConnection(parts.netloc, timeout=60)
+
+    def _send_systems_in_batches(self, systems: list) -> Optional[List[dict]]:
+        """POST systems to /api/extraction/batch, reusing one connection.
 
-        Collects unique regions from the exported systems, checks if each already
-        has a name or pending submission, and submits the nms_namegen-generated name
-        to the pending_region_names queue for admin approval.
+        Returns one result dict per system (same shape as /api/extraction's
+        response), or None if the server predates the batch endpoint.
+        """
+        total = len(systems)
+        path = urllib.parse.urlsplit(API_BASE_URL).path.rstrip('/') + '/api/extraction/batch'
+        headers = {
+            'Content-Type': 'application/json',
+            'X-API-Key': API_KEY,
+            'User-Agent': f'HavenExtractor/{self.__version__}',
+            'Connection': 'keep-alive',
+        }
+        conn = self._open_api_connection()
+        out = []
+        try:
+            for start in range(0, total, EXTRACTION_BATCH_SIZE):
+                chunk = systems[start:start + EXTRACTION_BATCH_SIZE]
+                payload = json.dumps({"systems": chunk}, default=str).encode('utf-8')
+                logger.info(f"[{start+1}-{start+len(chunk)}/{total}] Uploading batch of {len(chunk)}...")
+
+                try:
+                    try:
+                        conn.request('POST', path, body=payload, headers=headers)
+                        response = conn.getresponse()
+                    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                        # Server dropped the idle keep-alive socket - retry once on a fresh one.
+                        # Safe to resend: the server merges re-sent systems into the same submission.
+                        conn.close()
+                        conn.request('POST', path, body=payload, headers=headers)
+                        response = conn.getresponse()
+                    status, raw = response.status, response.read()
+                except Exception as e:
+                    conn.close()
+                    out.extend({"status": "error", "message": str(e)} for _ in chunk)
+                    continue
+
+                if status == 404 and start == 0:
+                    return None
+                try:
+                    data = json.loads(raw.decode('utf-8'))
+                except Exception:
+                    data = {}
+                if status != 200:
+                    message = data.get('detail') or f"HTTP {status}"
+                    out.extend({"status": "error", "message": message} for _ in chunk)
+                    continue
+
+                by_index = {r.get('index'): r for r in data.get('results', [])}
+                out.extend(by_index.get(i, {"status": "error", "message": "missing from server response"})
+                           for i in range(len(chunk)))
+        finally:
+            conn.close()
+        return out
+
+    def _send_region_names_in_batches(self, regions: list) -> bool:
+        """POST region names to /api/extraction/batch as regions-only requests.
+
+        Returns False if the server refused them, so the caller can fall back
+        to _submit_region_names().
+        """
+        if not regions:
+            return True
+        logger.info(f"[REGIONS] Submitting {len(regions)} procedural region name(s)...")
+        path = urllib.parse.urlsplit(API_BASE_URL).path.rstrip('/') + '/api/extraction/batch'
+        headers = {
+            'Content-Type': 'application/json',
+            'X-API-Key': API_KEY,
+            'User-Agent': f'HavenExtractor/{self.__version__}',
+            'Connection': 'keep-alive',
+        }
+        conn = self._open_api_connection()
+        try:
+            for start in range(0, len(regions), EXTRACTION_BATCH_SIZE):
+                payload = json.dumps({"systems": [], "regions": regions[start:start + EXTRACTION_BATCH_SIZE]},
+                                     default=str).encode('utf-8')
+                try:
+                    conn.request('POST', path, body=payload, headers=headers)
+                    response = conn.getresponse()
+                    status, raw = response.status, response.read()
+                except Exception as e:
+                    logger.warning(f"[REGIONS] Batch region submit failed: {e}")
+                    return False
+                if status != 200:
+                    logger.warning(f"[REGIONS] Batch region submit refused (HTTP {status})")
+                    return False
+                try:
+                    data = json.loads(raw.decode('utf-8'))
+                except Exception:
+                    data = {}
+                for region in data.get('regions', []):
+                    self._log_region_result(region)
+        finally:
+            conn.close()
+        return True
+
+    def _log_region_result(self, region: dict):
+        """Log one region-name result from the batch endpoint."""
+        name = region.get('proposed_name', '?')
+        coords = f"[{region.get('region_x')},{region.get('region_y')},{region.get('region_z')}]"
+        status = region.get('status')
+        if status == 'submitted':
+            logger.info(f"  [REGION] '{name}' {coords} — submitted for approval")
+        elif status in ('already_named', 'already_pending'):
+            logger.info(f"  [REGION] '{name}' {coords} — {status.replace('_', ' ')}")
+        else:
+            logger.warning(f"  [REGION] '{name}' {coords} — failed: {region.get('message', status)}")
+
+    def _collect_region_names(self, systems: list) -> list:
+        """Collect one region-name proposal per unique region in the exported systems.
+
+        Only regions with a procedural (nms_namegen) name are proposed; the
+        'Region_' placeholder is skipped.
         """
         if not NMS_NAMEGEN_AVAILABLE:
-            return
+            return []
 
-        # Collect unique regions from exported systems
         regions = {}
         for sys in systems:
             region_name = sys.get('region_name', '')
@@ -3006,23 +3149,37 @@ class HavenExtractorMod(Mod):
                 continue
             key = (rx, ry, rz, sys.get('galaxy_name', 'Euclid'), sys.get('reality', 'Normal'))
             if key not in regions:
-                regions[key] = region_name
+                regions[key] = {
+                    "region_x": rx,
+                    "region_y": ry,
+                    "region_z": rz,
+                    "proposed_name": region_name,
+                    "submitted_by": self._discord_username or "HavenExtractor",
+                    "personal_discord_username": self._discord_username,
+                    "discord_tag": self._discord_tag,
+                    "reality": key[4],
+                    "galaxy": key[3],
+                }
+        return list(regions.values())
+
+    def _submit_region_names(self, regions: list):
+        """Submit procedural region names one request at a time.
 
+        Fallback for servers without /api/extraction/batch. Each entry from
+        _collect_region_names() goes to the pending_region_names queue for
+        admin approval.
+        """
         if not regions:
             return
 
         logger.info(f"[REGIONS] Submitting {len(regions)} procedural region name(s)...")
 
-        for (rx, ry, rz, galaxy, reality), name in regions.items():
+        for region in regions:
+            rx, ry, rz, name = region['region_x'], region['region_y'], region['region_z'], region['proposed_name']
             try:
                 url = f"{API_BASE_URL}/api/regions/{rx}/{ry}/{rz}/submit"
                 payload = json.dumps({
-                    "proposed_name": name,
-                    "submitted_by": self._discord_username or "HavenExtractor",
-                    "personal_discord_username": self._discord_username,
-                    "discord_tag": self._discord_tag,
-                    "reality": reality,
-                    "galaxy": galaxy,
+                    k: v for k, v in region.items() if k not in ('region_x', 'region_y', 'region_z')
                 }).encode('utf-8')
 
                 ctx = ssl.create_default_context()
@@ -0,0 +1,105 @@
+"""
+Verification tests for the daily analytics rollups
+(Haven-UI/backend/services/analytics_rollups.py, migration 1.101.0).
+
+Covers:
+  - Trigger-maintained rollups match a from-scratch rebuild after inserts,
+    status flips (approve/reject), a retag and a delete, for both submissions
+    and discoveries.
+  - Public analytics endpoints read their counts from the rollups.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'ROLLUPVERIFY'
+
+
+def _snapshot(conn):
+    sub = conn.execute(
+        "SELECT day, discord_tag, contributor, source, total, approved, rejected, pending"
+        " FROM analytics_submission_daily ORDER BY 1, 2, 3, 4").fetchall()
+    disc = conn.execute(
+        "SELECT day, discord_tag, contributor, type_slug, total"
+        " FROM analytics_discovery_daily ORDER BY 1, 2, 3, 4").fetchall()
+    return [tuple(r) for r in sub], [tuple(r) for r in disc]
+
+
+def _cleanup(conn):
+    conn.execute("DELETE FROM pending_systems WHERE discord_tag = ? OR system_name LIKE 'Rollup %'", (TAG,))
+    conn.execute("DELETE FROM discoveries WHERE discord_tag = ? OR discovery_name LIKE 'Rollup %'", (TAG,))
+    conn.commit()
+
+
+def test_triggers_match_rebuild(haven_client):
+    import db
+    from services.analytics_rollups import rebuild_analytics_rollups
+
+    conn = db.get_db_connection()
+    try:
+        rows = [
+            ('Ana#1234', '2026-03-01T10:00:00+00:00', 'pending', None, 'ana'),
+            ('Ana', '2026-03-01T11:00:00+00:00', 'pending', 'haven_extractor', 'ana'),
+            ('Bo', '2026-03-02T09:00:00+00:00', 'pending', 'manual', 'bo'),
+            ('Cy', '2026-03-02T09:30:00+00:00', 'pending', None, None),
+        ]
+        ids = [conn.execute(
+            "INSERT INTO pending_systems (submitted_by, submission_date, status, source,"
+            " username_normalized, discord_tag, system_name, system_data)"
+            " VALUES (?, ?, ?, ?, ?, ?, 'Rollup sys', '{}')",
+            (who, at, status, source, norm, TAG)).lastrowid for who, at, status, source, norm in rows]
+        conn.execute("UPDATE pending_systems SET status = 'approved' WHERE id IN (?, ?)", (ids[0], ids[1]))
+        conn.execute("UPDATE pending_systems SET status = 'rejected' WHERE id = ?", (ids[2],))
+        conn.execute("UPDATE pending_systems SET discord_tag = NULL WHERE id = ?", (ids[3],))
+        conn.execute("DELETE FROM pending_systems WHERE id = ?", (ids[3],))
+
+        d1 = conn.execute(
+            "INSERT INTO discoveries (discovery_name, discovered_by, submission_timestamp, type_slug, discord_tag)"
+            " VALUES ('Rollup d1', 'Ana#1234', '2026-03-01T12:00:00', 'fauna', ?)", (TAG,)).lastrowid
+        conn.execute(
+            "INSERT INTO discoveries (discovery_name, discovered_by, submission_timestamp, type_slug, discord_tag)"
+            " VALUES ('Rollup d2', 'ana', '2026-03-01T13:00:00', NULL, ?)", (TAG,))
+        conn.execute("UPDATE discoveries SET type_slug = 'flora' WHERE id = ?", (d1,))
+        conn.commit()
+
+        sub, disc = _snapshot(conn)
+        ours = [r for r in sub if r[1] == TAG]
+        assert ('2026-03-01', TAG, 'ana', 'manual', 1, 1, 0, 0) in ours
+        assert ('2026-03-01', TAG, 'ana', 'haven_extractor', 1, 1, 0, 0) in ours
+        assert ('2026-03-02', TAG, 'bo', 'manual', 1, 0, 1, 0) in ours
+        assert not [r for r in sub if r[2] == '' and r[0] == '2026-03-02']
+        assert ('2026-03-01', TAG, 'ana', 'flora', 1) in disc
+        assert ('2026-03-01', TAG, 'ana', 'other', 1) in disc
+
+        rebuild_analytics_rollups(conn)
+        assert _snapshot(conn) == (sub, disc)
+    finally:
+        _cleanup(conn)
+        conn.close()
+
+
+def test_public_endpoints_read_rollups(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    try:
+        before = haven_client.get('/api/public/discovery-breakdown').json()
+        conn.executemany(
+            "INSERT INTO discoveries (discovery_name, discovered_by, submission_timestamp, type_slug, discord_tag)"
+            " VALUES (?, 'Rollup Tester', datetime('now'), 'mineral', ?)",
+            [('Rollup m1', TAG), ('Rollup m2', TAG)])
+        conn.commit()
+
+        after = haven_client.get('/api/public/discovery-breakdown').json()
+        assert after['total'] == before['total'] + 2
+        mineral = next(b for b in after['breakdown'] if b['type_slug'] == 'mineral')
+        assert mineral['discovery_type'] == '\U0001f48e'
+
+        timeline = haven_client.get('/api/public/activity-timeline', params={'granularity': 'day'}).json()
+        assert sum(t['discoveries'] for t in timeline['timeline']) >= 2
+    finally:
+        _cleanup(conn)
+        conn.close()
@@ -0,0 +1,53 @@
+"""
+Verification tests for API key caching and rate limiting
+(Haven-UI/backend/services/auth_service.py: verify_api_key and friends).
+
+Covers:
+  - api_keys.rate_limit is enforced per key with 429 + Retry-After.
+  - last_used_at is buffered in memory and written by the batch flush.
+  - Revoking a key through invalidate_api_key_cache takes effect at once,
+    even though verification is served from the cache.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+KEY = 'vh_live_ratelimitverify'
+
+
+def test_rate_limit_cache_and_flush(haven_client):
+    import db
+    from services.auth_service import flush_api_key_last_used, hash_api_key, invalidate_api_key_cache
+
+    conn = db.get_db_connection()
+    key_id = conn.execute(
+        "INSERT INTO api_keys (key_hash, key_prefix, name, created_at, permissions, rate_limit, is_active)"
+        " VALUES (?, ?, 'Rate Verify', datetime('now'), '[\"check_duplicate\"]', 2, 1)",
+        (hash_api_key(KEY), KEY[:16])).lastrowid
+    conn.commit()
+    try:
+        headers = {'X-API-Key': KEY}
+        params = {'glyph_code': '0123456789AB'}
+        assert haven_client.get('/api/check_duplicate', params=params, headers=headers).status_code == 200
+        assert haven_client.get('/api/check_duplicate', params=params, headers=headers).status_code == 200
+        limited = haven_client.get('/api/check_duplicate', params=params, headers=headers)
+        assert limited.status_code == 429
+        assert int(limited.headers['Retry-After']) > 0
+
+        assert conn.execute("SELECT last_used_at FROM api_keys WHERE id = ?", (key_id,)).fetchone()[0] is None
+        assert flush_api_key_last_used(conn) >= 1
+        conn.commit()
+        assert conn.execute("SELECT last_used_at FROM api_keys WHERE id = ?", (key_id,)).fetchone()[0]
+
+        conn.execute("UPDATE api_keys SET is_active = 0 WHERE id = ?", (key_id,))
+        conn.commit()
+        invalidate_api_key_cache(key_id)
+        assert haven_client.get('/api/check_duplicate', params=params, headers=headers).status_code == 401
+    finally:
+        invalidate_api_key_cache(key_id)
+        conn.execute("DELETE FROM api_keys WHERE id = ?", (key_id,))
+        conn.commit()
+        conn.close()
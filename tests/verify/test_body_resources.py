@@ -0,0 +1,79 @@
+"""
+Verification tests for the body_resources inverted index
+(Haven-UI/backend/db.py: sync_body_resources, migration 1.105.0).
+
+Covers:
+  - sync_body_resources() tokenizes planet and moon materials (stray
+    separators, case) plus the planet common/uncommon/rare columns.
+  - The /api/systems `resource` filter matches through the index, OR-logic
+    across planets and moons.
+  - /api/systems/filter-options lists resources from the index, scoped.
+  - Deleting a moon / system clears its rows by trigger.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'RESVERIFY'
+
+
+def _names(client, **params):
+    resp = client.get('/api/systems', params={'discord_tag': TAG, 'limit': 50, **params})
+    assert resp.status_code == 200
+    return sorted(s['name'] for s in resp.json()['systems'])
+
+
+def test_resource_index_filter_and_options(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    sids = []
+    try:
+        for i, name in enumerate(['Res Planet', 'Res Moon']):
+            sids.append(cursor.execute(
+                "INSERT INTO systems (name, galaxy, reality, x, y, z, glyph_code, discord_tag)"
+                " VALUES (?, 'Eissentam', 'Normal', 1, 2, 3, ?, ?)",
+                (name, f'00{i}E000A0B0C', TAG)).lastrowid)
+        cursor.execute("INSERT INTO planets (system_id, name, materials, rare_resource)"
+                       " VALUES (?, 'RP1', 'copper. Sodium and Oxygen', 'Gold')", (sids[0],))
+        pid = cursor.execute("INSERT INTO planets (system_id, name, materials) VALUES (?, 'RM1', 'Carbon')",
+                             (sids[1],)).lastrowid
+        moon = cursor.execute("INSERT INTO moons (planet_id, name, materials) VALUES (?, 'RM1 a', 'Copper, Hexite')",
+                              (pid,)).lastrowid
+        for sid in sids:
+            db.sync_body_resources(cursor, sid)
+        conn.commit()
+
+        tokens = {r[0] for r in conn.execute(
+            "SELECT resource_token FROM body_resources WHERE system_id = ?", (sids[0],))}
+        assert tokens == {'copper', 'sodium', 'oxygen', 'gold'}
+
+        assert _names(haven_client, resource='Copper') == ['Res Moon', 'Res Planet']
+        assert _names(haven_client, resource='Hexite,Gold') == ['Res Moon', 'Res Planet']
+        assert _names(haven_client, resource='Oxygen') == ['Res Planet']
+        assert _names(haven_client, resource='Uranium') == []
+
+        opts = haven_client.get('/api/systems/filter-options', params={'galaxy': 'Eissentam'}).json()
+        assert {'Copper', 'Hexite', 'Gold', 'Carbon'} <= set(opts['resources'])
+
+        plan = ' '.join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT system_id FROM body_resources WHERE resource_token IN ('copper')"))
+        assert 'idx_body_resources_token' in plan
+
+        conn.execute("DELETE FROM moons WHERE id = ?", (moon,))
+        conn.commit()
+        assert _names(haven_client, resource='Hexite') == []
+        conn.execute("DELETE FROM systems WHERE id = ?", (sids[0],))
+        conn.commit()
+        assert conn.execute("SELECT COUNT(*) FROM body_resources WHERE system_id = ?", (sids[0],)).fetchone()[0] == 0
+    finally:
+        for sid in sids:
+            conn.execute("DELETE FROM moons WHERE planet_id IN (SELECT id FROM planets WHERE system_id = ?)", (sid,))
+            conn.execute("DELETE FROM planets WHERE system_id = ?", (sid,))
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,163 @@
+"""
+Verification tests for the bulk completeness scorer
+(Haven-UI/backend/services/completeness.py).
+
+Covers:
+  - calculate_completeness_scores() returns exactly what the single-system
+    calculate_completeness_score() does — breakdown, grade and the S+
+    checklist — for a mixed batch (no planets, moons, stations, base
+    discoveries, abandoned economy).
+  - rescore_all_systems() writes is_complete / is_fully_charted for every
+    system in small batches.
+  - The batch-approval worker never commits an approved system before it is
+    scored, and a failing submission only rolls back itself.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'BULKSCOREVERIFY'
+
+
+def _add_system(cur, name, economy='Trading', station=True):
+    sid = cur.execute(
+        "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, discord_tag, star_type, economy_type,"
+        " economy_level, conflict_level, dominant_lifeform, stellar_classification)"
+        " VALUES (?, 'Euclid', 1, 2, 3, '0123456789AB', ?, 'Yellow', ?, 'High', 'None', 'Gek', 'G2')",
+        (name, TAG, economy)).lastrowid
+    if station:
+        cur.execute("INSERT INTO space_stations (system_id, name, trade_goods) VALUES (?, 'Station', '[\"x\"]')",
+                    (sid,))
+    return sid
+
+
+def _add_body(cur, table, parent_col, parent_id, name, biome='Lush', lore=None, base=False):
+    return cur.execute(
+        f"INSERT INTO {table} ({parent_col}, name, biome, weather, sentinel, fauna, flora, materials,"
+        " lore_notes, base_latitude, base_longitude) VALUES (?, ?, ?, 'Calm', 'Low', 'Many', 'Some', 'Copper', ?, ?, ?)",
+        (parent_id, name, biome, lore, 1.0 if base else None, 2.0 if base else None)).lastrowid
+
+
+def _add_discovery(cur, system_id, planet_id=None, moon_id=None, slug='fauna'):
+    cur.execute(
+        "INSERT INTO discoveries (discovery_type, discovery_name, system_id, planet_id, moon_id, type_slug, discord_tag)"
+        " VALUES (?, 'Bulk find', ?, ?, ?, ?, ?)", (slug, system_id, planet_id, moon_id, slug, TAG))
+
+
+def test_bulk_scores_match_single(haven_client):
+    import db
+    from services.completeness import (
+        calculate_completeness_score,
+        calculate_completeness_scores,
+        rescore_all_systems,
+    )
+
+    conn = db.get_db_connection()
+    cur = conn.cursor()
+    try:
+        bare = _add_system(cur, 'Bulk bare', station=False)
+        abandoned = _add_system(cur, 'Bulk abandoned', economy='Abandoned', station=False)
+        _add_body(cur, 'planets', 'system_id', abandoned, 'Dead rock', biome='Dead')
+
+        charted = _add_system(cur, 'Bulk charted')
+        p1 = _add_body(cur, 'planets', 'system_id', charted, 'P1', lore='Old')
+        p2 = _add_body(cur, 'planets', 'system_id', charted, 'P2')
+        m1 = _add_body(cur, 'moons', 'planet_id', p1, 'M1')
+        for pid, mid in ((p1, None), (p2, None), (None, m1)):
+            _add_discovery(cur, charted, pid, mid)
+        _add_discovery(cur, charted, planet_id=p2, slug='base')
+
+        partial = _add_system(cur, 'Bulk partial')
+        p3 = _add_body(cur, 'planets', 'system_id', partial, 'P3', lore='Old', base=True)
+        _add_body(cur, 'moons', 'planet_id', p3, 'M2')  # no discovery -> not S+
+        _add_discovery(cur, partial, p3)
+        conn.commit()
+
+        ids = [bare, abandoned, charted, partial]
+        bulk = calculate_completeness_scores(cur, ids + [-1])
+        assert set(bulk) == set(ids)
+        for sid in ids:
+            assert bulk[sid] == calculate_completeness_score(cur, sid)
+        assert bulk[charted]['is_fully_charted'] and bulk[charted]['breakdown']['body_count'] == 3
+        assert not bulk[partial]['is_fully_charted']
+
+        prev_factory = conn.row_factory
+        conn.row_factory = sqlite3.Row
+        try:
+            result = rescore_all_systems(conn, batch_size=2)
+        finally:
+            conn.row_factory = prev_factory
+        assert result['failed'] == 0
+        stored = {r[0]: (r[1], r[2]) for r in conn.execute(
+            "SELECT id, is_complete, is_fully_charted FROM systems WHERE discord_tag = ?", (TAG,))}
+        assert stored == {sid: (bulk[sid]['score'], 1 if bulk[sid]['is_fully_charted'] else 0) for sid in ids}
+    finally:
+        conn.execute("DELETE FROM discoveries WHERE discord_tag = ?", (TAG,))
+        conn.execute("DELETE FROM moons WHERE planet_id IN (SELECT p.id FROM planets p"
+                     " JOIN systems s ON s.id = p.system_id WHERE s.discord_tag = ?)", (TAG,))
+        conn.execute("DELETE FROM planets WHERE system_id IN (SELECT id FROM systems WHERE discord_tag = ?)", (TAG,))
+        conn.execute("DELETE FROM space_stations WHERE system_id IN (SELECT id FROM systems WHERE discord_tag = ?)",
+                     (TAG,))
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
+
+
+def test_batch_approval_commits_scored_systems(haven_client, monkeypatch):
+    import json
+
+    import db
+    import routes.approvals as approvals
+
+    conn = db.get_db_connection()
+    try:
+        ids = []
+        for i in range(7):
+            # Approve as edits of existing unscored systems (glyph match); a
+            # fresh test schema's integer systems.id can't take the UUID a
+            # new-system approval assigns.
+            glyph = f'0{i}4F000A0B0C'
+            conn.execute("INSERT INTO systems (name, galaxy, reality, x, y, z, glyph_code, discord_tag, is_complete)"
+                         " VALUES (?, 'Euclid', 'Normal', 0, 0, 0, ?, ?, 0)", (f'Bulk batch {i}', glyph, TAG))
+            data = {'name': f'Bulk batch {i}', 'galaxy': 'Euclid', 'reality': 'Normal', 'glyph_code': glyph,
+                    'discord_tag': TAG, 'star_type': 'Yellow', 'economy_type': 'Trading',
+                    'economy_level': 'High', 'conflict_level': 'None', 'dominant_lifeform': 'Gek'}
+            ids.append(conn.execute(
+                "INSERT INTO pending_systems (submitted_by, submission_date, status, discord_tag,"
+                " system_name, system_data) VALUES ('Batch Submitter', datetime('now'), 'pending', ?, ?, ?)",
+                (TAG, data['name'], 'not json' if i == 2 else json.dumps(data))).lastrowid)
+        conn.execute("INSERT INTO batch_jobs (id, status, total_systems) VALUES ('bulk-score-job', 'pending', 7)")
+        conn.commit()
+
+        # Every commit of the worker is followed by invalidate_filter_options();
+        # read what another connection can see at that point.
+        seen = []
+
+        def check_committed():
+            seen.append(conn.execute(
+                "SELECT COUNT(*), COUNT(*) FILTER (WHERE COALESCE(s.is_complete, 0) = 0)"
+                " FROM pending_systems p JOIN systems s ON s.name = p.system_name"
+                " WHERE p.discord_tag = ? AND p.status = 'approved'", (TAG,)).fetchone())
+
+        monkeypatch.setattr(approvals, 'invalidate_filter_options', check_committed)
+        approvals._process_batch_approvals_sync(
+            'bulk-score-job', ids, {'user_type': 'super_admin', 'username': 'Bulk Approver'})
+
+        assert [tuple(r) for r in seen] == [(4, 0), (6, 0)]
+        job = conn.execute("SELECT status, processed_systems, failed_systems FROM batch_jobs"
+                           " WHERE id = 'bulk-score-job'").fetchone()
+        assert tuple(job) == ('completed', 6, 1)
+        statuses = [r[0] for r in conn.execute(
+            f"SELECT status FROM pending_systems WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id", ids)]
+        assert statuses == ['approved'] * 2 + ['pending'] + ['approved'] * 4
+    finally:
+        conn.execute("DELETE FROM pending_systems WHERE discord_tag = ?", (TAG,))
+        conn.execute("DELETE FROM batch_jobs WHERE id = 'bulk-score-job'")
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,76 @@
+"""
+Verification tests for the stored contributor key
+(services.auth_service.contributor_key, migration 1.102.0).
+
+Covers:
+  - contributor_key() folds names the way user_profiles does and skips
+    blank / Anonymous candidates.
+  - sync_system_contributor_key() fills systems.username_normalized.
+  - /api/public/user-stats and /api/public/voyager-fingerprint resolve a
+    contributor through the indexed columns (discriminator and slug forms).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'KEYVERIFY'
+
+
+def test_contributor_key_folding(haven_module):
+    from services.auth_service import contributor_key
+
+    assert contributor_key('Hiroki Rinn#1234') == 'hirokirinn'
+    assert contributor_key('hiroki-rinn') == 'hirokirinn'
+    assert contributor_key('', 'Anonymous', None, 'Véla_X') == 'velax'
+    assert contributor_key(None, 'anonymous') == 'unknown'
+
+
+def test_public_lookups_use_stored_key(haven_client):
+    import db
+    from services.auth_service import contributor_key, sync_system_contributor_key
+
+    conn = db.get_db_connection()
+    try:
+        key = contributor_key('Key Tester#4321')
+        for source in ('manual', 'haven_extractor'):
+            conn.execute(
+                "INSERT INTO pending_systems (submitted_by, submission_date, status, source,"
+                " username_normalized, discord_tag, system_name, system_data)"
+                " VALUES ('Key Tester#4321', datetime('now'), 'approved', ?, ?, ?, 'Key sys', '{}')",
+                (source, key, TAG))
+        conn.execute(
+            "INSERT INTO discoveries (discovery_name, discovered_by, submission_timestamp,"
+            " type_slug, discord_tag, username_normalized)"
+            " VALUES ('Key disc', 'Key Tester', datetime('now'), 'fauna', ?, ?)",
+            (TAG, contributor_key('Key Tester')))
+        cursor = conn.cursor()
+        sid = cursor.execute(
+            "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, discovered_by, dominant_lifeform, discord_tag)"
+            " VALUES ('Key system', 'Euclid', 1, 2, 3, '0009000A0B0C', 'key-tester', 'Gek', ?)",
+            (TAG,)).lastrowid
+        sync_system_contributor_key(cursor, sid)
+        conn.commit()
+        assert conn.execute("SELECT username_normalized FROM systems WHERE id = ?", (sid,)).fetchone()[0] == key
+
+        stats = haven_client.get('/api/public/user-stats', params={'username': 'key_tester'}).json()
+        assert stats['systems'] == {'total': 2, 'manual': 1, 'extractor': 1}
+        assert stats['discoveries'] == 1
+
+        fp = haven_client.get('/api/public/voyager-fingerprint', params={'username': 'key-tester'}).json()
+        assert fp['totals']['systems'] == 2
+        assert fp['primary_community']['name'] == TAG and fp['primary_community']['rank'] == 1
+        assert fp['totals']['global_rank'] is not None
+        assert fp['lifeforms'] == [{'name': 'Gek', 'systems': 1, 'pct': 100.0}]
+
+        plan = ' '.join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM discoveries WHERE username_normalized = ?", (key,)))
+        assert 'idx_discoveries_username_normalized' in plan
+    finally:
+        conn.execute("DELETE FROM pending_systems WHERE discord_tag = ?", (TAG,))
+        conn.execute("DELETE FROM discoveries WHERE discord_tag = ?", (TAG,))
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,131 @@
+"""
+Verification tests for the pooled async DB access layer in Haven-UI/backend/db.py.
+
+Covers:
+  - run_write commits on success and rolls back on exception.
+  - run_read connections are query_only (a stray write fails loudly).
+  - Concurrent run_read calls overlap instead of serializing.
+  - close_db_pools() is re-entrant; the pools come back lazily.
+
+Runs against the conftest throwaway DB (haven_module forces migrations first).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+def _setup_scratch_table(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS _db_access_scratch (v INTEGER)")
+    conn.execute("DELETE FROM _db_access_scratch")
+
+
+def test_run_write_commits_and_rolls_back(haven_module):
+    import db
+
+    async def scenario():
+        await db.run_write(_setup_scratch_table)
+        await db.run_write(lambda c: c.execute("INSERT INTO _db_access_scratch VALUES (1)"))
+
+        def _boom(c):
+            c.execute("INSERT INTO _db_access_scratch VALUES (2)")
+            raise RuntimeError("abort")
+
+        with pytest.raises(RuntimeError):
+            await db.run_write(_boom)
+        return await db.run_read(
+            lambda c: [r[0] for r in c.execute("SELECT v FROM _db_access_scratch")])
+
+    assert asyncio.run(scenario()) == [1]
+
+
+def test_run_read_is_query_only(haven_module):
+    import db
+
+    async def scenario():
+        await db.run_write(_setup_scratch_table)
+        await db.run_read(lambda c: c.execute("INSERT INTO _db_access_scratch VALUES (3)"))
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(scenario())
+
+
+def test_concurrent_reads_overlap(haven_module):
+    import db
+    if db.DB_READER_POOL_SIZE < 2:
+        pytest.skip("reader pool has a single connection")
+
+    def _slow_read(conn):
+        conn.execute("SELECT 1").fetchone()
+        time.sleep(0.3)
+        return True
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(db.run_read(_slow_read), db.run_read(_slow_read))
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 0.55
+
+
+def test_close_db_pools_is_reentrant(haven_module):
+    import db
+    db.close_db_pools()
+    db.close_db_pools()
+    assert asyncio.run(db.run_read(lambda c: c.execute("SELECT 1").fetchone()[0])) == 1
+
+
+def test_shared_pool_recycles_connections(haven_module):
+    import db
+    first = db.get_db_connection()
+    raw = first._conn
+    first.close()
+    second = db.get_db_connection()
+    try:
+        assert second._conn is raw, "closed connection should be reused, not reopened"
+        # norm_token is registered once at open and survives reuse.
+        assert second.execute("SELECT norm_token('Power Generation')").fetchone()[0] == 'powergeneration'
+    finally:
+        second.close()
+
+
+def test_request_scope_reuses_one_connection(haven_module):
+    import db
+
+    async def handler():
+        a = db.get_db_connection()
+        b = db.get_db_connection()
+        same = a._conn is b._conn
+        b.close()
+        a.execute("SELECT 1").fetchone()  # still usable after the helper closed
+        a.close()
+        return same, a._conn
+
+    async def scenario():
+        token = db.begin_request_scope()
+        try:
+            return await handler()
+        finally:
+            db.end_request_scope(token)
+
+    before = db.db_pool_stats()['shared']['in_use']
+    same, raw = asyncio.run(scenario())
+    assert same
+    assert db.db_pool_stats()['shared']['in_use'] == before
+    # Released back to the pool, not closed.
+    assert raw.execute("SELECT 1").fetchone()[0] == 1
+
+
+def test_pool_stats_shape(haven_module):
+    import db
+    stats = db.db_pool_stats()
+    assert set(stats) == {'shared', 'reader', 'writer'}
+    assert stats['writer']['size'] == 1
+    for pool in stats.values():
+        assert {'checkouts', 'open', 'idle', 'in_use', 'wait_ms_total', 'wait_ms_max'} <= set(pool)
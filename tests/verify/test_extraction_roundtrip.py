@@ -8,6 +8,10 @@ guard rail ensures we cannot accidentally hit the production DB.
 Test list (PROPOSAL §3):
   10. test_extraction_creates_pending_row    — basic happy path → pending_systems
   11. test_extraction_no_trade_data_nullified — no_trade_data=True → fields=None  (P1)
+  12. test_extraction_batch_per_item_results  — /api/extraction/batch: new, in-batch
+                                                duplicate merged, bad glyph, region
+                                                names (same rule as the single-region
+                                                endpoint), regions-only request
 """
 
 from __future__ import annotations
@@ -115,3 +119,55 @@ def test_extraction_no_trade_data_nullified(haven_client, haven_module, fixtures
             f"{field!r} should be None for no_trade_data row, "
             f"got {submission_data.get(field)!r}"
         )
+
+
+def test_extraction_batch_per_item_results(haven_client, haven_module, fixtures_dir):
+    """One batch → per-item results; a repeated glyph merges into the first row."""
+    first = _load_fixture(fixtures_dir, "extractor_payload_basic.json")
+    first.update(glyph_code="0BA7C1D2E3F4", system_name="Batch One")
+    second = dict(first, glyph_code="0BA7C1D2E3F5", system_name="Batch Two")
+    again = dict(first, system_name="Batch One Renamed")
+    bad = dict(first, glyph_code="XYZ")
+    region = {"region_x": 3001, "region_y": 12, "region_z": 3002, "proposed_name": "Batch Verify Reach",
+              "galaxy": "Euclid", "reality": "Normal", "submitted_by": "smoke_test_user"}
+    # A named region takes a different proposed name, like the single-region endpoint.
+    named_same = dict(region, region_x=3003, region_z=3004, proposed_name="Batch Verify Named")
+    named_other = dict(named_same, proposed_name="Batch Verify Rename")
+    conn = haven_module.get_db_connection()
+    conn.execute("INSERT INTO regions (region_x, region_y, region_z, custom_name, reality, galaxy)"
+                 " VALUES (3003, 12, 3004, 'Batch Verify Named', 'Normal', 'Euclid')")
+    conn.commit()
+    conn.close()
+
+    resp = haven_client.post("/api/extraction/batch",
+                             json={"systems": [first, second, again, bad],
+                                   "regions": [region, region, named_same, named_other]})
+    assert resp.status_code == 200, resp.text[:300]
+    body = resp.json()
+    statuses = [r["status"] for r in body["results"]]
+    assert statuses == ["ok", "ok", "updated", "invalid"]
+    assert body["results"][2]["submission_id"] == body["results"][0]["submission_id"]
+    assert body["summary"] == {"ok": 2, "updated": 1, "invalid": 1, "error": 0, "total": 4}
+    assert [r["status"] for r in body["regions"]] == ["submitted", "already_pending", "already_named", "submitted"]
+
+    # Regions-only request (the extractor's trailing names for accepted systems).
+    resp = haven_client.post("/api/extraction/batch", json={"systems": [], "regions": [named_other]})
+    assert resp.status_code == 200, resp.text[:300]
+    assert [r["status"] for r in resp.json()["regions"]] == ["already_pending"]
+    assert haven_client.post("/api/regions/3003/12/3004/submit",
+                             json={"proposed_name": "Batch Verify Named"}).status_code == 409
+
+    conn = haven_module.get_db_connection()
+    try:
+        rows = conn.execute(
+            "SELECT glyph_code, system_name FROM pending_systems WHERE glyph_code LIKE '0BA7C1D2E3F_'"
+            " ORDER BY glyph_code").fetchall()
+        assert [tuple(r) for r in rows] == [("0BA7C1D2E3F4", "Batch One Renamed"), ("0BA7C1D2E3F5", "Batch Two")]
+    finally:
+        conn.execute("DELETE FROM pending_systems WHERE glyph_code LIKE '0BA7C1D2E3F_'")
+        conn.execute("DELETE FROM pending_region_names WHERE proposed_name LIKE 'Batch Verify %'")
+        conn.execute("DELETE FROM regions WHERE custom_name = 'Batch Verify Named'")
+        conn.commit()
+        conn.close()
+
+    assert haven_client.post("/api/extraction/batch", json={"systems": []}).status_code == 400
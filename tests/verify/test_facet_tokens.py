@@ -0,0 +1,66 @@
+"""
+Verification tests for the stored facet tokens
+(Haven-UI/backend/db.py: sync_facet_tokens / _facet_match, migration 1.104.0).
+
+Covers:
+  - /api/systems categorical and planet filters match formatting variants
+    through the stored `_norm` columns.
+  - A write path that skips sync_facet_tokens still filters correctly: the
+    trigger NULLs the stale token and the norm_token() fallback covers it.
+  - The filter SQL seeks the new indexes.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'FACETVERIFY'
+
+
+def _ids(client, **params):
+    resp = client.get('/api/systems', params={'discord_tag': TAG, 'limit': 50, **params})
+    assert resp.status_code == 200
+    return sorted(s['name'] for s in resp.json()['systems'])
+
+
+def test_filters_use_stored_tokens(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    sid = cursor.execute(
+        "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, discord_tag, star_type, economy_type)"
+        " VALUES ('Facet One', 'Euclid', 1, 2, 3, '000F000A0B0C', ?, 'Yellow', 'Power Generation')",
+        (TAG,)).lastrowid
+    cursor.execute("INSERT INTO planets (system_id, name, biome, sentinel) VALUES (?, 'F1', 'Lush', 'Low')", (sid,))
+    db.sync_facet_tokens(cursor, sid)
+    conn.commit()
+    try:
+        row = conn.execute("SELECT star_type_norm, economy_type_norm, conflict_level_norm FROM systems WHERE id = ?",
+                           (sid,)).fetchone()
+        assert tuple(row) == ('yellow', 'powergeneration', '')
+        assert _ids(haven_client, star_type='YELLOW,Red', economy_type='power-generation') == ['Facet One']
+        assert _ids(haven_client, biome='lush', sentinel_level='low') == ['Facet One']
+        assert _ids(haven_client, biome='Barren') == []
+
+        # Raw write without a sync: the trigger clears the stale token.
+        conn.execute("UPDATE systems SET economy_type = 'Mining' WHERE id = ?", (sid,))
+        conn.execute("UPDATE planets SET biome = 'Frozen' WHERE system_id = ?", (sid,))
+        conn.commit()
+        assert conn.execute("SELECT economy_type_norm, star_type_norm FROM systems WHERE id = ?",
+                            (sid,)).fetchone()[:] == (None, 'yellow')
+        assert _ids(haven_client, economy_type='mining', biome='FROZEN') == ['Facet One']
+        assert _ids(haven_client, economy_type='power generation') == []
+
+        where, params = [], []
+        db._build_advanced_filter_clauses({'star_type': 'Yellow', 'biome': 'Lush'}, where, params)
+        plan = ' '.join(r[3] for r in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT s.id FROM systems s WHERE {' AND '.join(where)}", params))
+        assert 'idx_systems_star_type_norm' in plan and 'idx_planets_biome_norm' in plan
+    finally:
+        conn.execute("DELETE FROM planets WHERE system_id = ?", (sid,))
+        conn.execute("DELETE FROM systems WHERE id = ?", (sid,))
+        conn.commit()
+        conn.close()
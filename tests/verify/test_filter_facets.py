@@ -0,0 +1,69 @@
+"""
+Verification tests for the cached filter-options facets
+(Haven-UI/backend/services/filter_facets.py).
+
+Covers:
+  - /api/systems/filter-options collapses formatting variants and returns
+    per-option system counts, scoped by galaxy.
+  - Repeat requests are served from the cache; invalidate_filter_options()
+    makes the next request rebuild.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'FACETCACHEVERIFY'
+GALAXY = 'Calypso'
+
+
+def test_filter_options_counts_and_cache(haven_client):
+    import db
+    from services.filter_facets import FILTER_OPTIONS_CACHE, invalidate_filter_options
+
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    sids = []
+    try:
+        for i, econ in enumerate(['Power Generation', 'PowerGeneration', 'Mining']):
+            sid = cursor.execute(
+                "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, discord_tag, economy_type)"
+                " VALUES (?, ?, 1, 2, 3, ?, ?, ?)",
+                (f'Facet cache {i}', GALAXY, f'00{i}C000A0B0C', TAG, econ)).lastrowid
+            sids.append(sid)
+            cursor.execute("INSERT INTO planets (system_id, name, biome, materials) VALUES (?, 'P1', 'Lush', 'Copper')",
+                           (sid,))
+            cursor.execute("INSERT INTO planets (system_id, name, biome) VALUES (?, 'P2', 'lush')", (sid,))
+            db.sync_facet_tokens(cursor, sid)
+            db.sync_body_resources(cursor, sid)
+        conn.commit()
+        invalidate_filter_options()
+
+        opts = haven_client.get('/api/systems/filter-options', params={'galaxy': GALAXY}).json()
+        assert opts['economy_types'] == ['Mining', 'Power Generation']
+        assert opts['counts']['economy_types'] == {'Mining': 1, 'Power Generation': 2}
+        # Two Lush planets per system still count each system once.
+        assert opts['biomes'] == ['Lush'] and opts['counts']['biomes'] == {'Lush': 3}
+        assert opts['counts']['resources'] == {'Copper': 3}
+
+        hits = FILTER_OPTIONS_CACHE.hits
+        assert haven_client.get('/api/systems/filter-options', params={'galaxy': GALAXY}).json() == opts
+        assert FILTER_OPTIONS_CACHE.hits == hits + 1
+
+        conn.execute("UPDATE systems SET economy_type = 'Mining' WHERE id = ?", (sids[0],))
+        conn.commit()
+        stale = haven_client.get('/api/systems/filter-options', params={'galaxy': GALAXY}).json()
+        assert stale['counts']['economy_types']['Mining'] == 1
+        invalidate_filter_options()
+        fresh = haven_client.get('/api/systems/filter-options', params={'galaxy': GALAXY}).json()
+        # Only the unspaced variant is left, so it becomes the display form.
+        assert fresh['counts']['economy_types'] == {'Mining': 2, 'PowerGeneration': 1}
+    finally:
+        for sid in sids:
+            conn.execute("DELETE FROM planets WHERE system_id = ?", (sid,))
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
+        invalidate_filter_options()
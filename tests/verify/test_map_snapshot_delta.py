@@ -0,0 +1,95 @@
+"""
+Verification tests for incremental Cartographer snapshot updates
+(Haven-UI/backend/services/map_snapshot.py + /api/map/snapshot/delta).
+
+Covers:
+  - An inserted system + planet shows up in the delta as an append, and the
+    patched full snapshot equals a from-scratch rebuild.
+  - Deleting a mapped system rebuilds under a new lineage, so an old token
+    gets `{"full": true}`.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+def _ensure_snapshot_columns(conn):
+    # The throwaway DB misses planets.sentinel_level (migration 1.32.0 fails
+    # on a fresh DB — see conftest), which the snapshot reads.
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(planets)")}
+    if 'sentinel_level' not in cols:
+        conn.execute("ALTER TABLE planets ADD COLUMN sentinel_level TEXT")
+    conn.commit()
+
+
+def _insert_system(conn, name, glyph):
+    cur = conn.execute(
+        "INSERT INTO systems (name, galaxy, reality, x, y, z, glyph_code,"
+        " region_x, region_y, region_z, star_type, discord_tag)"
+        " VALUES (?, 'Euclid', 'Normal', 1, 2, 3, ?, 2475, 103, 2117, 'Red', 'DELTA')",
+        (name, glyph))
+    conn.execute("INSERT INTO planets (system_id, name, biome, planet_size) VALUES (?, 'P1', 'Lush', 'Large')",
+                 (cur.lastrowid,))
+    conn.commit()
+    return cur.lastrowid
+
+
+def _delete_system(conn, sid):
+    conn.execute("DELETE FROM planets WHERE system_id = ?", (sid,))
+    conn.execute("DELETE FROM systems WHERE id = ?", (sid,))
+    conn.commit()
+
+
+def test_delta_appends_and_matches_rebuild(haven_client):
+    import db
+    from services.map_snapshot import invalidate_snapshot_states
+
+    conn = db.get_db_connection()
+    _ensure_snapshot_columns(conn)
+    conn.close()
+
+    before = haven_client.get('/api/map/snapshot').json()
+    conn = db.get_db_connection()
+    sid = _insert_system(conn, 'Delta Test', '0123456789AB')
+    conn.close()
+    try:
+        delta = haven_client.get('/api/map/snapshot/delta', params={'since': before['token']}).json()
+        assert delta['full'] is False
+        assert delta['n'] == before['n'] + 1
+        assert delta['idx'] == [before['n']]
+        assert delta['names'] == ['Delta Test']
+        assert len(delta['planets_by_idx'][str(before['n'])]) == 1
+        assert 'DELTA' in delta['tag_pool']
+
+        patched = haven_client.get('/api/map/snapshot').json()
+        assert patched['token'] == delta['token']
+        invalidate_snapshot_states()
+        rebuilt = haven_client.get('/api/map/snapshot').json()
+        for key in rebuilt:
+            if key != 'token':
+                assert patched[key] == rebuilt[key], key
+    finally:
+        conn = db.get_db_connection()
+        _delete_system(conn, sid)
+        conn.close()
+
+
+def test_deletion_forces_full_resync(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    _ensure_snapshot_columns(conn)
+    sid = _insert_system(conn, 'Delta Doomed', '0123456789AC')
+    conn.close()
+    token = haven_client.get('/api/map/snapshot').json()['token']
+
+    conn = db.get_db_connection()
+    _delete_system(conn, sid)
+    conn.close()
+
+    delta = haven_client.get('/api/map/snapshot/delta', params={'since': token}).json()
+    assert delta['full'] is True
+    assert delta['token'].split('.')[0] != token.split('.')[0]
@@ -0,0 +1,53 @@
+"""
+Verification tests for the bounded payload cache behind /api/map/snapshot
+(Haven-UI/backend/services/payload_cache.py).
+
+Covers:
+  - LRU eviction keeps the cache within its byte budget.
+  - Expired entries count as misses and are dropped.
+  - Responses serve the pre-compressed variant the client accepts.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+def test_lru_evicts_to_byte_budget(haven_module):
+    from services.payload_cache import PayloadCache
+    cache = PayloadCache('_verify_lru', max_bytes=2500, ttl_seconds=60, compress=False)
+    for i in range(4):
+        cache.put(i, b'x' * 1000)
+    stats = cache.stats()
+    assert stats['bytes'] <= 2500
+    assert stats['evictions'] == 2
+    assert cache.get(0) is None and cache.get(3) is not None
+
+
+def test_ttl_expiry_is_a_miss(haven_module):
+    from services.payload_cache import PayloadCache
+    cache = PayloadCache('_verify_ttl', max_bytes=10_000, ttl_seconds=0, compress=False)
+    cache.put('k', '{}')
+    assert cache.get('k') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_response_picks_accepted_encoding(haven_module):
+    from services.payload_cache import PayloadCache
+    cache = PayloadCache('_verify_enc', max_bytes=1_000_000, ttl_seconds=60)
+    doc = {'systems': list(range(500))}
+    entry = cache.put('k', json.dumps(doc))
+
+    gz = entry.response('gzip, deflate')
+    assert gz.headers['content-encoding'] == 'gzip'
+    assert gz.headers['vary'] == 'Accept-Encoding'
+    assert json.loads(gzip.decompress(gz.body)) == doc
+
+    plain = entry.response(None)
+    assert 'content-encoding' not in plain.headers
+    assert json.loads(plain.body) == doc
@@ -0,0 +1,80 @@
+"""
+Verification tests for poster data-hash skip-render
+(Haven-UI/backend/services/poster_service.py, migration 1.108.0).
+
+Covers:
+  - compute_data_hash() is stable while the data is, and moves when a
+    system lands in the poster's scope.
+  - An expired poster whose hash still matches keeps its PNG: no render,
+    verified_at restarts the TTL, generated_at is left alone.
+  - A poster older than DATA_HASH_MAX_AGE_DAYS re-renders regardless.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+GALAXY = 'PosterHashVerify'
+
+
+def _seed_cache_row(conn, ps, file_path, data_hash, age_days):
+    generated_at = (datetime.now(timezone.utc) - timedelta(days=age_days)).isoformat()
+    conn.execute(
+        "INSERT INTO poster_cache (poster_type, cache_key, template_version, generated_at,"
+        " data_hash, file_path, render_ms) VALUES ('atlas', ?, ?, ?, ?, ?, 1000)",
+        (GALAXY, ps.REGISTRY['atlas'].version, generated_at, data_hash, str(file_path)))
+    conn.commit()
+    return generated_at
+
+
+def test_unchanged_data_skips_render(haven_module, monkeypatch, tmp_path):
+    import db
+    from services import poster_service as ps
+
+    rendered = []
+
+    async def fake_render(template, cache_key, output_path, priority=ps.PRIORITY_INTERACTIVE):
+        rendered.append(cache_key)
+        output_path.write_bytes(b'png')
+        return 10
+
+    monkeypatch.setattr(ps, '_render', fake_render)
+    monkeypatch.setattr(ps, '_build_output_path', lambda t, k: tmp_path / f'{k}.png')
+    png = tmp_path / f'{GALAXY}.png'
+    png.write_bytes(b'old')
+
+    conn = db.get_db_connection()
+    try:
+        before = ps.compute_data_hash('atlas', GALAXY)
+        assert before and before == ps.compute_data_hash('atlas', GALAXY)
+        conn.execute(
+            "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, created_at)"
+            " VALUES ('PHash A', ?, 1, 2, 3, '0A1B2C3D4E5F', '2026-02-01')", (GALAXY,))
+        conn.commit()
+        current = ps.compute_data_hash('atlas', GALAXY)
+        assert current != before
+
+        generated_at = _seed_cache_row(conn, ps, png, current, age_days=2)
+        path = asyncio.run(ps.get_or_render('atlas', GALAXY, stale_ok=False))
+        assert path == png and rendered == []
+        row = ps._cache_lookup('atlas', GALAXY)
+        assert row['generated_at'] == generated_at and row['verified_at']
+        assert ps.is_cache_fresh('atlas', GALAXY, row)
+
+        # Past the cap the render happens even though nothing changed.
+        conn.execute("DELETE FROM poster_cache WHERE poster_type = 'atlas' AND cache_key = ?", (GALAXY,))
+        _seed_cache_row(conn, ps, png, current, age_days=ps.DATA_HASH_MAX_AGE_DAYS + 1)
+        asyncio.run(ps.get_or_render('atlas', GALAXY, stale_ok=False))
+        assert rendered == [GALAXY]
+        row = ps._cache_lookup('atlas', GALAXY)
+        assert row['data_hash'] == current and row['verified_at'] is None
+    finally:
+        conn.execute("DELETE FROM poster_cache WHERE poster_type = 'atlas' AND cache_key = ?", (GALAXY,))
+        conn.execute("DELETE FROM systems WHERE galaxy = ?", (GALAXY,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,96 @@
+"""
+Verification tests for the poster renderer's warm page pool
+(Haven-UI/backend/services/poster_service.py).
+
+Covers:
+  - The first render on a page does a full load; later renders reuse the
+    page through the client-side window.__posterNavigate hook.
+  - A failed render discards its page; pages are recycled after
+    PAGE_MAX_RENDERS.
+  - Phase timings and pool counters are reported by cache_stats() helpers.
+
+Chromium is replaced by a minimal fake browser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+class _FakePage:
+    def __init__(self, log):
+        self.log = log
+        self.loaded = False
+
+    def is_closed(self):
+        return False
+
+    async def evaluate(self, script, path):
+        self.log.append(('client', path))
+        return self.loaded
+
+    async def goto(self, url, **kwargs):
+        self.log.append(('load', url))
+        self.loaded = True
+
+    async def wait_for_function(self, expression, timeout):
+        if self.log[-1][1].endswith('/broken'):
+            raise TimeoutError('poster never became ready')
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def screenshot(self, path, **kwargs):
+        with open(path, 'wb') as fh:
+            fh.write(b'png')
+
+
+class _FakeBrowser:
+    def __init__(self, log):
+        self.log = log
+
+    async def new_context(self, **kwargs):
+        log = self.log
+
+        class _Context:
+            async def new_page(self):
+                return _FakePage(log)
+
+            async def close(self):
+                log.append(('close',))
+
+        return _Context()
+
+
+def test_pages_are_reused_and_recycled(haven_module, monkeypatch, tmp_path):
+    from services import poster_service as ps
+
+    log: list = []
+    monkeypatch.setattr(ps, '_browser', _FakeBrowser(log))
+    monkeypatch.setattr(ps, '_page_pools', {})
+    monkeypatch.setattr(ps, '_page_counters', dict.fromkeys(ps._page_counters, 0))
+    monkeypatch.setattr(ps, '_phase_stats', {phase: [0, 0, 0] for phase in ps.RENDER_PHASES})
+    monkeypatch.setattr(ps, 'PAGE_MAX_RENDERS', 3)
+    template = ps.REGISTRY['atlas_thumb']
+
+    async def scenario():
+        for key in ('Euclid', 'Hilbert', 'broken', 'Calypso', 'Eissentam', 'Budullangr'):
+            try:
+                await ps._render(template, key, tmp_path / f'{key}.png')
+            except TimeoutError:
+                pass
+
+    asyncio.run(scenario())
+    kinds = [entry[0] for entry in log]
+    assert kinds == ['load', 'client', 'client', 'close', 'load', 'client', 'client', 'close']
+    assert (tmp_path / 'Budullangr.png').exists() and not (tmp_path / 'broken.png').exists()
+
+    pool = ps.page_pool_stats()
+    assert (pool['created'], pool['discarded'], pool['recycled']) == (2, 1, 1)
+    assert (pool['page_loads'], pool['client_navigations']) == (2, 4)
+    phases = ps.render_phase_stats()
+    assert phases['navigation']['count'] == 6 and phases['screenshot']['count'] == 5
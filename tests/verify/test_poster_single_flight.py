@@ -0,0 +1,96 @@
+"""
+Verification tests for poster render scheduling
+(Haven-UI/backend/services/poster_service.py).
+
+Covers:
+  - Concurrent requests for one (type, key) share a single render.
+  - An expired poster is served immediately and refreshed in the background.
+  - Interactive requests take freed render slots ahead of queued pre-warm
+    work, including when they join a pre-warm render still in the queue.
+
+Chromium and the cache table are replaced with in-memory fakes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+@pytest.fixture
+def posters(haven_module, monkeypatch, tmp_path):
+    from services import poster_service as ps
+
+    rows: dict = {}
+    rendered: list[str] = []
+
+    async def fake_render(template, cache_key, output_path, priority=ps.PRIORITY_INTERACTIVE):
+        key = (template.type, cache_key)
+        priority = min(priority, ps._flight_priority.get(key, priority))
+        async with ps._render_gate.slot(priority, key):
+            rendered.append(cache_key)
+            await asyncio.sleep(0.01)
+            output_path.write_bytes(b'png')
+        return 10
+
+    def fake_write(poster_type, cache_key, template_version, data_hash, file_path, render_ms):
+        rows[(poster_type, cache_key)] = {
+            'template_version': template_version,
+            'file_path': file_path,
+            'generated_at': '2000-01-01T00:00:00+00:00',  # always past TTL
+        }
+
+    monkeypatch.setattr(ps, '_render', fake_render)
+    monkeypatch.setattr(ps, '_cache_write', fake_write)
+    monkeypatch.setattr(ps, '_cache_lookup', lambda t, k: rows.get((t, k)))
+    monkeypatch.setattr(ps, '_build_output_path', lambda t, k: tmp_path / f'{k}.png')
+    monkeypatch.setattr(ps, '_render_gate', ps._RenderGate(2))
+    monkeypatch.setattr(ps, 'compute_data_hash', lambda t, k: None)
+    return ps, rendered
+
+
+def test_concurrent_requests_share_one_render(posters):
+    ps, rendered = posters
+
+    async def scenario():
+        return await asyncio.gather(*[ps.get_or_render('atlas_thumb', 'Euclid') for _ in range(5)])
+
+    paths = asyncio.run(scenario())
+    assert rendered == ['Euclid']
+    assert len(set(paths)) == 1 and Path(paths[0]).exists()
+    assert not ps._inflight
+
+
+def test_stale_poster_served_while_refreshing(posters):
+    ps, rendered = posters
+
+    async def scenario():
+        first = await ps.get_or_render('atlas_thumb', 'Eissentam')
+        stale = await ps.get_or_render('atlas_thumb', 'Eissentam')
+        assert stale == first and ('atlas_thumb', 'Eissentam') in ps._inflight
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert rendered == ['Eissentam', 'Eissentam']
+    assert not ps._inflight
+
+
+def test_interactive_preempts_prewarm(posters):
+    ps, rendered = posters
+
+    async def scenario():
+        prewarm = [asyncio.create_task(ps.get_or_render(
+            'atlas_thumb', f'pre{i}', priority=ps.PRIORITY_PREWARM, stale_ok=False)) for i in range(6)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        hot = asyncio.create_task(ps.get_or_render('atlas_thumb', 'hot'))
+        joined = asyncio.create_task(ps.get_or_render('atlas_thumb', 'pre5'))
+        await asyncio.gather(*prewarm, hot, joined)
+
+    asyncio.run(scenario())
+    assert sorted(rendered[2:4]) == ['hot', 'pre5']
+    assert ps._render_gate.stats() == {'free_slots': 2, 'waiting': {}}
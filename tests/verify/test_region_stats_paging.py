@@ -0,0 +1,93 @@
+"""
+Verification tests for region_stats paging of /api/regions/grouped
+(Haven-UI/backend/services/region_stats.py, migration 1.106.0).
+
+Covers:
+  - Triggers keep region_stats current across insert, move and delete.
+  - Walking the list with `after` / next_cursor returns the same regions,
+    in the same order, as one limit=0 request and as page numbers.
+  - A request with an advanced filter (legacy aggregation) honours the same
+    cursor.
+  - A bad cursor is a 400.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'RSTATVERIFY'
+GALAXY = 'Hilbert Dimension'
+
+
+def _coords(body):
+    return [(r['region_x'], r['region_y'], r['region_z']) for r in body['regions']]
+
+
+def test_region_stats_keyset_paging(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # Region n gets n systems, so the list order is by count, descending.
+        ids = []
+        for n in range(1, 6):
+            for i in range(n):
+                ids.append(cursor.execute(
+                    "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, region_x, region_y, region_z,"
+                    " discord_tag, star_type, created_at) VALUES (?, ?, 1, 2, 3, ?, ?, 90, 90, ?, 'Yellow', ?)",
+                    (f'RS {n}-{i}', GALAXY, f'0{n}{i}D000A0B0C', 900 + n, TAG, f'2026-01-0{n}')).lastrowid)
+        conn.commit()
+
+        row = conn.execute(
+            "SELECT system_count, first_system_date FROM region_stats"
+            " WHERE galaxy = ? AND region_x = 903 AND discord_tag = ?", (GALAXY, TAG)).fetchone()
+        assert tuple(row) == (3, '2026-01-03')
+
+        # include_systems: the test schema predates systems.submitter_id,
+        # which the summary-only path reads.
+        params = {'galaxy': GALAXY, 'discord_tag': TAG, 'include_systems': True}
+        full = haven_client.get('/api/regions/grouped', params={**params, 'limit': 0}).json()
+        assert _coords(full) == [(905 - i, 90, 90) for i in range(5)]
+        assert [r['system_count'] for r in full['regions']] == [5, 4, 3, 2, 1]
+        assert len(full['regions'][0]['systems']) == 5
+
+        walked, after, pages = [], None, 0
+        while True:
+            q = {**params, 'limit': 2}
+            if after:
+                q['after'] = after
+            body = haven_client.get('/api/regions/grouped', params=q).json()
+            assert body['total_regions'] == 5
+            walked += _coords(body)
+            pages += 1
+            after = body['next_cursor']
+            if not after:
+                break
+        assert walked == _coords(full) and pages == 3
+        page2 = haven_client.get('/api/regions/grouped', params={**params, 'limit': 2, 'page': 2}).json()
+        assert _coords(page2) == _coords(full)[2:4]
+
+        first = haven_client.get('/api/regions/grouped', params={**params, 'limit': 2}).json()
+        legacy = haven_client.get('/api/regions/grouped', params={
+            **params, 'limit': 2, 'star_type': 'Yellow', 'after': first['next_cursor']}).json()
+        assert _coords(legacy) == _coords(full)[2:4]
+
+        # Move a system between regions, then delete a region's only system.
+        conn.execute("UPDATE systems SET region_x = 905 WHERE id = ?", (ids[0],))
+        conn.commit()
+        counts = dict(conn.execute(
+            "SELECT region_x, system_count FROM region_stats WHERE galaxy = ? AND discord_tag = ?", (GALAXY, TAG)))
+        assert 901 not in counts and counts[905] == 6
+        conn.execute("DELETE FROM systems WHERE region_x = 902 AND discord_tag = ?", (TAG,))
+        conn.commit()
+        body = haven_client.get('/api/regions/grouped', params={**params, 'limit': 0}).json()
+        assert _coords(body) == [(905, 90, 90), (904, 90, 90), (903, 90, 90)]
+
+        assert haven_client.get('/api/regions/grouped', params={**params, 'after': 'bogus'}).status_code == 400
+    finally:
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,159 @@
+"""
+Verification tests for the widened region summary
+(Haven-UI/backend/services/region_stats.py, migration 1.107.0).
+
+Covers:
+  - Triggers keep grade counts, display coords and region_contributors
+    current across inserts, co-author credits, a grade change and a move,
+    and match a from-scratch rebuild_region_stats().
+  - A key column updated from NULL to its default (reality NULL -> 'Normal',
+    discord_tag NULL -> '') stays in the same partition and is counted once.
+  - The card footer's contributor_count is the same from the summary and
+    from the fallback that aggregates systems itself.
+  - /api/map/regions-aggregated and the /api/regions/grouped card footer
+    read their numbers from the summary.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'RSUMVERIFY'
+GALAXY = 'Calypso'
+
+
+def _snapshot(conn):
+    stats = conn.execute(
+        "SELECT region_x, discord_tag, system_count, grade_s_count, grade_splus_count, min_x, min_y, min_z"
+        " FROM region_stats WHERE galaxy = ? ORDER BY 1, 2", (GALAXY,)).fetchall()
+    contributors = conn.execute(
+        "SELECT region_x, discord_tag, contributor FROM region_contributors"
+        " WHERE galaxy = ? ORDER BY 1, 2, 3", (GALAXY,)).fetchall()
+    return [tuple(r) for r in stats], [tuple(r) for r in contributors]
+
+
+def test_region_summary_triggers_and_readers(haven_client):
+    import db
+    from services.region_stats import rebuild_region_stats
+
+    conn = db.get_db_connection()
+    try:
+        rows = [
+            # (name, x, region_x, tag, score, fully_charted, profile_id, contributor key)
+            ('RSum A', 5, 920, TAG, 90, 1, None, 'ana'),
+            ('RSum B', -3, 920, TAG, 60, 0, None, 'bo'),
+            ('RSum C', 8, 920, 'RSUMOTHER', 88, 0, None, 'ana'),
+            ('RSum D', 1, 921, TAG, 95, 0, None, 'unknown'),
+        ]
+        ids = [conn.execute(
+            "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, region_x, region_y, region_z,"
+            " discord_tag, is_complete, is_fully_charted, profile_id, username_normalized, created_at)"
+            " VALUES (?, ?, ?, 7, 9, ?, ?, 91, 91, ?, ?, ?, ?, ?, '2026-02-01')",
+            (name, GALAXY, x, f'0{i}1E000A0B0C', rx, tag, score, charted, pid, norm)).lastrowid
+            for i, (name, x, rx, tag, score, charted, pid, norm) in enumerate(rows)]
+        conn.execute(
+            "INSERT INTO system_coauthors (system_id, profile_id, username, username_normalized, credited_at)"
+            " VALUES (?, NULL, 'Cy', 'cy', '2026-02-01')", (ids[3],))
+        conn.commit()
+
+        stats, contributors = _snapshot(conn)
+        assert (920, TAG, 2, 1, 1, -3.0, 7.0, 9.0) in stats
+        assert (921, TAG, 1, 1, 0, 1.0, 7.0, 9.0) in stats
+        assert contributors == [(920, 'RSUMOTHER', 'u:ana'), (920, TAG, 'u:ana'), (920, TAG, 'u:bo'),
+                                (921, TAG, 'u:cy')]
+
+        # Re-grade B, move C next to D, drop the co-author.
+        conn.execute("UPDATE systems SET is_complete = 86 WHERE id = ?", (ids[1],))
+        conn.execute("UPDATE systems SET region_x = 921 WHERE id = ?", (ids[2],))
+        conn.execute("DELETE FROM system_coauthors WHERE system_id = ?", (ids[3],))
+        conn.commit()
+        stats, contributors = _snapshot(conn)
+        assert (920, TAG, 2, 2, 1, -3.0, 7.0, 9.0) in stats
+        assert (921, 'RSUMOTHER', 1, 1, 0, 8.0, 7.0, 9.0) in stats
+        assert contributors == [(920, TAG, 'u:ana'), (920, TAG, 'u:bo'), (921, 'RSUMOTHER', 'u:ana')]
+
+        rebuild_region_stats(conn)
+        assert _snapshot(conn) == (stats, contributors)
+
+        body = haven_client.get('/api/map/regions-aggregated', params={'galaxy': GALAXY}).json()
+        by_x = {r['region_x']: r for r in body['regions'] if r['region_y'] == 91}
+        assert by_x[920]['system_count'] == 2 and by_x[920]['display_x'] == -3.0
+        assert by_x[921]['discord_tags'] == ['RSUMOTHER', TAG]  # tied counts, then by tag
+        assert by_x[920]['dominant_tag'] == TAG
+
+        cards = haven_client.get('/api/regions/grouped', params={'galaxy': GALAXY, 'limit': 0}).json()
+        card = {r['region_x']: r for r in cards['regions']}
+        assert (card[920]['grade_s_count'], card[920]['grade_splus_count'], card[920]['contributor_count']) == (2, 1, 2)
+        assert (card[921]['system_count'], card[921]['contributor_count']) == (2, 1)
+    finally:
+        conn.execute("DELETE FROM system_coauthors WHERE system_id IN"
+                     " (SELECT id FROM systems WHERE name LIKE 'RSum %')")
+        conn.execute("DELETE FROM systems WHERE name LIKE 'RSum %'")
+        conn.commit()
+        conn.close()
+
+
+def test_region_summary_null_to_default_update(haven_client):
+    import db
+    from services.region_stats import rebuild_region_stats
+
+    conn = db.get_db_connection()
+    try:
+        ids = [conn.execute(
+            "INSERT INTO systems (name, galaxy, reality, x, y, z, glyph_code, region_x, region_y, region_z,"
+            " discord_tag, is_complete, is_fully_charted, username_normalized, created_at)"
+            " VALUES (?, ?, NULL, ?, 7, 9, ?, 922, 91, 91, NULL, 90, 0, 'dee', '2026-02-01')",
+            (f'RSum N{i}', GALAXY, i, f'0{i}2E000A0B0C')).lastrowid
+            for i in range(3)]
+        conn.commit()
+        stats, contributors = _snapshot(conn)
+        assert (922, '', 3, 3, 0, 0.0, 7.0, 9.0) in stats
+
+        conn.execute("UPDATE systems SET reality = 'Normal' WHERE id = ?", (ids[0],))
+        conn.execute("UPDATE systems SET discord_tag = '' WHERE id = ?", (ids[1],))
+        conn.commit()
+        assert _snapshot(conn) == (stats, contributors)
+
+        rebuild_region_stats(conn)
+        assert _snapshot(conn) == (stats, contributors)
+    finally:
+        conn.execute("DELETE FROM systems WHERE name LIKE 'RSum N%'")
+        conn.commit()
+        conn.close()
+
+
+def test_region_contributor_count_matches_fallback(haven_client, monkeypatch):
+    import db
+    import routes.regions as regions_route
+
+    conn = db.get_db_connection()
+    try:
+        rows = [
+            # (name, profile_id, contributor key, personal_discord_username, discovered_by)
+            ('RSum P1', 7001, 'ana', 'Ana', 'Ana'),
+            ('RSum P2', None, 'ana', 'SomeoneElse', 'Ana'),
+            ('RSum P3', None, 'bo', None, 'Bo'),
+            ('RSum P4', None, 'unknown', 'Legacy Name', 'Anonymous'),
+        ]
+        for i, (name, pid, norm, personal, discoverer) in enumerate(rows):
+            conn.execute(
+                "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, region_x, region_y, region_z,"
+                " discord_tag, is_complete, profile_id, username_normalized, personal_discord_username,"
+                " discovered_by, created_at)"
+                " VALUES (?, ?, ?, 7, 9, ?, 923, 91, 91, ?, 50, ?, ?, ?, ?, '2026-02-01')",
+                (name, GALAXY, i, f'0{i}3E000A0B0C', TAG, pid, norm, personal, discoverer))
+        conn.commit()
+
+        def contributor_count():
+            cards = haven_client.get('/api/regions/grouped', params={'galaxy': GALAXY, 'limit': 0}).json()
+            return {r['region_x']: r['contributor_count'] for r in cards['regions']}[923]
+
+        summary = contributor_count()
+        monkeypatch.setattr(regions_route, 'has_hidden_systems', lambda *a, **k: True)
+        assert contributor_count() == summary == 3  # p:7001, u:ana, u:bo
+    finally:
+        conn.execute("DELETE FROM systems WHERE name LIKE 'RSum P%'")
+        conn.commit()
+        conn.close()
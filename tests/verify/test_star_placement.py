@@ -0,0 +1,36 @@
+"""
+Verification test for batched intra-region star placement
+(Haven-UI/backend/services/map_snapshot.py).
+
+spread_stars() must stay bit-identical to the scalar spread_star() — the map
+positions are part of the snapshot wire format and must not shift between
+a full build and an incremental patch.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+
+def test_spread_stars_bit_identical(haven_module):
+    from services.map_snapshot import spread_star, spread_stars
+
+    rng = np.random.default_rng(7)
+    n = 2000
+    rx = rng.integers(0, 0x1000, n)
+    ry = rng.integers(0, 0x100, n)
+    rz = rng.integers(0, 0x1000, n)
+    sss = rng.integers(0, 0x1000, n)
+    # Signed-coordinate boundaries on every axis.
+    rx[:4] = [0, 0x7FF, 0x800, 0xFFF]
+    ry[:4] = [0, 0x7F, 0x80, 0xFF]
+    rz[:4] = [0xFFF, 0x800, 0x7FF, 0]
+
+    expected = np.array([spread_star(*map(int, k)) for k in zip(rx, ry, rz, sss)])
+    for _ in range(2):  # second pass is served from the digest memo
+        got = spread_stars(rx, ry, rz, sss)
+        assert got.shape == (n, 3)
+        assert np.array_equal(got.view(np.uint64), expected.view(np.uint64))
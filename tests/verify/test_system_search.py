@@ -0,0 +1,82 @@
+"""
+Verification tests for the trigram FTS system search
+(Haven-UI/backend/services/system_search.py, migration 1.103.0).
+
+Covers:
+  - /api/systems/search finds systems through the index on name, region
+    name and co-author, with the existing match_reason chips.
+  - Triggers keep the index current across region renames, co-author
+    changes and system deletes.
+  - 2-char queries still work through the LIKE fallback.
+  - /api/search typeahead mode reports a capped systems total.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytestmark = [pytest.mark.verify]
+
+TAG = 'FTSVERIFY'
+
+
+def _names(resp):
+    return sorted(r['name'] for r in resp.json()['results'])
+
+
+def test_fts_search_and_sync(haven_client):
+    import db
+
+    conn = db.get_db_connection()
+    ids = []
+    try:
+        for i, name in enumerate(['Zorblax Prime', 'Zorblax Minor', 'Quietude']):
+            ids.append(conn.execute(
+                "INSERT INTO systems (name, galaxy, x, y, z, glyph_code, region_x, region_y, region_z, discord_tag)"
+                " VALUES (?, 'Euclid', 1, 2, 3, ?, 71, 72, 73, ?)",
+                (name, f'00{i}7000A0B0C', TAG)).lastrowid)
+        conn.execute("INSERT INTO regions (region_x, region_y, region_z, custom_name, reality, galaxy)"
+                     " VALUES (71, 72, 73, 'Ftsverify Reach', 'Normal', 'Euclid')")
+        conn.execute("INSERT INTO system_coauthors (system_id, username, username_normalized, credited_at)"
+                     " VALUES (?, 'Wibblequist', 'wibblequist', datetime('now'))", (str(ids[2]),))
+        conn.commit()
+
+        assert conn.execute("SELECT COUNT(*) FROM systems_fts WHERE systems_fts MATCH '\"zorblax\"'").fetchone()[0] == 2
+
+        resp = haven_client.get('/api/systems/search', params={'q': 'zorbl'})
+        assert _names(resp) == ['Zorblax Minor', 'Zorblax Prime']
+        assert all(r['match_reason'] is None for r in resp.json()['results'])
+
+        resp = haven_client.get('/api/systems/search', params={'q': 'ftsverify reach'})
+        assert _names(resp) == ['Quietude', 'Zorblax Minor', 'Zorblax Prime']
+        assert resp.json()['results'][0]['match_reason']['kind'] == 'region'
+
+        resp = haven_client.get('/api/systems/search', params={'q': 'bblequi'})
+        assert _names(resp) == ['Quietude']
+        assert resp.json()['results'][0]['match_reason'] == {'kind': 'contributor', 'snippet': 'co-author'}
+
+        # Region rename, co-author removal and a delete all reach the index.
+        conn.execute("UPDATE regions SET custom_name = 'Renamed Expanse' WHERE region_x = 71 AND region_y = 72")
+        conn.execute("DELETE FROM system_coauthors WHERE system_id = ?", (str(ids[2]),))
+        conn.execute("DELETE FROM systems WHERE id = ?", (ids[1],))
+        conn.commit()
+        assert _names(haven_client.get('/api/systems/search', params={'q': 'ftsverify reach'})) == []
+        assert _names(haven_client.get('/api/systems/search', params={'q': 'renamed expanse'})) == [
+            'Quietude', 'Zorblax Prime']
+        assert _names(haven_client.get('/api/systems/search', params={'q': 'bblequi'})) == []
+        conn.execute("INSERT INTO systems_fts(systems_fts) VALUES ('integrity-check')")
+
+        # Too short for trigrams: served by the LIKE fallback.
+        assert 'Quietude' in _names(haven_client.get('/api/systems/search', params={'q': 'Qu', 'limit': 50}))
+
+        full = haven_client.get('/api/search', params={'q': 'renamed expanse', 'limit': 1}).json()
+        assert full['totals']['systems'] == 2 and len(full['systems']) == 1
+        quick = haven_client.get('/api/search', params={'q': 'renamed expanse', 'limit': 1, 'typeahead': True}).json()
+        assert quick['totals']['systems'] == 2 and len(quick['systems']) == 1
+        assert quick['systems'][0]['name'] == full['systems'][0]['name']
+    finally:
+        conn.execute("DELETE FROM system_coauthors WHERE system_id IN (?, ?, ?)", tuple(str(i) for i in ids))
+        conn.execute("DELETE FROM regions WHERE region_x = 71 AND region_y = 72 AND region_z = 73")
+        conn.execute("DELETE FROM systems WHERE discord_tag = ?", (TAG,))
+        conn.commit()
+        conn.close()